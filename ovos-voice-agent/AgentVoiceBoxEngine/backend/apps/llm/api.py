@@ -44,6 +44,7 @@ def get_llm_config(request):
         model=settings.default_llm_model,
         temperature=settings.default_llm_temperature,
         max_tokens=settings.default_llm_max_tokens,
+        response_cache=settings.llm_response_cache_enabled,
         openai_api_key=secrets.get(
             "openai_api_key", ""
         ),  # Return empty string if not found.
@@ -63,7 +64,7 @@ def update_llm_config(request, payload: LLMConfigUpdate):
     Updates the LLM configuration for the authenticated tenant.
 
     This endpoint handles updates to both general LLM settings (like provider,
-    model, temperature, max_tokens) which are stored in `TenantSettings`,
+    model, temperature, max_tokens, response_cache) which are stored in `TenantSettings`,
     and sensitive credentials (like API keys, base URLs) which are securely
     stored in Vault. A `None` value for an API key in the payload will remove
     that key from Vault.
@@ -78,6 +79,7 @@ def update_llm_config(request, payload: LLMConfigUpdate):
         default_llm_model=payload.model,
         default_llm_temperature=payload.temperature,
         default_llm_max_tokens=payload.max_tokens,
+        llm_response_cache_enabled=payload.response_cache,
     )
 
     # Handle sensitive API keys and base URLs (stored in Vault).
@@ -109,6 +111,7 @@ def update_llm_config(request, payload: LLMConfigUpdate):
         model=settings.default_llm_model,
         temperature=settings.default_llm_temperature,
         max_tokens=settings.default_llm_max_tokens,
+        response_cache=settings.llm_response_cache_enabled,
         openai_api_key=retrieved_secrets_for_response.get("openai_api_key", ""),
         groq_api_key=retrieved_secrets_for_response.get("groq_api_key", ""),
         ollama_base_url=retrieved_secrets_for_response.get("ollama_base_url", ""),
@@ -25,6 +25,7 @@ class LLMConfigOut(Schema):
     model: str  # The specific LLM model being used (e.g., 'gpt-4', 'llama-3.3-70b-versatile').
     temperature: float  # The LLM's creativity/randomness setting (0.0 to 2.0).
     max_tokens: int  # The maximum number of tokens for an LLM response.
+    response_cache: bool = False  # Whether identical temperature-0 requests reuse responses.
     openai_api_key: str = ""  # Placeholder for OpenAI API key (retrieved from Vault).
     groq_api_key: str = ""  # Placeholder for Groq API key (retrieved from Vault).
     ollama_base_url: str = ""  # Placeholder for Ollama base URL (retrieved from Vault).
@@ -41,6 +42,7 @@ class LLMConfigUpdate(Schema):
     model: Optional[str] = None
     temperature: Optional[float] = None
     max_tokens: Optional[int] = None
+    response_cache: Optional[bool] = None
     openai_api_key: Optional[str] = None  # New OpenAI API key. Set to None to clear.
     groq_api_key: Optional[str] = None  # New Groq API key. Set to None to clear.
     ollama_base_url: Optional[str] = None  # New Ollama base URL. Set to None to clear.
@@ -17,6 +17,7 @@ from typing import Any, Optional
 
 from django.core.management.base import BaseCommand
 from apps.mcp.server_factory import create_mcp_server
+from apps.workflows.model_registry import warmup_models
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +59,9 @@ class Command(BaseCommand):
         # Initialize the MCP Server using the shared factory
         mcp = create_mcp_server()
 
+        # Load configured models so the first generate_speech call does not pay for it
+        warmup_models()
+
         # Run the server
         if transport == "stdio":
             # FastMCP.run() handles the event loop
@@ -76,7 +76,8 @@ async def generate_speech(
         output_format="wav",
     )
 
-    # Instantiate activities directly (since they don't depend on Temporal context for this method)
+    # Instantiate activities directly (since they don't depend on Temporal context for this method).
+    # The Kokoro pipeline comes from the process-wide model registry, so only the first call loads it.
     activities = TTSActivities()
     
     try:
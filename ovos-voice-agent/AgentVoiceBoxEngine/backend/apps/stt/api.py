@@ -5,10 +5,17 @@ Speech-to-Text (STT) Configuration and Testing API Endpoints
 This module provides API endpoints for managing Speech-to-Text (STT) configurations
 and for testing STT provider integrations. These endpoints allow tenants to set up
 their preferred STT models and languages, and to get insights into STT usage metrics.
+Long recordings are transcribed offline by the STT worker pool and streamed back
+segment by segment.
 """
 
+import json
+import os
+import shutil
+import tempfile
 
 from django.db.models import Sum
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from ninja import Router
 from ninja.files import UploadedFile
@@ -18,6 +25,7 @@ from apps.core.exceptions import ValidationError
 from apps.core.permissions.decorators import require_granular_role
 from apps.tenants.services import TenantSettingsService
 from apps.workflows.activities.stt import STTActivities, TranscriptionRequest
+from apps.workflows.stt_batch import longform_redis, transcribe_recording
 
 from .schemas import STTConfigOut, STTConfigUpdate, STTMetricsOut, STTTestOut
 
@@ -140,3 +148,52 @@ async def test_stt(request, audio: UploadedFile):
     )
 
     return STTTestOut(transcription=result.text)
+
+
+@require_granular_role(["agent_admin", "tenant_admin", "saas_admin"])
+@router.post("/transcriptions", summary="Transcribe a Long Recording")
+def transcribe_recording_file(request, audio: UploadedFile, language: str = ""):
+    """
+    Transcribes a long WAV recording on the STT worker pool.
+
+    The recording is split at silence into chunks that idle STT workers
+    decode in parallel. Segments are streamed back as newline-delimited JSON
+    (`{"type": "segment", "start", "end", "text"}`) in recording order as
+    their chunks finish, followed by a `completed` or `error` line.
+
+    **Permissions:** Requires AGENT_ADMIN or TENANT_ADMIN role.
+    """
+    if audio is None or not audio.size:
+        raise ValidationError("Audio file is required.")
+
+    # Large uploads are already on disk; small ones are spooled to a file so
+    # the recording can be memory-mapped.
+    if hasattr(audio, "temporary_file_path"):
+        path, owned = audio.temporary_file_path(), False
+    else:
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as spooled:
+            shutil.copyfileobj(audio.file, spooled)
+        path, owned = spooled.name, True
+
+    tenant_id = str(request.tenant.id)
+
+    async def lines():
+        redis = longform_redis()
+        segments = 0
+        try:
+            async for segment in transcribe_recording(
+                redis, path, tenant_id, language=language or None
+            ):
+                segments += 1
+                yield json.dumps({"type": "segment", **segment.to_dict()}) + "\n"
+            yield json.dumps({"type": "completed", "segments": segments}) + "\n"
+        except (ValueError, RuntimeError, TimeoutError) as exc:
+            yield json.dumps({"type": "error", "error": str(exc)}) + "\n"
+        finally:
+            await redis.aclose()
+            if owned:
+                os.remove(path)
+
+    response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0002_settings_stt_llm_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenantsettings",
+            name="llm_response_cache_enabled",
+            field=models.BooleanField(
+                default=False,
+                help_text="Reuse cached LLM responses for identical requests at temperature 0.",
+            ),
+        ),
+    ]
@@ -337,6 +337,10 @@ class TenantSettings(models.Model):
     default_llm_max_tokens = models.PositiveIntegerField(
         default=1024, help_text="Default LLM max tokens."
     )
+    llm_response_cache_enabled = models.BooleanField(
+        default=False,
+        help_text="Reuse cached LLM responses for identical requests at temperature 0.",
+    )
 
     # --- Notification Settings ---
     webhook_url = models.URLField(
@@ -129,6 +129,7 @@ class TenantSettingsSchema(Schema):
     default_llm_model: str = "llama-3.3-70b-versatile"
     default_llm_temperature: float = 0.7
     default_llm_max_tokens: int = 1024
+    llm_response_cache_enabled: bool = False
 
     # Notification settings
     webhook_url: str = ""
@@ -165,6 +166,7 @@ class TenantSettingsUpdateSchema(Schema):
     default_llm_model: Optional[str] = None
     default_llm_temperature: Optional[float] = None
     default_llm_max_tokens: Optional[int] = None
+    llm_response_cache_enabled: Optional[bool] = None
 
     # Notifications
     webhook_url: Optional[str] = None
@@ -488,6 +488,7 @@ class TenantSettingsService:
             "default_llm_model",
             "default_llm_temperature",
             "default_llm_max_tokens",
+            "llm_response_cache_enabled",
         ]
         for key, value in kwargs.items():
             if key in voice_fields and value is not None:
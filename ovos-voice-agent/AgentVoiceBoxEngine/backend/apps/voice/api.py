@@ -11,6 +11,7 @@ Key functionalities include:
 - CRUD operations for Voice Personas.
 - CRUD operations for Voice Models (partially admin-restricted).
 - Endpoints for retrieving configuration and testing voice personas.
+- Long-form batch synthesis streamed as a WAV file.
 
 The API is built using the Django Ninja framework, which provides automatic
 request validation and API documentation generation.
@@ -19,6 +20,8 @@ request validation and API documentation generation.
 from typing import Optional
 from uuid import UUID
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from ninja import Query, Router
 
 from apps.core.exceptions import (
@@ -28,8 +31,10 @@ from apps.core.exceptions import (
 )
 from apps.llm.services import LLMConfigService
 from apps.workflows.activities.llm import LLMActivities, LLMRequest, Message
+from apps.workflows.tts_batch import BatchJob, binary_redis, iter_sentences, stream_wav
 
 from .schemas import (
+    TTSBatchRequest,
     VoiceLanguagesOut,
     VoiceModelCreate,
     VoiceModelListOut,
@@ -69,6 +74,8 @@ def _persona_to_out(p) -> VoicePersonaOut:
         description=p.description,
         voice_id=p.voice_id,
         voice_speed=p.voice_speed,
+        greeting=p.greeting,
+        canned_phrases=p.canned_phrases,
         stt_model=p.stt_model,
         stt_language=p.stt_language,
         llm_provider=p.llm_provider,
@@ -550,3 +557,53 @@ def delete_model(request, model_id: str):
         raise NotFoundError(f"Voice model '{model_id}' not found")
     VoiceModelService.delete_model(model)
     return 204, None
+
+
+@router.post("/tts/batch", summary="Synthesize a Long-Form Document")
+def synthesize_batch(request, payload: TTSBatchRequest):
+    """
+    Synthesizes a long document and streams it as a WAV file.
+
+    The document is split into sentences that the TTS workers synthesize in
+    parallel. Audio is streamed in sentence order as soon as each sentence
+    is ready, and only a bounded window of sentences is in flight, so memory
+    use does not depend on the document's length. The WAV header carries no
+    length; the stream ends with the last sentence.
+
+    Args:
+        payload: A TTSBatchRequest with the document, voice and speed.
+
+    Returns:
+        A streaming `audio/wav` response.
+
+    Raises:
+        ValidationError: If the document is empty.
+    """
+    if not payload.text.strip():
+        raise ValidationError("Text is required")
+
+    config = settings.TTS_WORKER
+    job = BatchJob.create(
+        tenant_id=str(request.tenant.id),
+        voice=payload.voice_id or config["DEFAULT_VOICE"],
+        speed=payload.speed,
+    )
+
+    async def audio():
+        redis = binary_redis()
+        try:
+            async for chunk in stream_wav(
+                redis,
+                job,
+                iter_sentences([payload.text], config["BATCH_MAX_SENTENCE_CHARS"]),
+                window=config["BATCH_WINDOW"],
+                timeout=config["BATCH_SEGMENT_TIMEOUT"],
+            ):
+                yield chunk
+        finally:
+            await redis.aclose()
+
+    response = StreamingHttpResponse(audio(), content_type="audio/wav")
+    response["Content-Disposition"] = f'attachment; filename="{job.job_id}.wav"'
+    response["X-Accel-Buffering"] = "no"
+    return response
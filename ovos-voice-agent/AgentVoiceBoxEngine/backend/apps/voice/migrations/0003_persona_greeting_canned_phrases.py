@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("voice", "0002_persona_solvers_custom_voice_wake_word"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voicepersona",
+            name="greeting",
+            field=models.TextField(
+                blank=True,
+                help_text="The phrase spoken when a session of this persona starts. Pre-rendered into the TTS cache on save.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voicepersona",
+            name="canned_phrases",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                help_text="Fixed phrases the persona speaks often (e.g., hold messages). Pre-rendered into the TTS cache on save.",
+            ),
+        ),
+    ]
@@ -59,6 +59,15 @@ class VoicePersona(TenantScopedModel):
         default=1.0,
         help_text="Speech speed multiplier. 1.0 is normal speed, <1.0 is slower, >1.0 is faster.",
     )
+    greeting = models.TextField(
+        blank=True,
+        help_text="The phrase spoken when a session of this persona starts. Pre-rendered into the TTS cache on save.",
+    )
+    canned_phrases = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Fixed phrases the persona speaks often (e.g., hold messages). Pre-rendered into the TTS cache on save.",
+    )
 
     # --- Speech-to-Text (STT) Settings ---
     stt_model = models.CharField(
@@ -175,6 +184,7 @@ class VoicePersona(TenantScopedModel):
             "voice": {
                 "id": self.voice_id,
                 "speed": self.voice_speed,
+                "greeting": self.greeting,
             },
             "stt": {
                 "model": self.stt_model,
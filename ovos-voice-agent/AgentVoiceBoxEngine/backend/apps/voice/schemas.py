@@ -32,6 +32,8 @@ class VoicePersonaCreate(Schema):
     description: str = ""  # Optional description of the persona's character.
     voice_id: str = "af_heart"  # The ID of the TTS voice model to use.
     voice_speed: float = 1.0  # Speech speed multiplier (1.0 = normal).
+    greeting: str = ""  # Spoken when a session starts; pre-rendered on save.
+    canned_phrases: list[str] = []  # Frequent fixed phrases; pre-rendered on save.
     stt_model: str = "tiny"  # The Whisper model for Speech-to-Text.
     stt_language: str = "en"  # The language code for STT.
     llm_provider: str = (
@@ -64,6 +66,8 @@ class VoicePersonaUpdate(Schema):
     )
     voice_id: Optional[str] = None  # The ID of the TTS voice model to use.
     voice_speed: Optional[float] = None  # Speech speed multiplier (1.0 = normal).
+    greeting: Optional[str] = None  # Spoken when a session starts.
+    canned_phrases: Optional[list[str]] = None  # Frequent fixed phrases.
     stt_model: Optional[str] = None  # The Whisper model for Speech-to-Text.
     stt_language: Optional[str] = None  # The language code for STT.
     llm_provider: Optional[str] = None  # The provider for the Large Language Model.
@@ -99,6 +103,8 @@ class VoicePersonaOut(Schema):
     description: str
     voice_id: str
     voice_speed: float
+    greeting: str
+    canned_phrases: list[str]
     stt_model: str
     stt_language: str
     llm_provider: str
@@ -124,7 +130,7 @@ class VoicePersonaConfigOut(Schema):
     configure a voice session.
     """
 
-    voice: dict[str, Any]  # Contains 'id' and 'speed' for TTS.
+    voice: dict[str, Any]  # Contains 'id', 'speed' and 'greeting' for TTS.
     stt: dict[str, Any]  # Contains 'model' and 'language' for STT.
     llm: dict[str, Any]  # Contains LLM parameters like 'provider', 'model', etc.
     turn_detection: dict[str, Any]  # Contains VAD parameters.
@@ -157,6 +163,17 @@ class VoicePersonaTestResponse(Schema):
     response: str  # The text response generated by the LLM.
 
 
+class TTSBatchRequest(Schema):
+    """
+    Defines the request payload for synthesizing a long-form document.
+    The document is synthesized sentence by sentence and streamed as WAV.
+    """
+
+    text: str  # The document to synthesize.
+    voice_id: Optional[str] = None  # The TTS voice; the worker default when omitted.
+    speed: float = 1.0  # Speech speed multiplier (1.0 = normal).
+
+
 # ==========================================================================
 # VOICE MODEL SCHEMAS
 # ==========================================================================
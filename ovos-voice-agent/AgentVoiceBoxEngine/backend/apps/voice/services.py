@@ -18,6 +18,7 @@ from django.db import transaction
 
 from apps.tenants.models import Tenant
 from apps.voice.models import VoiceModel, VoicePersona
+from apps.workflows.tts_prerender import schedule_persona_prerender
 
 
 class VoicePersonaService:
@@ -126,7 +127,9 @@ class VoicePersonaService:
 
         If the `is_default` flag is set to True in the payload, this method
         atomically ensures that any other persona for the same tenant is
-        unmarked as the default.
+        unmarked as the default. Once the transaction commits, the persona's
+        greeting and canned phrases are queued for pre-rendering into the
+        TTS cache.
 
         Args:
             tenant: The tenant who will own the new persona.
@@ -143,6 +146,7 @@ class VoicePersonaService:
             )
 
         persona = VoicePersona.objects.create(tenant=tenant, **data)
+        schedule_persona_prerender(persona)
         return persona
 
     @staticmethod
@@ -154,6 +158,8 @@ class VoicePersonaService:
         If the `is_default` flag is being set to True, this method atomically
         unsets the flag on any other persona for the same tenant. It performs
         a partial update based on the keys provided in the data dictionary.
+        Updates that change the greeting, canned phrases or voice queue the
+        persona's phrases for pre-rendering again.
 
         Args:
             persona: The VoicePersona instance to update.
@@ -174,6 +180,9 @@ class VoicePersonaService:
             if value is not None:
                 setattr(persona, key, value)
         persona.save()
+        schedule_persona_prerender(
+            persona, [key for key, value in data.items() if value is not None]
+        )
         return persona
 
     @staticmethod
@@ -11,7 +11,7 @@ and Ollama.
 
 import logging
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Any, Optional
 
 from temporalio import activity
@@ -127,6 +127,8 @@ class LLMActivities:
 
         This activity dynamically dispatches the request to the appropriate LLM
         provider (Groq, OpenAI, Ollama) and measures the processing time.
+        Temperature-0 requests of tenants that enabled the response cache are
+        answered from LLM_CACHE when an identical request was answered before.
 
         Args:
             request: An `LLMRequest` object containing all necessary parameters
@@ -142,7 +144,11 @@ class LLMActivities:
         start_time = time.time()  # Record start time for latency calculation.
 
         try:
-            if request.provider == "groq":
+            cache, key = await self._response_cache(request)
+            cached = await cache.get(key) if cache else None
+            if cached is not None:
+                result = LLMResult(**cached["result"])
+            elif request.provider == "groq":
                 result = await self._generate_groq(request)
             elif request.provider == "openai":
                 result = await self._generate_openai(request)
@@ -156,9 +162,15 @@ class LLMActivities:
             ) * 1000  # Convert to milliseconds.
             result.processing_time_ms = processing_time
 
+            if cache and cached is None:
+                await cache.put(
+                    request.tenant_id, key, {"result": asdict(result)}, len(result.content or "")
+                )
+
             logger.info(
                 f"Generated LLM response for session {request.session_id}: "
                 f"{result.output_tokens} tokens, {processing_time:.0f}ms"
+                f"{' (cached)' if cached is not None else ''}"
             )
 
             return result
@@ -167,6 +179,44 @@ class LLMActivities:
             logger.error(f"LLM generation failed for session {request.session_id}: {e}")
             raise  # Re-raise the exception for Temporal to handle.
 
+    async def _response_cache(
+        self, request: LLMRequest
+    ) -> tuple[Optional[Any], Optional[str]]:
+        """
+        Internal helper returning the response cache and the request's key.
+
+        Returns (None, None) unless the cache is enabled, the request samples
+        at temperature 0 and its tenant opted in.
+        """
+        from apps.workflows.llm_cache import (  # Local import.
+            deterministic,
+            get_activity_llm_cache,
+            response_key,
+            tenant_opted_in,
+        )
+
+        if not deterministic(request.temperature):
+            return None, None
+        cache = await get_activity_llm_cache()
+        if cache is None or not await tenant_opted_in(request.tenant_id):
+            return None, None
+
+        messages = []
+        if request.system_prompt:
+            messages.append({"role": "system", "content": request.system_prompt})
+        for msg in request.messages:
+            messages.append({"role": msg.role, "content": msg.content})
+        key = response_key(
+            request.tenant_id,
+            request.provider,
+            request.model,
+            messages,
+            tools=request.tools,
+            sampling={"temperature": request.temperature, "max_tokens": request.max_tokens},
+            variant="result",
+        )
+        return cache, key
+
     async def _generate_groq(self, request: LLMRequest) -> LLMResult:
         """
         Internal helper to generate an LLM response using the Groq API.
@@ -174,11 +224,12 @@ class LLMActivities:
         This method handles message formatting, API key retrieval (from `request.api_keys`
         or Django settings), and parsing the Groq API response.
         """
-        import httpx
         from django.conf import (
             settings,
         )  # Local import to avoid module-level dependency.
 
+        from apps.workflows.llm_transport import get_llm_transport
+
         provider_config = settings.LLM_PROVIDERS.get("groq", {})
         api_key = request.api_keys.get("groq") or provider_config.get("api_key", "")
         base_url = provider_config.get("base_url", "https://api.groq.com/openai/v1")
@@ -192,24 +243,23 @@ class LLMActivities:
         for msg in request.messages:
             messages.append({"role": msg.role, "content": msg.content})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{base_url.rstrip('/')}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": request.model,
-                    "messages": messages,
-                    "max_tokens": request.max_tokens,
-                    "temperature": request.temperature,
-                    "tools": request.tools if request.tools else None,
-                },
-                timeout=60.0,
-            )
-            response.raise_for_status()  # Raise an exception for 4xx/5xx responses.
-            data = response.json()
+        client = get_llm_transport().client(base_url)
+        response = await client.post(
+            f"{base_url.rstrip('/')}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": request.model,
+                "messages": messages,
+                "max_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "tools": request.tools if request.tools else None,
+            },
+        )
+        response.raise_for_status()  # Raise an exception for 4xx/5xx responses.
+        data = response.json()
 
         choice = data["choices"][0]
         usage = data.get("usage", {})
@@ -245,9 +295,10 @@ class LLMActivities:
         This method handles message formatting, API key retrieval (from `request.api_keys`
         or Django settings), and parsing the OpenAI API response.
         """
-        import httpx
         from django.conf import settings  # Local import.
 
+        from apps.workflows.llm_transport import get_llm_transport
+
         provider_config = settings.LLM_PROVIDERS.get("openai", {})
         api_key = request.api_keys.get("openai") or provider_config.get("api_key", "")
         base_url = provider_config.get("base_url", "https://api.openai.com/v1")
@@ -260,24 +311,23 @@ class LLMActivities:
         for msg in request.messages:
             messages.append({"role": msg.role, "content": msg.content})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{base_url.rstrip('/')}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": request.model,
-                    "messages": messages,
-                    "max_tokens": request.max_tokens,
-                    "temperature": request.temperature,
-                    "tools": request.tools if request.tools else None,
-                },
-                timeout=60.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_llm_transport().client(base_url)
+        response = await client.post(
+            f"{base_url.rstrip('/')}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": request.model,
+                "messages": messages,
+                "max_tokens": request.max_tokens,
+                "temperature": request.temperature,
+                "tools": request.tools if request.tools else None,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
 
         choice = data["choices"][0]
         usage = data.get("usage", {})
@@ -312,9 +362,10 @@ class LLMActivities:
         This method handles message formatting, base URL retrieval (from `request`
         or Django settings), and parsing the Ollama API response.
         """
-        import httpx
         from django.conf import settings  # Local import.
 
+        from apps.workflows.llm_transport import get_llm_transport
+
         base_url = (
             request.ollama_base_url
             or request.api_keys.get("ollama_base_url")
@@ -329,22 +380,21 @@ class LLMActivities:
         for msg in request.messages:
             messages.append({"role": msg.role, "content": msg.content})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{base_url}/api/chat",
-                json={
-                    "model": request.model,
-                    "messages": messages,
-                    "stream": False,  # Only non-streaming generation is supported here.
-                    "options": {
-                        "num_predict": request.max_tokens,  # Ollama's equivalent of max_tokens.
-                        "temperature": request.temperature,
-                    },
+        client = get_llm_transport().client(base_url)
+        response = await client.post(
+            f"{base_url}/api/chat",
+            json={
+                "model": request.model,
+                "messages": messages,
+                "stream": False,  # Only non-streaming generation is supported here.
+                "options": {
+                    "num_predict": request.max_tokens,  # Ollama's equivalent of max_tokens.
+                    "temperature": request.temperature,
                 },
-                timeout=60.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
 
         content = data.get("message", {}).get("content", "")
         # Ollama API response for token usage is not standardized across versions,
@@ -6,17 +6,28 @@ This module defines a set of Temporal Workflow Activities specifically designed
 for Speech-to-Text (STT) processing within voice processing pipelines. These
 activities leverage the `faster_whisper` library for efficient audio
 transcription and language detection, and include utilities for audio validation.
+
+Audio is decoded in memory: raw PCM and PCM16/float32 WAV payloads are wrapped
+without copying, other containers are decoded from a memory buffer, and a
+temporary file is only used when no in-memory decoder accepts the payload.
 """
 
+import io
 import logging
+import os
+import tempfile
 import time
-from dataclasses import dataclass
-from typing import Any, Optional
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, Optional, Union
 
 from temporalio import activity
 
 logger = logging.getLogger(__name__)
 
+# Sample rate expected by Whisper.
+WHISPER_SAMPLE_RATE = 16000
+
 
 @dataclass
 class TranscriptionRequest:
@@ -27,9 +38,11 @@ class TranscriptionRequest:
         tenant_id (str): The ID of the tenant initiating the request.
         session_id (str): A unique identifier for the current session or interaction.
         audio_data (bytes): The raw audio data to be transcribed.
-        audio_format (str): The format of the audio data (e.g., 'wav', 'mp3').
+        audio_format (str): The format of the audio data (e.g., 'wav', 'mp3', or raw 'pcm16'/'float32').
         language (Optional[str]): The language of the audio (e.g., 'en', 'es'). If None, language is auto-detected.
         model (str): The `faster_whisper` model size to use for transcription (e.g., 'tiny', 'base', 'small').
+        sample_rate (Optional[int]): Sample rate of raw PCM audio (defaults to 16000).
+        channels (int): Interleaved channel count of raw PCM audio.
     """
 
     tenant_id: str
@@ -38,6 +51,8 @@ class TranscriptionRequest:
     audio_format: str = "wav"
     language: Optional[str] = None
     model: str = "tiny"
+    sample_rate: Optional[int] = None
+    channels: int = 1
 
 
 @dataclass
@@ -80,6 +95,86 @@ class TranscriptionSegment:
     confidence: float
 
 
+def decode_audio_in_memory(
+    audio_data: bytes,
+    audio_format: str,
+    sample_rate: Optional[int] = None,
+    channels: int = 1,
+) -> Optional[Any]:
+    """
+    Decodes audio bytes to mono float32 at 16 kHz without touching the disk.
+
+    Raw PCM is wrapped with `np.frombuffer` and PCM16/float32 WAV data is read
+    straight from the payload; other containers are decoded by faster-whisper
+    (PyAV) from a memory buffer.
+
+    Returns:
+        Optional[np.ndarray]: The samples, or None if no in-memory decoder
+                              accepts the payload.
+
+    Raises:
+        ValueError: If a raw PCM payload is malformed.
+    """
+    from apps.workflows.audio_processing import (
+        PCM_ENCODINGS,
+        PCMFormat,
+        parse_wav,
+        pcm_to_float32,
+        resample,
+    )
+
+    encoding = audio_format.lower()
+    if encoding in PCM_ENCODINGS:
+        pcm_format = PCMFormat(encoding, sample_rate or WHISPER_SAMPLE_RATE, channels)
+        samples = pcm_to_float32(audio_data, pcm_format)
+        return resample(samples, pcm_format.sample_rate, WHISPER_SAMPLE_RATE)
+
+    wav = parse_wav(audio_data)
+    if wav is not None:
+        pcm_format, frames = wav
+        samples = pcm_to_float32(frames, pcm_format)
+        return resample(samples, pcm_format.sample_rate, WHISPER_SAMPLE_RATE)
+
+    try:
+        from faster_whisper import decode_audio
+
+        return decode_audio(io.BytesIO(audio_data), sampling_rate=WHISPER_SAMPLE_RATE)
+    except Exception as exc:
+        logger.debug(f"In-memory decode failed for {audio_format} audio: {exc}")
+        return None
+
+
+@contextmanager
+def audio_input(
+    audio_data: bytes,
+    audio_format: str,
+    sample_rate: Optional[int] = None,
+    channels: int = 1,
+) -> Iterator[Union[Any, str]]:
+    """
+    Yields audio in a form `WhisperModel.transcribe` accepts.
+
+    Yields the decoded NumPy buffer when possible and otherwise falls back to
+    a temporary file holding the payload, which is removed afterwards.
+    """
+    samples = decode_audio_in_memory(audio_data, audio_format, sample_rate, channels)
+    if samples is not None:
+        yield samples
+        return
+
+    # Fallback for containers that need a real, seekable file.
+    with tempfile.NamedTemporaryFile(
+        suffix=f".{audio_format}",
+        delete=False,  # Keep file until explicitly unlinked.
+    ) as f:
+        f.write(audio_data)
+        temp_path = f.name
+    try:
+        yield temp_path
+    finally:
+        os.unlink(temp_path)
+
+
 class STTActivities:
     """
     A collection of Temporal Workflow Activities for Speech-to-Text (STT) operations.
@@ -96,8 +191,10 @@ class STTActivities:
         """
         Transcribes audio data into text using the `faster_whisper` library.
 
-        This activity handles saving the audio data to a temporary file,
-        performing the transcription, and cleaning up the temporary file.
+        The audio is decoded in memory; a temporary file is only written for
+        containers no in-memory decoder understands. With the transcription
+        cache enabled, byte-identical audio transcribed with the same model
+        and language is answered from the cache.
 
         Args:
             request: A `TranscriptionRequest` object containing audio data and
@@ -112,34 +209,50 @@ class STTActivities:
         """
         start_time = time.time()  # Record start time for latency calculation.
 
-        # Local import to avoid loading the model at module level and for dynamic model loading.
-        import os
-        import tempfile
-
-        from faster_whisper import WhisperModel
+        from apps.workflows.model_registry import get_model_registry, whisper_key
+        from apps.workflows.transcription_cache import (
+            cacheable,
+            get_activity_transcription_cache,
+            transcription_key,
+        )
 
         try:
-            # Initialize Whisper model.
-            # `device="cpu"` uses the CPU, `compute_type="int8"` uses 8-bit integer quantization
-            # for faster inference on CPUs. For GPU, `device="cuda"` would be used.
-            model = WhisperModel(
-                request.model,
-                device="cpu",
-                compute_type="int8",
-            )
-
-            # Save audio to a temporary file for `faster_whisper` processing.
-            with tempfile.NamedTemporaryFile(
-                suffix=f".{request.audio_format}",
-                delete=False,  # Keep file until explicitly unlinked.
-            ) as f:
-                f.write(request.audio_data)
-                temp_path = f.name
+            cache = await get_activity_transcription_cache()
+            # Shared Whisper model from the process-wide registry; only the first
+            # call in this process pays the model load. Device and compute type
+            # follow the STT worker settings.
+            model = await get_model_registry().aget(whisper_key(request.model))
+
+            with audio_input(
+                request.audio_data,
+                request.audio_format,
+                request.sample_rate,
+                request.channels,
+            ) as audio:
+                cache_key = None
+                if cache is not None:
+                    # The raw payload stands in for audio only a temp file could decode.
+                    audio_seconds = (
+                        len(audio) / WHISPER_SAMPLE_RATE if not isinstance(audio, str) else 0.0
+                    )
+                    if cacheable(audio_seconds):
+                        cache_key = transcription_key(
+                            request.audio_data if isinstance(audio, str) else audio,
+                            request.model,
+                            request.language,
+                            beam_size=5,
+                            variant="activity",
+                        )
+                        cached = await cache.get(cache_key)
+                        if cached is not None:
+                            return TranscriptionResult(
+                                **cached,
+                                processing_time_ms=(time.time() - start_time) * 1000,
+                            )
 
-            try:
                 # Perform the transcription.
                 segments, info = model.transcribe(
-                    temp_path,
+                    audio,
                     language=request.language,
                     beam_size=5,  # Parameter for beam search decoding.
                     vad_filter=True,  # Enable Voice Activity Detection filtering.
@@ -159,25 +272,26 @@ class STTActivities:
                     )
                     full_text.append(segment.text.strip())
 
-                processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds.
-
-                logger.info(
-                    f"Transcribed audio for session {request.session_id}: "
-                    f"{len(result_segments)} segments, {info.duration:.2f}s audio, {processing_time:.0f}ms"
-                )
+            processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds.
 
-                return TranscriptionResult(
-                    text=" ".join(full_text),
-                    language=info.language,
-                    confidence=info.language_probability,
-                    segments=result_segments,
-                    duration_seconds=info.duration,
-                    processing_time_ms=processing_time,
-                )
+            logger.info(
+                f"Transcribed audio for session {request.session_id}: "
+                f"{len(result_segments)} segments, {info.duration:.2f}s audio, {processing_time:.0f}ms"
+            )
 
-            finally:
-                # Ensure the temporary file is deleted.
-                os.unlink(temp_path)
+            result = TranscriptionResult(
+                text=" ".join(full_text),
+                language=info.language,
+                confidence=info.language_probability,
+                segments=result_segments,
+                duration_seconds=info.duration,
+                processing_time_ms=processing_time,
+            )
+            if cache_key:
+                cached = asdict(result)
+                del cached["processing_time_ms"]
+                await cache.set(cache_key, cached)
+            return result
 
         except Exception as e:
             logger.error(f"STT transcription failed for session {request.session_id}: {e}")
@@ -208,37 +322,24 @@ class STTActivities:
         Raises:
             Exception: If language detection fails.
         """
-        import os
-        import tempfile
-
-        from faster_whisper import WhisperModel  # Local import.
+        from apps.workflows.model_registry import get_model_registry, whisper_key
 
         try:
-            model = WhisperModel("tiny", device="cpu", compute_type="int8")
-
-            with tempfile.NamedTemporaryFile(
-                suffix=f".{audio_format}",
-                delete=False,
-            ) as f:
-                f.write(audio_data)
-                temp_path = f.name
+            model = await get_model_registry().aget(whisper_key("tiny"))
 
-            try:
+            with audio_input(audio_data, audio_format) as audio:
                 # Transcribe with language=None to enable auto-detection.
                 # Only a short audio segment is needed for reliable language detection.
                 segments, info = model.transcribe(
-                    temp_path,
+                    audio,
                     language=None,
                     beam_size=1,  # Lower beam size for faster detection.
                 )
 
-                return {
-                    "language": info.language,
-                    "confidence": info.language_probability,
-                }
-
-            finally:
-                os.unlink(temp_path)
+            return {
+                "language": info.language,
+                "confidence": info.language_probability,
+            }
 
         except Exception as e:
             logger.error(f"STT language detection failed for tenant {tenant_id}: {e}")
@@ -102,7 +102,8 @@ class TTSActivities:
 
         This activity converts input text into audio bytes, handling the
         interaction with the Kokoro engine and necessary audio processing
-        (e.g., combining segments, converting to WAV format).
+        (e.g., combining segments, converting to WAV format). Short phrases
+        are served from the TTS phrase cache when it is enabled.
 
         Args:
             request: A `SynthesisRequest` object containing text and synthesis parameters.
@@ -113,6 +114,7 @@ class TTSActivities:
         Raises:
             Exception: If the speech synthesis process fails.
         """
+        import base64
         import io
         import time
         import wave  # Python's built-in WAV file writer.
@@ -121,15 +123,42 @@ class TTSActivities:
 
         start_time = time.time()  # Record start time for latency calculation.
 
-        try:
-            # Local import of Kokoro TTS to avoid module-level dependency.
-            from kokoro import KPipeline
+        from apps.workflows.model_registry import get_model_registry, kokoro_key
+        from apps.workflows.tts_cache import (
+            CachedPhrase,
+            get_activity_phrase_cache,
+            phrase_key,
+        )
+
+        sample_rate = 24000  # Kokoro's default sample rate.
 
-            # Initialize Kokoro pipeline for the specified language.
-            lang_code = request.language.split("-")[
-                0
-            ]  # Extract base language from locale (e.g., "en" from "en-us").
-            pipeline = KPipeline(lang_code=lang_code)
+        try:
+            cache = await get_activity_phrase_cache()
+            cache_key = None
+            if cache is not None and cache.cacheable(request.text):
+                language = kokoro_key(request.language).language
+                cache_key = phrase_key(
+                    request.text,
+                    request.voice_id,
+                    request.speed,
+                    sample_rate,
+                    request.output_format,
+                    engine=f"kokoro:{language}",
+                )
+                cached = await cache.get(cache_key)
+                if cached is not None:
+                    return SynthesisResult(
+                        audio_data=base64.b64decode(cached.chunks[0]),
+                        audio_format=request.output_format,
+                        duration_seconds=cached.duration_seconds,
+                        sample_rate=cached.sample_rate,
+                        processing_time_ms=(time.time() - start_time) * 1000,
+                        character_count=len(request.text),
+                    )
+
+            # Shared Kokoro pipeline for the base language of the locale (e.g. "en"
+            # from "en-us"), loaded once per process by the model registry.
+            pipeline = await get_model_registry().aget(kokoro_key(request.language))
 
             audio_segments = []
             # Iterate through generated audio segments from Kokoro.
@@ -147,7 +176,6 @@ class TTSActivities:
                 combined_audio_float = np.array([], dtype=np.float32)
 
             # Convert the float audio data to 16-bit WAV bytes.
-            sample_rate = 24000  # Kokoro's default sample rate.
             audio_bytes_buffer = io.BytesIO()
 
             with wave.open(audio_bytes_buffer, "wb") as wav_file:
@@ -170,6 +198,16 @@ class TTSActivities:
                 f"{len(request.text)} chars, {duration:.2f}s audio, {processing_time:.0f}ms"
             )
 
+            if cache_key and len(combined_audio_float):
+                await cache.put(
+                    cache_key,
+                    CachedPhrase(
+                        sample_rate=sample_rate,
+                        duration_seconds=duration,
+                        chunks=[base64.b64encode(audio_data).decode("ascii")],
+                    ),
+                )
+
             return SynthesisResult(
                 audio_data=audio_data,
                 audio_format=request.output_format,
@@ -0,0 +1,203 @@
+"""
+Output framing of synthesized audio.
+
+The TTS worker publishes every response in one negotiated framing:
+
+- "pcm16": raw little-endian 16-bit PCM, published as binary stream fields.
+- "mulaw": 8-bit G.711 μ-law, half the size of PCM16, for telephony legs.
+- "wav": the legacy framing, a complete base64 WAV file per chunk.
+
+For the binary framings the layout (format, sample rate, channels) is sent
+once with the first chunk of a response instead of a WAV header in every
+chunk, and the response ends with an empty final chunk. Float32 model output
+is scaled and clipped in place and written into a reused int16 buffer, so
+encoding a chunk allocates nothing but the bytes that are published.
+"""
+
+from __future__ import annotations
+
+import base64
+import struct
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+
+OUTPUT_FORMATS = ("pcm16", "mulaw", "wav")
+BINARY_FORMATS = frozenset({"pcm16", "mulaw"})
+
+# G.711 μ-law bias and the largest magnitude that can be encoded.
+MULAW_BIAS = 0x84
+MULAW_CLIP = 32635
+
+
+def negotiate_format(requested: Optional[str], default: str) -> str:
+    """
+    Picks the output framing of a response.
+
+    Args:
+        requested: Preferred framings, comma separated and most preferred
+                   first (e.g. "mulaw,pcm16"), or None.
+        default: Framing used when none of the requested ones is supported.
+
+    Returns:
+        str: One of OUTPUT_FORMATS.
+    """
+    for candidate in (requested or "").split(","):
+        candidate = candidate.strip().lower()
+        if candidate in OUTPUT_FORMATS:
+            return candidate
+    return default
+
+
+def float32_to_pcm16(audio: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Converts float32 samples in [-1, 1] to int16.
+
+    Writable float32 input is scaled, rounded and clipped in place, so the
+    caller must not reuse `audio` afterwards; other input is copied once.
+
+    Args:
+        audio: Samples to convert.
+        out: Optional int16 buffer of the same length to write into.
+
+    Returns:
+        np.ndarray: The int16 samples (`out` when given).
+    """
+    if audio.dtype != np.float32 or not audio.flags.writeable:
+        audio = np.array(audio, dtype=np.float32)
+    np.multiply(audio, 32767.0, out=audio)
+    np.rint(audio, out=audio)
+    np.clip(audio, -32768.0, 32767.0, out=audio)
+    if out is None:
+        return audio.astype(np.int16)
+    np.copyto(out, audio, casting="unsafe")
+    return out
+
+
+@lru_cache(maxsize=1)
+def _mulaw_encode_table() -> np.ndarray:
+    """Returns the μ-law byte of every int16 value, indexed by its uint16 view."""
+    # G.711 encodes the top 14 bits of the sample.
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), MULAW_CLIP >> 2) + (MULAW_BIAS >> 2)
+    segment = np.clip(np.frexp(magnitude)[1] - 6, 0, 7)
+    code = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return (code ^ mask).astype(np.uint8)
+
+
+@lru_cache(maxsize=1)
+def _mulaw_decode_table() -> np.ndarray:
+    """Returns the int16 value of every μ-law byte."""
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + MULAW_BIAS) << exponent) - MULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def pcm16_to_mulaw(samples: np.ndarray) -> np.ndarray:
+    """Encodes int16 samples as G.711 μ-law bytes."""
+    return _mulaw_encode_table()[samples.view(np.uint16)]
+
+
+def mulaw_to_pcm16(data: Union[bytes, memoryview, np.ndarray]) -> np.ndarray:
+    """Decodes G.711 μ-law bytes to int16 samples."""
+    return _mulaw_decode_table()[np.frombuffer(data, dtype=np.uint8)]
+
+
+def wav_header(sample_rate: int, channels: int, data_bytes: int) -> bytes:
+    """Returns the 44-byte header of a PCM16 WAV file."""
+    block_align = 2 * channels
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        16,
+        b"data",
+        data_bytes,
+    )
+
+
+class AudioFramer:
+    """
+    Encodes the synthesized chunks of one response in its output framing.
+
+    Binary framings return bytes; the legacy "wav" framing returns a base64
+    WAV file per chunk.
+    """
+
+    def __init__(self, output_format: str, channels: int = 1) -> None:
+        """
+        Initializes the framer.
+
+        Raises:
+            ValueError: If the output format is not one of OUTPUT_FORMATS.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.output_format = output_format
+        self.channels = channels
+        self._pcm = np.empty(0, dtype=np.int16)
+
+    @property
+    def binary(self) -> bool:
+        """Whether chunks are published as raw bytes."""
+        return self.output_format in BINARY_FORMATS
+
+    def header(self, sample_rate: int) -> dict[str, str]:
+        """Returns the layout fields sent once, with the first chunk."""
+        return {
+            "format": self.output_format,
+            "sample_rate": str(sample_rate),
+            "channels": str(self.channels),
+        }
+
+    def encode(self, audio: np.ndarray, sample_rate: int) -> Union[bytes, str]:
+        """
+        Encodes one chunk of float32 model output, which is modified in place.
+
+        Returns:
+            Union[bytes, str]: Raw frames, or a base64 WAV file for "wav".
+        """
+        if len(self._pcm) < len(audio):
+            self._pcm = np.empty(len(audio), dtype=np.int16)
+        samples = float32_to_pcm16(audio, out=self._pcm[: len(audio)])
+
+        if self.output_format == "mulaw":
+            return pcm16_to_mulaw(samples).tobytes()
+        payload = samples.astype("<i2", copy=False).tobytes()
+        if self.output_format == "pcm16":
+            return payload
+        header = wav_header(sample_rate, self.channels, len(payload))
+        return base64.b64encode(header + payload).decode("ascii")
+
+    def final_chunk(self, sample_rate: int) -> Union[bytes, str]:
+        """
+        Returns the chunk that ends a response.
+
+        Binary framings end with an empty chunk; "wav" keeps the one-sample
+        WAV marker existing clients expect.
+        """
+        if self.binary:
+            return b""
+        return self.encode(np.zeros(1, dtype=np.float32), sample_rate)
+
+    def to_cache(self, chunk: Union[bytes, str]) -> str:
+        """Returns the text form of a chunk stored in the phrase cache."""
+        if isinstance(chunk, bytes):
+            return base64.b64encode(chunk).decode("ascii")
+        return chunk
+
+    def from_cache(self, chunk: str) -> Union[bytes, str]:
+        """Restores a chunk stored in the phrase cache."""
+        return base64.b64decode(chunk) if self.binary else chunk
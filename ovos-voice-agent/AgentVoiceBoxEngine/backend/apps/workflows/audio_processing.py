@@ -0,0 +1,478 @@
+"""
+Audio pre-processing shared by the STT pipeline.
+
+Provides raw PCM and WAV decoding, a cached polyphase resampler and a lightweight,
+vectorized voice activity detector (VAD) with endpointing. Frames are
+classified with NumPy from their energy and two spectral features (flatness
+and the share of energy in the speech band), so silent and noise-only audio
+is dropped before it ever reaches Whisper and utterances are cut at
+end-of-speech.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import Any, Optional, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Frames whose spectrum is flatter than this look like broadband noise.
+SPECTRAL_FLATNESS_MAX = 0.3
+
+# Share of frame energy that must fall in the speech band (300-3400 Hz) for
+# a frame with a noisy-looking spectrum to still count as speech.
+SPEECH_BAND_RATIO_MIN = 0.6
+SPEECH_BAND_HZ = (300.0, 3400.0)
+
+# Required margin of a speech frame over the adaptive noise floor.
+NOISE_FLOOR_MARGIN_DB = 10.0
+
+# Per-frame weight of new non-speech frames in the noise floor estimate.
+NOISE_FLOOR_ADAPTATION = 0.05
+
+# Audio kept from before the detected onset so the first phoneme is not clipped.
+PREROLL_MS = 150
+
+_EPSILON = 1e-10
+
+# Accepted values of the `format` stream field for raw frames.
+PCM_ENCODINGS = {
+    "pcm16": np.dtype("<i2"),
+    "s16le": np.dtype("<i2"),
+    "float32": np.dtype("<f4"),
+    "f32le": np.dtype("<f4"),
+}
+
+# Half-length of the resampling filter in input samples (per unit of the
+# larger rate factor); 10 matches the usual polyphase resampler default.
+RESAMPLE_HALF_TAPS = 10
+RESAMPLE_KAISER_BETA = 5.0
+
+
+@dataclass(frozen=True)
+class PCMFormat:
+    """
+    Layout of a raw PCM frame.
+
+    Attributes:
+        encoding: Sample encoding, one of PCM_ENCODINGS.
+        sample_rate: Sample rate of the frame in Hz.
+        channels: Number of interleaved channels.
+    """
+
+    encoding: str
+    sample_rate: int
+    channels: int = 1
+
+    @classmethod
+    def from_fields(cls, data: dict[str, Any]) -> Optional[PCMFormat]:
+        """
+        Reads the raw frame layout from stream message fields.
+
+        Returns:
+            Optional[PCMFormat]: The layout, or None when the payload is a
+                                 container (WAV, FLAC, ...) to be parsed instead.
+
+        Raises:
+            ValueError: If the format is unknown or the fields are invalid.
+        """
+        encoding = (data.get("format") or "").lower()
+        if not encoding or encoding == "container":
+            return None
+        if encoding not in PCM_ENCODINGS:
+            raise ValueError(f"Unsupported audio format: {encoding}")
+
+        try:
+            sample_rate = int(data.get("sample_rate") or 0)
+            channels = int(data.get("channels") or 1)
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid sample_rate or channels field") from exc
+        if sample_rate <= 0 or channels <= 0:
+            raise ValueError("Raw PCM frames require positive sample_rate and channels")
+        return cls(encoding=encoding, sample_rate=sample_rate, channels=channels)
+
+
+# WAV `fmt ` codes for integer PCM, IEEE float and WAVE_FORMAT_EXTENSIBLE.
+_WAV_PCM = 0x0001
+_WAV_FLOAT = 0x0003
+_WAV_EXTENSIBLE = 0xFFFE
+
+
+def parse_wav(data: Union[bytes, memoryview]) -> Optional[tuple[PCMFormat, memoryview]]:
+    """
+    Locates the sample data of a PCM16 or float32 WAV file without copying it.
+
+    Returns:
+        Optional[tuple[PCMFormat, memoryview]]: The frame layout and a view of
+            the `data` chunk, or None if the payload is not a WAV file in one
+            of these encodings (compressed or 8/24/32-bit integer WAVs).
+    """
+    view = memoryview(data)
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        return None
+
+    pcm_format: Optional[PCMFormat] = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset : offset + 4])
+        chunk_size = int.from_bytes(view[offset + 4 : offset + 8], "little")
+        body = offset + 8
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            code = int.from_bytes(view[body : body + 2], "little")
+            channels = int.from_bytes(view[body + 2 : body + 4], "little")
+            sample_rate = int.from_bytes(view[body + 4 : body + 8], "little")
+            bits = int.from_bytes(view[body + 14 : body + 16], "little")
+            if code == _WAV_EXTENSIBLE and chunk_size >= 26:
+                code = int.from_bytes(view[body + 24 : body + 26], "little")
+            if code == _WAV_PCM and bits == 16:
+                encoding = "pcm16"
+            elif code == _WAV_FLOAT and bits == 32:
+                encoding = "float32"
+            else:
+                return None
+            if channels <= 0 or sample_rate <= 0:
+                return None
+            pcm_format = PCMFormat(encoding, sample_rate, channels)
+        elif chunk_id == b"data":
+            if pcm_format is None:
+                return None
+            frame_bytes = PCM_ENCODINGS[pcm_format.encoding].itemsize * pcm_format.channels
+            # Streamed WAVs may carry a placeholder size; clamp to what arrived
+            # and drop a trailing partial frame.
+            size = min(chunk_size, len(view) - body)
+            size -= size % frame_bytes
+            return pcm_format, view[body : body + size]
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def pcm_to_float32(payload: Union[bytes, memoryview], pcm_format: PCMFormat) -> np.ndarray:
+    """
+    Converts a raw PCM frame to mono float32 in [-1, 1].
+
+    float32 mono frames are returned as a read-only view of the payload;
+    PCM16 needs exactly one conversion buffer.
+
+    Raises:
+        ValueError: If the payload is not a whole number of frames.
+    """
+    dtype = PCM_ENCODINGS[pcm_format.encoding]
+    frame_bytes = dtype.itemsize * pcm_format.channels
+    if len(payload) % frame_bytes:
+        raise ValueError("PCM payload is not a whole number of sample frames")
+
+    samples = np.frombuffer(payload, dtype=dtype)
+    if dtype.kind == "i":
+        converted = np.empty(samples.shape, dtype=np.float32)
+        np.multiply(samples, 1.0 / 32768.0, out=converted, casting="unsafe")
+        samples = converted
+    elif dtype != np.float32:
+        samples = samples.astype(np.float32)
+
+    if pcm_format.channels > 1:
+        samples = samples.reshape(-1, pcm_format.channels).mean(axis=1, dtype=np.float32)
+    return samples
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(up: int, down: int) -> tuple[np.ndarray, int]:
+    """
+    Designs the anti-aliasing filter for a rational rate change.
+
+    Returns:
+        tuple: A `(up, taps_per_phase)` float32 matrix holding the Kaiser-windowed
+               sinc split into polyphase components (each reversed for use
+               against a sliding window) and the filter delay in samples.
+    """
+    max_rate = max(up, down)
+    half_len = RESAMPLE_HALF_TAPS * max_rate
+    taps = np.arange(-half_len, half_len + 1, dtype=np.float64)
+    cutoff = 1.0 / max_rate
+    kernel = cutoff * np.sinc(cutoff * taps) * np.kaiser(len(taps), RESAMPLE_KAISER_BETA)
+    kernel *= up
+
+    taps_per_phase = -(-len(kernel) // up)
+    padded = np.zeros(taps_per_phase * up, dtype=np.float64)
+    padded[: len(kernel)] = kernel
+    phases = padded.reshape(taps_per_phase, up).T[:, ::-1]
+    return np.ascontiguousarray(phases, dtype=np.float32), half_len
+
+
+def resample(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Resamples mono float32 audio with a polyphase FIR filter.
+
+    The rate ratio is reduced to `up/down`, the filter for it is designed once
+    and cached, and each output phase is computed as a strided window of the
+    input times that phase's taps, so neither the upsampled signal nor a
+    float64 copy of the input is ever materialized.
+
+    Args:
+        audio: Mono float32 samples.
+        orig_rate: Sample rate of `audio`.
+        target_rate: Desired sample rate.
+
+    Returns:
+        np.ndarray: Resampled float32 audio (the input itself if the rates match).
+    """
+    if orig_rate == target_rate or not len(audio):
+        return audio
+
+    divisor = gcd(orig_rate, target_rate)
+    up, down = target_rate // divisor, orig_rate // divisor
+    phases, delay = _polyphase_filter(up, down)
+    taps_per_phase = phases.shape[1]
+
+    n_out = -(-len(audio) * up // down)
+    lead = taps_per_phase - 1
+    tail = taps_per_phase + delay // up + 1
+    padded = np.zeros(lead + len(audio) + tail, dtype=np.float32)
+    padded[lead : lead + len(audio)] = audio
+    windows = sliding_window_view(padded, taps_per_phase)
+
+    output = np.empty(n_out, dtype=np.float32)
+    for residue in range(min(up, n_out)):
+        position = residue * down + delay
+        start = position // up
+        count = len(range(residue, n_out, up))
+        rows = windows[start : start + count * down : down]
+        np.matmul(rows, phases[position % up], out=output[residue::up])
+    return output
+
+
+@dataclass
+class VADConfig:
+    """
+    Voice activity detection and endpointing parameters.
+
+    Attributes:
+        sample_rate: Sample rate of the analysed audio.
+        frame_ms: Analysis frame length in milliseconds.
+        energy_threshold_db: Absolute frame energy (dBFS) below which frames are silence.
+        min_speech_ms: Speech required before `speech_started` is emitted.
+        hangover_ms: Silence required after speech before `speech_stopped` is emitted.
+    """
+
+    sample_rate: int = 16000
+    frame_ms: int = 30
+    energy_threshold_db: float = -45.0
+    min_speech_ms: int = 150
+    hangover_ms: int = 500
+
+    @property
+    def frame_length(self) -> int:
+        """Number of samples per analysis frame."""
+        return max(1, self.sample_rate * self.frame_ms // 1000)
+
+    def frames_for(self, milliseconds: int) -> int:
+        """Converts a duration in milliseconds to a whole number of frames (at least one)."""
+        return max(1, -(-milliseconds // self.frame_ms))
+
+
+@dataclass
+class SpeechSpan:
+    """
+    Contiguous speech audio produced by one `VoiceActivityDetector.process` call.
+
+    Attributes:
+        audio: Speech samples (including pre-roll and hangover).
+        start_ms: Stream offset of the first sample in milliseconds.
+        started: True if `speech_started` was detected at the start of this span.
+        end_ms: Stream offset of the end of speech if the utterance ended here.
+    """
+
+    audio: np.ndarray
+    start_ms: int
+    started: bool = False
+    end_ms: Optional[int] = None
+
+
+@lru_cache(maxsize=8)
+def _analysis_tables(frame_length: int, sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the Hann window and the speech band mask for a frame length."""
+    window = np.hanning(frame_length).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame_length, d=1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    return window, band
+
+
+def frame_features(
+    frames: np.ndarray, sample_rate: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes per-frame VAD features for a `(n_frames, frame_length)` array.
+
+    Returns:
+        tuple: Energy in dBFS, spectral flatness in [0, 1] and the share of
+               spectral energy inside the speech band, one value per frame.
+    """
+    energy_db = 10.0 * np.log10(np.mean(np.square(frames), axis=1) + _EPSILON)
+
+    window, band = _analysis_tables(frames.shape[1], sample_rate)
+    power = np.square(np.abs(np.fft.rfft(frames * window, axis=1))) + _EPSILON
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    band_ratio = power[:, band].sum(axis=1) / power.sum(axis=1)
+    return energy_db, flatness, band_ratio
+
+
+class VoiceActivityDetector:
+    """
+    Streaming VAD with endpointing for one audio stream.
+
+    Audio is consumed in arbitrary chunk sizes; a partial trailing frame is
+    carried over to the next call. Onsets require `min_speech_ms` of
+    consecutive speech frames and offsets `hangover_ms` of consecutive
+    non-speech frames, so short clicks and pauses between words do not
+    toggle the state.
+    """
+
+    def __init__(self, config: VADConfig) -> None:
+        """Initializes the detector in the silence state."""
+        self.config = config
+        self._min_speech_frames = config.frames_for(config.min_speech_ms)
+        self._hangover_frames = config.frames_for(config.hangover_ms)
+        self._preroll_frames = config.frames_for(PREROLL_MS)
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._frame_index = 0
+        self._noise_floor_db: Optional[float] = None
+        self.in_speech = False
+        # Recent frames kept while deciding whether speech started, plus the
+        # current run lengths of speech and non-speech frames.
+        self._pending: list[np.ndarray] = []
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Returns a boolean speech mask for a `(n_frames, frame_length)` array."""
+        energy_db, flatness, band_ratio = frame_features(frames, self.config.sample_rate)
+
+        threshold = self.config.energy_threshold_db
+        if self._noise_floor_db is not None:
+            threshold = max(threshold, self._noise_floor_db + NOISE_FLOOR_MARGIN_DB)
+        speech = (energy_db >= threshold) & (
+            (flatness <= SPECTRAL_FLATNESS_MAX) | (band_ratio >= SPEECH_BAND_RATIO_MIN)
+        )
+
+        noise = energy_db[~speech]
+        if len(noise):
+            weight = min(1.0, NOISE_FLOOR_ADAPTATION * len(noise))
+            level = float(np.median(noise))
+            if self._noise_floor_db is None:
+                self._noise_floor_db = level
+            else:
+                self._noise_floor_db += weight * (level - self._noise_floor_db)
+        return speech
+
+    def process(self, samples: np.ndarray) -> list[SpeechSpan]:
+        """
+        Consumes audio and returns the speech it contains.
+
+        Args:
+            samples: Mono float32 audio at the configured sample rate.
+
+        Returns:
+            list[SpeechSpan]: Speech spans in stream order. A span with `end_ms`
+                              set closes its utterance; audio after it belongs
+                              to the next one.
+        """
+        audio = np.concatenate((self._remainder, samples.astype(np.float32, copy=False)))
+        frame_length = self.config.frame_length
+        n_frames = len(audio) // frame_length
+        self._remainder = audio[n_frames * frame_length :]
+        if n_frames == 0:
+            return []
+
+        frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+        mask = self.classify(frames)
+
+        spans: list[SpeechSpan] = []
+        current: Optional[SpeechSpan] = None
+        current_frames: list[np.ndarray] = []
+
+        def close(end_ms: Optional[int] = None) -> None:
+            """Finishes the span under construction."""
+            nonlocal current, current_frames
+            if current is not None:
+                current.audio = np.concatenate(current_frames)
+                current.end_ms = end_ms
+                spans.append(current)
+            current, current_frames = None, []
+
+        for frame, is_speech in zip(frames, mask):
+            if not self.in_speech:
+                self._pending.append(frame)
+                self._speech_run = self._speech_run + 1 if is_speech else 0
+                if self._speech_run >= self._min_speech_frames:
+                    self.in_speech = True
+                    self._silence_run = 0
+                    keep = self._speech_run + self._preroll_frames
+                    kept = self._pending[-keep:]
+                    onset = self._frame_index + 1 - len(kept)
+                    current = SpeechSpan(
+                        audio=np.zeros(0, dtype=np.float32),
+                        start_ms=self._frames_to_ms(onset),
+                        started=True,
+                    )
+                    current_frames = list(kept)
+                    self._pending = []
+                elif len(self._pending) > self._min_speech_frames + self._preroll_frames:
+                    del self._pending[0]
+            else:
+                if current is None:
+                    current = SpeechSpan(
+                        audio=np.zeros(0, dtype=np.float32),
+                        start_ms=self._frames_to_ms(self._frame_index),
+                    )
+                current_frames.append(frame)
+                self._silence_run = 0 if is_speech else self._silence_run + 1
+                if self._silence_run >= self._hangover_frames:
+                    end_frame = self._frame_index + 1 - self._silence_run
+                    self.in_speech = False
+                    self._speech_run = 0
+                    close(end_ms=self._frames_to_ms(end_frame))
+            self._frame_index += 1
+
+        close()
+        return spans
+
+    def flush(self) -> Optional[int]:
+        """
+        Ends the stream, closing an open utterance.
+
+        Returns:
+            Optional[int]: End-of-speech offset in milliseconds if speech was active.
+        """
+        end_ms = None
+        if self.in_speech:
+            end_ms = self._frames_to_ms(self._frame_index - self._silence_run)
+        self.reset()
+        return end_ms
+
+    def reset(self) -> None:
+        """Returns to the silence state, keeping the noise floor and stream clock."""
+        self.in_speech = False
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._pending = []
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def _frames_to_ms(self, frame_index: int) -> int:
+        """Converts a stream frame index to milliseconds."""
+        return frame_index * self.config.frame_ms
+
+
+def extract_speech(audio: np.ndarray, config: VADConfig) -> np.ndarray:
+    """
+    Drops non-speech audio from a complete clip.
+
+    Returns:
+        np.ndarray: Concatenated speech spans; empty if the clip has no speech.
+    """
+    detector = VoiceActivityDetector(config)
+    spans = detector.process(audio)
+    if not spans:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate([span.audio for span in spans])
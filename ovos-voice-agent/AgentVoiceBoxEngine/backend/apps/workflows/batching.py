@@ -0,0 +1,248 @@
+"""
+Micro-batching scheduler for realtime inference workers.
+
+Collects work items submitted concurrently by many sessions inside a short
+window and hands them to a single batched processing call. Each submitter
+awaits its own result, so callers keep a per-item request/response shape.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class BatchMetrics:
+    """
+    Rolling metrics describing how well the batching window is tuned.
+
+    Attributes:
+        max_batch_size: Configured upper bound of items per batch.
+        batches_total: Number of batches dispatched.
+        items_total: Number of items dispatched across all batches.
+        batches_failed: Number of batches whose processing call raised.
+        queue_wait_ms: Recent per-item waits between submit and dispatch.
+        batch_sizes: Recent dispatched batch sizes.
+    """
+
+    max_batch_size: int
+    batches_total: int = 0
+    items_total: int = 0
+    batches_failed: int = 0
+    queue_wait_ms: deque = field(default_factory=lambda: deque(maxlen=1024))
+    batch_sizes: deque = field(default_factory=lambda: deque(maxlen=256))
+
+    def record_batch(self, size: int, waits_ms: list[float]) -> None:
+        """Records one dispatched batch and the queue wait of its items."""
+        self.batches_total += 1
+        self.items_total += size
+        self.batch_sizes.append(size)
+        self.queue_wait_ms.extend(waits_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        Returns a point-in-time summary suitable for structured logging.
+
+        `batch_fill` is the mean fraction of `max_batch_size` used by recent
+        batches; values close to 1.0 mean the window closes on size, values
+        close to 0 mean it closes on time and could be shortened.
+        """
+        waits = sorted(self.queue_wait_ms)
+        sizes = list(self.batch_sizes)
+
+        def _percentile(values: list[float], pct: float) -> float:
+            if not values:
+                return 0.0
+            index = min(len(values) - 1, int(round(pct * (len(values) - 1))))
+            return values[index]
+
+        return {
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "batches_failed": self.batches_failed,
+            "batch_fill": (sum(sizes) / (len(sizes) * self.max_batch_size) if sizes else 0.0),
+            "batch_size_avg": (sum(sizes) / len(sizes)) if sizes else 0.0,
+            "queue_wait_ms_p50": _percentile(waits, 0.50),
+            "queue_wait_ms_p95": _percentile(waits, 0.95),
+            "queue_wait_ms_max": waits[-1] if waits else 0.0,
+        }
+
+
+@dataclass
+class _PendingItem(Generic[T, R]):
+    """An item waiting in the batching queue together with its result future."""
+
+    item: T
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects concurrently submitted items into batches.
+
+    A batch is dispatched when `max_batch_size` items are pending or when the
+    oldest pending item has waited `max_wait_seconds`, whichever comes first.
+    Up to `concurrency` batches are processed at a time; items submitted
+    while all slots are busy accumulate for the next batch.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[list[T]], Awaitable[list[R]]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+        name: str = "batcher",
+        concurrency: int = 1,
+    ) -> None:
+        """
+        Initializes the batcher.
+
+        Args:
+            process_batch: Coroutine receiving a list of items and returning
+                one result per item, in the same order. An exception instance
+                in the result list fails only the corresponding submitter.
+            max_batch_size: Maximum number of items per batch.
+            max_wait_seconds: Maximum time the first item of a batch waits
+                for the batch to fill.
+            name: Name used in log messages.
+            concurrency: Maximum number of batches processed at the same time.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if max_wait_seconds < 0:
+            raise ValueError("max_wait_seconds must not be negative")
+
+        self._process_batch = process_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_seconds
+        self._name = name
+        self._queue: asyncio.Queue[_PendingItem[T, R]] = asyncio.Queue()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._slots = asyncio.Semaphore(concurrency)
+        self._in_flight: set[asyncio.Task] = set()
+        self.metrics = BatchMetrics(max_batch_size=max_batch_size)
+
+    async def start(self) -> None:
+        """Starts the background dispatch loop."""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self) -> None:
+        """Stops the dispatch loop and fails any items still queued."""
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        for task in list(self._in_flight):
+            task.cancel()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError(f"{self._name} stopped"))
+
+    async def submit(self, item: T) -> R:
+        """
+        Queues an item and waits for its result.
+
+        Raises:
+            RuntimeError: If the batcher has not been started.
+            Exception: Whatever the batch processing call raised.
+        """
+        if self._loop_task is None:
+            raise RuntimeError(f"{self._name} not started")
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingItem(item, future, time.monotonic()))
+        return await future
+
+    async def _collect(self) -> list[_PendingItem[T, R]]:
+        """Waits for the first item, then fills the batch until size or deadline."""
+        first = await self._queue.get()
+        batch = [first]
+        deadline = first.enqueued_at + self._max_wait
+
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                while len(batch) < self._max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dispatch_loop(self) -> None:
+        """Collects batches and dispatches them to free slots until cancelled."""
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            dispatched_at = time.monotonic()
+            self.metrics.record_batch(
+                len(batch),
+                [(dispatched_at - p.enqueued_at) * 1000 for p in batch],
+            )
+            task = asyncio.create_task(self._run_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_batch(self, batch: list[_PendingItem[T, R]]) -> None:
+        """Processes one batch and resolves its futures."""
+        try:
+            try:
+                results = await self._process_batch([p.item for p in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"{self._name} returned {len(results)} results " f"for {len(batch)} items"
+                    )
+            except asyncio.CancelledError:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(RuntimeError(f"{self._name} stopped"))
+                raise
+            except Exception as exc:
+                self.metrics.batches_failed += 1
+                logger.error(
+                    "Batch processing failed",
+                    extra={"batcher": self._name, "size": len(batch), "error": str(exc)},
+                )
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+                return
+
+            for pending, result in zip(batch, results):
+                if pending.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    pending.future.set_exception(result)
+                else:
+                    pending.future.set_result(result)
+        finally:
+            self._slots.release()
@@ -0,0 +1,210 @@
+"""
+Shared helpers for the inference benchmarks.
+
+Provides parameter sweeps, latency summaries, a resident-memory sampler,
+deterministic synthetic speech and text corpora and a description of the
+host, so the STT and TTS benchmark commands report comparable JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import platform
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+import numpy as np
+
+from apps.workflows.audio_processing import parse_wav, pcm_to_float32, resample
+from apps.workflows.model_registry import rss_bytes
+from apps.workflows.supervisor import available_cpus
+
+T = TypeVar("T")
+
+LATENCY_FIELDS = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+# Vocabulary of the synthetic text corpus: common words of mixed length.
+_WORDS = (
+    "the voice agent will call you back about your order tomorrow morning "
+    "please confirm the delivery address and the preferred time window "
+    "our support team can help with billing questions account changes and "
+    "technical problems while the system checks the latest status for you"
+).split()
+
+
+def parse_axis(value: str, cast: Callable[[str], T]) -> list[T]:
+    """Parses a comma separated sweep axis ("1,4,8") into typed values."""
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def sweep(**axes: Iterable[Any]) -> list[dict[str, Any]]:
+    """
+    Expands sweep axes into their cartesian product.
+
+    Returns:
+        list[dict[str, Any]]: One configuration per combination, in axis order.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """
+    Summarizes request latencies given in seconds.
+
+    Returns:
+        dict[str, float]: Count, mean, p50, p95, p99 and max in milliseconds.
+    """
+    if not latencies:
+        return dict.fromkeys(LATENCY_FIELDS, 0.0) | {"count": 0}
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": len(latencies),
+        "mean_ms": round(float(values.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(values.max()), 2),
+    }
+
+
+class RSSSampler:
+    """
+    Samples the resident set size of this process in the background.
+
+    Used as an async context manager around a benchmark run; `peak_bytes`
+    holds the largest RSS seen, including the values at entry and exit.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        """
+        Initializes the sampler.
+
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> RSSSampler:
+        self.peak_bytes = rss_bytes()
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.peak_bytes = max(self.peak_bytes, rss_bytes())
+
+    async def _sample(self) -> None:
+        """Records the RSS every interval until cancelled."""
+        while True:
+            self.peak_bytes = max(self.peak_bytes, rss_bytes())
+            await asyncio.sleep(self.interval)
+
+
+def synthetic_speech(seconds: float, sample_rate: int = 16000, seed: int = 0) -> np.ndarray:
+    """
+    Generates deterministic speech-like audio.
+
+    Syllable-rate bursts of a harmonic voice with a drifting pitch, separated
+    by short pauses, over a low noise floor. It exercises VAD, batching and
+    the decoder the way speech does, without shipping recordings.
+
+    Returns:
+        np.ndarray: Mono float32 samples in [-1, 1].
+    """
+    rng = np.random.default_rng(seed)
+    count = int(seconds * sample_rate)
+    t = np.arange(count, dtype=np.float64) / sample_rate
+
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 2 * np.pi))
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, 2 * np.pi)), 0, None)
+    pauses = (np.sin(2 * np.pi * 0.4 * t) > -0.6).astype(np.float64)
+    audio = 0.25 * voice * syllables * pauses + 0.003 * rng.standard_normal(count)
+    return np.clip(audio, -1.0, 1.0).astype(np.float32)
+
+
+def synthetic_text(characters: int, seed: int = 0) -> str:
+    """
+    Generates deterministic English-like text of about `characters` characters.
+
+    Sentences of 6 to 16 words end with a period, a question mark or an
+    exclamation mark and every fourth one carries a comma, so sentence and
+    clause segmentation run the way they do on LLM output.
+
+    Returns:
+        str: Text at least `characters` long (at least one word).
+    """
+    rng = np.random.default_rng(seed)
+    sentences = []
+    length = 0
+    while length < characters or not sentences:
+        words = [str(word) for word in rng.choice(_WORDS, size=int(rng.integers(6, 17)))]
+        if len(sentences) % 4 == 3:
+            words[len(words) // 2] += ","
+        sentence = " ".join(words).capitalize() + str(rng.choice([".", ".", "?", "!"]))
+        length += len(sentence) + (1 if sentences else 0)
+        sentences.append(sentence)
+    return " ".join(sentences)
+
+
+def load_text_corpus(path: str) -> list[tuple[str, str]]:
+    """
+    Loads a text corpus, one request per non-empty line.
+
+    Returns:
+        list[tuple[str, str]]: Line name and text, in file order.
+    """
+    with open(path, encoding="utf-8") as corpus_file:
+        lines = [line.strip() for line in corpus_file]
+    return [(f"line-{number}", line) for number, line in enumerate(lines, 1) if line]
+
+
+def host_info() -> dict[str, Any]:
+    """Describes the host, so reports from different hardware can be compared."""
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": len(available_cpus()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def pcm16_bytes(audio: np.ndarray) -> bytes:
+    """Encodes float32 samples as little-endian PCM16."""
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def load_wav_corpus(directory: str, sample_rate: int) -> list[tuple[str, np.ndarray]]:
+    """
+    Loads the PCM16/float32 WAV files of a directory, resampled to `sample_rate`.
+
+    Files in other encodings are skipped.
+
+    Returns:
+        list[tuple[str, np.ndarray]]: File name and mono float32 samples, sorted by name.
+    """
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".wav"):
+            continue
+        with open(os.path.join(directory, name), "rb") as wav_file:
+            wav = parse_wav(wav_file.read())
+        if wav is None:
+            continue
+        fmt, frames = wav
+        audio = resample(pcm_to_float32(frames, fmt), fmt.sample_rate, sample_rate)
+        corpus.append((name, audio))
+    return corpus
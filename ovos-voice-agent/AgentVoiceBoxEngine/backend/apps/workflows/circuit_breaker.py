@@ -0,0 +1,315 @@
+"""
+Circuit breakers for LLM providers.
+
+`CircuitBreaker` keeps the state of a provider in the memory of one worker,
+so every replica has to see `threshold` failures of its own before it stops
+sending traffic to a provider that is down, and each replica probes the
+recovery on its own.
+
+`SharedCircuitBreaker` keeps the state in Redis instead, updated by Lua
+scripts so that each admission and each outcome is a single atomic step
+for the whole fleet: failures seen by any worker count towards the
+threshold, an open circuit rejects requests on every worker, and a
+half-open circuit admits one probe request cluster-wide. The probe holds a
+lease of `probe_timeout` seconds; if its worker dies without reporting,
+the next request after the lease expires becomes the probe. Times come
+from the Redis server clock, so workers with skewed clocks agree.
+
+When Redis cannot be reached, or no client is given, `SharedCircuitBreaker`
+falls back to an in-memory `CircuitBreaker`, which it keeps up to date with
+every outcome.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Seconds circuit state is kept after its last update.
+KEY_TTL_SECONDS = 86400
+
+# Seconds a worker admits requests to a closed circuit without asking Redis.
+LOCAL_TTL_SECONDS = 1.0
+
+_NOW = """
+local function now()
+    local t = redis.call('TIME')
+    return tonumber(t[1]) + tonumber(t[2]) / 1000000
+end
+"""
+
+# KEYS[1]: circuit hash. ARGV: open timeout, probe timeout, key TTL, probe id.
+# Returns {admission, state}; admission is "allow", "probe" or "reject".
+ACQUIRE_SCRIPT = _NOW + """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state or state == 'closed' then
+    return {'allow', 'closed'}
+end
+local t = now()
+if state == 'open' then
+    local opened_at = tonumber(redis.call('HGET', KEYS[1], 'opened_at') or '0')
+    if t - opened_at < tonumber(ARGV[1]) then
+        return {'reject', 'open'}
+    end
+elseif t < tonumber(redis.call('HGET', KEYS[1], 'probe_until') or '0') then
+    return {'reject', 'half_open'}
+end
+redis.call('HSET', KEYS[1], 'state', 'half_open', 'probe_id', ARGV[4],
+    'probe_until', t + tonumber(ARGV[2]))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {'probe', 'half_open'}
+"""
+
+# KEYS[1]: circuit hash. ARGV: outcome ("success", "failure" or "release"),
+# probe id ("" for a regular request), failure threshold, key TTL.
+# Returns {previous state, new state}.
+RECORD_SCRIPT = _NOW + """
+local previous = redis.call('HGET', KEYS[1], 'state') or 'closed'
+local probe = ARGV[2] ~= '' and redis.call('HGET', KEYS[1], 'probe_id') == ARGV[2]
+local state = previous
+if ARGV[1] == 'success' then
+    if previous == 'closed' then
+        redis.call('HSET', KEYS[1], 'failures', 0)
+    elseif previous == 'half_open' and probe then
+        state = 'closed'
+        redis.call('HSET', KEYS[1], 'state', state, 'failures', 0, 'probe_id', '',
+            'probe_until', 0)
+    end
+elseif ARGV[1] == 'failure' then
+    if previous == 'closed' then
+        local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+        if failures >= tonumber(ARGV[3]) then
+            state = 'open'
+            redis.call('HSET', KEYS[1], 'state', state, 'opened_at', now())
+        end
+    elseif previous == 'half_open' and probe then
+        state = 'open'
+        redis.call('HSET', KEYS[1], 'state', state, 'opened_at', now(), 'probe_id', '',
+            'probe_until', 0)
+    end
+elseif probe then
+    redis.call('HSET', KEYS[1], 'probe_id', '', 'probe_until', 0)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {previous, state}
+"""
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Circuit breaker for provider failover."""
+
+    threshold: int
+    timeout: float
+    failure_count: int = 0
+    last_failure_time: float = 0.0
+    state: CircuitState = CircuitState.CLOSED
+
+    def record_success(self) -> None:
+        """Records a successful operation, resetting failure count and state."""
+        self.failure_count = 0
+        self.state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        """
+        Records a failed operation, incrementing failure count.
+        Opens the circuit if the failure threshold is met.
+        """
+        self.failure_count += 1
+        self.last_failure_time = time.time()
+        if self.failure_count >= self.threshold:
+            self.state = CircuitState.OPEN
+            logger.warning("Circuit breaker opened", extra={"failures": self.failure_count})
+
+    def can_execute(self) -> bool:
+        """
+        Checks if an operation can be executed based on the current circuit state.
+
+        Returns:
+            bool: True if execution is allowed, False otherwise.
+        """
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if time.time() - self.last_failure_time >= self.timeout:
+                self.state = CircuitState.HALF_OPEN
+                logger.info("Circuit breaker half-open, testing recovery")
+                return True
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class Permit:
+    """
+    Admission of one request to a provider.
+
+    Attributes:
+        provider: The admitted provider.
+        probe_id: Lease of the cluster's half-open probe, or "" for a regular request.
+    """
+
+    provider: str
+    probe_id: str = ""
+
+    @property
+    def probe(self) -> bool:
+        """Whether the request is the probe of a half-open circuit."""
+        return bool(self.probe_id)
+
+
+class SharedCircuitBreaker:
+    """
+    Redis-backed circuit breaker shared by every worker.
+
+    State lives in the hash `llm:circuit:<provider>` with the fields `state`,
+    `failures`, `opened_at`, `probe_id` and `probe_until`, expiring
+    KEY_TTL_SECONDS after its last update.
+    """
+
+    def __init__(
+        self,
+        redis: Optional[aioredis.Redis],
+        provider: str,
+        threshold: int,
+        timeout: float,
+        probe_timeout: float,
+        local_ttl: float = LOCAL_TTL_SECONDS,
+    ) -> None:
+        """
+        Initializes the breaker.
+
+        Args:
+            redis: Redis client (decode_responses=True), or None to keep the
+                state in this worker only.
+            provider: Name of the guarded provider.
+            threshold: Consecutive failures that open the circuit.
+            timeout: Seconds an open circuit rejects requests before admitting a probe.
+            probe_timeout: Seconds a probe may run before another request is admitted.
+            local_ttl: Seconds a closed circuit admits without a Redis round trip.
+        """
+        self.provider = provider
+        self.threshold = threshold
+        self.timeout = timeout
+        self.probe_timeout = probe_timeout
+        self.local_ttl = local_ttl
+        self._acquire = redis.register_script(ACQUIRE_SCRIPT) if redis is not None else None
+        self._record = redis.register_script(RECORD_SCRIPT) if redis is not None else None
+        self._local = CircuitBreaker(threshold=threshold, timeout=timeout)
+        self._closed_until = 0.0
+        self._local_only = False
+
+    @staticmethod
+    def key(provider: str) -> str:
+        """Returns the Redis key holding a provider's circuit."""
+        return f"llm:circuit:{provider}"
+
+    async def acquire(self) -> Optional[Permit]:
+        """
+        Asks the circuit to admit a request.
+
+        A circuit seen closed in the last `local_ttl` seconds admits without
+        a Redis round trip, so a circuit opened by another worker is noticed
+        up to that much later.
+
+        Returns:
+            Optional[Permit]: The admission, or None if the circuit rejects the request.
+        """
+        if self._acquire is None:
+            return Permit(self.provider) if self._local.can_execute() else None
+        if time.monotonic() < self._closed_until:
+            return Permit(self.provider)
+
+        probe_id = uuid.uuid4().hex
+        try:
+            admission, state = await self._acquire(
+                keys=[self.key(self.provider)],
+                args=[self.timeout, self.probe_timeout, KEY_TTL_SECONDS, probe_id],
+            )
+        except RedisError as exc:
+            self._fall_back(exc)
+            return Permit(self.provider) if self._local.can_execute() else None
+
+        self._recover()
+        if admission == "allow":
+            self._closed_until = time.monotonic() + self.local_ttl
+            return Permit(self.provider)
+        if admission == "probe":
+            logger.info(
+                "Circuit breaker half-open, probing recovery",
+                extra={"provider": self.provider},
+            )
+            return Permit(self.provider, probe_id)
+        return None
+
+    async def record_success(self, permit: Permit) -> None:
+        """Records a successful request; a successful probe closes the circuit."""
+        self._local.record_success()
+        await self._report("success", permit)
+
+    async def record_failure(self, permit: Permit) -> None:
+        """Records a failed request; a failed probe opens the circuit again."""
+        self._local.record_failure()
+        await self._report("failure", permit)
+
+    async def release(self, permit: Permit) -> None:
+        """Returns a permit whose request ended without an outcome, such as a cancelled one."""
+        if permit.probe:
+            await self._report("release", permit)
+
+    async def _report(self, outcome: str, permit: Permit) -> None:
+        """Applies the outcome of a request to the shared state."""
+        if self._record is None:
+            return
+        try:
+            previous, state = await self._record(
+                keys=[self.key(self.provider)],
+                args=[outcome, permit.probe_id, self.threshold, KEY_TTL_SECONDS],
+            )
+        except RedisError as exc:
+            self._fall_back(exc)
+            return
+
+        self._recover()
+        if state != "closed":
+            self._closed_until = 0.0
+        if state == previous:
+            return
+        if state == "open":
+            logger.warning("Circuit breaker opened", extra={"provider": self.provider})
+        elif state == "closed":
+            logger.info("Circuit breaker closed", extra={"provider": self.provider})
+
+    def _fall_back(self, exc: RedisError) -> None:
+        """Switches to this worker's own state, logging only the switch."""
+        if self._local_only:
+            return
+        self._local_only = True
+        logger.warning(
+            "Shared circuit state unavailable, using local state",
+            extra={"provider": self.provider, "error": str(exc)},
+        )
+
+    def _recover(self) -> None:
+        """Logs that the shared state answers again after a fallback."""
+        if not self._local_only:
+            return
+        self._local_only = False
+        logger.info("Shared circuit state available again", extra={"provider": self.provider})
@@ -0,0 +1,276 @@
+"""
+Tuned ONNX Runtime sessions for Kokoro.
+
+`kokoro_onnx.Kokoro` builds its InferenceSession with default options, reads
+a voice style from the voices archive on every request and leaves graph
+optimization and arena growth to the first synthesis. `KokoroReplicaPool`
+instead:
+
+- builds N session replicas with explicit intra-op/inter-op threads, graph
+  optimization level and memory arena options, splitting the process's CPUs
+  between the replicas so concurrent inferences use every core without
+  oversubscribing them;
+- shares the model weights between the replicas when the `onnx` package is
+  installed (each session otherwise holds its own copy);
+- loads every voice style once into a table shared by all replicas;
+- warms each replica by synthesizing a short phrase per configured voice, so
+  the first request does not pay for optimization and allocation.
+
+The pool exposes the `create_stream` / `get_voices` interface of a single
+Kokoro instance and hands each stream to the least busy replica.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+from apps.workflows.supervisor import available_cpus
+
+logger = logging.getLogger(__name__)
+
+# Accepted values of ONNX_GRAPH_OPTIMIZATION and their ORT levels.
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    """
+    ONNX Runtime options of the Kokoro sessions.
+
+    Attributes:
+        replicas: Inference sessions per process.
+        intra_op_threads: Threads per session for one operator; 0 splits the
+            available CPUs evenly between the replicas.
+        inter_op_threads: Threads per session for parallel operators.
+        graph_optimization: One of GRAPH_OPTIMIZATION_LEVELS.
+        cpu_mem_arena: Whether sessions keep freed memory in an arena.
+        mem_pattern: Whether sessions pre-plan allocations from the first run.
+    """
+
+    replicas: int = 1
+    intra_op_threads: int = 0
+    inter_op_threads: int = 1
+    graph_optimization: str = "all"
+    cpu_mem_arena: bool = True
+    mem_pattern: bool = True
+
+    @classmethod
+    def from_settings(cls, config: dict[str, Any]) -> RuntimeConfig:
+        """Reads the options from the TTS_WORKER settings."""
+        return cls(
+            replicas=config["ONNX_REPLICAS"],
+            intra_op_threads=config["ONNX_INTRA_OP_THREADS"],
+            inter_op_threads=config["ONNX_INTER_OP_THREADS"],
+            graph_optimization=config["ONNX_GRAPH_OPTIMIZATION"],
+            cpu_mem_arena=config["ONNX_CPU_MEM_ARENA"],
+            mem_pattern=config["ONNX_MEM_PATTERN"],
+        )
+
+
+def intra_op_threads(config: RuntimeConfig, cpus: Optional[int] = None) -> int:
+    """Returns the intra-op threads of each replica."""
+    if config.intra_op_threads > 0:
+        return config.intra_op_threads
+    cpus = cpus if cpus is not None else len(available_cpus())
+    return max(1, cpus // max(1, config.replicas))
+
+
+def session_options(config: RuntimeConfig, cpus: Optional[int] = None) -> Any:
+    """
+    Builds the SessionOptions of one replica.
+
+    Raises:
+        ValueError: If the graph optimization level is unknown.
+    """
+    import onnxruntime as rt
+
+    level = GRAPH_OPTIMIZATION_LEVELS.get(config.graph_optimization.lower())
+    if level is None:
+        raise ValueError(f"Unknown graph optimization level: {config.graph_optimization}")
+
+    options = rt.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads(config, cpus)
+    options.inter_op_num_threads = max(1, config.inter_op_threads)
+    options.execution_mode = (
+        rt.ExecutionMode.ORT_PARALLEL
+        if config.inter_op_threads > 1
+        else rt.ExecutionMode.ORT_SEQUENTIAL
+    )
+    options.graph_optimization_level = getattr(rt.GraphOptimizationLevel, level)
+    options.enable_cpu_mem_arena = config.cpu_mem_arena
+    options.enable_mem_pattern = config.mem_pattern
+    return options
+
+
+def execution_providers() -> list[str]:
+    """
+    Returns the execution providers of the sessions.
+
+    Honours the ONNX_PROVIDER environment variable like kokoro-onnx and
+    prefers CUDA when the GPU build of ONNX Runtime is installed.
+    """
+    import onnxruntime as rt
+
+    provider = os.getenv("ONNX_PROVIDER")
+    if provider:
+        return [provider]
+    if "CUDAExecutionProvider" in rt.get_available_providers():
+        return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    return ["CPUExecutionProvider"]
+
+
+def load_voice_table(voices_path: str) -> dict[str, np.ndarray]:
+    """Loads every voice style of a voices archive into memory."""
+    with np.load(voices_path) as archive:
+        return {name: np.ascontiguousarray(archive[name]) for name in archive.files}
+
+
+def shared_initializers(model_path: str) -> list[tuple[str, Any]]:
+    """
+    Returns the model weights as OrtValues that sessions can share.
+
+    Returns an empty list when the `onnx` package is not installed, in which
+    case every session loads its own copy of the weights.
+    """
+    try:
+        import onnx
+        from onnx import numpy_helper
+    except ImportError:
+        return []
+    import onnxruntime as rt
+
+    model = onnx.load(model_path)
+    return [
+        (tensor.name, rt.OrtValue.ortvalue_from_numpy(numpy_helper.to_array(tensor)))
+        for tensor in model.graph.initializer
+    ]
+
+
+class KokoroReplicaPool:
+    """
+    Kokoro inference sessions sharing one voice table.
+
+    Streams go to the replica with the fewest streams in progress.
+    """
+
+    def __init__(self, engines: list[Any], voices: dict[str, np.ndarray]) -> None:
+        """
+        Initializes the pool.
+
+        Args:
+            engines: Kokoro instances, one per session replica.
+            voices: Voice styles shared by the engines.
+        """
+        if not engines:
+            raise ValueError("At least one Kokoro replica is required")
+        self._engines = engines
+        self._active = [0] * len(engines)
+        self._voices = voices
+        self._voice_names = sorted(voices)
+        self.voice_names = frozenset(voices)
+        # Shared weights; they must outlive every session that uses them.
+        self._initializers: list[Any] = []
+
+    @classmethod
+    def load(
+        cls,
+        model_path: str,
+        voices_path: str,
+        config: RuntimeConfig,
+    ) -> KokoroReplicaPool:
+        """Builds the replicas of a Kokoro model with tuned session options."""
+        import kokoro_onnx
+        import onnxruntime as rt
+
+        voices = load_voice_table(voices_path)
+        initializers = shared_initializers(model_path) if config.replicas > 1 else []
+        providers = execution_providers()
+
+        engines = []
+        for _ in range(max(1, config.replicas)):
+            options = session_options(config)
+            for name, value in initializers:
+                options.add_initializer(name, value)
+            session = rt.InferenceSession(model_path, sess_options=options, providers=providers)
+            engine = kokoro_onnx.Kokoro.from_session(session, voices_path)
+            engine.voices = voices
+            engines.append(engine)
+
+        pool = cls(engines, voices)
+        pool._initializers = [value for _, value in initializers]
+        logger.info(
+            "Kokoro replicas loaded",
+            extra={
+                "replicas": len(engines),
+                "intra_op_threads": intra_op_threads(config),
+                "inter_op_threads": config.inter_op_threads,
+                "graph_optimization": config.graph_optimization,
+                "shared_weights": bool(initializers),
+                "voices": len(voices),
+            },
+        )
+        return pool
+
+    @property
+    def replicas(self) -> int:
+        """Number of session replicas."""
+        return len(self._engines)
+
+    def get_voices(self) -> list[str]:
+        """Returns the voice names, sorted."""
+        return self._voice_names
+
+    async def create_stream(
+        self,
+        text: str,
+        voice: str,
+        speed: float = 1.0,
+        **kwargs: Any,
+    ) -> AsyncIterator[tuple[np.ndarray, int]]:
+        """Synthesizes text on the least busy replica, yielding (audio, sample_rate)."""
+        index = min(range(len(self._engines)), key=self._active.__getitem__)
+        self._active[index] += 1
+        try:
+            async for chunk in self._engines[index].create_stream(
+                text, self._voices[voice], speed, **kwargs
+            ):
+                yield chunk
+        finally:
+            self._active[index] -= 1
+
+    def warmup(self, voices: list[str], text: str) -> None:
+        """
+        Synthesizes a short phrase with each voice on every replica.
+
+        Unknown voices are skipped; failures are logged.
+        """
+        voices = [voice for voice in voices if voice in self.voice_names]
+        started = time.monotonic()
+        for engine in self._engines:
+            for voice in voices:
+                try:
+                    engine.create(text, self._voices[voice])
+                except Exception as exc:
+                    logger.warning(
+                        "Kokoro warmup failed", extra={"voice": voice, "error": str(exc)}
+                    )
+        logger.info(
+            "Kokoro replicas warmed up",
+            extra={
+                "replicas": len(self._engines),
+                "voices": voices,
+                "warmup_ms": int((time.monotonic() - started) * 1000),
+            },
+        )
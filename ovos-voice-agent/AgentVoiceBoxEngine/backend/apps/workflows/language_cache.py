@@ -0,0 +1,165 @@
+"""
+Per-session spoken language pinning.
+
+Whisper detects the language of every chunk decoded without a language,
+which costs a detection pass per chunk and lets the language flap mid-call.
+This cache accumulates confident detections for a session and, once the
+same language has been detected on enough seconds of speech, pins it in
+Redis so every later decode of the session (on any worker) skips detection.
+A pinned language is dropped again when decodes with it keep coming back
+with low confidence, so the next chunk re-detects.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Consecutive low-confidence decodes with a pinned language before re-detection.
+REDETECT_STRIKES = 2
+
+# Seconds a worker trusts its local copy of a session's pinned language.
+LOCAL_TTL_SECONDS = 5.0
+
+
+class SessionLanguageCache:
+    """
+    Redis-backed language pinning for realtime sessions.
+
+    State lives in the hash `stt:lang:<session_id>` with the fields
+    `candidate`, `seconds`, `pinned`, `probability` and `strikes`, expiring
+    `ttl` seconds after the session's last decode.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        ttl: int,
+        min_probability: float,
+        detect_seconds: float,
+        redetect_confidence: float,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            redis: Redis client (decode_responses=True).
+            ttl: Seconds session language state is kept after the last decode.
+            min_probability: Detection probability required for a detection to count.
+            detect_seconds: Seconds of consistently detected speech required to pin.
+            redetect_confidence: Decode confidence below which a pinned language is doubted.
+        """
+        self._redis = redis
+        self.ttl = ttl
+        self.min_probability = min_probability
+        self.detect_seconds = detect_seconds
+        self.redetect_confidence = redetect_confidence
+        self._local: dict[str, tuple[Optional[str], float]] = {}
+
+    @staticmethod
+    def key(session_id: str) -> str:
+        """Returns the Redis key holding a session's language state."""
+        return f"stt:lang:{session_id}"
+
+    async def pinned(self, session_id: str) -> Optional[str]:
+        """Returns the session's pinned language, or None if it must be detected."""
+        now = time.monotonic()
+        local = self._local.get(session_id)
+        if local and local[1] > now:
+            return local[0]
+
+        language = await self._redis.hget(self.key(session_id), "pinned") or None
+        self._local[session_id] = (language, now + LOCAL_TTL_SECONDS)
+        return language
+
+    async def observe(
+        self,
+        session_id: str,
+        language: str,
+        probability: float,
+        audio_seconds: float,
+    ) -> Optional[str]:
+        """
+        Records a detection for a session without a pinned language.
+
+        Confident detections of the same language accumulate their audio
+        duration; a different language restarts the count and low-probability
+        detections are ignored.
+
+        Returns:
+            Optional[str]: The language if this detection pinned it.
+        """
+        if probability < self.min_probability:
+            return None
+
+        key = self.key(session_id)
+        state = await self._redis.hgetall(key)
+        if state.get("pinned"):
+            return state["pinned"]
+
+        seconds = audio_seconds
+        if state.get("candidate") == language:
+            seconds += float(state.get("seconds") or 0.0)
+
+        mapping = {"candidate": language, "seconds": seconds, "probability": probability}
+        pinned = seconds >= self.detect_seconds
+        if pinned:
+            mapping["pinned"] = language
+            mapping["strikes"] = 0
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+        if not pinned:
+            return None
+        self._local[session_id] = (language, time.monotonic() + LOCAL_TTL_SECONDS)
+        logger.info(
+            "Session language pinned",
+            extra={"session_id": session_id, "language": language, "seconds": seconds},
+        )
+        return language
+
+    async def record_confidence(self, session_id: str, confidence: float) -> bool:
+        """
+        Records the confidence of a decode that used the pinned language.
+
+        Returns:
+            bool: True if the pin was dropped and the next decode re-detects.
+        """
+        key = self.key(session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if confidence < self.redetect_confidence:
+                pipe.hincrby(key, "strikes", 1)
+            else:
+                pipe.hdel(key, "strikes")
+            pipe.expire(key, self.ttl)
+            strikes = (await pipe.execute())[0]
+
+        if confidence >= self.redetect_confidence or strikes < REDETECT_STRIKES:
+            return False
+
+        await self.unpin(session_id)
+        logger.info(
+            "Session language unpinned after low-confidence decodes",
+            extra={"session_id": session_id, "strikes": strikes},
+        )
+        return True
+
+    async def unpin(self, session_id: str) -> None:
+        """Forgets a session's language state."""
+        self._local.pop(session_id, None)
+        await self._redis.delete(self.key(session_id))
+
+    def prune_local(self) -> None:
+        """Drops expired local entries."""
+        now = time.monotonic()
+        for session_id, (_, expires) in list(self._local.items()):
+            if expires <= now:
+                self._local.pop(session_id, None)
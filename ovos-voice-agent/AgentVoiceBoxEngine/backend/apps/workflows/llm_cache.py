@@ -0,0 +1,294 @@
+"""
+Exact-match cache of deterministic LLM responses.
+
+FAQ bots and stock intents send the same message list at temperature 0 many
+times a day, and get the same answer each time. Responses are cached under a
+hash of the canonical request (provider, model, messages, tools and sampling
+settings), so a repeated request skips the provider entirely.
+
+Only temperature-0 requests of tenants that enabled
+`TenantSettings.llm_response_cache_enabled` are cached. Keys are partitioned
+by tenant, so no tenant is ever answered from another tenant's requests.
+Each tenant keeps at most MAX_ENTRIES responses of at most MAX_CHARACTERS;
+a Lua script stores an entry and evicts the tenant's oldest ones in one
+atomic step. Cached streams are replayed token by token, so the TTS worker
+receives them exactly like a live response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm:cache"
+
+# Seconds a tenant's opt-in is cached per process.
+TENANT_SETTINGS_TTL = 60
+
+# Tenants whose opt-in is cached per process; expired entries are pruned beyond it.
+TENANT_SETTINGS_MAX = 1024
+
+# KEYS[1]: entry, KEYS[2]: tenant index. ARGV: value, TTL, max entries.
+# Index scores are server times in microseconds, built as strings so that no
+# digit is lost. Returns the number of evicted entries.
+STORE_SCRIPT = """
+local t = redis.call('TIME')
+local ttl = tonumber(ARGV[2])
+local micros = string.format('%06d', tonumber(t[2]))
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+redis.call('ZADD', KEYS[2], t[1] .. micros, KEYS[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', (tonumber(t[1]) - ttl) .. micros)
+local overflow = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[3])
+if overflow > 0 then
+    local evicted = redis.call('ZRANGE', KEYS[2], 0, overflow - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, overflow - 1)
+    for _, entry in ipairs(evicted) do
+        redis.call('DEL', entry)
+    end
+end
+redis.call('EXPIRE', KEYS[2], ttl)
+return math.max(overflow, 0)
+"""
+
+_tenant_opt_in: dict[str, tuple[bool, float]] = {}
+
+
+def deterministic(temperature: Optional[float]) -> bool:
+    """Whether a request samples greedily, so that identical requests get identical answers."""
+    return temperature is not None and float(temperature) == 0.0
+
+
+def index_key(tenant_id: str) -> str:
+    """Returns the key of a tenant's entry index, ordered by insertion time."""
+    return f"{KEY_PREFIX}:{{{tenant_id}}}:index"
+
+
+def response_key(
+    tenant_id: str,
+    provider: str,
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: Optional[list[dict[str, Any]]] = None,
+    sampling: Optional[dict[str, Any]] = None,
+    variant: str = "",
+) -> str:
+    """
+    Builds the cache key of a request.
+
+    The request is serialized as JSON with sorted keys and no whitespace, so
+    requests that differ only in key order or formatting share a key. The
+    tenant is a Redis hash tag, keeping a tenant's entries and index in one
+    cluster slot for the store script.
+
+    Args:
+        tenant_id: Tenant the response belongs to.
+        provider: Requested provider.
+        model: Requested model.
+        messages: Chat messages, in the providers' {"role", "content"} format.
+        tools: Tool definitions offered to the model.
+        sampling: Every other setting that changes the answer (e.g. max_tokens).
+        variant: Shape of the cached value (e.g. "stream" or "result").
+
+    Returns:
+        str: Redis key of the response.
+    """
+    canonical = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "messages": messages,
+            "tools": tools or [],
+            "sampling": sampling or {},
+            "variant": variant,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+    return f"{KEY_PREFIX}:{{{tenant_id}}}:{digest}"
+
+
+async def replay(tokens: list[str]) -> AsyncIterator[str]:
+    """Yields cached tokens as a stream, letting other tasks run between them."""
+    for token in tokens:
+        yield token
+        await asyncio.sleep(0)
+
+
+class LLMResponseCache:
+    """
+    Redis-backed cache of LLM responses, bounded per tenant.
+
+    Values are JSON-serializable dicts chosen by the caller. Redis failures
+    are logged and treated as misses so the cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        ttl: int,
+        max_entries: int,
+        max_characters: int,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            redis: Redis client (decode_responses=True).
+            ttl: Seconds an entry is kept.
+            max_entries: Entries kept per tenant; the oldest are evicted first.
+            max_characters: Longest response that is cached.
+        """
+        self._redis = redis
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_characters = max_characters
+        self._store = redis.register_script(STORE_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Returns the cached value for a key, or None on a miss."""
+        try:
+            raw = await self._redis.get(key)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("LLM response cache read failed", extra={"error": str(exc)})
+            raw = None
+
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def put(self, tenant_id: str, key: str, value: dict[str, Any], characters: int) -> None:
+        """
+        Stores a value under a key, unless the response is too long.
+
+        Args:
+            tenant_id: Tenant the key belongs to.
+            key: Key built by `response_key` for the same tenant.
+            value: Value to cache.
+            characters: Length of the response text.
+        """
+        if characters > self.max_characters or self.max_entries <= 0:
+            return
+        try:
+            evicted = await self._store(
+                keys=[key, index_key(tenant_id)],
+                args=[json.dumps(value), self.ttl, self.max_entries],
+            )
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("LLM response cache write failed", extra={"error": str(exc)})
+            return
+        self.stored += 1
+        self.evicted += int(evicted)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "llm_cache_hits": self.hits,
+            "llm_cache_misses": self.misses,
+            "llm_cache_stored": self.stored,
+            "llm_cache_evicted": self.evicted,
+            "llm_cache_errors": self.errors,
+            "llm_cache_hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def tenant_opted_in(tenant_id: str) -> bool:
+    """
+    Returns whether a tenant enabled the response cache.
+
+    Reads `TenantSettings.llm_response_cache_enabled`, cached per process for
+    TENANT_SETTINGS_TTL seconds for at most TENANT_SETTINGS_MAX tenants.
+    Tenants without extended settings, and lookups that fail, are treated
+    as not opted in.
+    """
+    if not tenant_id:
+        return False
+
+    now = time.monotonic()
+    cached = _tenant_opt_in.get(tenant_id)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    from apps.tenants.models import TenantSettings
+
+    try:
+        enabled = await (
+            TenantSettings.objects.filter(tenant_id=tenant_id)
+            .values_list("llm_response_cache_enabled", flat=True)
+            .afirst()
+        )
+    except Exception as exc:
+        logger.warning(
+            "Failed to load tenant LLM cache setting",
+            extra={"tenant_id": tenant_id, "error": str(exc)},
+        )
+        enabled = None
+
+    enabled = bool(enabled)
+    _remember_opt_in(tenant_id, enabled, now)
+    return enabled
+
+
+def _remember_opt_in(tenant_id: str, enabled: bool, now: float) -> None:
+    """Caches a tenant's opt-in, dropping expired entries and then the oldest beyond the limit."""
+    _tenant_opt_in.pop(tenant_id, None)
+    if len(_tenant_opt_in) >= TENANT_SETTINGS_MAX:
+        for expired in [tenant for tenant, (_, until) in _tenant_opt_in.items() if until <= now]:
+            del _tenant_opt_in[expired]
+    while len(_tenant_opt_in) >= TENANT_SETTINGS_MAX:
+        del _tenant_opt_in[next(iter(_tenant_opt_in))]
+    _tenant_opt_in[tenant_id] = (enabled, now + TENANT_SETTINGS_TTL)
+
+
+def build_llm_cache(redis: aioredis.Redis) -> Optional[LLMResponseCache]:
+    """Returns a cache configured from LLM_CACHE, or None when disabled."""
+    config = settings.LLM_CACHE
+    if not config["ENABLED"]:
+        return None
+    return LLMResponseCache(
+        redis,
+        ttl=config["TTL"],
+        max_entries=config["MAX_ENTRIES"],
+        max_characters=config["MAX_CHARACTERS"],
+    )
+
+
+_activity_cache: Optional[LLMResponseCache] = None
+
+
+async def get_activity_llm_cache() -> Optional[LLMResponseCache]:
+    """Returns the process-wide cache used by the LLM activities, or None when disabled."""
+    global _activity_cache
+    if not settings.LLM_CACHE["ENABLED"]:
+        return None
+    if _activity_cache is None:
+        from apps.workflows.redis_client import get_shared_redis
+
+        try:
+            redis = await get_shared_redis()
+        except Exception as exc:
+            logger.warning("LLM response cache unavailable", extra={"error": str(exc)})
+            return None
+        _activity_cache = build_llm_cache(redis.client)
+    return _activity_cache
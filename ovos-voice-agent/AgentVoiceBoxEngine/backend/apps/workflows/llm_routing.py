@@ -0,0 +1,340 @@
+"""
+Latency-aware routing and hedging of LLM requests.
+
+`LatencyRouter` keeps, per provider and model, an exponentially weighted
+moving average (EWMA) of the time to first token and of the error rate, and
+a window of recent first-token times. It orders the providers of a request
+fastest first, with providers whose error rate is too high moved to the end
+and providers without samples kept in priority order after the measured
+healthy ones.
+
+`race` starts the first provider and, when hedging, starts a second one if
+no token has arrived by a deadline derived from the first provider's p95
+time to first token. Whichever stream produces a token first answers; the
+other is cancelled. A provider that fails before answering hands over to
+the other one, started at once if it was still waiting for the deadline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Marks the end of a provider stream in its queue.
+_END = object()
+
+
+@dataclass
+class RouteStats:
+    """Latency and error statistics of one provider and model."""
+
+    ttft_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    samples: int = 0
+    failures: int = 0
+    recent: deque[float] = field(default_factory=deque)
+
+
+@dataclass(frozen=True)
+class RoutingConfig:
+    """
+    Options of the LLM router.
+
+    Attributes:
+        policy: "latency" orders by measured speed, "priority" keeps the configured order.
+        alpha: Weight of the newest sample in the averages.
+        max_error_rate: Error rate above which a provider is tried last.
+        window: First-token samples kept for the hedge deadline.
+        hedge: Whether slow requests are hedged to a second provider.
+        hedge_min: Shortest hedge deadline, in seconds.
+        hedge_max: Longest hedge deadline, and the deadline without enough samples.
+        hedge_min_samples: Samples needed before the deadline follows the p95.
+    """
+
+    policy: str = "latency"
+    alpha: float = 0.2
+    max_error_rate: float = 0.5
+    window: int = 200
+    hedge: bool = False
+    hedge_min: float = 0.25
+    hedge_max: float = 2.0
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_settings(cls, config: dict[str, Any]) -> RoutingConfig:
+        """Reads the options from the LLM_WORKER settings."""
+        return cls(
+            policy=config["ROUTING"],
+            alpha=config["ROUTING_EWMA_ALPHA"],
+            max_error_rate=config["ROUTING_MAX_ERROR_RATE"],
+            window=config["ROUTING_WINDOW"],
+            hedge=config["HEDGE_ENABLED"],
+            hedge_min=config["HEDGE_MIN_MS"] / 1000,
+            hedge_max=config["HEDGE_MAX_MS"] / 1000,
+            hedge_min_samples=config["HEDGE_MIN_SAMPLES"],
+        )
+
+
+class LatencyRouter:
+    """Per provider and model latency and error statistics, and the order they imply."""
+
+    def __init__(self, config: RoutingConfig) -> None:
+        """
+        Initializes the router without samples.
+
+        Args:
+            config: Routing options.
+        """
+        self.config = config
+        self._stats: dict[tuple[str, str], RouteStats] = {}
+
+    def _route(self, provider: str, model: str) -> RouteStats:
+        """Returns the statistics of a provider and model, creating them."""
+        key = (provider, model)
+        if key not in self._stats:
+            self._stats[key] = RouteStats(recent=deque(maxlen=max(1, self.config.window)))
+        return self._stats[key]
+
+    def _update(self, average: Optional[float], sample: float) -> float:
+        """Returns an EWMA updated with a sample."""
+        if average is None:
+            return sample
+        return self.config.alpha * sample + (1 - self.config.alpha) * average
+
+    def record_ttft(self, provider: str, model: str, seconds: float) -> None:
+        """Records the time to first token of an answering provider."""
+        route = self._route(provider, model)
+        route.ttft_ewma = self._update(route.ttft_ewma, seconds)
+        route.error_ewma = self._update(route.error_ewma, 0.0)
+        route.samples += 1
+        route.recent.append(seconds)
+
+    def record_slow(self, provider: str, model: str, seconds: float) -> None:
+        """
+        Records a provider abandoned after `seconds` without a token.
+
+        The elapsed time is a lower bound of its time to first token; it
+        raises the average without counting as an error.
+        """
+        route = self._route(provider, model)
+        route.ttft_ewma = self._update(route.ttft_ewma, seconds)
+        route.recent.append(seconds)
+
+    def record_failure(self, provider: str, model: str) -> None:
+        """Records a failed request."""
+        route = self._route(provider, model)
+        route.error_ewma = self._update(route.error_ewma, 1.0)
+        route.failures += 1
+
+    def healthy(self, provider: str, model: str) -> bool:
+        """Whether a provider's error rate is within the limit."""
+        route = self._stats.get((provider, model))
+        return route is None or route.error_ewma <= self.config.max_error_rate
+
+    def order(self, providers: list[str], model: str) -> list[str]:
+        """
+        Orders providers for a request.
+
+        Returns:
+            list[str]: Healthy measured providers fastest first, then the
+                unmeasured ones, then the unhealthy ones; ties and the
+                "priority" policy keep the given order.
+        """
+        if self.config.policy != "latency":
+            return list(providers)
+
+        def key(item: tuple[int, str]) -> tuple[int, float, int]:
+            index, provider = item
+            route = self._stats.get((provider, model))
+            if not self.healthy(provider, model):
+                return 2, 0.0, index
+            if route is None or route.ttft_ewma is None:
+                return 1, 0.0, index
+            return 0, route.ttft_ewma, index
+
+        return [provider for _, provider in sorted(enumerate(providers), key=key)]
+
+    def hedge_delay(self, provider: str, model: str) -> float:
+        """Returns how long to wait for a provider's first token before hedging."""
+        route = self._stats.get((provider, model))
+        if route is None or len(route.recent) < max(1, self.config.hedge_min_samples):
+            return self.config.hedge_max
+        p95 = float(np.percentile(np.fromiter(route.recent, dtype=np.float64), 95))
+        return min(self.config.hedge_max, max(self.config.hedge_min, p95))
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Returns the statistics of every provider and model."""
+        return [
+            {
+                "provider": provider,
+                "model": model,
+                "ttft_ewma_ms": round(route.ttft_ewma * 1000, 1) if route.ttft_ewma else None,
+                "error_ewma": round(route.error_ewma, 3),
+                "samples": route.samples,
+                "failures": route.failures,
+                "hedge_delay_ms": round(self.hedge_delay(provider, model) * 1000, 1),
+            }
+            for (provider, model), route in self._stats.items()
+        ]
+
+
+class ProviderStream:
+    """A provider stream read ahead by a task of its own, so it can be raced and cancelled."""
+
+    def __init__(self, name: str, stream: AsyncIterator[str]) -> None:
+        """
+        Starts reading a stream.
+
+        Args:
+            name: Provider of the stream.
+            stream: The provider's token stream.
+        """
+        self.name = name
+        self.started = time.monotonic()
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._task = asyncio.create_task(self._read(stream))
+
+    async def _read(self, stream: AsyncIterator[str]) -> None:
+        try:
+            async for token in stream:
+                self._queue.put_nowait(token)
+        except Exception as exc:
+            self._queue.put_nowait(exc)
+            return
+        self._queue.put_nowait(_END)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the stream started."""
+        return time.monotonic() - self.started
+
+    async def next(self) -> Any:
+        """Returns the next token, `_END`, or the exception the stream failed with."""
+        return await self._queue.get()
+
+    async def cancel(self) -> None:
+        """Stops reading the stream and closes it."""
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+@dataclass
+class RaceResult:
+    """
+    The provider that answered a race.
+
+    Attributes:
+        winner: The answering stream; `first` is its first item.
+        first: First token, or `_END` for an empty answer.
+        ttft: Seconds from the winner's start to its first token.
+        failures: Providers that failed before the winner answered.
+        abandoned: Providers cancelled with the seconds they had run.
+        unused: The hedge provider, if it was never started.
+    """
+
+    winner: ProviderStream
+    first: Any
+    ttft: float
+    failures: list[tuple[str, Exception]] = field(default_factory=list)
+    abandoned: list[tuple[str, float]] = field(default_factory=list)
+    unused: Optional[str] = None
+
+    async def tokens(self) -> AsyncIterator[str]:
+        """
+        Yields the winner's tokens, starting with the first one.
+
+        Raises:
+            Exception: The error the winner's stream failed with.
+        """
+        try:
+            item = self.first
+            while item is not _END:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                item = await self.winner.next()
+        finally:
+            await self.winner.cancel()
+
+
+class RaceFailed(Exception):
+    """Every provider of a race failed before answering."""
+
+    def __init__(self, failures: list[tuple[str, Exception]]) -> None:
+        super().__init__(f"All raced providers failed: {failures[-1][1]}")
+        self.failures = failures
+
+
+async def race(
+    primary: str,
+    hedge: Optional[str],
+    open_stream: Callable[[str], AsyncIterator[str]],
+    delay: float,
+) -> RaceResult:
+    """
+    Races a provider against a hedge started after `delay` seconds.
+
+    Args:
+        primary: Provider started at once.
+        hedge: Provider started when the primary has not answered by the
+            deadline or failed; None to run the primary alone.
+        open_stream: Returns the token stream of a provider.
+        delay: Seconds to wait for the primary's first token.
+
+    Returns:
+        RaceResult: The provider that produced a token (or ended) first.
+
+    Raises:
+        RaceFailed: If every started provider failed before answering.
+    """
+    running: dict[asyncio.Task, ProviderStream] = {}
+    failures: list[tuple[str, Exception]] = []
+    deadline = time.monotonic() + delay
+
+    def start(name: str) -> None:
+        stream = ProviderStream(name, open_stream(name))
+        running[asyncio.create_task(stream.next())] = stream
+
+    start(primary)
+    waiting_hedge = hedge
+    try:
+        while running:
+            timeout = None
+            if waiting_hedge is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                start(waiting_hedge)
+                waiting_hedge = None
+                continue
+            for task in done:
+                stream = running.pop(task)
+                item = task.result()
+                if isinstance(item, Exception):
+                    failures.append((stream.name, item))
+                    await stream.cancel()
+                    continue
+                result = RaceResult(stream, item, stream.elapsed, failures, unused=waiting_hedge)
+                for other_task, other in running.items():
+                    other_task.cancel()
+                    result.abandoned.append((other.name, other.elapsed))
+                    await other.cancel()
+                running.clear()
+                return result
+            if not running and waiting_hedge is not None:
+                start(waiting_hedge)
+                waiting_hedge = None
+    except BaseException:
+        for task, stream in running.items():
+            task.cancel()
+            await stream.cancel()
+        raise
+    raise RaceFailed(failures)
@@ -0,0 +1,274 @@
+"""
+Pooled HTTP transport for LLM provider calls.
+
+Every LLM call, from the realtime LLM worker or the Temporal activities, goes
+through one `httpx.AsyncClient` per provider origin (scheme, host and port).
+The client keeps its connections alive between requests and negotiates
+HTTP/2 when the h2 package is installed, so concurrent streams to a provider
+are multiplexed over a few connections and a conversational turn does not
+pay a TCP and TLS handshake before its first token. Connections can be
+opened at startup, and each pool reports its requests, in-flight streams and
+connections for utilization metrics.
+
+Clients are bound to the event loop that created them: the worker owns its
+transport, and activities share the process-wide one returned by
+`get_llm_transport()`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """Whether the h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def pool_key(base_url: str) -> str:
+    """
+    Returns the origin a base URL is pooled under.
+
+    URLs on the same scheme, host and port share connections whatever their
+    path; default ports are made explicit.
+    """
+    url = httpx.URL(base_url)
+    port = url.port or {"http": 80, "https": 443}.get(url.scheme, 0)
+    return f"{url.scheme}://{url.host}:{port}"
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    Connection pool options of the LLM transport.
+
+    Attributes:
+        http2: Negotiate HTTP/2 (falls back to HTTP/1.1 without h2).
+        max_connections: Connections per origin.
+        max_keepalive: Idle connections kept per origin.
+        keepalive_expiry: Seconds an idle connection stays open.
+        connect_timeout: Seconds to establish a connection.
+        read_timeout: Seconds to wait for data on a connection.
+        pool_timeout: Seconds to wait for a free connection.
+        preconnect: Open connections to the configured providers at startup.
+    """
+
+    http2: bool = True
+    max_connections: int = 20
+    max_keepalive: int = 10
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+    pool_timeout: float = 5.0
+    preconnect: bool = True
+
+    @classmethod
+    def from_settings(cls, config: dict[str, Any]) -> TransportConfig:
+        """Reads the options from the LLM_WORKER settings."""
+        return cls(
+            http2=config["HTTP2"],
+            max_connections=config["HTTP_MAX_CONNECTIONS"],
+            max_keepalive=config["HTTP_MAX_KEEPALIVE"],
+            keepalive_expiry=config["HTTP_KEEPALIVE_EXPIRY"],
+            connect_timeout=config["HTTP_CONNECT_TIMEOUT"],
+            read_timeout=config["HTTP_READ_TIMEOUT"],
+            pool_timeout=config["HTTP_POOL_TIMEOUT"],
+            preconnect=config["HTTP_PRECONNECT"],
+        )
+
+    def limits(self) -> httpx.Limits:
+        """Returns the pool limits of one origin."""
+        return httpx.Limits(
+            max_connections=max(1, self.max_connections),
+            max_keepalive_connections=max(0, min(self.max_keepalive, self.max_connections)),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        """Returns the request timeouts."""
+        return httpx.Timeout(
+            self.read_timeout,
+            connect=self.connect_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+@dataclass
+class PoolStats:
+    """Counters of one origin's pool."""
+
+    requests_total: int = 0
+    failures_total: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that reports when the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Connection pool of one origin that counts its requests and open responses."""
+
+    def __init__(self, config: TransportConfig, http2: bool) -> None:
+        self._transport = httpx.AsyncHTTPTransport(http2=http2, limits=config.limits())
+        self.stats = PoolStats()
+
+    def _release(self) -> None:
+        self.stats.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.requests_total += 1
+        self.stats.in_flight += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.stats.in_flight)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.stats.failures_total += 1
+            self._release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    def connections(self) -> tuple[int, int]:
+        """Returns the open and the idle connections of the pool."""
+        # The pool is internal to httpx; report nothing rather than fail if it moves.
+        connections = list(getattr(getattr(self._transport, "_pool", None), "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LLMTransport:
+    """Keep-alive HTTP clients of the LLM providers, one pool per origin."""
+
+    def __init__(self, config: TransportConfig) -> None:
+        """
+        Initializes the transport; pools are created on first use.
+
+        Args:
+            config: Connection pool options.
+        """
+        self.config = config
+        self.http2 = config.http2 and http2_available()
+        if config.http2 and not self.http2:
+            logger.warning("h2 is not installed; LLM providers are called over HTTP/1.1")
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._pools: dict[str, _MeteredTransport] = {}
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Returns the pooled client of a provider base URL."""
+        key = pool_key(base_url)
+        client = self._clients.get(key)
+        if client is None:
+            pool = _MeteredTransport(self.config, self.http2)
+            client = httpx.AsyncClient(transport=pool, timeout=self.config.timeout())
+            self._pools[key] = pool
+            self._clients[key] = client
+        return client
+
+    async def preconnect(self, base_urls: Iterable[str]) -> None:
+        """
+        Opens a connection to the origin of every base URL, so the first turn
+        finds it pooled.
+
+        Any HTTP response leaves the connection in the pool; failures are
+        logged and retried by the first real request.
+        """
+
+        async def connect(base_url: str) -> None:
+            try:
+                response = await self.client(base_url).head(base_url)
+                await response.aclose()
+                logger.info(
+                    "LLM provider connection opened",
+                    extra={"origin": pool_key(base_url), "http_version": response.http_version},
+                )
+            except httpx.HTTPError as exc:
+                logger.warning(
+                    "LLM provider pre-connect failed",
+                    extra={"origin": pool_key(base_url), "error": str(exc)},
+                )
+
+        origins = {pool_key(url): url for url in base_urls if url}
+        await asyncio.gather(*(connect(url) for url in origins.values()))
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Returns the counters and connection use of every pool."""
+        max_connections = self.config.limits().max_connections
+        stats = []
+        for key, pool in self._pools.items():
+            connections, idle = pool.connections()
+            stats.append(
+                {
+                    "origin": key,
+                    "http2": self.http2,
+                    "requests_total": pool.stats.requests_total,
+                    "failures_total": pool.stats.failures_total,
+                    "in_flight": pool.stats.in_flight,
+                    "peak_in_flight": pool.stats.peak_in_flight,
+                    "connections": connections,
+                    "idle_connections": idle,
+                    "utilization": round((connections - idle) / max_connections, 3),
+                }
+            )
+        return stats
+
+    async def aclose(self) -> None:
+        """Closes every pooled connection."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._pools.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_shared_transport: Optional[LLMTransport] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_llm_transport() -> LLMTransport:
+    """
+    Returns the transport shared by the LLM activities of this process.
+
+    A transport is bound to the running event loop; a new loop gets a new
+    transport, and the connections of the previous loop are dropped with it.
+    """
+    global _shared_transport, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_transport is None or _shared_loop is not loop:
+        _shared_transport = LLMTransport(TransportConfig.from_settings(settings.LLM_WORKER))
+        _shared_loop = loop
+    return _shared_transport
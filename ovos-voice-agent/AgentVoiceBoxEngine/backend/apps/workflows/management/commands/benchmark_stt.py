@@ -0,0 +1,265 @@
+"""
+Benchmark the realtime STT worker.
+
+Pushes a synthetic or recorded corpus through a real `STTWorker` over Redis
+streams and reports real-time factor, latency percentiles, throughput and
+peak RSS for every combination of batch size, model and compute type.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gc
+import json
+import logging
+import time
+import uuid
+from typing import Any
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.workflows.benchmark import (
+    RSSSampler,
+    load_wav_corpus,
+    parse_axis,
+    pcm16_bytes,
+    summarize_latencies,
+    sweep,
+    synthetic_speech,
+)
+from apps.workflows.management.commands.run_stt_worker import STTWorker
+from apps.workflows.model_registry import get_model_registry
+from apps.workflows.redis_client import RedisClient
+from apps.workflows.stt_batch import longform_stream
+
+logger = logging.getLogger(__name__)
+
+
+def synthetic_corpus(
+    utterances: int, seconds: float, sample_rate: int
+) -> list[tuple[str, np.ndarray]]:
+    """Builds a corpus of distinct synthetic utterances of the given length."""
+    return [
+        (f"synthetic-{index}", synthetic_speech(seconds, sample_rate, seed=index))
+        for index in range(utterances)
+    ]
+
+
+async def benchmark_config(
+    config: dict[str, Any],
+    corpus: list[tuple[str, np.ndarray]],
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    """
+    Runs one benchmark configuration against a fresh worker.
+
+    The worker reads from private streams and publishes to a private
+    channel, so benchmarks can run next to live workers on the same Redis.
+    The transcription cache is disabled so every request is decoded.
+
+    Args:
+        config: Sweep point with `batch_size`, `model` and `compute_type`.
+        corpus: Utterances sent round-robin.
+        requests: Number of transcription requests.
+        concurrency: Maximum requests in flight.
+
+    Returns:
+        dict[str, Any]: The configuration and its measurements.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    sample_rate = settings.STT_WORKER["SAMPLE_RATE"]
+    stt_settings = {
+        **settings.STT_WORKER,
+        "BATCH_SIZE": config["batch_size"],
+        "MODEL": config["model"],
+        "COMPUTE_TYPE": config["compute_type"],
+        "STREAM_AUDIO": f"stt:bench:{run_id}:audio",
+        "GROUP_WORKERS": f"stt-bench-{run_id}",
+        "CHANNEL_TRANSCRIPTION": f"stt:bench:{run_id}:transcription",
+    }
+    cache_settings = {**settings.TRANSCRIPTION_CACHE, "ENABLED": False}
+    payloads = [
+        (name, base64.b64encode(pcm16_bytes(audio)).decode(), len(audio) / sample_rate)
+        for name, audio in corpus
+    ]
+
+    with override_settings(STT_WORKER=stt_settings, TRANSCRIPTION_CACHE=cache_settings):
+        redis = RedisClient()
+        await redis.connect()
+        worker = STTWorker()
+        pending: dict[str, asyncio.Future] = {}
+        latencies: list[float] = []
+        failures = 0
+        audio_seconds = 0.0
+
+        async with RSSSampler() as rss:
+            load_started = time.perf_counter()
+            await worker.start()
+            load_seconds = time.perf_counter() - load_started
+
+            pubsub = redis.client.pubsub()
+            await pubsub.psubscribe(f"{stt_settings['CHANNEL_TRANSCRIPTION']}:*")
+
+            async def collect() -> None:
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    data = json.loads(message["data"])
+                    future = pending.pop(data.get("correlation_id", ""), None)
+                    if future and not future.done():
+                        future.set_result(data)
+
+            run_task = asyncio.create_task(worker.run())
+            collect_task = asyncio.create_task(collect())
+            slots = asyncio.Semaphore(concurrency)
+            loop = asyncio.get_running_loop()
+
+            async def send(index: int) -> None:
+                nonlocal failures, audio_seconds
+                _, audio_b64, seconds = payloads[index % len(payloads)]
+                correlation_id = f"{run_id}-{index}"
+                async with slots:
+                    future = loop.create_future()
+                    pending[correlation_id] = future
+                    started = time.perf_counter()
+                    await redis.client.xadd(
+                        stt_settings["STREAM_AUDIO"],
+                        {
+                            "session_id": f"bench-{run_id}-{index}",
+                            "correlation_id": correlation_id,
+                            "audio": audio_b64,
+                            "format": "pcm16",
+                            "sample_rate": sample_rate,
+                            "channels": 1,
+                            "language": "en",
+                        },
+                    )
+                    result = await future
+                    latencies.append(time.perf_counter() - started)
+                    audio_seconds += seconds
+                    if result.get("type") != "transcription.completed":
+                        failures += 1
+
+            started = time.perf_counter()
+            try:
+                await asyncio.gather(*(send(index) for index in range(requests)))
+            finally:
+                wall_seconds = time.perf_counter() - started
+                run_task.cancel()
+                collect_task.cancel()
+                await asyncio.gather(run_task, collect_task, return_exceptions=True)
+                await pubsub.aclose()
+                await worker.stop()
+                await redis.client.delete(
+                    stt_settings["STREAM_AUDIO"], longform_stream(), worker._direct_stream
+                )
+                await redis.disconnect()
+
+        get_model_registry().clear()
+        gc.collect()
+
+    return {
+        **config,
+        "requests": requests,
+        "concurrency": concurrency,
+        "failures": failures,
+        "model_load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "rtf": round(wall_seconds / audio_seconds, 4) if audio_seconds else None,
+        "throughput_rps": round(requests / wall_seconds, 2) if wall_seconds else None,
+        "latency": summarize_latencies(latencies),
+        "peak_rss_mb": round(rss.peak_bytes / (1024 * 1024), 1),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Django management command to benchmark the STT worker.
+
+    Example:
+        python manage.py benchmark_stt --batch-sizes 1,4,8 --models tiny,base \\
+            --compute-types int8 --requests 64 --concurrency 16 --output stt.json
+    """
+
+    help = "Benchmark the realtime STT worker and report RTF, latency, throughput and RSS"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--batch-sizes",
+            default=str(settings.STT_WORKER["BATCH_SIZE"]),
+            help="Comma separated STT_BATCH_SIZE values",
+        )
+        parser.add_argument(
+            "--models",
+            default=settings.STT_WORKER["MODEL"],
+            help="Comma separated Whisper models",
+        )
+        parser.add_argument(
+            "--compute-types",
+            default=settings.STT_WORKER["COMPUTE_TYPE"],
+            help="Comma separated compute types (int8, float16, ...)",
+        )
+        parser.add_argument("--requests", type=int, default=64, help="Requests per configuration")
+        parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+        parser.add_argument(
+            "--corpus",
+            default=None,
+            help="Directory of PCM16/float32 WAV files (default: synthetic speech)",
+        )
+        parser.add_argument(
+            "--utterances", type=int, default=8, help="Synthetic utterances in the corpus"
+        )
+        parser.add_argument(
+            "--seconds", type=float, default=5.0, help="Length of each synthetic utterance"
+        )
+        parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+
+    def handle(self, *args, **options) -> None:
+        """Runs every sweep configuration and prints the JSON report."""
+        logging.basicConfig(
+            level=logging.WARNING,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+        sample_rate = settings.STT_WORKER["SAMPLE_RATE"]
+        if options["corpus"]:
+            corpus = load_wav_corpus(options["corpus"], sample_rate)
+            if not corpus:
+                raise CommandError(f"No PCM16/float32 WAV files in {options['corpus']}")
+        else:
+            corpus = synthetic_corpus(options["utterances"], options["seconds"], sample_rate)
+
+        configs = sweep(
+            batch_size=parse_axis(options["batch_sizes"], int),
+            model=parse_axis(options["models"], str),
+            compute_type=parse_axis(options["compute_types"], str),
+        )
+        results = []
+        for config in configs:
+            self.stderr.write(f"Benchmarking {config}")
+            results.append(
+                asyncio.run(
+                    benchmark_config(config, corpus, options["requests"], options["concurrency"])
+                )
+            )
+
+        report = json.dumps(
+            {
+                "benchmark": "stt",
+                "corpus": options["corpus"] or "synthetic",
+                "corpus_utterances": len(corpus),
+                "corpus_seconds": round(sum(len(audio) for _, audio in corpus) / sample_rate, 3),
+                "results": results,
+            },
+            indent=2,
+        )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(report + "\n")
+        self.stdout.write(report)
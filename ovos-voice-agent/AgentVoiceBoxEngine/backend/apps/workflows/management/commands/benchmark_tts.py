@@ -0,0 +1,364 @@
+"""
+Benchmark TTS synthesis.
+
+Runs a synthetic or supplied text corpus through the realtime worker's
+`_synthesize_stream` and through the `TTSActivities` Temporal activity, and
+reports time to first chunk, real-time factor, chunks per second, latency
+percentiles and peak RSS for every combination of concurrency, output
+framing and ONNX thread settings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import logging
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from apps.workflows.activities.tts import SynthesisRequest, TTSActivities
+from apps.workflows.audio_framing import OUTPUT_FORMATS, AudioFramer
+from apps.workflows.benchmark import (
+    RSSSampler,
+    host_info,
+    load_text_corpus,
+    parse_axis,
+    summarize_latencies,
+    sweep,
+    synthetic_text,
+)
+from apps.workflows.model_registry import get_model_registry
+from apps.workflows.tts_scheduler import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+PATHS = ("worker", "activity")
+
+
+def synthetic_corpus(lengths: list[int], variants: int) -> list[tuple[str, str]]:
+    """Builds a corpus of distinct synthetic texts of the given lengths in characters."""
+    return [
+        (f"synthetic-{length}-{variant}", synthetic_text(length, seed=length * 1000 + variant))
+        for length in lengths
+        for variant in range(variants)
+    ]
+
+
+def _result(
+    config: dict[str, Any],
+    requests: int,
+    failures: int,
+    load_seconds: float,
+    wall_seconds: float,
+    audio_seconds: float,
+    characters: int,
+    chunks: int,
+    first_chunk: list[float],
+    latencies: list[float],
+    peak_rss_bytes: int,
+) -> dict[str, Any]:
+    """Builds the report entry of one configuration."""
+    return {
+        **config,
+        "requests": requests,
+        "failures": failures,
+        "model_load_seconds": round(load_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "characters": characters,
+        "rtf": round(wall_seconds / audio_seconds, 4) if audio_seconds else None,
+        "chunks": chunks,
+        "chunks_per_second": round(chunks / wall_seconds, 2) if wall_seconds else None,
+        "throughput_rps": round(requests / wall_seconds, 2) if wall_seconds else None,
+        "first_chunk": summarize_latencies(first_chunk),
+        "latency": summarize_latencies(latencies),
+        "peak_rss_mb": round(peak_rss_bytes / (1024 * 1024), 1),
+    }
+
+
+async def benchmark_worker(
+    config: dict[str, Any],
+    corpus: list[tuple[str, str]],
+    requests: int,
+) -> dict[str, Any]:
+    """
+    Runs one configuration through `TTSWorker._synthesize_stream`.
+
+    A fresh worker loads the Kokoro ONNX replicas with the configuration's
+    thread settings; no Redis connection is made and the phrase cache is
+    not used, so every request is synthesized.
+
+    Args:
+        config: Sweep point with `concurrency`, `output_format`,
+            `intra_op_threads` and `inter_op_threads`.
+        corpus: Texts sent round-robin.
+        requests: Number of synthesis requests.
+
+    Returns:
+        dict[str, Any]: The configuration and its measurements.
+    """
+    # The worker module requires kokoro-onnx; the activity path does not.
+    from apps.workflows.management.commands.run_tts_worker import TTSWorker
+
+    tts_settings = {
+        **settings.TTS_WORKER,
+        "ONNX_INTRA_OP_THREADS": config["intra_op_threads"],
+        "ONNX_INTER_OP_THREADS": config["inter_op_threads"],
+    }
+    voice = tts_settings["DEFAULT_VOICE"]
+    speed = tts_settings["DEFAULT_SPEED"]
+
+    with override_settings(TTS_WORKER=tts_settings):
+        get_model_registry().clear()
+        gc.collect()
+        worker = TTSWorker()
+        first_chunk: list[float] = []
+        latencies: list[float] = []
+        failures = 0
+        chunks = 0
+        characters = 0
+
+        async with RSSSampler() as rss:
+            load_started = time.perf_counter()
+            await asyncio.to_thread(worker._load_model)
+            load_seconds = time.perf_counter() - load_started
+            slots = asyncio.Semaphore(config["concurrency"])
+
+            async def send(index: int, worker: TTSWorker) -> None:
+                nonlocal failures, chunks, characters
+                _, text = corpus[index % len(corpus)]
+                token = CancellationToken(f"bench-{index}", f"bench-{index}")
+                framer = AudioFramer(config["output_format"])
+                async with slots:
+                    started = time.perf_counter()
+                    first = True
+                    try:
+                        async for _, _, is_final in worker._synthesize_stream(
+                            text, voice, speed, token, framer
+                        ):
+                            if first:
+                                first_chunk.append(time.perf_counter() - started)
+                                first = False
+                            if not is_final:
+                                chunks += 1
+                    except Exception as exc:
+                        failures += 1
+                        logger.warning("Benchmark synthesis failed", extra={"error": str(exc)})
+                        return
+                    latencies.append(time.perf_counter() - started)
+                    characters += len(text)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(send(index, worker) for index in range(requests)))
+            wall_seconds = time.perf_counter() - started
+
+        audio_seconds = worker._total_audio_seconds
+        del worker
+        get_model_registry().clear()
+        gc.collect()
+
+    return _result(
+        {"path": "worker", **config},
+        requests,
+        failures,
+        load_seconds,
+        wall_seconds,
+        audio_seconds,
+        characters,
+        chunks,
+        first_chunk,
+        latencies,
+        rss.peak_bytes,
+    )
+
+
+async def benchmark_activity(
+    config: dict[str, Any],
+    corpus: list[tuple[str, str]],
+    requests: int,
+) -> dict[str, Any]:
+    """
+    Runs one configuration through the `tts_synthesize_speech` activity.
+
+    The activity returns the whole WAV file at once, so its first chunk is
+    the complete response. The phrase cache is disabled.
+
+    Args:
+        config: Sweep point with `concurrency`.
+        corpus: Texts sent round-robin.
+        requests: Number of synthesis requests.
+
+    Returns:
+        dict[str, Any]: The configuration and its measurements.
+    """
+    cache_settings = {**settings.TTS_CACHE, "ENABLED": False}
+    voice = settings.TTS_WORKER["DEFAULT_VOICE"]
+    speed = settings.TTS_WORKER["DEFAULT_SPEED"]
+
+    with override_settings(TTS_CACHE=cache_settings):
+        get_model_registry().clear()
+        gc.collect()
+        activities = TTSActivities()
+        latencies: list[float] = []
+        failures = 0
+        audio_seconds = 0.0
+        characters = 0
+
+        async with RSSSampler() as rss:
+            # The first request loads the pipeline; time it on its own.
+            load_started = time.perf_counter()
+            await activities.synthesize_speech(
+                SynthesisRequest("bench", "bench-load", corpus[0][1][:40], voice, speed=speed)
+            )
+            load_seconds = time.perf_counter() - load_started
+            slots = asyncio.Semaphore(config["concurrency"])
+
+            async def send(index: int) -> None:
+                nonlocal failures, audio_seconds, characters
+                _, text = corpus[index % len(corpus)]
+                async with slots:
+                    started = time.perf_counter()
+                    try:
+                        result = await activities.synthesize_speech(
+                            SynthesisRequest("bench", f"bench-{index}", text, voice, speed=speed)
+                        )
+                    except Exception as exc:
+                        failures += 1
+                        logger.warning("Benchmark synthesis failed", extra={"error": str(exc)})
+                        return
+                    latencies.append(time.perf_counter() - started)
+                    if not result.audio_data:
+                        failures += 1
+                    audio_seconds += result.duration_seconds
+                    characters += len(text)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(send(index) for index in range(requests)))
+            wall_seconds = time.perf_counter() - started
+
+        get_model_registry().clear()
+        gc.collect()
+
+    return _result(
+        {"path": "activity", **config},
+        requests,
+        failures,
+        load_seconds,
+        wall_seconds,
+        audio_seconds,
+        characters,
+        len(latencies),
+        latencies,
+        latencies,
+        rss.peak_bytes,
+    )
+
+
+class Command(BaseCommand):
+    """
+    Django management command to benchmark TTS synthesis.
+
+    Example:
+        python manage.py benchmark_tts --paths worker --concurrency 1,4,8 \\
+            --formats pcm16,wav --intra-op-threads 0,2 --requests 32 --output tts.json
+    """
+
+    help = "Benchmark TTS synthesis and report time to first chunk, RTF, chunks/s and RSS"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--paths",
+            default="worker",
+            help=f"Comma separated synthesis paths ({', '.join(PATHS)})",
+        )
+        parser.add_argument(
+            "--concurrency", default="1,4", help="Comma separated requests in flight"
+        )
+        parser.add_argument(
+            "--formats",
+            default=settings.TTS_WORKER["OUTPUT_FORMAT"],
+            help=f"Comma separated worker output framings ({', '.join(OUTPUT_FORMATS)})",
+        )
+        parser.add_argument(
+            "--intra-op-threads",
+            default=str(settings.TTS_WORKER["ONNX_INTRA_OP_THREADS"]),
+            help="Comma separated ONNX intra-op threads per replica (0: CPUs / replicas)",
+        )
+        parser.add_argument(
+            "--inter-op-threads",
+            default=str(settings.TTS_WORKER["ONNX_INTER_OP_THREADS"]),
+            help="Comma separated ONNX inter-op threads per replica",
+        )
+        parser.add_argument("--requests", type=int, default=32, help="Requests per configuration")
+        parser.add_argument(
+            "--corpus",
+            default=None,
+            help="UTF-8 text file, one request per line (default: synthetic text)",
+        )
+        parser.add_argument(
+            "--lengths",
+            default="40,200,800",
+            help="Comma separated lengths in characters of the synthetic texts",
+        )
+        parser.add_argument("--variants", type=int, default=2, help="Synthetic texts per length")
+        parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+
+    def handle(self, *args, **options) -> None:
+        """Runs every sweep configuration and prints the JSON report."""
+        logging.basicConfig(
+            level=logging.WARNING,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+        if options["corpus"]:
+            corpus = load_text_corpus(options["corpus"])
+            if not corpus:
+                raise CommandError(f"No text in {options['corpus']}")
+        else:
+            corpus = synthetic_corpus(parse_axis(options["lengths"], int), options["variants"])
+
+        paths = parse_axis(options["paths"], str)
+        formats = parse_axis(options["formats"], str)
+        for path in paths:
+            if path not in PATHS:
+                raise CommandError(f"Unknown path: {path}")
+        for output_format in formats:
+            if output_format not in OUTPUT_FORMATS:
+                raise CommandError(f"Unknown output format: {output_format}")
+        concurrency = parse_axis(options["concurrency"], int)
+
+        results = []
+        if "worker" in paths:
+            for config in sweep(
+                intra_op_threads=parse_axis(options["intra_op_threads"], int),
+                inter_op_threads=parse_axis(options["inter_op_threads"], int),
+                output_format=formats,
+                concurrency=concurrency,
+            ):
+                self.stderr.write(f"Benchmarking worker {config}")
+                results.append(asyncio.run(benchmark_worker(config, corpus, options["requests"])))
+        if "activity" in paths:
+            for config in sweep(concurrency=concurrency):
+                self.stderr.write(f"Benchmarking activity {config}")
+                results.append(asyncio.run(benchmark_activity(config, corpus, options["requests"])))
+
+        report = json.dumps(
+            {
+                "benchmark": "tts",
+                "host": host_info(),
+                "corpus": options["corpus"] or "synthetic",
+                "corpus_texts": len(corpus),
+                "corpus_characters": sum(len(text) for _, text in corpus),
+                "results": results,
+            },
+            indent=2,
+        )
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(report + "\n")
+        self.stdout.write(report)
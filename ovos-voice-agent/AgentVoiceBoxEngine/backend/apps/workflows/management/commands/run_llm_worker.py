@@ -10,91 +10,70 @@ import logging
 import signal
 import time
 import uuid
-from collections.abc import AsyncGenerator
-from dataclasses import dataclass
-from enum import Enum
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Any, Optional
 
 import httpx
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from apps.workflows.circuit_breaker import Permit, SharedCircuitBreaker
+from apps.workflows.llm_cache import (
+    LLMResponseCache,
+    build_llm_cache,
+    deterministic,
+    replay,
+    response_key,
+    tenant_opted_in,
+)
+from apps.workflows.llm_routing import LatencyRouter, RaceFailed, RoutingConfig, race
+from apps.workflows.llm_transport import LLMTransport, TransportConfig
 from apps.workflows.redis_client import RedisClient
+from apps.workflows.token_coalescer import (
+    REPLAY_MAXLEN,
+    REPLAY_TTL_SECONDS,
+    TokenCoalescer,
+    coalesce,
+    replay_stream,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class CircuitState(Enum):
-    """Circuit breaker states."""
-
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
-
-
-@dataclass
-class CircuitBreaker:
-    """Circuit breaker for provider failover."""
-
-    threshold: int
-    timeout: float
-    failure_count: int = 0
-    last_failure_time: float = 0.0
-    state: CircuitState = CircuitState.CLOSED
-
-    def record_success(self) -> None:
-        """Records a successful operation, resetting failure count and state."""
-        self.failure_count = 0
-        self.state = CircuitState.CLOSED
+class LLMProvider:
+    """Base class for LLM providers, defining common interface and lifecycle methods."""
 
-    def record_failure(self) -> None:
-        """
-        Records a failed operation, incrementing failure count.
-        Opens the circuit if the failure threshold is met.
-        """
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-        if self.failure_count >= self.threshold:
-            self.state = CircuitState.OPEN
-            logger.warning(
-                "Circuit breaker opened", extra={"failures": self.failure_count}
-            )
+    name = ""
 
-    def can_execute(self) -> bool:
+    def __init__(self, transport: LLMTransport) -> None:
         """
-        Checks if an operation can be executed based on the current circuit state.
+        Initializes the LLMProvider.
 
-        Returns:
-            bool: True if execution is allowed, False otherwise.
+        Args:
+            transport: Pooled HTTP transport shared by the worker's providers.
         """
-        if self.state == CircuitState.CLOSED:
-            return True
-        if self.state == CircuitState.OPEN:
-            if time.time() - self.last_failure_time >= self.timeout:
-                self.state = CircuitState.HALF_OPEN
-                logger.info("Circuit breaker half-open, testing recovery")
-                return True
-            return False
-        return True
-
+        self._transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
 
-class LLMProvider:
-    """Base class for LLM providers, defining common interface and lifecycle methods."""
+    @property
+    def base_url(self) -> str:
+        """Configured base URL of the provider."""
+        return settings.LLM_PROVIDERS[self.name]["base_url"] or ""
 
-    def __init__(self) -> None:
-        """Initializes the LLMProvider."""
-        self._client: Optional["httpx.AsyncClient"] = None
+    @property
+    def configured(self) -> bool:
+        """Whether the provider has the settings it needs to be called."""
+        return bool(self.base_url and settings.LLM_PROVIDERS[self.name].get("api_key", True))
 
     async def start(self) -> None:
-        """Starts the provider, initializing any necessary clients or connections."""
-        import httpx
-
-        self._client = httpx.AsyncClient(timeout=60.0)
+        """Starts the provider, taking the pooled client of its base URL."""
+        if self.base_url:
+            self._client = self._transport.client(self.base_url)
 
     async def stop(self) -> None:
-        """Stops the provider, closing any open clients or connections."""
-        if self._client:
-            await self._client.aclose()
+        """Stops the provider; its connections are closed with the transport."""
+        self._client = None
 
     async def generate_stream(
         self,
@@ -124,6 +103,8 @@ class LLMProvider:
 class OpenAIProvider(LLMProvider):
     """OpenAI API provider."""
 
+    name = "openai"
+
     async def generate_stream(
         self,
         messages: list[dict[str, str]],
@@ -188,6 +169,8 @@ class OpenAIProvider(LLMProvider):
 class GroqProvider(LLMProvider):
     """Groq API provider."""
 
+    name = "groq"
+
     async def generate_stream(
         self,
         messages: list[dict[str, str]],
@@ -252,6 +235,8 @@ class GroqProvider(LLMProvider):
 class OllamaProvider(LLMProvider):
     """Ollama (self-hosted) provider."""
 
+    name = "ollama"
+
     async def generate_stream(
         self,
         messages: list[dict[str, str]],
@@ -324,13 +309,18 @@ class LLMWorker:
         self._tasks: set[asyncio.Task] = set()
         self._worker_id = f"llm-{uuid.uuid4().hex[:8]}"
 
+        self._transport = LLMTransport(TransportConfig.from_settings(settings.LLM_WORKER))
         self._providers: dict[str, LLMProvider] = {}
-        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._circuit_breakers: dict[str, SharedCircuitBreaker] = {}
         self._provider_priority = settings.LLM_WORKER["PROVIDER_PRIORITY"]
+        self._router = LatencyRouter(RoutingConfig.from_settings(settings.LLM_WORKER))
+        self._cache: Optional[LLMResponseCache] = None
 
         self._requests_total = 0
         self._requests_failed = 0
         self._tokens_generated = 0
+        self._hedges_total = 0
+        self._hedges_won = 0
 
     async def start(self) -> None:
         """
@@ -339,6 +329,7 @@ class LLMWorker:
         """
         logger.info("Starting LLM worker", extra={"worker_id": self._worker_id})
         await self._redis.connect()
+        self._cache = build_llm_cache(self._redis.client)
         await self._init_providers()
         await self._ensure_consumer_group()
         self._running = True
@@ -357,6 +348,8 @@ class LLMWorker:
 
         for provider in self._providers.values():
             await provider.stop()
+        http_pools = self._transport.stats()
+        await self._transport.aclose()
 
         await self._redis.disconnect()
         logger.info(
@@ -366,14 +359,23 @@ class LLMWorker:
                 "requests_total": self._requests_total,
                 "requests_failed": self._requests_failed,
                 "tokens_generated": self._tokens_generated,
+                "http_pools": http_pools,
+                "hedges_total": self._hedges_total,
+                "hedges_won": self._hedges_won,
+                "routes": self._router.stats(),
+                **(self._cache.stats() if self._cache else {}),
             },
         )
 
     async def _init_providers(self) -> None:
         """
         Initializes and starts all configured LLM providers and their
-        associated circuit breakers based on the provider priority.
+        associated circuit breakers based on the provider priority, then
+        opens a pooled connection to each configured provider when
+        LLM_HTTP_PRECONNECT is set. With LLM_CIRCUIT_BREAKER_SHARED, circuit
+        state is kept in Redis and shared with every LLM worker.
         """
+        config = settings.LLM_WORKER
         provider_map = {
             "openai": OpenAIProvider,
             "groq": GroqProvider,
@@ -384,15 +386,23 @@ class LLMWorker:
             provider_cls = provider_map.get(name)
             if not provider_cls:
                 continue
-            provider = provider_cls()
+            provider = provider_cls(self._transport)
             await provider.start()
             self._providers[name] = provider
-            self._circuit_breakers[name] = CircuitBreaker(
-                threshold=settings.LLM_WORKER["CIRCUIT_BREAKER_THRESHOLD"],
-                timeout=settings.LLM_WORKER["CIRCUIT_BREAKER_TIMEOUT"],
+            self._circuit_breakers[name] = SharedCircuitBreaker(
+                self._redis.client if config["CIRCUIT_BREAKER_SHARED"] else None,
+                name,
+                threshold=config["CIRCUIT_BREAKER_THRESHOLD"],
+                timeout=config["CIRCUIT_BREAKER_TIMEOUT"],
+                probe_timeout=config["CIRCUIT_BREAKER_PROBE_TIMEOUT"],
             )
             logger.info("LLM provider initialized", extra={"provider": name})
 
+        if self._transport.config.preconnect:
+            await self._transport.preconnect(
+                provider.base_url for provider in self._providers.values() if provider.configured
+            )
+
     async def _ensure_consumer_group(self) -> None:
         """
         Ensures the Redis consumer group for LLM requests exists.
@@ -453,15 +463,22 @@ class LLMWorker:
         Processes a single LLM request message from the Redis stream.
 
         This method extracts request parameters, calls the LLM provider
-        (with failover), and publishes the streaming response.
+        (with failover), and publishes the streaming response. Tokens are
+        coalesced into batches (see `TokenCoalescer`); the last batch, the
+        completion and the acknowledgement go out in one pipeline.
+        Requests may carry `tenant_id`, `temperature` and `max_tokens`;
+        the sampling settings default to LLM_TEMPERATURE and LLM_MAX_TOKENS.
         """
         session_id = data.get("session_id", "")
+        tenant_id = data.get("tenant_id", "")
         messages_json = data.get("messages", "[]")
         provider_name = data.get("provider", settings.LLM_WORKER["DEFAULT_PROVIDER"])
         model = data.get("model", settings.LLM_WORKER["DEFAULT_MODEL"])
         correlation_id = data.get("correlation_id", "")
 
         start_time = time.time()
+        coalescer = TokenCoalescer.from_settings(settings.LLM_WORKER)
+        parts: list[str] = []
 
         try:
             messages = (
@@ -469,24 +486,30 @@ class LLMWorker:
                 if isinstance(messages_json, str)
                 else messages_json
             )
+            temperature = float(data.get("temperature", settings.LLM_WORKER["TEMPERATURE"]))
+            max_tokens = int(data.get("max_tokens", settings.LLM_WORKER["MAX_TOKENS"]))
 
-            full_response = ""
-            async for token in self._generate_with_failover(
-                messages=messages,
-                preferred_provider=provider_name,
-                model=model,
+            async for text in coalesce(
+                self._generate(
+                    tenant_id=tenant_id,
+                    messages=messages,
+                    preferred_provider=provider_name,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
+                coalescer,
             ):
-                full_response += token
-                self._tokens_generated += 1
-                await self._publish_token(session_id, token, correlation_id)
+                parts.append(text)
+                await self._publish_token(session_id, text, correlation_id)
 
-            await self._publish_completion(session_id, full_response, correlation_id)
-
-            await self._redis.client.xack(
-                settings.LLM_WORKER["STREAM_REQUESTS"],
-                settings.LLM_WORKER["GROUP_WORKERS"],
-                message_id,
-            )
+            final = []
+            if tail := coalescer.flush():
+                parts.append(tail)
+                final.append(self._token_message(session_id, tail, correlation_id))
+            full_response = "".join(parts)
+            final.append(self._completion_message(session_id, full_response, correlation_id))
+            await self._finish(message_id, session_id, correlation_id, final)
 
             self._requests_total += 1
             duration = time.time() - start_time
@@ -495,6 +518,8 @@ class LLMWorker:
                 extra={
                     "session_id": session_id,
                     "response_length": len(full_response),
+                    "tokens": coalescer.tokens_total,
+                    "messages": len(parts) + 1,
                     "duration_ms": int(duration * 1000),
                 },
             )
@@ -506,65 +531,215 @@ class LLMWorker:
                 extra={"session_id": session_id, "error": str(exc)},
                 exc_info=True,
             )
-            await self._publish_error(session_id, str(exc), correlation_id)
-            await self._redis.client.xack(
-                settings.LLM_WORKER["STREAM_REQUESTS"],
-                settings.LLM_WORKER["GROUP_WORKERS"],
-                message_id,
+            final = []
+            if tail := coalescer.flush():
+                final.append(self._token_message(session_id, tail, correlation_id))
+            final.append(self._error_message(session_id, str(exc), correlation_id))
+            await self._finish(message_id, session_id, correlation_id, final)
+        finally:
+            self._tokens_generated += coalescer.tokens_total
+
+    async def _generate(
+        self,
+        tenant_id: str,
+        messages: list[dict[str, str]],
+        preferred_provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Streams a response from the response cache or the providers.
+
+        With LLM_CACHE_ENABLED, a temperature-0 request of a tenant that
+        opted in is answered from the cache when an identical request was
+        answered before, replaying the cached tokens as a stream. Otherwise
+        the response is generated with failover and, if cacheable, stored
+        once it is complete. A response that failed over in the middle of
+        its stream joins the output of two providers and is not stored.
+        """
+        key = None
+        if (
+            self._cache is not None
+            and deterministic(temperature)
+            and await tenant_opted_in(tenant_id)
+        ):
+            key = response_key(
+                tenant_id,
+                preferred_provider,
+                model,
+                messages,
+                sampling={"temperature": temperature, "max_tokens": max_tokens},
+                variant="stream",
             )
+            cached = await self._cache.get(key)
+            if cached is not None:
+                async for token in replay(cached["tokens"]):
+                    yield token
+                return
+
+        tokens: list[str] = []
+        streamed: list[str] = []
+        async for token in self._generate_with_failover(
+            messages, preferred_provider, model, temperature, max_tokens, streamed
+        ):
+            tokens.append(token)
+            yield token
+
+        if key is not None and len(streamed) == 1:
+            # Stored in the background so the end of the response is not delayed.
+            task = asyncio.create_task(
+                self._cache.put(
+                    tenant_id, key, {"tokens": tokens}, sum(len(token) for token in tokens)
+                )
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
 
     async def _generate_with_failover(
         self,
         messages: list[dict[str, str]],
         preferred_provider: str,
         model: str,
+        temperature: float,
+        max_tokens: int,
+        streamed: Optional[list[str]] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Attempts to generate an LLM response, with failover to alternative
         providers if the preferred one fails or its circuit breaker is open.
+        Each provider whose answer starts streaming is appended to
+        `streamed`, so a caller can tell a response that failed over midway.
+
+        Providers are tried in the router's order: with LLM_ROUTING=latency
+        the fastest healthy provider goes first and the preferred provider
+        only breaks ties. With LLM_HEDGE_ENABLED, the next provider is
+        started when the first has not produced a token by its hedge
+        deadline, and the first of the two to answer is streamed.
         """
         providers_to_try = [preferred_provider] + [
             name for name in self._provider_priority if name != preferred_provider
         ]
+        remaining = deque(self._router.order(providers_to_try, model))
 
-        last_error: Optional[Exception] = None
-        for provider_name in providers_to_try:
-            provider = self._providers.get(provider_name)
-            circuit = self._circuit_breakers.get(provider_name)
-            if not provider or not circuit:
-                continue
-            if not circuit.can_execute():
-                continue
+        def open_stream(provider_name: str) -> AsyncIterator[str]:
+            return self._providers[provider_name].generate_stream(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
 
-            try:
-                async for token in provider.generate_stream(
-                    messages=messages,
-                    model=model,
-                    max_tokens=settings.LLM_WORKER["MAX_TOKENS"],
-                    temperature=settings.LLM_WORKER["TEMPERATURE"],
-                ):
-                    yield token
+        # Circuit admissions held by this request, returned if left unused.
+        permits: dict[str, Permit] = {}
+        last_error: Optional[Exception] = None
+        try:
+            while (primary := await self._next_provider(remaining, permits)) is not None:
+                hedge = None
+                if self._router.config.hedge:
+                    hedge = await self._next_provider(remaining, permits)
+                try:
+                    result = await race(
+                        primary, hedge, open_stream, self._router.hedge_delay(primary, model)
+                    )
+                except RaceFailed as exc:
+                    for provider_name, error in exc.failures:
+                        await self._record_failure(provider_name, model, error, permits)
+                        last_error = error
+                    continue
 
-                circuit.record_success()
-                return
+                for provider_name, error in result.failures:
+                    await self._record_failure(provider_name, model, error, permits)
+                    last_error = error
+                for provider_name, elapsed in result.abandoned:
+                    self._router.record_slow(provider_name, model, elapsed)
+                    self._hedges_won += provider_name == primary
+                    await self._circuit_breakers[provider_name].release(
+                        permits.pop(provider_name)
+                    )
+                if result.unused:
+                    remaining.appendleft(result.unused)
+                if hedge and result.unused is None:
+                    self._hedges_total += 1
+
+                provider_name = result.winner.name
+                self._router.record_ttft(provider_name, model, result.ttft)
+                if streamed is not None:
+                    streamed.append(provider_name)
+                try:
+                    async for token in result.tokens():
+                        yield token
+                except Exception as exc:
+                    await self._record_failure(provider_name, model, exc, permits)
+                    last_error = exc
+                    continue
 
-            except Exception as exc:
-                circuit.record_failure()
-                last_error = exc
-                logger.warning(
-                    "Provider failed",
-                    extra={"provider": provider_name, "error": str(exc)},
+                await self._circuit_breakers[provider_name].record_success(
+                    permits.pop(provider_name)
                 )
-                continue
+                return
+        finally:
+            for provider_name, permit in permits.items():
+                await self._circuit_breakers[provider_name].release(permit)
 
         raise RuntimeError(f"All LLM providers failed. Last error: {last_error}")
 
-    async def _publish_token(
-        self, session_id: str, token: str, correlation_id: str
+    async def _next_provider(
+        self, remaining: deque[str], permits: dict[str, Permit]
+    ) -> Optional[str]:
+        """
+        Takes the next provider whose circuit admits the request.
+
+        A provider whose permit the request already holds, such as a hedge
+        that was not started, is taken without asking its circuit again.
+        """
+        while remaining:
+            provider_name = remaining.popleft()
+            circuit = self._circuit_breakers.get(provider_name)
+            if provider_name not in self._providers or circuit is None:
+                continue
+            if provider_name in permits:
+                return provider_name
+            if permit := await circuit.acquire():
+                permits[provider_name] = permit
+                return provider_name
+        return None
+
+    async def _record_failure(
+        self,
+        provider_name: str,
+        model: str,
+        error: Exception,
+        permits: dict[str, Permit],
+    ) -> None:
+        """Records a provider failure in its circuit breaker and the router."""
+        await self._circuit_breakers[provider_name].record_failure(permits.pop(provider_name))
+        self._router.record_failure(provider_name, model)
+        logger.warning(
+            "Provider failed",
+            extra={"provider": provider_name, "error": str(error)},
+        )
+
+    def _send(
+        self, pipe: Any, session_id: str, correlation_id: str, messages: list[str]
     ) -> None:
-        """Publishes a single LLM response token to the appropriate Redis channel."""
-        channel = f"{settings.LLM_WORKER['RESPONSE_CHANNEL']}:{session_id}"
-        message = json.dumps(
+        """Queues messages for the session's channel and the response's replay stream."""
+        channel = self._channel(session_id)
+        replay = replay_stream(channel, correlation_id)
+        for message in messages:
+            pipe.publish(channel, message)
+            pipe.xadd(replay, {"data": message}, maxlen=REPLAY_MAXLEN)
+        pipe.expire(replay, REPLAY_TTL_SECONDS)
+
+    @staticmethod
+    def _channel(session_id: str) -> str:
+        """Returns the response channel of a session."""
+        return f"{settings.LLM_WORKER['RESPONSE_CHANNEL']}:{session_id}"
+
+    @staticmethod
+    def _token_message(session_id: str, token: str, correlation_id: str) -> str:
+        """Builds the message carrying a batch of response tokens."""
+        return json.dumps(
             {
                 "type": "llm.token",
                 "session_id": session_id,
@@ -573,17 +748,11 @@ class LLMWorker:
                 "timestamp": time.time(),
             }
         )
-        await self._redis.publish(channel, message)
 
-    async def _publish_completion(
-        self,
-        session_id: str,
-        text: str,
-        correlation_id: str,
-    ) -> None:
-        """Publishes the final completed LLM response to the appropriate Redis channel."""
-        channel = f"{settings.LLM_WORKER['RESPONSE_CHANNEL']}:{session_id}"
-        message = json.dumps(
+    @staticmethod
+    def _completion_message(session_id: str, text: str, correlation_id: str) -> str:
+        """Builds the message carrying the completed response."""
+        return json.dumps(
             {
                 "type": "llm.completed",
                 "session_id": session_id,
@@ -592,14 +761,11 @@ class LLMWorker:
                 "timestamp": time.time(),
             }
         )
-        await self._redis.publish(channel, message)
 
-    async def _publish_error(
-        self, session_id: str, error: str, correlation_id: str
-    ) -> None:
-        """Publishes an error message to the appropriate Redis channel if an LLM request fails."""
-        channel = f"{settings.LLM_WORKER['RESPONSE_CHANNEL']}:{session_id}"
-        message = json.dumps(
+    @staticmethod
+    def _error_message(session_id: str, error: str, correlation_id: str) -> str:
+        """Builds the message reporting a failed request."""
+        return json.dumps(
             {
                 "type": "llm.failed",
                 "session_id": session_id,
@@ -608,7 +774,38 @@ class LLMWorker:
                 "timestamp": time.time(),
             }
         )
-        await self._redis.publish(channel, message)
+
+    async def _publish_token(
+        self, session_id: str, token: str, correlation_id: str
+    ) -> None:
+        """
+        Publishes a batch of LLM response tokens to the session's channel
+        and appends it to the response's replay stream.
+        """
+        pipe = self._redis.client.pipeline(transaction=False)
+        self._send(
+            pipe,
+            session_id,
+            correlation_id,
+            [self._token_message(session_id, token, correlation_id)],
+        )
+        await pipe.execute()
+
+    async def _finish(
+        self, message_id: str, session_id: str, correlation_id: str, messages: list[str]
+    ) -> None:
+        """
+        Publishes the closing messages of a response and acknowledges its
+        request in a single round trip.
+        """
+        pipe = self._redis.client.pipeline(transaction=False)
+        self._send(pipe, session_id, correlation_id, messages)
+        pipe.xack(
+            settings.LLM_WORKER["STREAM_REQUESTS"],
+            settings.LLM_WORKER["GROUP_WORKERS"],
+            message_id,
+        )
+        await pipe.execute()
 
 
 class Command(BaseCommand):
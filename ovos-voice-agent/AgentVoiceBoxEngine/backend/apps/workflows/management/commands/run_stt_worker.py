@@ -1,53 +1,221 @@
 """
 Run the STT worker for realtime sessions.
+
+With STT_WORKER_PROCESSES > 1 (or --processes) the command runs as a
+supervisor that forks pinned inference processes sharing one consumer group.
 """
 
 from __future__ import annotations
 
 import asyncio
 import base64
+import functools
 import io
 import json
 import logging
+import os
 import signal
 import time
 import uuid
-from typing import Any, Optional
+from dataclasses import dataclass
+from typing import Any, Optional, Union
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import connections
 
+from apps.tenants.models import TenantSettings
+from apps.workflows.audio_processing import (
+    PCMFormat,
+    VADConfig,
+    VoiceActivityDetector,
+    extract_speech,
+    pcm_to_float32,
+    resample,
+)
+from apps.workflows.batching import MicroBatcher
+from apps.workflows.language_cache import SessionLanguageCache
+from apps.workflows.model_registry import get_model_registry, warmup_models, whisper_key
 from apps.workflows.redis_client import RedisClient
+from apps.workflows.stt_batch import cancel_key, longform_stream, result_key
+from apps.workflows.stt_streaming import (
+    HypothesisSegment,
+    StreamingSession,
+    StreamingUpdate,
+)
+from apps.workflows.supervisor import WorkerSupervisor
+from apps.workflows.transcription_cache import (
+    TranscriptionCache,
+    build_transcription_cache,
+    cacheable,
+    transcription_key,
+)
 
 logger = logging.getLogger(__name__)
 
 try:
-    from faster_whisper import WhisperModel
+    import ctranslate2
+    from faster_whisper import WhisperModel, download_model
+    from faster_whisper.tokenizer import Tokenizer
 except ImportError as exc:  # pragma: no cover
     raise ImportError("faster-whisper is required for STT worker") from exc
 
 try:
     import numpy as np
-    import soundfile as sf
 except ImportError as exc:  # pragma: no cover
-    raise ImportError("numpy and soundfile are required for STT worker") from exc
+    raise ImportError("numpy is required for STT worker") from exc
+
+try:
+    import soundfile as sf
+except ImportError:  # pragma: no cover - only needed for container payloads
+    sf = None
+
+# Beam size used for both the batched and the single-pass decode.
+BEAM_SIZE = 5
+
+# Whisper's standard no-speech rule: drop the hypothesis when the model is
+# confident there is no speech and the decode itself is unlikely.
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+# Seconds per Whisper timestamp token.
+TIMESTAMP_PRECISION = 0.02
+
+# Seconds a tenant's VAD setting is cached before it is read again.
+TENANT_SETTINGS_TTL = 60
+
+# Chunks kept in a worker's direct stream.
+DIRECT_STREAM_MAXLEN = 10000
+
+# KEYS[1]: session owner key, KEYS[2]: the owner's direct stream.
+# ARGV: owner worker ID, max stream length, then the chunk's field/value pairs.
+# Forwards the chunk only while the owner holds the session and its stream
+# exists; a session of a worker that is gone is released. Returns 1 if forwarded.
+FORWARD_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], '*', unpack(ARGV, 3))
+return 1
+"""
+
+# KEYS[1]: this worker's direct stream, KEYS[2]: shared audio stream,
+# KEYS[3..]: owner keys of its sessions. ARGV: worker ID, consumer group,
+# max stream length. Releases the sessions still held, moves chunks that were
+# not processed (pending or never delivered) to the shared stream and deletes
+# the direct stream, in one step so no forwarded chunk is lost in between.
+# Returns the number of moved chunks.
+RELEASE_SCRIPT = """
+for i = 3, #KEYS do
+    if redis.call('GET', KEYS[i]) == ARGV[1] then
+        redis.call('DEL', KEYS[i])
+    end
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local last = '0-0'
+for _, group in ipairs(redis.call('XINFO', 'GROUPS', KEYS[1])) do
+    local fields = {}
+    for i = 1, #group, 2 do
+        fields[group[i]] = group[i + 1]
+    end
+    if fields['name'] == ARGV[2] then
+        last = fields['last-delivered-id']
+    end
+end
+local entries = {}
+for _, pending in ipairs(redis.call('XPENDING', KEYS[1], ARGV[2], '-', '+', ARGV[3])) do
+    for _, entry in ipairs(redis.call('XRANGE', KEYS[1], pending[1], pending[1])) do
+        table.insert(entries, entry)
+    end
+end
+for _, entry in ipairs(redis.call('XRANGE', KEYS[1], '(' .. last, '+')) do
+    table.insert(entries, entry)
+end
+for _, entry in ipairs(entries) do
+    redis.call('XADD', KEYS[2], '*', unpack(entry[2]))
+end
+redis.call('DEL', KEYS[1])
+return #entries
+"""
+
+
+@dataclass
+class TranscriptionJob:
+    """
+    A decoded audio chunk waiting for a batched Whisper pass.
+
+    Attributes:
+        audio: Float32 audio at the worker sample rate.
+        language: Language to decode in, or None to detect it.
+        with_timestamps: Whether segment timestamps are needed.
+        vad_filtered: Whether non-speech was already dropped by the server-side VAD.
+        vad_filter: Whether Whisper's own VAD filter must drop non-speech; such
+            jobs are decoded on their own, as the batched pass has no VAD.
+    """
+
+    audio: np.ndarray
+    language: Optional[str]
+    with_timestamps: bool = False
+    vad_filtered: bool = False
+    vad_filter: bool = False
+
+
+@dataclass
+class DecodeResult:
+    """Text, language and confidence of one decoded job, with segments if requested."""
+
+    text: str
+    language: str
+    confidence: float
+    segments: list[HypothesisSegment]
+    language_probability: float = 1.0
+
+
+TranscriptionOutcome = Union[DecodeResult, Exception]
 
 
 class STTWorker:
     """Speech-to-Text worker using Faster-Whisper."""
 
-    def __init__(self) -> None:
-        """Initializes the STT worker with Redis client, Whisper model, and internal state."""
+    def __init__(self, model_path: Optional[str] = None) -> None:
+        """
+        Initializes the STT worker with Redis client, Whisper model, and internal state.
+
+        Args:
+            model_path: Local model directory resolved by the supervisor; the
+                        configured model name is used when not given.
+        """
         self._redis = RedisClient()
+        self._model_path = model_path
         self._model: Optional[WhisperModel] = None
         self._running = False
         self._tasks: set[asyncio.Task] = set()
         self._semaphore: Optional[asyncio.Semaphore] = None
+        self._batcher: Optional[MicroBatcher[TranscriptionJob, TranscriptionOutcome]] = None
+        self._tokenizers: dict[Optional[str], Tokenizer] = {}
+        self._streams: dict[str, StreamingSession] = {}
+        self._stream_tails: dict[str, asyncio.Task] = {}
+        self._forward_chunk = None
+        self._hand_over = None
+        self._vad_config: Optional[VADConfig] = None
+        self._tenant_vad: dict[str, tuple[bool, float]] = {}
+        self._languages: Optional[SessionLanguageCache] = None
+        self._transcripts: Optional[TranscriptionCache] = None
+        self._model_id = ""
         self._worker_id = f"stt-{uuid.uuid4().hex[:8]}"
 
         self._transcriptions_total = 0
         self._transcriptions_failed = 0
         self._total_audio_seconds = 0.0
+        self._vad_skipped_total = 0
+        self._longform_active = 0
+        self._longform_total = 0
 
     async def start(self) -> None:
         """
@@ -55,8 +223,35 @@ class STTWorker:
         and ensuring the consumer group exists.
         """
         await self._redis.connect()
-        self._semaphore = asyncio.Semaphore(settings.STT_WORKER["BATCH_SIZE"])
+        self._forward_chunk = self._redis.client.register_script(FORWARD_SCRIPT)
+        self._hand_over = self._redis.client.register_script(RELEASE_SCRIPT)
+        self._languages = SessionLanguageCache(
+            self._redis.client,
+            ttl=settings.STT_WORKER["LANGUAGE_PIN_TTL"],
+            min_probability=settings.STT_WORKER["LANGUAGE_MIN_PROBABILITY"],
+            detect_seconds=settings.STT_WORKER["LANGUAGE_DETECT_SECONDS"],
+            redetect_confidence=settings.STT_WORKER["LANGUAGE_REDETECT_CONFIDENCE"],
+        )
+        self._transcripts = build_transcription_cache(self._redis.client)
+        batch_size = settings.STT_WORKER["BATCH_SIZE"]
+        # Allow one batch to fill while the previous one is being decoded.
+        self._semaphore = asyncio.Semaphore(batch_size * 2)
         self._load_model()
+        self._vad_config = VADConfig(
+            sample_rate=settings.STT_WORKER["SAMPLE_RATE"],
+            frame_ms=settings.STT_WORKER["VAD_FRAME_MS"],
+            energy_threshold_db=settings.STT_WORKER["VAD_ENERGY_THRESHOLD_DB"],
+            min_speech_ms=settings.STT_WORKER["VAD_MIN_SPEECH_MS"],
+            hangover_ms=settings.STT_WORKER["VAD_HANGOVER_MS"],
+        )
+        self._batcher = MicroBatcher(
+            self._transcribe_batch,
+            max_batch_size=batch_size,
+            max_wait_seconds=settings.STT_WORKER["BATCH_MAX_WAIT_MS"] / 1000,
+            name="stt-batcher",
+            concurrency=settings.STT_WORKER["NUM_WORKERS"],
+        )
+        await self._batcher.start()
         await self._ensure_consumer_group()
         self._running = True
         logger.info("STT worker started", extra={"worker_id": self._worker_id})
@@ -69,6 +264,13 @@ class STTWorker:
         self._running = False
         if self._tasks:
             await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._release_stream_sessions()
+        batch_metrics = {}
+        if self._batcher:
+            await self._batcher.stop()
+            batch_metrics = self._batcher.metrics.snapshot()
+        if self._transcripts:
+            batch_metrics.update(self._transcripts.stats())
         await self._redis.disconnect()
         logger.info(
             "STT worker stopped",
@@ -77,37 +279,34 @@ class STTWorker:
                 "transcriptions_total": self._transcriptions_total,
                 "transcriptions_failed": self._transcriptions_failed,
                 "total_audio_seconds": self._total_audio_seconds,
+                "vad_skipped_total": self._vad_skipped_total,
+                "longform_chunks_total": self._longform_total,
+                **batch_metrics,
             },
         )
 
     def _load_model(self) -> None:
         """
-        Loads the Faster-Whisper model into memory.
+        Loads the Faster-Whisper model through the process-wide model registry.
 
-        Determines the appropriate device (CUDA or CPU) and compute type
-        based on settings and hardware availability.
+        The registry resolves the device and compute type from settings; on
+        CPU, intra-op threads default to the CPUs this process is allowed to
+        run on divided by the number of model replicas, so pinned processes
+        do not oversubscribe. Models listed in MODEL_REGISTRY_WARMUP are
+        loaded as well.
         """
-        device = settings.STT_WORKER["DEVICE"]
-        if device == "auto":
-            try:
-                import torch
-
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-            except ImportError:
-                device = "cpu"
-
-        compute_type = settings.STT_WORKER["COMPUTE_TYPE"]
-        if device == "cpu" and compute_type == "float16":
-            compute_type = "int8"
-
-        self._model = WhisperModel(
-            settings.STT_WORKER["MODEL"],
-            device=device,
-            compute_type=compute_type,
-        )
+        key = whisper_key(self._model_path)
+        self._model = get_model_registry().get(key)
+        self._model_id = f"{settings.STT_WORKER['MODEL']}/{key.compute_type}"
+        warmup_models()
         logger.info(
             "Whisper model loaded",
-            extra={"model": settings.STT_WORKER["MODEL"], "device": device},
+            extra={
+                "model": settings.STT_WORKER["MODEL"],
+                "device": key.device,
+                "compute_type": key.compute_type,
+                "num_workers": settings.STT_WORKER["NUM_WORKERS"],
+            },
         )
 
     async def _ensure_consumer_group(self) -> None:
@@ -116,46 +315,87 @@ class STTWorker:
         Creates the group if it does not already exist.
         """
         client = self._redis.client
-        stream = settings.STT_WORKER["STREAM_AUDIO"]
         group = settings.STT_WORKER["GROUP_WORKERS"]
 
-        try:
-            await client.xgroup_create(stream, group, id="0", mkstream=True)
-            logger.info("Created consumer group", extra={"group": group})
-        except Exception as exc:
-            if "BUSYGROUP" not in str(exc):
-                logger.warning(
-                    "Failed to create consumer group", extra={"error": str(exc)}
-                )
+        for stream in (
+            settings.STT_WORKER["STREAM_AUDIO"],
+            self._direct_stream,
+            longform_stream(),
+        ):
+            try:
+                await client.xgroup_create(stream, group, id="0", mkstream=True)
+                logger.info("Created consumer group", extra={"group": group, "stream": stream})
+            except Exception as exc:
+                if "BUSYGROUP" not in str(exc):
+                    logger.warning(
+                        "Failed to create consumer group", extra={"error": str(exc)}
+                    )
+
+    @property
+    def _direct_stream(self) -> str:
+        """Per-worker stream receiving chunks of streaming sessions this worker owns."""
+        return f"{settings.STT_WORKER['STREAM_AUDIO']}:{self._worker_id}"
+
+    @property
+    def _longform_capacity(self) -> int:
+        """
+        Long-form chunks this worker can take now.
+
+        Long-form chunks only use idle capacity: none are taken while live
+        audio is being processed.
+        """
+        if len(self._tasks) > self._longform_active:
+            return 0
+        return max(0, settings.STT_WORKER["LONGFORM_CONCURRENCY"] - self._longform_active)
 
     async def run(self) -> None:
         """
         Main loop of the STT worker, continuously reading and processing
         audio chunks from the Redis stream.
+
+        When the worker has no live work, the long-form stream is read as
+        well, after checking that no live audio is waiting.
         """
         client = self._redis.client
         stream = settings.STT_WORKER["STREAM_AUDIO"]
         group = settings.STT_WORKER["GROUP_WORKERS"]
+        live_streams = {stream: ">", self._direct_stream: ">"}
 
         while self._running:
             try:
-                messages = await client.xreadgroup(
-                    group,
-                    self._worker_id,
-                    {stream: ">"},
-                    count=settings.STT_WORKER["BATCH_SIZE"],
-                    block=1000,
-                )
+                messages = None
+                capacity = self._longform_capacity
+                if capacity:
+                    messages = await client.xreadgroup(
+                        group,
+                        self._worker_id,
+                        live_streams,
+                        count=settings.STT_WORKER["BATCH_SIZE"],
+                    )
+                    if not messages:
+                        messages = await client.xreadgroup(
+                            group,
+                            self._worker_id,
+                            {**live_streams, longform_stream(): ">"},
+                            count=capacity,
+                            block=1000,
+                        )
+                else:
+                    messages = await client.xreadgroup(
+                        group,
+                        self._worker_id,
+                        live_streams,
+                        count=settings.STT_WORKER["BATCH_SIZE"],
+                        block=1000,
+                    )
                 if not messages:
+                    self._prune_stream_sessions()
+                    self._languages.prune_local()
                     continue
 
-                for _, stream_messages in messages:
+                for source_stream, stream_messages in messages:
                     for message_id, data in stream_messages:
-                        task = asyncio.create_task(
-                            self._process_message(message_id, data)
-                        )
-                        self._tasks.add(task)
-                        task.add_done_callback(self._tasks.discard)
+                        self._schedule_message(message_id, data, source_stream)
 
             except asyncio.CancelledError:
                 break
@@ -165,16 +405,59 @@ class STTWorker:
                 )
                 await asyncio.sleep(1)
 
-    async def _process_message(self, message_id: str, data: dict[str, Any]) -> None:
+    def _schedule_message(self, message_id: str, data: dict[str, Any], stream: str) -> None:
+        """
+        Starts processing a message read from an audio stream.
+
+        Chunks of one streaming session are processed one at a time, in the
+        order they were read: each waits for the previous chunk of its
+        session before doing anything else.
+        """
+        previous = None
+        session_id = data.get("session_id", "")
+        streamed = data.get("stream") == "1"
+        if streamed:
+            previous = self._stream_tails.get(session_id)
+        task = asyncio.create_task(self._process_message(message_id, data, stream, previous))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if streamed:
+            self._stream_tails[session_id] = task
+            task.add_done_callback(functools.partial(self._drop_stream_tail, session_id))
+
+    def _drop_stream_tail(self, session_id: str, task: asyncio.Task) -> None:
+        """Forgets the last chunk task of a session once it is done."""
+        if self._stream_tails.get(session_id) is task:
+            del self._stream_tails[session_id]
+
+    async def _process_message(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: Optional[str] = None,
+        previous: Optional[asyncio.Task] = None,
+    ) -> None:
         """
         Processes a single audio chunk message from the Redis stream.
 
         This method transcribes the audio, publishes the result, and acknowledges
-        the message in the stream.
+        the message in the stream. Messages with `stream=1` are routed to the
+        incremental streaming path instead, after `previous`, the task of the
+        session's preceding chunk, has finished.
         """
         if not self._semaphore:
             return
 
+        stream = stream or settings.STT_WORKER["STREAM_AUDIO"]
+        if data.get("stream") == "1":
+            if previous is not None:
+                await asyncio.wait({previous})
+            await self._process_stream_chunk(message_id, data, stream)
+            return
+        if data.get("type") == "longform":
+            await self._process_longform_chunk(message_id, data, stream)
+            return
+
         async with self._semaphore:
             session_id = data.get("session_id", "")
             correlation_id = data.get("correlation_id", "")
@@ -189,6 +472,9 @@ class STTWorker:
                 text, language, confidence = await self._transcribe(
                     audio_bytes,
                     language_hint=data.get("language") or None,
+                    vad_enabled=await self._vad_enabled(data.get("tenant_id")),
+                    pcm_format=PCMFormat.from_fields(data),
+                    session_id=session_id,
                 )
 
                 await self._publish_result(
@@ -200,9 +486,7 @@ class STTWorker:
                 )
 
                 await self._redis.client.xack(
-                    settings.STT_WORKER["STREAM_AUDIO"],
-                    settings.STT_WORKER["GROUP_WORKERS"],
-                    message_id,
+                    stream, settings.STT_WORKER["GROUP_WORKERS"], message_id
                 )
 
                 self._transcriptions_total += 1
@@ -226,22 +510,374 @@ class STTWorker:
                 )
                 await self._publish_error(session_id, str(exc), correlation_id)
                 await self._redis.client.xack(
+                    stream, settings.STT_WORKER["GROUP_WORKERS"], message_id
+                )
+
+    async def _process_longform_chunk(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: str,
+    ) -> None:
+        """
+        Transcribes one chunk of a long recording (see `apps.workflows.stt_batch`).
+
+        The chunk is decoded with timestamps through the micro-batcher and
+        its segments, or its error, are pushed to the chunk's result key as
+        JSON. Chunks of a cancelled job are acknowledged without decoding.
+        """
+        job_id = data.get("job_id", "")
+        index = int(data.get("index", 0))
+        self._longform_active += 1
+        try:
+            async with self._semaphore:
+                if await self._redis.client.exists(cancel_key(job_id)):
+                    await self._redis.client.xack(
+                        stream, settings.STT_WORKER["GROUP_WORKERS"], message_id
+                    )
+                    return
+
+                try:
+                    audio_data = self._decode_audio(
+                        base64.b64decode(data.get("audio", "")), PCMFormat.from_fields(data)
+                    )
+                    sample_rate = settings.STT_WORKER["SAMPLE_RATE"]
+                    self._total_audio_seconds += len(audio_data) / sample_rate
+                    result = await self._batcher.submit(
+                        TranscriptionJob(
+                            audio_data, data.get("language") or None, with_timestamps=True
+                        )
+                    )
+                    payload = {
+                        "segments": [
+                            [segment.start, segment.end, segment.text]
+                            for segment in result.segments
+                        ],
+                        "language": result.language,
+                        "confidence": result.confidence,
+                    }
+                    self._longform_total += 1
+                except Exception as exc:
+                    self._transcriptions_failed += 1
+                    logger.error(
+                        "Long-form chunk failed",
+                        extra={"job_id": job_id, "index": index, "error": str(exc)},
+                    )
+                    payload = {"error": str(exc)}
+
+                key = result_key(job_id, index)
+                async with self._redis.client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(key, json.dumps(payload))
+                    pipe.expire(key, settings.STT_WORKER["LONGFORM_RESULT_TTL"])
+                    await pipe.execute()
+                await self._redis.client.xack(
+                    stream, settings.STT_WORKER["GROUP_WORKERS"], message_id
+                )
+        finally:
+            self._longform_active -= 1
+
+    async def _process_stream_chunk(
+        self, message_id: str, data: dict[str, Any], stream: str
+    ) -> None:
+        """
+        Processes one chunk of a streaming session.
+
+        The chunk is appended to the session's rolling buffer. Once enough new
+        audio has arrived the buffer is re-decoded, agreed words are committed
+        and published as a `transcription.partial` delta. A chunk flagged
+        `is_final=1` ends the utterance and publishes `transcription.completed`.
+        Chunks of sessions owned by another worker are forwarded to it; if
+        that worker released the session meanwhile, the chunk claims it again.
+        Forwarded chunks can overtake or trail chunks read directly, so
+        producers number each session's chunks from 0 in a `seq` field and
+        the session processes them in that order; chunks without `seq` are
+        processed as they arrive.
+
+        When VAD is enabled for the tenant only speech reaches the buffer,
+        `speech_started`/`speech_stopped` events are published and each
+        utterance is completed at end-of-speech; `is_final=1` then only
+        completes an utterance that is still open.
+        """
+        session_id = data.get("session_id", "")
+        correlation_id = data.get("correlation_id", "")
+        group = settings.STT_WORKER["GROUP_WORKERS"]
+
+        try:
+            owner = await self._claim_stream_session(session_id)
+            while owner != self._worker_id:
+                fields = [item for pair in data.items() for item in pair]
+                if await self._forward_chunk(
+                    keys=[
+                        self._owner_key(session_id),
+                        f"{settings.STT_WORKER['STREAM_AUDIO']}:{owner}",
+                    ],
+                    args=[owner, DIRECT_STREAM_MAXLEN, *fields],
+                ):
+                    await self._redis.client.xack(stream, group, message_id)
+                    return
+                owner = await self._claim_stream_session(session_id)
+
+            session = self._streams.get(session_id)
+            if session is None:
+                session = StreamingSession(
+                    session_id=session_id,
+                    sample_rate=settings.STT_WORKER["SAMPLE_RATE"],
+                    max_buffer_seconds=settings.STT_WORKER["STREAM_MAX_BUFFER_SECONDS"],
+                    min_decode_seconds=settings.STT_WORKER["STREAM_MIN_DECODE_MS"] / 1000,
+                )
+                if await self._vad_enabled(data.get("tenant_id")):
+                    session.vad = VoiceActivityDetector(self._vad_config)
+                self._streams[session_id] = session
+
+            seq = data.get("seq")
+            chunks = [data] if seq is None else session.order(int(seq), data)
+            for chunk in chunks:
+                await self._apply_stream_chunk(session, chunk)
+
+            await self._redis.client.xack(stream, group, message_id)
+
+        except Exception as exc:
+            self._transcriptions_failed += 1
+            logger.error(
+                "Streaming transcription failed",
+                extra={"session_id": session_id, "error": str(exc)},
+                exc_info=True,
+            )
+            self._streams.pop(session_id, None)
+            await self._publish_error(session_id, str(exc), correlation_id)
+            await self._redis.client.xack(stream, group, message_id)
+
+    async def _apply_stream_chunk(self, session: StreamingSession, data: dict[str, Any]) -> None:
+        """Adds one in-order chunk to a streaming session and publishes the results."""
+        session_id = session.session_id
+        correlation_id = data.get("correlation_id", "")
+
+        is_final = data.get("is_final") == "1"
+        language = data.get("language") or None
+        samples = None
+        audio_b64 = data.get("audio", "")
+        if audio_b64:
+            samples = self._decode_audio(base64.b64decode(audio_b64), PCMFormat.from_fields(data))
+            self._total_audio_seconds += len(samples) / session.sample_rate
+
+        utterance_open = True
+        if session.vad is None:
+            if samples is not None:
+                session.append(samples)
+        else:
+            spans = session.vad.process(samples) if samples is not None else []
+            for span in spans:
+                if span.started:
+                    await self._publish_speech_event(
+                        session_id, "speech_started", span.start_ms, correlation_id
+                    )
+                session.append(span.audio)
+                if span.end_ms is not None:
+                    await self._publish_speech_event(
+                        session_id, "speech_stopped", span.end_ms, correlation_id
+                    )
+                    language = await self._decode_stream_buffer(session, language, correlation_id)
+                    await self._finish_stream_utterance(session, language, correlation_id)
+            if is_final:
+                end_ms = session.vad.flush()
+                utterance_open = end_ms is not None
+                if utterance_open:
+                    await self._publish_speech_event(
+                        session_id, "speech_stopped", end_ms, correlation_id
+                    )
+
+        if is_final or session.ready_to_decode() or session.must_force_commit():
+            language = await self._decode_stream_buffer(session, language, correlation_id)
+        if is_final and utterance_open:
+            await self._finish_stream_utterance(session, language, correlation_id)
+
+    async def _claim_stream_session(self, session_id: str) -> str:
+        """
+        Claims ownership of a streaming session for this worker.
+
+        Streaming state lives in worker memory, so all chunks of a session must
+        be decoded by one worker. The first worker to see a session claims it
+        with a Redis key that is refreshed on every chunk.
+
+        Returns:
+            str: Worker ID of the session owner.
+        """
+        client = self._redis.client
+        key = self._owner_key(session_id)
+        ttl = settings.STT_WORKER["STREAM_SESSION_TTL"]
+
+        if await client.set(key, self._worker_id, nx=True, ex=ttl):
+            return self._worker_id
+        owner = await client.get(key)
+        if owner is None:
+            return await self._claim_stream_session(session_id)
+        if owner == self._worker_id:
+            await client.expire(key, ttl)
+        return owner
+
+    @staticmethod
+    def _owner_key(session_id: str) -> str:
+        """Returns the Redis key naming the worker that owns a streaming session."""
+        return f"stt:stream:owner:{session_id}"
+
+    async def _decode_stream_buffer(
+        self,
+        session: StreamingSession,
+        language: Optional[str],
+        correlation_id: str,
+    ) -> Optional[str]:
+        """
+        Re-decodes a streaming session buffer and publishes the agreed delta.
+
+        Returns:
+            Optional[str]: Detected language, or the given hint if nothing was decoded.
+        """
+        if not len(session.audio):
+            return language
+
+        new_seconds = session.undecoded_samples / session.sample_rate
+        decode_language = language or await self._pinned_language(session.session_id)
+        async with self._semaphore:
+            result = await self._batcher.submit(
+                TranscriptionJob(session.audio, decode_language, with_timestamps=True)
+            )
+        await self._track_language(
+            session.session_id, language, decode_language, result, new_seconds
+        )
+        update = session.apply_hypothesis(result.segments)
+        if session.must_force_commit():
+            # No closed segment could be trimmed; commit the tail so
+            # the buffer never grows past its configured maximum.
+            forced = session.force_commit()
+            update = StreamingUpdate(
+                delta=" ".join(filter(None, (update.delta, forced.delta))),
+                committed_text=forced.committed_text,
+                unstable_text="",
+            )
+        if update.delta or update.unstable_text:
+            await self._publish_partial(
+                session.session_id, update, result.language, correlation_id
+            )
+        return result.language
+
+    async def _finish_stream_utterance(
+        self,
+        session: StreamingSession,
+        language: Optional[str],
+        correlation_id: str,
+    ) -> None:
+        """Commits the current utterance of a streaming session and publishes it."""
+        text = session.finish_utterance()
+        await self._publish_result(
+            session_id=session.session_id,
+            text=text,
+            language=language or "en",
+            confidence=1.0 if text else 0.0,
+            correlation_id=correlation_id,
+        )
+        self._transcriptions_total += 1
+
+    async def _vad_enabled(self, tenant_id: Optional[str]) -> bool:
+        """
+        Returns whether server-side VAD applies to a tenant's audio.
+
+        Reads `TenantSettings.stt_vad_enabled`, cached per worker for
+        TENANT_SETTINGS_TTL seconds. Audio without a tenant, or of a tenant
+        without extended settings, uses the STT_VAD_ENABLED default.
+        """
+        default = settings.STT_WORKER["VAD_ENABLED"]
+        if not tenant_id:
+            return default
+
+        now = time.monotonic()
+        cached = self._tenant_vad.get(tenant_id)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        try:
+            enabled = await (
+                TenantSettings.objects.filter(tenant_id=tenant_id)
+                .values_list("stt_vad_enabled", flat=True)
+                .afirst()
+            )
+        except Exception as exc:
+            logger.warning(
+                "Failed to load tenant VAD setting",
+                extra={"tenant_id": tenant_id, "error": str(exc)},
+            )
+            enabled = None
+
+        enabled = default if enabled is None else enabled
+        self._tenant_vad[tenant_id] = (enabled, now + TENANT_SETTINGS_TTL)
+        return enabled
+
+    def _prune_stream_sessions(self) -> None:
+        """Drops streaming sessions idle for longer than the session TTL."""
+        cutoff = time.monotonic() - settings.STT_WORKER["STREAM_SESSION_TTL"]
+        for session_id, session in list(self._streams.items()):
+            if session.last_activity < cutoff and session_id not in self._stream_tails:
+                self._streams.pop(session_id, None)
+
+    async def _release_stream_sessions(self) -> None:
+        """
+        Hands this worker's streaming sessions back to the fleet on shutdown.
+
+        Owner keys are released first, so other workers stop forwarding
+        chunks here and the next chunk of each session is claimed by a live
+        worker. Chunks already forwarded but not processed are moved back to
+        the shared audio stream before the direct stream is deleted.
+        """
+        try:
+            moved = await self._hand_over(
+                keys=[
+                    self._direct_stream,
                     settings.STT_WORKER["STREAM_AUDIO"],
+                    *[self._owner_key(session_id) for session_id in self._streams],
+                ],
+                args=[
+                    self._worker_id,
                     settings.STT_WORKER["GROUP_WORKERS"],
-                    message_id,
+                    DIRECT_STREAM_MAXLEN,
+                ],
+            )
+            if moved:
+                logger.info(
+                    "Re-routed unprocessed streaming chunks",
+                    extra={"worker_id": self._worker_id, "chunks": moved},
                 )
+        except Exception as exc:
+            logger.warning(
+                "Failed to release streaming sessions", extra={"error": str(exc)}
+            )
+        self._streams.clear()
 
     async def _transcribe(
         self,
         audio_bytes: bytes,
         language_hint: Optional[str] = None,
+        vad_enabled: bool = False,
+        pcm_format: Optional[PCMFormat] = None,
+        session_id: Optional[str] = None,
     ) -> tuple[str, str, float]:
         """
         Transcribes the given audio bytes using the loaded Whisper model.
 
+        The decoded audio is submitted to the micro-batcher, so chunks arriving
+        from different sessions within the batching window share one encoder
+        and decoder pass. With VAD enabled, non-speech audio is dropped first
+        and chunks without speech never reach the model; with VAD disabled the
+        chunk is decoded on its own with Whisper's VAD filter, so silence
+        does not make Whisper hallucinate. Without a language
+        hint, the session's pinned language is used so Whisper skips detection.
+        With the transcription cache enabled, byte-identical audio decoded
+        with the same settings is answered from the cache.
+
         Args:
             audio_bytes: Raw audio data in bytes.
             language_hint: Optional language hint for transcription.
+            vad_enabled: Whether to run server-side VAD before the model.
+            pcm_format: Layout of a raw PCM payload; None for container audio.
+            session_id: Session used for language pinning.
 
         Returns:
             tuple[str, str, float]: A tuple containing the transcribed text,
@@ -250,49 +886,322 @@ class STTWorker:
         Raises:
             RuntimeError: If the STT model is not initialized.
         """
-        if not self._model:
+        if not self._model or not self._batcher:
             raise RuntimeError("STT model not initialized")
 
-        audio_io = io.BytesIO(audio_bytes)
-        audio_data, sample_rate = sf.read(audio_io)
-        target_rate = settings.STT_WORKER["SAMPLE_RATE"]
-        if sample_rate != target_rate:
-            ratio = target_rate / sample_rate
-            new_length = int(len(audio_data) * ratio)
-            audio_data = np.interp(
-                np.linspace(0, len(audio_data), new_length),
-                np.arange(len(audio_data)),
-                audio_data,
+        audio_data = self._decode_audio(audio_bytes, pcm_format)
+        audio_seconds = len(audio_data) / settings.STT_WORKER["SAMPLE_RATE"]
+        self._total_audio_seconds += audio_seconds
+        language = language_hint or await self._pinned_language(session_id)
+
+        cache_key = None
+        if self._transcripts and cacheable(audio_seconds):
+            cache_key = transcription_key(
+                audio_data, self._model_id, language, BEAM_SIZE, f"vad={int(vad_enabled)}"
+            )
+            cached = await self._transcripts.get(cache_key)
+            if cached is not None:
+                return cached["text"], cached["language"], cached["confidence"]
+
+        if vad_enabled:
+            audio_data = extract_speech(audio_data, self._vad_config)
+            if not len(audio_data):
+                self._vad_skipped_total += 1
+                return "", language_hint or "en", 0.0
+
+        result = await self._batcher.submit(
+            TranscriptionJob(
+                audio_data, language, vad_filtered=vad_enabled, vad_filter=not vad_enabled
+            )
+        )
+        if cache_key:
+            await self._transcripts.set(
+                cache_key,
+                {
+                    "text": result.text,
+                    "language": result.language,
+                    "confidence": result.confidence,
+                },
+            )
+        await self._track_language(
+            session_id,
+            language_hint,
+            language,
+            result,
+            len(audio_data) / settings.STT_WORKER["SAMPLE_RATE"],
+        )
+        return result.text, result.language, result.confidence
+
+    async def _pinned_language(self, session_id: Optional[str]) -> Optional[str]:
+        """Returns the session's pinned language, or None if it must be detected."""
+        if not session_id or not self._languages:
+            return None
+        try:
+            return await self._languages.pinned(session_id)
+        except Exception as exc:
+            logger.warning(
+                "Failed to read pinned language",
+                extra={"session_id": session_id, "error": str(exc)},
+            )
+            return None
+
+    async def _track_language(
+        self,
+        session_id: Optional[str],
+        language_hint: Optional[str],
+        decode_language: Optional[str],
+        result: DecodeResult,
+        audio_seconds: float,
+    ) -> None:
+        """
+        Feeds a decode into the session language cache.
+
+        Detections count towards pinning; decodes that used the pinned
+        language report their confidence so a wrong pin is dropped. Decodes
+        with an explicit language hint are not tracked.
+        """
+        if language_hint or not session_id or not self._languages:
+            return
+        try:
+            if decode_language:
+                await self._languages.record_confidence(session_id, result.confidence)
+            elif result.text:
+                await self._languages.observe(
+                    session_id, result.language, result.language_probability, audio_seconds
+                )
+        except Exception as exc:
+            logger.warning(
+                "Failed to update session language",
+                extra={"session_id": session_id, "error": str(exc)},
+            )
+
+    def _decode_audio(
+        self, audio_bytes: bytes, pcm_format: Optional[PCMFormat] = None
+    ) -> np.ndarray:
+        """
+        Decodes a payload into mono float32 at the target sample rate.
+
+        Raw PCM frames (described by the `format`, `sample_rate` and `channels`
+        stream fields) are read in place; other payloads are parsed as an audio
+        container with soundfile.
+
+        Raises:
+            ValueError: If a container payload arrives without soundfile installed.
+        """
+        if pcm_format is not None:
+            audio_data = pcm_to_float32(audio_bytes, pcm_format)
+            sample_rate = pcm_format.sample_rate
+        else:
+            if sf is None:
+                raise ValueError(
+                    "soundfile is required to decode container audio; send raw PCM instead"
+                )
+            audio_data, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32")
+            if audio_data.ndim > 1:
+                audio_data = audio_data.mean(axis=1, dtype=np.float32)
+        return resample(audio_data, sample_rate, settings.STT_WORKER["SAMPLE_RATE"])
+
+    async def _transcribe_batch(
+        self, jobs: list[TranscriptionJob]
+    ) -> list[TranscriptionOutcome]:
+        """Runs one batched decode in the executor and logs batch metrics periodically."""
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(None, self._transcribe_batch_sync, jobs)
+
+        metrics = self._batcher.metrics if self._batcher else None
+        if metrics and metrics.batches_total % 100 == 0:
+            cache_metrics = self._transcripts.stats() if self._transcripts else {}
+            logger.info(
+                "STT batch metrics",
+                extra={"worker_id": self._worker_id, **metrics.snapshot(), **cache_metrics},
+            )
+        return results
+
+    def _transcribe_batch_sync(
+        self, jobs: list[TranscriptionJob]
+    ) -> list[TranscriptionOutcome]:
+        """
+        Transcribes a batch of jobs with a single encoder and decoder pass.
+
+        Chunks that fit in one Whisper window (30 seconds) are stacked into a
+        single feature batch. Longer chunks, and chunks that need Whisper's
+        VAD filter, fall back to the regular `WhisperModel.transcribe` path,
+        which handles sliding windows and runs the filter.
+        CTranslate2 requires equal prompt lengths within a batch, so jobs with
+        and without timestamps are decoded as separate batches.
+        """
+        results: list[TranscriptionOutcome] = [
+            RuntimeError("Transcription not attempted")
+        ] * len(jobs)
+        window_samples = self._model.feature_extractor.n_samples
+
+        groups: dict[bool, list[int]] = {False: [], True: []}
+        for i, job in enumerate(jobs):
+            if len(job.audio) > window_samples or job.vad_filter:
+                try:
+                    results[i] = self._transcribe_single(job)
+                except Exception as exc:
+                    results[i] = exc
+            else:
+                groups[job.with_timestamps].append(i)
+
+        for with_timestamps, indices in groups.items():
+            if not indices:
+                continue
+            try:
+                outcomes = self._decode_window_batch(
+                    [jobs[i] for i in indices], with_timestamps
+                )
+                for i, outcome in zip(indices, outcomes):
+                    results[i] = outcome
+            except Exception as exc:
+                for i in indices:
+                    results[i] = exc
+        return results
+
+    def _decode_window_batch(
+        self, jobs: list[TranscriptionJob], with_timestamps: bool = False
+    ) -> list[DecodeResult]:
+        """Encodes and decodes up-to-30-second chunks as one CTranslate2 batch."""
+        extractor = self._model.feature_extractor
+        n_frames = extractor.nb_max_frames
+
+        features = np.zeros((len(jobs), extractor.mel_filters.shape[0], n_frames), np.float32)
+        for row, job in enumerate(jobs):
+            mel = extractor(job.audio)[:, :n_frames]
+            features[row, :, : mel.shape[1]] = mel
+
+        encoder_output = self._model.model.encode(
+            ctranslate2.StorageView.from_array(features)
+        )
+
+        languages = [job.language for job in jobs]
+        probabilities = [1.0] * len(jobs)
+        if not self._model.model.is_multilingual:
+            languages = ["en"] * len(jobs)
+        elif any(lang is None for lang in languages):
+            detected = self._model.model.detect_language(encoder_output)
+            for row, lang in enumerate(languages):
+                if lang is None:
+                    token, probabilities[row] = detected[row][0]
+                    languages[row] = token[2:-2]
+
+        tokenizers = [self._get_tokenizer(lang) for lang in languages]
+        prompts = [
+            list(tokenizer.sot_sequence)
+            + ([] if with_timestamps else [tokenizer.no_timestamps])
+            for tokenizer in tokenizers
+        ]
+
+        generated = self._model.model.generate(
+            encoder_output,
+            prompts,
+            beam_size=BEAM_SIZE,
+            max_length=self._model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True,
+        )
+
+        outcomes = []
+        for job, result, tokenizer, language, probability in zip(
+            jobs, generated, tokenizers, languages, probabilities
+        ):
+            tokens = result.sequences_ids[0]
+            # CTranslate2 returns the length-normalized log probability.
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            segments = (
+                self._split_timestamped(tokens, tokenizer)
+                if with_timestamps
+                else [HypothesisSegment(0.0, None, tokenizer.decode(tokens).strip())]
+            )
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOGPROB_THRESHOLD:
+                segments = []
+            outcomes.append(
+                DecodeResult(
+                    text=" ".join(segment.text for segment in segments).strip(),
+                    language=language or "en",
+                    confidence=min(1.0, max(0.0, 1.0 + avg_logprob)),
+                    segments=segments,
+                    language_probability=probability,
+                )
+            )
+        return outcomes
+
+    @staticmethod
+    def _split_timestamped(
+        tokens: list[int], tokenizer: Tokenizer
+    ) -> list[HypothesisSegment]:
+        """
+        Splits a timestamped token sequence into segments.
+
+        Whisper emits `<|t0|> text <|t1|>` per segment; a trailing segment
+        without a closing timestamp is returned with `end=None`.
+        """
+        segments: list[HypothesisSegment] = []
+        text_tokens: list[int] = []
+        start: Optional[float] = None
+        for token in tokens:
+            if token < tokenizer.timestamp_begin:
+                if token < tokenizer.eot:
+                    text_tokens.append(token)
+                continue
+            timestamp = (token - tokenizer.timestamp_begin) * TIMESTAMP_PRECISION
+            if start is None:
+                start = timestamp
+            elif text_tokens:
+                segments.append(
+                    HypothesisSegment(start, timestamp, tokenizer.decode(text_tokens).strip())
+                )
+                text_tokens = []
+                start = None
+            else:
+                start = timestamp
+
+        if text_tokens:
+            segments.append(
+                HypothesisSegment(start or 0.0, None, tokenizer.decode(text_tokens).strip())
+            )
+        return segments
+
+    def _get_tokenizer(self, language: Optional[str]) -> Tokenizer:
+        """Returns a cached transcription tokenizer for the given language."""
+        tokenizer = self._tokenizers.get(language)
+        if tokenizer is None:
+            tokenizer = Tokenizer(
+                self._model.hf_tokenizer,
+                self._model.model.is_multilingual,
+                task="transcribe",
+                language=language,
             )
-            sample_rate = target_rate
-
-        self._total_audio_seconds += len(audio_data) / sample_rate
-
-        loop = asyncio.get_event_loop()
-        segments, info = await loop.run_in_executor(
-            None,
-            lambda: self._model.transcribe(
-                audio_data,
-                language=language_hint,
-                beam_size=5,
-                vad_filter=True,
-            ),
+            self._tokenizers[language] = tokenizer
+        return tokenizer
+
+    def _transcribe_single(self, job: TranscriptionJob) -> DecodeResult:
+        """Transcribes one chunk with the sliding-window decoder."""
+        segments, info = self._model.transcribe(
+            job.audio,
+            language=job.language,
+            beam_size=BEAM_SIZE,
+            vad_filter=not job.vad_filtered,
         )
 
-        text_parts = []
+        hypothesis_segments = []
         total_confidence = 0.0
-        segment_count = 0
         for segment in segments:
-            text_parts.append(segment.text)
+            hypothesis_segments.append(
+                HypothesisSegment(segment.start, segment.end, segment.text.strip())
+            )
             total_confidence += segment.avg_logprob
-            segment_count += 1
 
-        text = " ".join(text_parts).strip()
+        text = " ".join(segment.text for segment in hypothesis_segments).strip()
         language = info.language or "en"
+        segment_count = len(hypothesis_segments)
         confidence = (total_confidence / segment_count) if segment_count > 0 else 0.0
         confidence = min(1.0, max(0.0, 1.0 + confidence))
 
-        return text, language, confidence
+        probability = info.language_probability if job.language is None else 1.0
+        return DecodeResult(text, language, confidence, hypothesis_segments, probability)
 
     async def _publish_result(
         self,
@@ -317,6 +1226,51 @@ class STTWorker:
         )
         await self._redis.publish(channel, message)
 
+    async def _publish_partial(
+        self,
+        session_id: str,
+        update: StreamingUpdate,
+        language: Optional[str],
+        correlation_id: str,
+    ) -> None:
+        """Publishes an incremental streaming hypothesis to the session channel."""
+        channel = f"{settings.STT_WORKER['CHANNEL_TRANSCRIPTION']}:{session_id}"
+        message = json.dumps(
+            {
+                "type": "transcription.partial",
+                "session_id": session_id,
+                "delta": update.delta,
+                "text": update.committed_text,
+                "unstable_text": update.unstable_text,
+                "language": language,
+                "is_final": False,
+                "correlation_id": correlation_id,
+                "timestamp": time.time(),
+            }
+        )
+        await self._redis.publish(channel, message)
+
+    async def _publish_speech_event(
+        self,
+        session_id: str,
+        event_type: str,
+        offset_ms: int,
+        correlation_id: str,
+    ) -> None:
+        """Publishes a `speech_started` or `speech_stopped` VAD event to the session channel."""
+        channel = f"{settings.STT_WORKER['CHANNEL_TRANSCRIPTION']}:{session_id}"
+        offset_field = "audio_start_ms" if event_type == "speech_started" else "audio_end_ms"
+        message = json.dumps(
+            {
+                "type": event_type,
+                "session_id": session_id,
+                offset_field: offset_ms,
+                "correlation_id": correlation_id,
+                "timestamp": time.time(),
+            }
+        )
+        await self._redis.publish(channel, message)
+
     async def _publish_error(
         self, session_id: str, error: str, correlation_id: str
     ) -> None:
@@ -334,6 +1288,45 @@ class STTWorker:
         await self._redis.publish(channel, message)
 
 
+def run_worker(model_path: Optional[str] = None) -> None:
+    """
+    Runs one STT worker until SIGTERM/SIGINT.
+
+    Args:
+        model_path: Local model directory shared by supervised processes.
+    """
+
+    async def _run() -> None:
+        """
+        Asynchronous main loop for the STT worker.
+
+        Initializes and starts the `STTWorker`, sets up signal handlers
+        for graceful shutdown, and runs the worker's message processing loop.
+        """
+        worker = STTWorker(model_path=model_path)
+        loop = asyncio.get_running_loop()
+
+        def _shutdown() -> None:
+            """
+            Initiates a graceful shutdown of the STT worker.
+
+            This function is registered as a signal handler and schedules
+            the worker's `stop` method to be run asynchronously.
+            """
+            asyncio.create_task(worker.stop())
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, _shutdown)
+
+        await worker.start()
+        try:
+            await worker.run()
+        finally:
+            await worker.stop()
+
+    asyncio.run(_run())
+
+
 class Command(BaseCommand):
     """
     Django management command to run the Speech-to-Text (STT) worker.
@@ -344,44 +1337,43 @@ class Command(BaseCommand):
 
     help = "Run the realtime STT worker"
 
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="Inference processes to fork (default: from settings)",
+        )
+
     def handle(self, *args, **options) -> None:
         """
         Starts the asynchronous STT worker.
 
-        This method sets up basic logging, initializes the `STTWorker`,
-        and manages its lifecycle, including graceful shutdown on signals.
+        This method sets up basic logging and runs a single `STTWorker`, or a
+        supervisor that forks one pinned worker process per CPU set. The model
+        is resolved to a local directory before forking so all processes load
+        the same files (shared through the page cache) instead of racing to
+        download them.
         """
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
 
-        async def _run() -> None:
-            """
-            Asynchronous main loop for the STT worker.
-
-            Initializes and starts the `STTWorker`, sets up signal handlers
-            for graceful shutdown, and runs the worker's message processing loop.
-            """
-            worker = STTWorker()
-            loop = asyncio.get_running_loop()
-
-            def _shutdown() -> None:
-                """
-                Initiates a graceful shutdown of the STT worker.
-
-                This function is registered as a signal handler and schedules
-                the worker's `stop` method to be run asynchronously.
-                """
-                asyncio.create_task(worker.stop())
-
-            for sig in (signal.SIGTERM, signal.SIGINT):
-                loop.add_signal_handler(sig, _shutdown)
+        processes = options.get("processes") or settings.STT_WORKER["PROCESSES"]
+        if processes <= 1:
+            run_worker()
+            return
 
-            await worker.start()
-            try:
-                await worker.run()
-            finally:
-                await worker.stop()
+        model = settings.STT_WORKER["MODEL"]
+        model_path = model if os.path.isdir(model) else download_model(model)
+        connections.close_all()
 
-        asyncio.run(_run())
+        supervisor = WorkerSupervisor(
+            "stt",
+            processes,
+            lambda index, cpus: run_worker(model_path),
+            pin_cpus=settings.STT_WORKER["PIN_CPUS"],
+        )
+        supervisor.run()
@@ -161,6 +161,11 @@ class Command(BaseCommand):
             MetricsAggregationWorkflow,
         ]
 
+        # Load configured STT/TTS models before accepting activities
+        from apps.workflows.model_registry import warmup_models
+
+        await asyncio.to_thread(warmup_models)
+
         # All activity instances
         activities = [
             STTActivities(),
@@ -5,33 +5,43 @@ Run the TTS worker for realtime sessions.
 from __future__ import annotations
 
 import asyncio
-import base64
-import io
+import functools
 import json
 import logging
-import os
 import signal
 import time
 import uuid
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from apps.workflows.audio_framing import AudioFramer, negotiate_format
+from apps.workflows.model_registry import get_model_registry, kokoro_onnx_key, warmup_models
 from apps.workflows.redis_client import RedisClient
+from apps.workflows.text_segmenter import SentenceSegmenter, unspoken_tail
+from apps.workflows.token_coalescer import replay_stream
+from apps.workflows.tts_batch import encode_failure, encode_segment, segment_key
+from apps.workflows.tts_cache import CachedPhrase, TTSPhraseCache, build_phrase_cache, phrase_key
+from apps.workflows.tts_scheduler import (
+    CancellationRegistry,
+    CancellationToken,
+    Priority,
+    TTSScheduler,
+    parse_priority,
+    request_stream,
+    until_cancelled,
+)
 
 logger = logging.getLogger(__name__)
 
 try:
-    import kokoro_onnx as kokoro
+    import kokoro_onnx  # noqa: F401
 except ImportError as exc:  # pragma: no cover
     raise ImportError("kokoro-onnx is required for TTS worker") from exc
 
-try:
-    import numpy as np
-    import soundfile as sf
-except ImportError as exc:  # pragma: no cover
-    raise ImportError("numpy and soundfile are required for TTS worker") from exc
+# Output sample rate of Kokoro, part of the phrase cache key.
+KOKORO_SAMPLE_RATE = 24000
 
 
 class TTSWorker:
@@ -42,13 +52,24 @@ class TTSWorker:
         self._redis = RedisClient()
         self._engine: Optional[Any] = None
         self._running = False
-        self._tasks: set[asyncio.Task] = set()
-        self._cancelled_sessions: set[str] = set()
+        self._scheduler = TTSScheduler(
+            slots=settings.TTS_WORKER["INFERENCE_SLOTS"],
+            reserved_live_slots=settings.TTS_WORKER["LIVE_RESERVED_SLOTS"],
+            queue_depth=settings.TTS_WORKER["QUEUE_DEPTH"],
+        )
+        self._streams = {
+            priority: request_stream(settings.TTS_WORKER["STREAM_REQUESTS"], priority)
+            for priority in Priority
+        }
+        self._cancellations = CancellationRegistry(ttl=settings.TTS_WORKER["CANCEL_TTL"])
         self._cancel_listener_task: Optional[asyncio.Task] = None
+        self._llm_streams: set[asyncio.Task] = set()
+        self._phrases: Optional[TTSPhraseCache] = None
         self._worker_id = f"tts-{uuid.uuid4().hex[:8]}"
 
         self._synthesis_total = 0
         self._synthesis_failed = 0
+        self._synthesis_dropped = 0
         self._total_audio_seconds = 0.0
         self._total_characters = 0
 
@@ -58,6 +79,7 @@ class TTSWorker:
         and ensuring the consumer group exists.
         """
         await self._redis.connect()
+        self._phrases = build_phrase_cache(self._redis.client)
         self._load_model()
         await self._ensure_consumer_group()
         self._cancel_listener_task = asyncio.create_task(self._listen_for_cancels())
@@ -77,8 +99,9 @@ class TTSWorker:
             except asyncio.CancelledError:
                 pass
 
-        if self._tasks:
-            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._llm_streams:
+            await asyncio.gather(*self._llm_streams, return_exceptions=True)
+        await self._scheduler.join()
 
         await self._redis.disconnect()
         logger.info(
@@ -87,52 +110,60 @@ class TTSWorker:
                 "worker_id": self._worker_id,
                 "synthesis_total": self._synthesis_total,
                 "synthesis_failed": self._synthesis_failed,
+                "synthesis_dropped": self._synthesis_dropped,
                 "total_audio_seconds": self._total_audio_seconds,
                 "total_characters": self._total_characters,
+                **self._scheduler.stats(),
+                **self._cancellations.stats(),
+                **(self._phrases.stats() if self._phrases else {}),
             },
         )
 
     def _load_model(self) -> None:
-        """Loads the Kokoro TTS model from the specified model directory."""
-        model_dir = settings.TTS_WORKER["MODEL_DIR"]
-        model_file = settings.TTS_WORKER["MODEL_FILE"]
-        voices_file = settings.TTS_WORKER["VOICES_FILE"]
-
-        model_path = os.path.join(model_dir, model_file)
-        voices_path = os.path.join(model_dir, voices_file)
-
-        if not os.path.isfile(model_path):
-            raise FileNotFoundError(f"Kokoro model file not found: {model_path}")
-        if not os.path.isfile(voices_path):
-            raise FileNotFoundError(f"Kokoro voices file not found: {voices_path}")
+        """
+        Loads the Kokoro TTS replicas through the process-wide model registry
+        and warms them up with every voice in TTS_WARMUP_VOICES (the default
+        voice when empty).
 
-        self._engine = kokoro.Kokoro(model_path=model_path, voices_path=voices_path)
-        logger.info("Kokoro model loaded", extra={"model_path": model_path})
+        Models listed in MODEL_REGISTRY_WARMUP are loaded as well.
+        """
+        key = kokoro_onnx_key()
+        self._engine = get_model_registry().get(key)
+        voices = [
+            voice.strip()
+            for voice in settings.TTS_WORKER["WARMUP_VOICES"].split(",")
+            if voice.strip()
+        ] or [settings.TTS_WORKER["DEFAULT_VOICE"]]
+        self._engine.warmup(voices, settings.TTS_WORKER["WARMUP_TEXT"])
+        warmup_models()
+        logger.info("Kokoro model loaded", extra={"model_path": key.model})
 
     async def _ensure_consumer_group(self) -> None:
         """
-        Ensures the Redis consumer group for TTS requests exists.
-        Creates it if it does not already exist.
+        Ensures the Redis consumer group exists on the request stream of
+        every priority class. Creates it if it does not already exist.
         """
         client = self._redis.client
-        stream = settings.TTS_WORKER["STREAM_REQUESTS"]
         group = settings.TTS_WORKER["GROUP_WORKERS"]
 
-        try:
-            await client.xgroup_create(stream, group, id="0", mkstream=True)
-            logger.info("Created consumer group", extra={"group": group})
-        except Exception as exc:
-            if "BUSYGROUP" not in str(exc):
-                logger.warning(
-                    "Failed to create consumer group", extra={"error": str(exc)}
-                )
+        for stream in self._streams.values():
+            try:
+                await client.xgroup_create(stream, group, id="0", mkstream=True)
+                logger.info("Created consumer group", extra={"group": group, "stream": stream})
+            except Exception as exc:
+                if "BUSYGROUP" not in str(exc):
+                    logger.warning(
+                        "Failed to create consumer group", extra={"error": str(exc)}
+                    )
 
     async def _listen_for_cancels(self) -> None:
         """
         Listens for TTS cancellation messages on a Redis pub/sub channel.
 
-        If a cancellation message is received for a session, the session ID is
-        added to a set of cancelled sessions to stop ongoing synthesis.
+        A message with a response_id cancels that response; without one it
+        cancels every response of the session (barge-in). Requests in
+        progress stop within the segment being synthesized and queued ones
+        are dropped when they reach a slot.
         """
         pubsub = self._redis.client.pubsub()
         await pubsub.psubscribe(f"{settings.TTS_WORKER['CHANNEL_TTS']}:*")
@@ -146,38 +177,56 @@ class TTSWorker:
                     if data.get("type") == "tts.cancel":
                         session_id = data.get("session_id")
                         if session_id:
-                            self._cancelled_sessions.add(session_id)
+                            self._cancellations.cancel(session_id, data.get("response_id") or "")
                 except (json.JSONDecodeError, KeyError):
                     continue
 
     async def run(self) -> None:
         """
-        Main loop of the TTS worker, continuously reading and processing
-        TTS requests from the Redis stream.
+        Main loop of the TTS worker, reading TTS requests from Redis and
+        handing them to the scheduler.
+
+        Each priority class has its own request stream. Streams are read in
+        priority order and only as many messages are read as the scheduler
+        can start or hold for its class; when all classes are full the worker
+        stops reading until a slot frees up.
         """
         client = self._redis.client
-        stream = settings.TTS_WORKER["STREAM_REQUESTS"]
         group = settings.TTS_WORKER["GROUP_WORKERS"]
+        stream_priorities = {stream: priority for priority, stream in self._streams.items()}
 
         while self._running:
             try:
+                if not await self._scheduler.wait_for_capacity(timeout=1.0):
+                    continue
+
+                read = 0
+                for priority, stream in self._streams.items():
+                    count = self._scheduler.capacity(priority)
+                    if not count:
+                        continue
+                    messages = await client.xreadgroup(
+                        group, self._worker_id, {stream: ">"}, count=count
+                    )
+                    read += self._submit_messages(messages, stream_priorities)
+
+                if read:
+                    continue
+
+                # Nothing waiting: block until a class with capacity gets a request.
+                wanted = {
+                    stream: ">"
+                    for priority, stream in self._streams.items()
+                    if self._scheduler.capacity(priority)
+                }
                 messages = await client.xreadgroup(
                     group,
                     self._worker_id,
-                    {stream: ">"},
+                    wanted,
                     count=1,
                     block=1000,
                 )
-                if not messages:
-                    continue
-
-                for _, stream_messages in messages:
-                    for message_id, data in stream_messages:
-                        task = asyncio.create_task(
-                            self._process_message(message_id, data)
-                        )
-                        self._tasks.add(task)
-                        task.add_done_callback(self._tasks.discard)
+                self._submit_messages(messages, stream_priorities)
 
             except asyncio.CancelledError:
                 break
@@ -187,53 +236,117 @@ class TTSWorker:
                 )
                 await asyncio.sleep(1)
 
-    async def _process_message(self, message_id: str, data: dict[str, Any]) -> None:
+    def _submit_messages(
+        self,
+        messages: Optional[list[Any]],
+        stream_priorities: dict[str, Priority],
+    ) -> int:
+        """
+        Queues read messages in the scheduler.
+
+        A message's class comes from the stream it was read from unless its
+        `priority` field names another one; tenants share each class fairly
+        by `tenant_id`. Requests with `source=llm` start reading their LLM
+        response at once and only queue the synthesis of each segment, so
+        no slot is held while the response is being generated; until they
+        finish they are held against their class's read capacity.
+
+        Returns:
+            int: Number of messages queued.
+        """
+        count = 0
+        for stream, stream_messages in messages or []:
+            for message_id, data in stream_messages:
+                priority = parse_priority(data.get("priority"), stream_priorities[stream])
+                if data.get("source") == "llm":
+                    self._scheduler.hold(priority)
+                    task = asyncio.create_task(
+                        self._process_llm_stream(message_id, data, stream, priority)
+                    )
+                    self._llm_streams.add(task)
+                    task.add_done_callback(functools.partial(self._end_llm_stream, priority))
+                else:
+                    self._scheduler.submit(
+                        priority,
+                        data.get("tenant_id", ""),
+                        functools.partial(self._process_message, message_id, data, stream),
+                    )
+                count += 1
+        return count
+
+    def _end_llm_stream(self, priority: Priority, task: asyncio.Task) -> None:
+        """Forgets a finished LLM-backed request and frees its read capacity."""
+        self._llm_streams.discard(task)
+        self._scheduler.release(priority)
+
+    async def _ack(self, stream: str, message_id: str) -> None:
+        """Acknowledges a request message on the stream it was read from."""
+        await self._redis.client.xack(stream, settings.TTS_WORKER["GROUP_WORKERS"], message_id)
+
+    async def _process_message(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: Optional[str] = None,
+    ) -> None:
         """
         Processes a single TTS request message from the Redis stream.
 
         This method extracts request parameters, synthesizes speech,
-        and publishes the audio chunks.
+        and publishes the audio chunks. Requests with `source=llm` are
+        handled by `_process_llm_stream` instead.
         """
+        stream = stream or settings.TTS_WORKER["STREAM_REQUESTS"]
+        if data.get("type") == "prerender":
+            await self._process_prerender(message_id, data, stream)
+            return
+        if data.get("type") == "batch":
+            await self._process_batch_sentence(message_id, data, stream)
+            return
+
         session_id = data.get("session_id", "")
         text = data.get("text", "")
         voice = data.get("voice", settings.TTS_WORKER["DEFAULT_VOICE"])
         speed = float(data.get("speed", settings.TTS_WORKER["DEFAULT_SPEED"]))
         response_id = data.get("response_id", "")
         correlation_id = data.get("correlation_id", "")
+        framer = self._framer(data)
 
         start_time = time.time()
-        self._cancelled_sessions.discard(session_id)
+        token = self._open_token(message_id, data)
 
         try:
+            if token.cancelled:
+                await self._drop_cancelled(stream, message_id, data)
+                return
             if not text:
                 raise ValueError("No text in message")
 
             self._total_characters += len(text)
             sequence = 0
-            async for chunk_b64, sample_rate, is_final in self._synthesize_stream(
+            async for chunk, sample_rate, is_final in self._synthesize_stream(
                 text=text,
                 voice=voice,
                 speed=speed,
-                session_id=session_id,
+                token=token,
+                framer=framer,
             ):
-                if session_id in self._cancelled_sessions:
-                    await self._publish_cancelled(session_id, response_id)
+                if token.cancelled:
                     break
 
                 await self._publish_audio_chunk(
                     session_id=session_id,
-                    chunk_b64=chunk_b64,
+                    chunk=chunk,
                     sequence=sequence,
                     sample_rate=sample_rate,
                     is_final=is_final,
+                    framer=framer,
                 )
                 sequence += 1
 
-            await self._redis.client.xack(
-                settings.TTS_WORKER["STREAM_REQUESTS"],
-                settings.TTS_WORKER["GROUP_WORKERS"],
-                message_id,
-            )
+            if token.cancelled:
+                await self._publish_cancelled(session_id, response_id)
+            await self._ack(stream, message_id)
 
             self._synthesis_total += 1
             duration = time.time() - start_time
@@ -243,6 +356,8 @@ class TTSWorker:
                     "session_id": session_id,
                     "text_length": len(text),
                     "chunks": sequence,
+                    "format": framer.output_format,
+                    "cancelled": token.cancelled,
                     "duration_ms": int(duration * 1000),
                 },
             )
@@ -255,84 +370,546 @@ class TTSWorker:
                 exc_info=True,
             )
             await self._publish_error(session_id, str(exc), response_id, correlation_id)
-            await self._redis.client.xack(
-                settings.TTS_WORKER["STREAM_REQUESTS"],
-                settings.TTS_WORKER["GROUP_WORKERS"],
-                message_id,
+            await self._ack(stream, message_id)
+
+        finally:
+            self._cancellations.close(token)
+
+    async def _process_llm_stream(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: str,
+        priority: Priority = Priority.LIVE,
+    ) -> None:
+        """
+        Speaks an LLM response while it is being generated.
+
+        Reads the response's replay stream (see
+        `apps.workflows.token_coalescer.replay_stream`), segments the tokens
+        at sentence and clause boundaries and synthesizes each segment as soon
+        as it is complete. Chunks of all segments share one sequence and a
+        single final chunk follows the last segment. The response is named by
+        `llm_correlation_id` (defaulting to the request's correlation_id) and
+        read from its first token, so tokens generated before the request
+        reached a worker, or a whole response replayed from the LLM cache,
+        are spoken too. Without a correlation ID the session's stream is read
+        from the time the request was queued. The response is read outside
+        the scheduler; each segment is synthesized as a job of the request's
+        priority class.
+        """
+        session_id = data.get("session_id", "")
+        voice = data.get("voice", settings.TTS_WORKER["DEFAULT_VOICE"])
+        speed = float(data.get("speed", settings.TTS_WORKER["DEFAULT_SPEED"]))
+        response_id = data.get("response_id", "")
+        tenant_id = data.get("tenant_id", "")
+        correlation_id = data.get("correlation_id", "")
+        llm_correlation_id = data.get("llm_correlation_id") or correlation_id
+        framer = self._framer(data)
+
+        start_time = time.time()
+        token = self._open_token(message_id, data)
+        if token.cancelled:
+            try:
+                await self._drop_cancelled(stream, message_id, data)
+            finally:
+                self._cancellations.close(token)
+            return
+
+        segments: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        channel = f"{settings.LLM_WORKER['RESPONSE_CHANNEL']}:{session_id}"
+        reader = asyncio.create_task(
+            self._read_llm_segments(
+                replay_stream(channel, llm_correlation_id),
+                "0" if llm_correlation_id else message_id,
+                llm_correlation_id,
+                segments,
+            )
+        )
+
+        sequence = 0
+        sample_rate = KOKORO_SAMPLE_RATE
+
+        async def speak(segment: str) -> None:
+            nonlocal sequence, sample_rate
+            async for chunk, sample_rate, _ in self._synthesize_stream(
+                text=segment,
+                voice=voice,
+                speed=speed,
+                token=token,
+                framer=framer,
+                final_chunk=False,
+            ):
+                if token.cancelled:
+                    break
+                await self._publish_audio_chunk(
+                    session_id=session_id,
+                    chunk=chunk,
+                    sequence=sequence,
+                    sample_rate=sample_rate,
+                    is_final=False,
+                    framer=framer,
+                )
+                sequence += 1
+
+        try:
+            segment_count = 0
+            async for segment in until_cancelled(self._queued_segments(segments), token):
+                segment_count += 1
+                self._total_characters += len(segment)
+                await self._scheduler.execute(
+                    priority, tenant_id, functools.partial(speak, segment)
+                )
+                if token.cancelled:
+                    break
+
+            if token.cancelled:
+                await self._publish_cancelled(session_id, response_id)
+            else:
+                # Surfaces LLM failures and token timeouts.
+                await reader
+                if sequence:
+                    await self._publish_audio_chunk(
+                        session_id=session_id,
+                        chunk=framer.final_chunk(sample_rate),
+                        sequence=sequence,
+                        sample_rate=sample_rate,
+                        is_final=True,
+                        framer=framer,
+                    )
+
+            await self._ack(stream, message_id)
+
+            self._synthesis_total += 1
+            logger.info(
+                "Streaming synthesis completed",
+                extra={
+                    "session_id": session_id,
+                    "segments": segment_count,
+                    "chunks": sequence,
+                    "duration_ms": int((time.time() - start_time) * 1000),
+                },
+            )
+
+        except Exception as exc:
+            self._synthesis_failed += 1
+            logger.error(
+                "Streaming synthesis failed",
+                extra={"session_id": session_id, "error": str(exc)},
+                exc_info=True,
+            )
+            await self._publish_error(session_id, str(exc), response_id, correlation_id)
+            await self._ack(stream, message_id)
+
+        finally:
+            self._cancellations.close(token)
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+    async def _process_batch_sentence(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: str,
+    ) -> None:
+        """
+        Synthesizes one sentence of a long-form batch job.
+
+        The PCM16 audio of the sentence, or its error, is pushed to the
+        sentence's result key for the assembler (see `apps.workflows.tts_batch`);
+        nothing is published to the session. Sentences of a cancelled job
+        are acknowledged without synthesis.
+        """
+        job_id = data.get("job_id", "")
+        index = int(data.get("index", 0))
+        text = data.get("text", "")
+        voice = data.get("voice", settings.TTS_WORKER["DEFAULT_VOICE"])
+        speed = float(data.get("speed", settings.TTS_WORKER["DEFAULT_SPEED"]))
+        framer = AudioFramer("pcm16")
+
+        token = self._open_token(message_id, data)
+        try:
+            if token.cancelled:
+                self._synthesis_dropped += 1
+                await self._ack(stream, message_id)
+                return
+
+            try:
+                parts = []
+                async for chunk, _, _ in self._synthesize_stream(
+                    text=text,
+                    voice=voice,
+                    speed=speed,
+                    token=token,
+                    framer=framer,
+                    final_chunk=False,
+                ):
+                    parts.append(chunk)
+                result = encode_segment(b"".join(parts))
+                self._total_characters += len(text)
+                self._synthesis_total += 1
+            except Exception as exc:
+                self._synthesis_failed += 1
+                logger.error(
+                    "Batch sentence failed",
+                    extra={"job_id": job_id, "index": index, "error": str(exc)},
+                )
+                result = encode_failure(str(exc))
+
+            if not token.cancelled:
+                key = segment_key(job_id, index)
+                async with self._redis.client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(key, result)
+                    pipe.expire(key, settings.TTS_WORKER["BATCH_RESULT_TTL"])
+                    await pipe.execute()
+            await self._ack(stream, message_id)
+
+        finally:
+            self._cancellations.close(token)
+
+    async def _process_prerender(
+        self,
+        message_id: str,
+        data: dict[str, Any],
+        stream: str,
+    ) -> None:
+        """
+        Pre-renders persona phrases into the phrase cache.
+
+        `texts` is a JSON list of phrases and `formats` a comma-separated
+        list of output framings. Each phrase missing from the cache in any
+        of the framings is synthesized once and stored in all of them.
+        Nothing is published; failures are logged.
+        """
+        persona_id = data.get("persona_id", "")
+        voice = data.get("voice", settings.TTS_WORKER["DEFAULT_VOICE"])
+        speed = float(data.get("speed", settings.TTS_WORKER["DEFAULT_SPEED"]))
+        framers = [
+            AudioFramer(negotiate_format(name, settings.TTS_WORKER["OUTPUT_FORMAT"]))
+            for name in data.get("formats", "").split(",")
+            if name.strip()
+        ] or [self._framer(data)]
+
+        start_time = time.time()
+        token = self._open_token(message_id, data)
+        rendered = 0
+        try:
+            if self._phrases is None:
+                logger.warning(
+                    "Pre-render skipped, TTS cache disabled", extra={"persona_id": persona_id}
+                )
+                await self._ack(stream, message_id)
+                return
+
+            texts = json.loads(data.get("texts", "[]"))
+            for text in texts:
+                if token.cancelled:
+                    break
+                if self._phrases.cacheable(text):
+                    rendered += await self._prerender_phrase(text, voice, speed, framers, token)
+            await self._ack(stream, message_id)
+
+            self._synthesis_total += 1
+            logger.info(
+                "Pre-render completed",
+                extra={
+                    "persona_id": persona_id,
+                    "phrases": len(texts),
+                    "rendered": rendered,
+                    "formats": [framer.output_format for framer in framers],
+                    "duration_ms": int((time.time() - start_time) * 1000),
+                },
+            )
+
+        except Exception as exc:
+            self._synthesis_failed += 1
+            logger.error(
+                "Pre-render failed",
+                extra={"persona_id": persona_id, "error": str(exc)},
+                exc_info=True,
             )
+            await self._ack(stream, message_id)
+
+        finally:
+            self._cancellations.close(token)
+
+    async def _prerender_phrase(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        framers: list[AudioFramer],
+        token: CancellationToken,
+    ) -> int:
+        """
+        Synthesizes one phrase and caches it in every framing it is missing in.
+
+        Returns:
+            int: Number of cache entries written.
+        """
+        if not self._engine:
+            raise RuntimeError("Kokoro engine not initialized")
+        if voice not in self._engine.voice_names:
+            raise ValueError("Requested voice not available")
+
+        missing: dict[str, tuple[AudioFramer, CachedPhrase]] = {}
+        for framer in framers:
+            key = phrase_key(
+                text, voice, speed, KOKORO_SAMPLE_RATE, framer.output_format, "kokoro_onnx"
+            )
+            if key not in missing and await self._phrases.get(key) is None:
+                missing[key] = (
+                    framer,
+                    CachedPhrase(sample_rate=KOKORO_SAMPLE_RATE, duration_seconds=0.0),
+                )
+        if not missing:
+            return 0
+
+        framings = list(missing.values())
+        produced = False
+        for segment in self._text_segments(text):
+            if token.cancelled:
+                return 0
+            stream = self._engine.create_stream(text=segment, voice=voice, speed=speed)
+            async for audio_arr, sample_rate in until_cancelled(stream, token):
+                seconds = len(audio_arr) / sample_rate
+                self._total_audio_seconds += seconds
+                for index, (framer, phrase) in enumerate(framings):
+                    # encode() scales its input in place, so all but the last framing get a copy.
+                    samples = audio_arr if index == len(framings) - 1 else audio_arr.copy()
+                    phrase.sample_rate = sample_rate
+                    phrase.duration_seconds += seconds
+                    phrase.chunks.append(framer.to_cache(framer.encode(samples, sample_rate)))
+                produced = True
+
+        if not produced or token.cancelled:
+            return 0
+        for key, (_, phrase) in missing.items():
+            await self._phrases.put(key, phrase)
+        return len(missing)
+
+    @staticmethod
+    def _text_segments(text: str) -> list[str]:
+        """Splits a text into the sentences and clauses synthesized one by one."""
+        segmenter = SentenceSegmenter(
+            min_clause_chars=settings.TTS_WORKER["STREAM_MIN_CLAUSE_CHARS"],
+            max_chars=settings.TTS_WORKER["STREAM_MAX_SEGMENT_CHARS"],
+        )
+        return segmenter.feed(text) + segmenter.flush()
+
+    @staticmethod
+    async def _queued_segments(segments: asyncio.Queue[Optional[str]]):
+        """Yields queued segments until the None that ends the response."""
+        while (segment := await segments.get()) is not None:
+            yield segment
+
+    async def _read_llm_segments(
+        self,
+        stream: str,
+        last_id: str,
+        correlation_id: str,
+        segments: asyncio.Queue[Optional[str]],
+    ) -> None:
+        """
+        Feeds LLM tokens from a response's replay stream into a segmenter.
+
+        Messages after `last_id` are read. Complete segments are queued as
+        they appear; the remainder is queued when the response completes,
+        followed by None. Any part of the completion text that the received
+        tokens did not cover is spoken from the completion.
+
+        Raises:
+            RuntimeError: If the LLM request fails.
+            TimeoutError: If no token arrives within STREAM_IDLE_TIMEOUT.
+        """
+        segmenter = SentenceSegmenter(
+            min_clause_chars=settings.TTS_WORKER["STREAM_MIN_CLAUSE_CHARS"],
+            max_chars=settings.TTS_WORKER["STREAM_MAX_SEGMENT_CHARS"],
+        )
+        idle_timeout = settings.TTS_WORKER["STREAM_IDLE_TIMEOUT"]
+        received: list[str] = []
+        last_message = time.monotonic()
+        client = self._redis.client
+
+        try:
+            while True:
+                entries = await client.xread({stream: last_id}, count=100, block=1000)
+                if not entries:
+                    if time.monotonic() - last_message > idle_timeout:
+                        raise TimeoutError("No LLM tokens received for streaming TTS")
+                    continue
+
+                for _, messages in entries:
+                    for last_id, fields in messages:
+                        try:
+                            event = json.loads(fields.get("data", ""))
+                        except (json.JSONDecodeError, TypeError):
+                            continue
+                        if correlation_id and event.get("correlation_id") != correlation_id:
+                            continue
+                        last_message = time.monotonic()
+
+                        event_type = event.get("type")
+                        if event_type == "llm.token":
+                            token = event.get("token", "")
+                            received.append(token)
+                            for segment in segmenter.feed(token):
+                                segments.put_nowait(segment)
+                        elif event_type == "llm.completed":
+                            tail = unspoken_tail(event.get("text", ""), "".join(received))
+                            for segment in segmenter.feed(tail) + segmenter.flush():
+                                segments.put_nowait(segment)
+                            return
+                        elif event_type == "llm.failed":
+                            raise RuntimeError(f"LLM request failed: {event.get('error', '')}")
+        finally:
+            segments.put_nowait(None)
 
     async def _synthesize_stream(
         self,
         text: str,
         voice: str,
         speed: float,
-        session_id: str,
+        token: CancellationToken,
+        framer: AudioFramer,
+        final_chunk: bool = True,
     ):
         """
         Synthesizes speech from text into a stream of audio chunks.
 
+        The text is synthesized sentence by sentence (long sentences clause
+        by clause), so a cancelled request stops within the segment being
+        synthesized. Short phrases found in the phrase cache are replayed
+        chunk by chunk without running the model; synthesized phrases that
+        complete without cancellation are added to the cache. Phrases are
+        cached per output framing.
+
         Args:
             text: The text to synthesize.
             voice: The voice ID to use for synthesis.
             speed: The speech speed multiplier.
-            session_id: The ID of the current session, used for cancellation checks.
+            token: Cancellation token of the request.
+            framer: Encoder of the response's output framing.
+            final_chunk: Whether to end the stream with the final marker chunk.
 
         Yields:
-            tuple[str, int, bool]: A tuple containing base64 encoded audio chunk,
-                                   sample rate, and a boolean indicating if it's the final chunk.
+            tuple[Union[bytes, str], int, bool]: A tuple containing the encoded audio
+                chunk, sample rate, and a boolean indicating if it's the final chunk.
         """
         if not self._engine:
             raise RuntimeError("Kokoro engine not initialized")
 
-        try:
-            available_voices = self._engine.get_voices()
-            if voice not in available_voices:
-                raise ValueError("Requested voice not available")
-        except Exception as exc:
-            raise RuntimeError("Failed to validate voice") from exc
-
-        chunk_count = 0
-        async for audio_arr, sample_rate in self._engine.create_stream(
-            text=text,
-            voice=voice,
-            speed=speed,
-        ):
-            if session_id in self._cancelled_sessions:
+        if voice not in self._engine.voice_names:
+            raise ValueError("Requested voice not available")
+
+        cache_key = None
+        if self._phrases and self._phrases.cacheable(text):
+            cache_key = phrase_key(
+                text, voice, speed, KOKORO_SAMPLE_RATE, framer.output_format, "kokoro_onnx"
+            )
+            cached = await self._phrases.get(cache_key)
+            if cached is not None:
+                for cached_chunk in cached.chunks:
+                    if token.cancelled:
+                        return
+                    yield framer.from_cache(cached_chunk), cached.sample_rate, False
+                if final_chunk:
+                    yield framer.final_chunk(cached.sample_rate), cached.sample_rate, True
+                return
+
+        phrase = CachedPhrase(sample_rate=KOKORO_SAMPLE_RATE, duration_seconds=0.0)
+        produced = False
+        for segment in self._text_segments(text):
+            if token.cancelled:
                 break
+            stream = self._engine.create_stream(text=segment, voice=voice, speed=speed)
+            async for audio_arr, sample_rate in until_cancelled(stream, token):
+                seconds = len(audio_arr) / sample_rate
+                self._total_audio_seconds += seconds
+                chunk = framer.encode(audio_arr, sample_rate)
+                phrase.sample_rate = sample_rate
+                phrase.duration_seconds += seconds
+                if cache_key:
+                    phrase.chunks.append(framer.to_cache(chunk))
+                yield chunk, sample_rate, False
+                produced = True
+
+        if produced and not token.cancelled:
+            if cache_key:
+                await self._phrases.put(cache_key, phrase)
+            if final_chunk:
+                yield framer.final_chunk(phrase.sample_rate), phrase.sample_rate, True
+
+    def _open_token(self, message_id: str, data: dict[str, Any]) -> CancellationToken:
+        """
+        Returns the cancellation token of a request message.
 
-            self._total_audio_seconds += len(audio_arr) / sample_rate
-            buf = io.BytesIO()
-            sf.write(buf, audio_arr, sample_rate, format="WAV")
-            chunk_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
-            chunk_count += 1
-            yield chunk_b64, sample_rate, False
+        Requests without a response_id are keyed by their message ID. The
+        queue time comes from the stream entry ID, in milliseconds.
+        """
+        try:
+            requested_at = int(message_id.split("-", 1)[0]) / 1000
+        except ValueError:
+            requested_at = None
+        return self._cancellations.open(
+            data.get("session_id", ""),
+            data.get("response_id") or message_id,
+            requested_at,
+        )
+
+    async def _drop_cancelled(
+        self,
+        stream: str,
+        message_id: str,
+        data: dict[str, Any],
+    ) -> None:
+        """Acknowledges a request cancelled before it started, without synthesis."""
+        session_id = data.get("session_id", "")
+        response_id = data.get("response_id", "")
+        self._synthesis_dropped += 1
+        await self._publish_cancelled(session_id, response_id)
+        await self._ack(stream, message_id)
+        logger.info(
+            "Cancelled request dropped",
+            extra={"session_id": session_id, "response_id": response_id},
+        )
 
-        if chunk_count > 0:
-            buf = io.BytesIO()
-            sf.write(buf, np.zeros(1, dtype=np.float32), sample_rate, format="WAV")
-            yield base64.b64encode(buf.getvalue()).decode("utf-8"), sample_rate, True
+    @staticmethod
+    def _framer(data: dict[str, Any]) -> AudioFramer:
+        """Returns the encoder of the output framing requested by a message."""
+        return AudioFramer(
+            negotiate_format(data.get("format"), settings.TTS_WORKER["OUTPUT_FORMAT"])
+        )
 
     async def _publish_audio_chunk(
         self,
         session_id: str,
-        chunk_b64: str,
+        chunk: Union[bytes, str],
         sequence: int,
         sample_rate: int,
         is_final: bool,
+        framer: AudioFramer,
     ) -> None:
-        """Publishes a synthesized audio chunk to the appropriate Redis stream."""
+        """
+        Publishes a synthesized audio chunk to the appropriate Redis stream.
+
+        Binary framings store the raw frames as a binary field and send the
+        layout (format, sample_rate, channels) only with the first chunk of
+        a response; readers need a client with decode_responses=False. The
+        "wav" framing keeps the legacy per-chunk fields.
+        """
         stream_name = f"{settings.TTS_WORKER['CHANNEL_AUDIO_OUT']}:{session_id}"
-        await self._redis.client.xadd(
-            stream_name,
-            {
-                "chunk": chunk_b64,
-                "sequence": str(sequence),
-                "sample_rate": str(sample_rate),
-                "is_final": "1" if is_final else "0",
-                "timestamp": str(time.time()),
-            },
-            maxlen=1000,
-        )
+        fields: dict[str, Union[bytes, str]] = {
+            "chunk": chunk,
+            "sequence": str(sequence),
+            "is_final": "1" if is_final else "0",
+        }
+        if not framer.binary:
+            fields["sample_rate"] = str(sample_rate)
+            fields["timestamp"] = str(time.time())
+        elif sequence == 0:
+            fields.update(framer.header(sample_rate))
+        await self._redis.client.xadd(stream_name, fields, maxlen=1000)
 
     async def _publish_cancelled(self, session_id: str, response_id: str) -> None:
         """Publishes a cancellation message to the appropriate Redis channel."""
@@ -0,0 +1,121 @@
+"""
+Synthesize a long text file to a WAV file on the TTS workers.
+
+The text is read in chunks and split into sentences that the running TTS
+workers synthesize in parallel; the audio is appended to the output file in
+sentence order as it arrives, and the WAV header is completed at the end.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workflows.audio_framing import wav_header
+from apps.workflows.tts_batch import (
+    BatchJob,
+    binary_redis,
+    iter_sentences,
+    read_chunks,
+    synthesize_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def synthesize_file(
+    input_path: str,
+    output_path: str,
+    job: BatchJob,
+) -> tuple[int, float]:
+    """
+    Synthesizes a text file into a WAV file.
+
+    The output is written to a temporary file next to it and renamed once
+    complete.
+
+    Returns:
+        tuple[int, float]: Bytes of audio written and their duration in seconds.
+    """
+    config = settings.TTS_WORKER
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    redis = binary_redis()
+    data_bytes = 0
+    try:
+        with open(temp_path, "wb") as wav_file:
+            wav_file.write(wav_header(job.sample_rate, 1, 0))
+            async for pcm in synthesize_batch(
+                redis,
+                job,
+                iter_sentences(read_chunks(input_path), config["BATCH_MAX_SENTENCE_CHARS"]),
+                window=config["BATCH_WINDOW"],
+                timeout=config["BATCH_SEGMENT_TIMEOUT"],
+            ):
+                wav_file.write(pcm)
+                data_bytes += len(pcm)
+            wav_file.seek(0)
+            wav_file.write(wav_header(job.sample_rate, 1, data_bytes))
+        os.replace(temp_path, output_path)
+    finally:
+        await redis.aclose()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return data_bytes, data_bytes / 2 / job.sample_rate
+
+
+class Command(BaseCommand):
+    """Django management command to synthesize a long text file."""
+
+    help = "Synthesize a long text file to WAV on the running TTS workers"
+
+    def add_arguments(self, parser) -> None:
+        """Adds command-line arguments."""
+        parser.add_argument("input", help="UTF-8 text file to synthesize")
+        parser.add_argument("output", help="WAV file to write")
+        parser.add_argument(
+            "--voice",
+            default=settings.TTS_WORKER["DEFAULT_VOICE"],
+            help="Voice of the synthesis",
+        )
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=settings.TTS_WORKER["DEFAULT_SPEED"],
+            help="Speech speed multiplier",
+        )
+        parser.add_argument(
+            "--tenant",
+            default="batch",
+            help="Tenant the sentences are scheduled for",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Runs the synthesis."""
+        if not os.path.isfile(options["input"]):
+            raise CommandError(f"Input file not found: {options['input']}")
+
+        job = BatchJob.create(options["tenant"], options["voice"], options["speed"])
+        started = time.time()
+        try:
+            data_bytes, seconds = asyncio.run(
+                synthesize_file(options["input"], options["output"], job)
+            )
+        except (RuntimeError, TimeoutError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        elapsed = time.time() - started
+        logger.info(
+            "Batch synthesis completed",
+            extra={
+                "job_id": job.job_id,
+                "audio_seconds": round(seconds, 2),
+                "duration_ms": int(elapsed * 1000),
+            },
+        )
+        self.stdout.write(f"Wrote {seconds:.1f}s of audio to {options['output']} in {elapsed:.1f}s")
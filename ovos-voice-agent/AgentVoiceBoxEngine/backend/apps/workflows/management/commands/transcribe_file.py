@@ -0,0 +1,101 @@
+"""
+Transcribe a long WAV recording on the STT workers.
+
+The recording is memory-mapped and split at silence into chunks that idle
+STT workers decode in parallel; segments are printed (or appended to a
+JSON Lines file) in recording order as their chunks finish.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workflows.stt_batch import longform_redis, transcribe_recording
+
+logger = logging.getLogger(__name__)
+
+
+async def transcribe_file(
+    input_path: str,
+    output_path: Optional[str],
+    tenant_id: str,
+    language: Optional[str],
+) -> int:
+    """
+    Transcribes a recording, writing one JSON segment per line.
+
+    Returns:
+        int: Number of segments written.
+    """
+    redis = longform_redis()
+    output = open(output_path, "w", encoding="utf-8") if output_path else sys.stdout
+    segments = 0
+    try:
+        async for segment in transcribe_recording(redis, input_path, tenant_id, language=language):
+            output.write(json.dumps(segment.to_dict()) + "\n")
+            output.flush()
+            segments += 1
+    finally:
+        await redis.aclose()
+        if output is not sys.stdout:
+            output.close()
+    return segments
+
+
+class Command(BaseCommand):
+    """Django management command to transcribe a long recording."""
+
+    help = "Transcribe a long WAV recording on the running STT workers"
+
+    def add_arguments(self, parser) -> None:
+        """Adds command-line arguments."""
+        parser.add_argument("input", help="PCM16 or float32 WAV recording")
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="JSON Lines file to write (standard output when omitted)",
+        )
+        parser.add_argument(
+            "--language",
+            default=None,
+            help="Language of the recording (detected per chunk when omitted)",
+        )
+        parser.add_argument(
+            "--tenant",
+            default="batch",
+            help="Tenant the chunks are transcribed for",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """Runs the transcription."""
+        if not os.path.isfile(options["input"]):
+            raise CommandError(f"Input file not found: {options['input']}")
+
+        started = time.time()
+        try:
+            segments = asyncio.run(
+                transcribe_file(
+                    options["input"],
+                    options["output"],
+                    options["tenant"],
+                    options["language"],
+                )
+            )
+        except (ValueError, RuntimeError, TimeoutError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        elapsed = time.time() - started
+        logger.info(
+            "Long-form transcription completed",
+            extra={"segments": segments, "duration_ms": int(elapsed * 1000)},
+        )
+        if options["output"]:
+            self.stdout.write(f"Wrote {segments} segments to {options['output']} in {elapsed:.1f}s")
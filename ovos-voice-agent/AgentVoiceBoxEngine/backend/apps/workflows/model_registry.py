@@ -0,0 +1,359 @@
+"""
+Process-wide registry of loaded STT/TTS models.
+
+Models are keyed by (engine, model, device, compute_type, language), loaded
+lazily on first use and shared by every caller in the process: the Temporal
+activities, the Redis stream workers and the MCP tools. Loaded models are
+kept in an LRU; when the estimated memory of all loaded models exceeds the
+configured budget, the least recently used models are evicted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """
+    Identity of a loaded model.
+
+    Attributes:
+        engine: Loader name ("whisper", "kokoro", "kokoro_onnx").
+        model: Model name or path understood by the engine.
+        device: Device the model runs on ("cpu", "cuda").
+        compute_type: Engine-specific precision ("int8", "float16", "default").
+        language: Language the model instance is bound to, if any.
+    """
+
+    engine: str
+    model: str
+    device: str = "cpu"
+    compute_type: str = "default"
+    language: Optional[str] = None
+
+
+@dataclass
+class _Entry:
+    """A loaded model with its accounting data."""
+
+    model: Any
+    size_bytes: int
+    loaded_at: float
+    last_used: float
+    hits: int = 0
+
+
+Loader = Callable[[ModelKey], Any]
+Sizer = Callable[[Any], int]
+
+
+def rss_bytes() -> int:
+    """Returns the resident set size of this process, or 0 if unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily loading LRU of models.
+
+    Loads are serialized so concurrent callers never load the same model
+    twice and the resident-memory delta of a load can be attributed to it.
+    Eviction only drops the registry's reference; callers still holding a
+    model keep it alive until they are done with it.
+    """
+
+    def __init__(self, memory_budget_bytes: int = 0) -> None:
+        """
+        Initializes an empty registry.
+
+        Args:
+            memory_budget_bytes: Estimated memory allowed for loaded models
+                                 (0 disables eviction).
+        """
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries: OrderedDict[ModelKey, _Entry] = OrderedDict()
+        self._loaders: dict[str, tuple[Loader, Optional[Sizer]]] = {}
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self.loads_total = 0
+        self.evictions_total = 0
+
+    def register_loader(self, engine: str, loader: Loader, sizer: Optional[Sizer] = None) -> None:
+        """
+        Registers how models of an engine are loaded.
+
+        Args:
+            engine: Engine name used in `ModelKey.engine`.
+            loader: Callable building the model for a key.
+            sizer: Optional callable estimating a loaded model's size in bytes;
+                   by default the growth of the process RSS during the load is used.
+        """
+        with self._lock:
+            self._loaders[engine] = (loader, sizer)
+
+    def get(self, key: ModelKey) -> Any:
+        """
+        Returns the model for a key, loading it on first use.
+
+        Raises:
+            KeyError: If no loader is registered for the key's engine.
+        """
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+            if key.engine not in self._loaders:
+                raise KeyError(f"No model loader registered for engine: {key.engine}")
+            loader, sizer = self._loaders[key.engine]
+
+        with self._load_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry.model
+
+            started = time.monotonic()
+            rss_before = rss_bytes()
+            model = loader(key)
+            size = sizer(model) if sizer else max(0, rss_bytes() - rss_before)
+            now = time.monotonic()
+
+            with self._lock:
+                self._entries[key] = _Entry(model, size, now, now)
+                self.loads_total += 1
+                self._evict(keep=key)
+
+        logger.info(
+            "Model loaded",
+            extra={
+                "engine": key.engine,
+                "model": key.model,
+                "device": key.device,
+                "compute_type": key.compute_type,
+                "language": key.language,
+                "size_mb": round(size / (1024 * 1024), 1),
+                "load_ms": int((now - started) * 1000),
+            },
+        )
+        return model
+
+    async def aget(self, key: ModelKey) -> Any:
+        """Returns the model for a key without blocking the event loop on a load."""
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry.model
+        return await asyncio.to_thread(self.get, key)
+
+    def warmup(self, keys: list[ModelKey]) -> None:
+        """Loads the given models ahead of the first request, logging failures."""
+        for key in keys:
+            try:
+                self.get(key)
+            except Exception as exc:
+                logger.warning(
+                    "Model warmup failed",
+                    extra={"engine": key.engine, "model": key.model, "error": str(exc)},
+                )
+
+    def evict(self, key: ModelKey) -> bool:
+        """Drops a model from the registry. Returns True if it was loaded."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drops all models."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns registry counters and the loaded models."""
+        with self._lock:
+            return {
+                "loaded": len(self._entries),
+                "memory_bytes": sum(entry.size_bytes for entry in self._entries.values()),
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "loads_total": self.loads_total,
+                "evictions_total": self.evictions_total,
+                "models": [
+                    {
+                        "engine": key.engine,
+                        "model": key.model,
+                        "language": key.language,
+                        "size_bytes": entry.size_bytes,
+                        "hits": entry.hits,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+    def __contains__(self, key: ModelKey) -> bool:
+        """Returns True if the model is currently loaded."""
+        with self._lock:
+            return key in self._entries
+
+    def _touch(self, key: ModelKey) -> Optional[_Entry]:
+        """Marks a loaded model as most recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.hits += 1
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self, keep: ModelKey) -> None:
+        """Evicts least recently used models until within budget. Caller holds the lock."""
+        if self.memory_budget_bytes <= 0:
+            return
+        total = sum(entry.size_bytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.memory_budget_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry.size_bytes
+            self.evictions_total += 1
+            logger.info(
+                "Model evicted",
+                extra={"engine": key.engine, "model": key.model, "language": key.language},
+            )
+
+
+def resolve_device(device: str, compute_type: str) -> tuple[str, str]:
+    """
+    Resolves "auto" to an available device and adjusts the compute type.
+
+    float16 is not supported on CPU and falls back to int8.
+    """
+    if device == "auto":
+        try:
+            import torch
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        except ImportError:
+            device = "cpu"
+    if device == "cpu" and compute_type == "float16":
+        compute_type = "int8"
+    return device, compute_type
+
+
+def whisper_key(model: Optional[str] = None) -> ModelKey:
+    """Builds the registry key of a Whisper model on the configured STT device."""
+    device, compute_type = resolve_device(
+        settings.STT_WORKER["DEVICE"], settings.STT_WORKER["COMPUTE_TYPE"]
+    )
+    return ModelKey("whisper", model or settings.STT_WORKER["MODEL"], device, compute_type)
+
+
+def kokoro_key(language: str) -> ModelKey:
+    """Builds the registry key of a Kokoro pipeline for a language ("en-us" -> "en")."""
+    return ModelKey("kokoro", "kokoro", language=language.split("-")[0].lower())
+
+
+def kokoro_onnx_key() -> ModelKey:
+    """Builds the registry key of the configured Kokoro ONNX model."""
+    model_path = os.path.join(settings.TTS_WORKER["MODEL_DIR"], settings.TTS_WORKER["MODEL_FILE"])
+    return ModelKey("kokoro_onnx", model_path)
+
+
+def _load_whisper(key: ModelKey) -> Any:
+    """Loads a Faster-Whisper model sized for the CPUs of this process."""
+    from faster_whisper import WhisperModel
+
+    from apps.workflows.supervisor import available_cpus
+
+    num_workers = settings.STT_WORKER["NUM_WORKERS"]
+    cpu_threads = settings.STT_WORKER["CPU_THREADS"]
+    if key.device == "cpu" and cpu_threads <= 0:
+        cpu_threads = max(1, len(available_cpus()) // num_workers)
+    return WhisperModel(
+        key.model,
+        device=key.device,
+        compute_type=key.compute_type,
+        cpu_threads=max(0, cpu_threads),
+        num_workers=num_workers,
+    )
+
+
+def _load_kokoro(key: ModelKey) -> Any:
+    """Loads a Kokoro pipeline for one language."""
+    from kokoro import KPipeline
+
+    return KPipeline(lang_code=key.language)
+
+
+def _load_kokoro_onnx(key: ModelKey) -> Any:
+    """Loads the session replicas of a Kokoro ONNX model with the configured voices file."""
+    from apps.workflows.kokoro_runtime import KokoroReplicaPool, RuntimeConfig
+
+    voices_path = os.path.join(settings.TTS_WORKER["MODEL_DIR"], settings.TTS_WORKER["VOICES_FILE"])
+    if not os.path.exists(key.model):
+        raise FileNotFoundError(f"Kokoro model file not found: {key.model}")
+    if not os.path.exists(voices_path):
+        raise FileNotFoundError(f"Kokoro voices file not found: {voices_path}")
+    return KokoroReplicaPool.load(
+        key.model, voices_path, RuntimeConfig.from_settings(settings.TTS_WORKER)
+    )
+
+
+def parse_warmup(spec: str) -> list[ModelKey]:
+    """
+    Parses the MODEL_REGISTRY_WARMUP setting.
+
+    Entries are comma separated: `whisper:<model>`, `kokoro:<language>` or
+    `kokoro_onnx`. Unknown engines are skipped.
+    """
+    keys = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        engine, _, value = item.partition(":")
+        if engine == "whisper":
+            keys.append(whisper_key(value or None))
+        elif engine == "kokoro":
+            keys.append(kokoro_key(value or "en"))
+        elif engine == "kokoro_onnx":
+            keys.append(kokoro_onnx_key())
+        else:
+            logger.warning("Unknown model warmup entry", extra={"entry": item})
+    return keys
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Returns the process-wide registry with the built-in loaders registered."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = ModelRegistry(settings.MODEL_REGISTRY["MEMORY_BUDGET_MB"] * 1024 * 1024)
+                registry.register_loader("whisper", _load_whisper)
+                registry.register_loader("kokoro", _load_kokoro)
+                registry.register_loader("kokoro_onnx", _load_kokoro_onnx)
+                _registry = registry
+    return _registry
+
+
+def warmup_models(spec: Optional[str] = None) -> None:
+    """Loads the models listed in MODEL_REGISTRY_WARMUP (or `spec`) into the registry."""
+    keys = parse_warmup(spec if spec is not None else settings.MODEL_REGISTRY["WARMUP"])
+    if keys:
+        get_model_registry().warmup(keys)
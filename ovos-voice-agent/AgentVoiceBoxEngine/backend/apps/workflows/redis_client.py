@@ -125,3 +125,20 @@ class RedisClient:
             )
             self.start_reconnect()
             raise
+
+
+_shared_client: Optional[RedisClient] = None
+
+
+async def get_shared_redis() -> RedisClient:
+    """
+    Returns a connected Redis client shared by the activities of this process.
+
+    Stream workers own their client; Temporal activities and MCP tools, which
+    have no worker object to hold one, use this client instead.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = RedisClient()
+    await _shared_client.connect()
+    return _shared_client
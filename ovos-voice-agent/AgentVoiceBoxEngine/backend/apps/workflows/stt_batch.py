@@ -0,0 +1,338 @@
+"""
+Offline transcription of long recordings across the STT workers.
+
+The recording is memory-mapped and never read as a whole: chunk boundaries
+are placed at the quietest frame near every `chunk_seconds` (the silence
+between words or sentences), each chunk is extended by a small overlap on
+both sides, converted to 16 kHz mono PCM16 and queued as a `longform`
+message on the long-form STT stream. STT workers read that stream only when
+they have no live work, so long recordings use idle capacity; chunks fit
+one Whisper window and are decoded with timestamps through the regular
+micro-batcher, several at a time across the worker pool.
+
+Results come back per chunk and are consumed in chunk order. Stitching is
+deterministic: a chunk owns the time between its own boundaries, and a
+decoded segment is kept by the chunk that owns its midpoint, so words in an
+overlap are emitted exactly once. Only a window of chunks is in flight;
+when the consumer stops early, the chunks still queued are skipped.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import mmap
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+from django.conf import settings
+
+from apps.workflows.audio_framing import float32_to_pcm16
+from apps.workflows.audio_processing import (
+    PCM_ENCODINGS,
+    PCMFormat,
+    parse_wav,
+    pcm_to_float32,
+    resample,
+)
+
+KEY_PREFIX = "stt:longform"
+
+# Frame length used to look for silence near a chunk boundary.
+SILENCE_FRAME_MS = 20
+
+_EPSILON = 1e-10
+
+
+@dataclass(frozen=True)
+class ChunkPlan:
+    """
+    One chunk of a long recording, in source frames.
+
+    Attributes:
+        index: Position of the chunk in the recording.
+        start: First frame decoded, including the leading overlap.
+        end: Frame after the last one decoded, including the trailing overlap.
+        keep_start: First frame owned by the chunk.
+        keep_end: Frame after the last one owned by the chunk.
+    """
+
+    index: int
+    start: int
+    end: int
+    keep_start: int
+    keep_end: int
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    """A stitched segment of a long recording, in seconds from its start."""
+
+    start: float
+    end: float
+    text: str
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializes the segment."""
+        return {"start": round(self.start, 3), "end": round(self.end, 3), "text": self.text}
+
+
+@contextmanager
+def open_recording(path: str) -> Iterator[tuple[PCMFormat, memoryview]]:
+    """
+    Memory-maps a PCM16 or float32 WAV file.
+
+    Yields:
+        The frame layout and a view of the sample data; pages are read on demand.
+
+    Raises:
+        ValueError: If the file is empty or not a PCM16/float32 WAV file.
+    """
+    with open(path, "rb") as recording:
+        try:
+            mapped = mmap.mmap(recording.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise ValueError("Recording is empty") from exc
+        view = memoryview(mapped)
+        try:
+            parsed = parse_wav(view)
+            if parsed is None:
+                raise ValueError("Recording must be a PCM16 or float32 WAV file")
+            pcm_format, samples = parsed
+            try:
+                yield pcm_format, samples
+            finally:
+                samples.release()
+        finally:
+            view.release()
+            mapped.close()
+
+
+def frame_bytes(pcm_format: PCMFormat) -> int:
+    """Returns the bytes of one frame (all channels)."""
+    return PCM_ENCODINGS[pcm_format.encoding].itemsize * pcm_format.channels
+
+
+def read_frames(samples: memoryview, pcm_format: PCMFormat, start: int, end: int) -> np.ndarray:
+    """
+    Returns frames [start, end) as mono float32 at the source rate.
+
+    The result owns its memory, so no view of the mapping outlives the read.
+    """
+    size = frame_bytes(pcm_format)
+    audio = pcm_to_float32(samples[start * size : end * size], pcm_format)
+    return np.require(audio, requirements="O")
+
+
+def quietest_frame(audio: np.ndarray, frame_length: int) -> int:
+    """
+    Returns the offset of the centre of the quietest frame in an audio slice.
+
+    Ties go to the latest frame, so chunks are as long as possible.
+    """
+    n_frames = len(audio) // frame_length
+    if n_frames == 0:
+        return len(audio)
+    frames = audio[: n_frames * frame_length].reshape(n_frames, frame_length)
+    energy = 10.0 * np.log10(np.mean(np.square(frames), axis=1) + _EPSILON)
+    # Round so float noise does not decide between equally silent frames.
+    energy = np.round(energy, 1)
+    best = n_frames - 1 - int(np.argmin(energy[::-1]))
+    return best * frame_length + frame_length // 2
+
+
+def plan_chunks(
+    samples: memoryview,
+    pcm_format: PCMFormat,
+    chunk_seconds: float,
+    search_seconds: float,
+    overlap_seconds: float,
+) -> Iterator[ChunkPlan]:
+    """
+    Splits a recording into chunks cut at silence.
+
+    Each boundary is the quietest frame in the `search_seconds` before the
+    chunk would reach `chunk_seconds`; only that slice is read. Chunks are
+    extended by `overlap_seconds` on both sides within the recording.
+    """
+    rate = pcm_format.sample_rate
+    total = len(samples) // frame_bytes(pcm_format)
+    chunk = max(1, int(chunk_seconds * rate))
+    search = min(chunk - 1, int(search_seconds * rate))
+    overlap = int(overlap_seconds * rate)
+    frame_length = max(1, rate * SILENCE_FRAME_MS // 1000)
+
+    index = 0
+    keep_start = 0
+    while keep_start < total:
+        target = keep_start + chunk
+        if target >= total:
+            keep_end = total
+        else:
+            window_start = target - search
+            audio = read_frames(samples, pcm_format, window_start, target)
+            keep_end = window_start + quietest_frame(audio, frame_length)
+            keep_end = max(keep_end, keep_start + 1)
+        yield ChunkPlan(
+            index=index,
+            start=max(0, keep_start - overlap),
+            end=min(total, keep_end + overlap),
+            keep_start=keep_start,
+            keep_end=keep_end,
+        )
+        index += 1
+        keep_start = keep_end
+
+
+def chunk_pcm16(
+    samples: memoryview,
+    pcm_format: PCMFormat,
+    plan: ChunkPlan,
+    target_rate: int,
+) -> bytes:
+    """Returns a chunk as mono PCM16 at the target rate."""
+    audio = read_frames(samples, pcm_format, plan.start, plan.end)
+    audio = resample(audio, pcm_format.sample_rate, target_rate)
+    return float32_to_pcm16(audio).tobytes()
+
+
+def stitch(
+    plan: ChunkPlan,
+    sample_rate: int,
+    segments: list[list[Any]],
+) -> list[TranscriptSegment]:
+    """
+    Places the segments decoded from a chunk on the recording's timeline.
+
+    Args:
+        plan: The chunk the segments were decoded from.
+        sample_rate: Sample rate of the plan's frames.
+        segments: `[start, end, text]` relative to the chunk start; an end of
+            None means the segment runs to the end of the chunk.
+
+    Returns:
+        The segments whose midpoint the chunk owns, in order.
+    """
+    offset = plan.start / sample_rate
+    chunk_end = plan.end / sample_rate
+    keep_start = plan.keep_start / sample_rate
+    keep_end = plan.keep_end / sample_rate
+
+    stitched = []
+    for start, end, text in segments:
+        text = text.strip()
+        if not text:
+            continue
+        absolute_start = offset + start
+        absolute_end = min(chunk_end, offset + end) if end is not None else chunk_end
+        absolute_end = max(absolute_start, absolute_end)
+        midpoint = (absolute_start + absolute_end) / 2
+        if keep_start <= midpoint < keep_end:
+            stitched.append(TranscriptSegment(absolute_start, absolute_end, text))
+    return stitched
+
+
+def result_key(job_id: str, index: int) -> str:
+    """Returns the result key of a chunk."""
+    return f"{KEY_PREFIX}:{job_id}:{index}"
+
+
+def cancel_key(job_id: str) -> str:
+    """Returns the key marking a job whose remaining chunks must be skipped."""
+    return f"{KEY_PREFIX}:{job_id}:cancelled"
+
+
+def longform_stream() -> str:
+    """Returns the stream STT workers read long-form chunks from."""
+    return f"{settings.STT_WORKER['STREAM_AUDIO']}:longform"
+
+
+def longform_redis() -> aioredis.Redis:
+    """Returns a Redis client without a read timeout, for waiting on chunk results."""
+    config = settings.REDIS_WORKER
+    return aioredis.from_url(
+        config["URL"],
+        socket_timeout=None,
+        socket_connect_timeout=config["SOCKET_CONNECT_TIMEOUT"],
+        decode_responses=True,
+    )
+
+
+async def transcribe_recording(
+    redis: Any,
+    path: str,
+    tenant_id: str,
+    language: Optional[str] = None,
+    job_id: Optional[str] = None,
+) -> AsyncIterator[TranscriptSegment]:
+    """
+    Transcribes a long WAV recording on the STT workers, yielding segments in order.
+
+    Raises:
+        ValueError: If the file is not a PCM16/float32 WAV file.
+        TimeoutError: If a chunk result does not arrive in time.
+        RuntimeError: If the transcription of a chunk failed.
+    """
+    config = settings.STT_WORKER
+    job_id = job_id or uuid.uuid4().hex
+    target_rate = config["SAMPLE_RATE"]
+    stream = longform_stream()
+
+    with open_recording(path) as (pcm_format, samples):
+        plans = plan_chunks(
+            samples,
+            pcm_format,
+            chunk_seconds=config["LONGFORM_CHUNK_SECONDS"],
+            search_seconds=config["LONGFORM_SEARCH_SECONDS"],
+            overlap_seconds=config["LONGFORM_OVERLAP_MS"] / 1000,
+        )
+        pending: deque[ChunkPlan] = deque()
+
+        async def fill() -> None:
+            while len(pending) < max(1, config["LONGFORM_WINDOW"]):
+                plan = next(plans, None)
+                if plan is None:
+                    return
+                audio = chunk_pcm16(samples, pcm_format, plan, target_rate)
+                await redis.xadd(
+                    stream,
+                    {
+                        "type": "longform",
+                        "job_id": job_id,
+                        "index": str(plan.index),
+                        "audio": base64.b64encode(audio).decode("ascii"),
+                        "format": "pcm16",
+                        "sample_rate": str(target_rate),
+                        "channels": "1",
+                        "language": language or "",
+                        "tenant_id": tenant_id,
+                    },
+                )
+                pending.append(plan)
+
+        try:
+            await fill()
+            while pending:
+                plan = pending[0]
+                result = await redis.blpop(
+                    [result_key(job_id, plan.index)], timeout=config["LONGFORM_CHUNK_TIMEOUT"]
+                )
+                if result is None:
+                    raise TimeoutError(f"No transcript for chunk {plan.index} of job {job_id}")
+                pending.popleft()
+                payload = json.loads(result[1])
+                if "error" in payload:
+                    raise RuntimeError(f"Chunk transcription failed: {payload['error']}")
+                await fill()
+                for segment in stitch(plan, pcm_format.sample_rate, payload["segments"]):
+                    yield segment
+        finally:
+            if pending:
+                await redis.set(cancel_key(job_id), "1", ex=config["LONGFORM_RESULT_TTL"])
+                await redis.delete(*(result_key(job_id, plan.index) for plan in pending))
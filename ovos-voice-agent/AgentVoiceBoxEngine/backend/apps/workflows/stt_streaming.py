@@ -0,0 +1,262 @@
+"""
+Incremental (streaming) transcription state for realtime STT sessions.
+
+Implements the local-agreement policy used by streaming Whisper decoders:
+the rolling audio buffer of a session is re-decoded as new audio arrives,
+and the longest word prefix on which two consecutive hypotheses agree is
+committed. Audio behind fully committed, timestamp-closed segments is
+trimmed from the buffer so it is never decoded again.
+
+Chunks can reach the owning worker out of order, since forwarded chunks
+travel through a second stream; chunks numbered with a per-session `seq`
+are put back in order before they reach the buffer.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+from apps.workflows.audio_processing import VoiceActivityDetector
+
+_NORMALIZE_RE = re.compile(r"[^\w']+", re.UNICODE)
+
+# Out-of-order chunks held per session before a missing chunk is given up on.
+MAX_HELD_CHUNKS = 32
+
+
+@dataclass
+class HypothesisSegment:
+    """
+    A decoded segment of the session buffer.
+
+    Attributes:
+        start: Segment start in seconds, relative to the buffer start.
+        end: Segment end in seconds, or None if Whisper did not close it.
+        text: Decoded segment text.
+    """
+
+    start: float
+    end: Optional[float]
+    text: str
+
+
+@dataclass
+class StreamingUpdate:
+    """
+    Result of applying one hypothesis to a streaming session.
+
+    Attributes:
+        delta: Text committed by this update (empty if nothing became stable).
+        committed_text: All text committed so far for the current utterance.
+        unstable_text: Tail of the latest hypothesis that is not yet committed.
+    """
+
+    delta: str
+    committed_text: str
+    unstable_text: str
+
+
+def _normalize(word: str) -> str:
+    """Normalizes a word for agreement checks (case and punctuation insensitive)."""
+    return _NORMALIZE_RE.sub("", word.lower())
+
+
+class LocalAgreementBuffer:
+    """
+    Commits the longest common word prefix of consecutive hypotheses.
+
+    Words committed from the current audio buffer are remembered so they can
+    be skipped in the next hypothesis, which still covers the same audio until
+    the buffer is trimmed.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty agreement buffer."""
+        self.committed_in_buffer: list[str] = []
+        self._previous: list[str] = []
+
+    @property
+    def unstable(self) -> list[str]:
+        """Words of the latest hypothesis that are not committed yet."""
+        return list(self._previous)
+
+    def insert(self, words: list[str]) -> list[str]:
+        """
+        Applies a new hypothesis for the whole buffer.
+
+        Args:
+            words: All words decoded from the current buffer.
+
+        Returns:
+            list[str]: Words newly committed by this hypothesis.
+        """
+        candidate = words[len(self.committed_in_buffer) :]
+        agreed: list[str] = []
+        for previous, current in zip(self._previous, candidate):
+            if _normalize(previous) != _normalize(current):
+                break
+            agreed.append(current)
+
+        self.committed_in_buffer.extend(agreed)
+        self._previous = candidate[len(agreed) :]
+        return agreed
+
+    def flush(self) -> list[str]:
+        """Commits the unstable tail unconditionally (end of utterance)."""
+        flushed = self._previous
+        self.committed_in_buffer.extend(flushed)
+        self._previous = []
+        return flushed
+
+    def drop_committed(self, count: int) -> None:
+        """Forgets `count` leading committed words after their audio was trimmed."""
+        del self.committed_in_buffer[:count]
+
+    def reset(self) -> None:
+        """Clears all state."""
+        self.committed_in_buffer = []
+        self._previous = []
+
+
+@dataclass
+class StreamingSession:
+    """
+    Rolling audio buffer and agreement state for one streaming session.
+
+    Attributes:
+        session_id: Realtime session the buffer belongs to.
+        sample_rate: Sample rate of the buffered audio.
+        max_buffer_seconds: Buffer length that forces a commit and reset.
+        min_decode_seconds: New audio required before the buffer is re-decoded.
+        vad: Endpointing detector when server-side VAD is enabled for the session.
+        next_seq: Sequence number of the next chunk to process, None before the first one.
+        held: Chunks that arrived ahead of `next_seq`, by sequence number.
+    """
+
+    session_id: str
+    sample_rate: int
+    max_buffer_seconds: float
+    min_decode_seconds: float
+    audio: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    agreement: LocalAgreementBuffer = field(default_factory=LocalAgreementBuffer)
+    utterance_words: list[str] = field(default_factory=list)
+    undecoded_samples: int = 0
+    vad: Optional[VoiceActivityDetector] = None
+    last_activity: float = field(default_factory=time.monotonic)
+    next_seq: Optional[int] = None
+    held: dict[int, Any] = field(default_factory=dict)
+
+    @property
+    def buffer_seconds(self) -> float:
+        """Length of the buffered, not yet trimmed audio in seconds."""
+        return len(self.audio) / self.sample_rate
+
+    def append(self, samples: np.ndarray) -> None:
+        """Appends decoded float32 audio to the buffer."""
+        self.audio = np.concatenate((self.audio, samples.astype(np.float32, copy=False)))
+        self.undecoded_samples += len(samples)
+        self.last_activity = time.monotonic()
+
+    def order(self, seq: int, chunk: Any) -> list[Any]:
+        """
+        Puts a numbered chunk in sequence.
+
+        Producers number the chunks of a session from 0. A chunk ahead of
+        `next_seq` is held until the gap is filled; once more than
+        MAX_HELD_CHUNKS are held the missing chunks are given up on and
+        processing resumes at the oldest held one. Duplicates and chunks
+        behind `next_seq` are dropped. A session that starts past the first
+        MAX_HELD_CHUNKS numbers was taken over from another worker and
+        starts at the chunk it sees first.
+
+        Returns:
+            list[Any]: Chunks ready to be processed, in sequence order.
+        """
+        if self.next_seq is None:
+            self.next_seq = seq if seq > MAX_HELD_CHUNKS else 0
+        if seq < self.next_seq or seq in self.held:
+            return []
+        self.held[seq] = chunk
+        if len(self.held) > MAX_HELD_CHUNKS:
+            self.next_seq = min(self.held)
+
+        ready = []
+        while self.next_seq in self.held:
+            ready.append(self.held.pop(self.next_seq))
+            self.next_seq += 1
+        return ready
+
+    def ready_to_decode(self) -> bool:
+        """Returns True once enough new audio arrived to justify a re-decode."""
+        return self.undecoded_samples >= self.min_decode_seconds * self.sample_rate
+
+    def must_force_commit(self) -> bool:
+        """Returns True when the buffer exceeds its maximum length."""
+        return self.buffer_seconds >= self.max_buffer_seconds
+
+    def apply_hypothesis(self, segments: list[HypothesisSegment]) -> StreamingUpdate:
+        """
+        Applies a hypothesis decoded from the current buffer.
+
+        Newly agreed words are committed, then the buffer is trimmed up to the
+        end of the last closed segment whose words are all committed.
+        """
+        self.undecoded_samples = 0
+        words_per_segment = [segment.text.split() for segment in segments]
+        words = [word for segment_words in words_per_segment for word in segment_words]
+
+        delta = self.agreement.insert(words)
+        self.utterance_words.extend(delta)
+        self._trim(segments, words_per_segment)
+
+        return StreamingUpdate(
+            delta=" ".join(delta),
+            committed_text=" ".join(self.utterance_words),
+            unstable_text=" ".join(self.agreement.unstable),
+        )
+
+    def force_commit(self) -> StreamingUpdate:
+        """Commits the unstable tail and drops the whole buffer."""
+        delta = self.agreement.flush()
+        self.utterance_words.extend(delta)
+        self.agreement.reset()
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.undecoded_samples = 0
+        return StreamingUpdate(
+            delta=" ".join(delta),
+            committed_text=" ".join(self.utterance_words),
+            unstable_text="",
+        )
+
+    def finish_utterance(self) -> str:
+        """Commits everything, returns the utterance text and resets the session."""
+        self.force_commit()
+        text = " ".join(self.utterance_words)
+        self.utterance_words = []
+        return text
+
+    def _trim(
+        self,
+        segments: list[HypothesisSegment],
+        words_per_segment: list[list[str]],
+    ) -> None:
+        """Trims audio behind closed segments that are fully committed."""
+        committed = len(self.agreement.committed_in_buffer)
+        consumed_words = 0
+        trim_seconds = 0.0
+        for segment, segment_words in zip(segments, words_per_segment):
+            if segment.end is None or consumed_words + len(segment_words) > committed:
+                break
+            consumed_words += len(segment_words)
+            trim_seconds = segment.end
+
+        if trim_seconds <= 0:
+            return
+        trim_samples = min(len(self.audio), int(trim_seconds * self.sample_rate))
+        self.audio = self.audio[trim_samples:]
+        self.agreement.drop_committed(consumed_words)
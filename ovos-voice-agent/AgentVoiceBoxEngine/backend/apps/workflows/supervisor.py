@@ -0,0 +1,184 @@
+"""
+Multi-process supervisor for inference workers.
+
+Forks N worker processes, pins each to its own slice of the CPUs available
+to the supervisor and restarts processes that exit unexpectedly. Each child
+runs an independent worker (its own event loop, Redis connection and model)
+that joins the same Redis consumer group, so work is shared through the
+stream rather than through the supervisor.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Minimum delay between restarts of the same slot, so a worker that crashes
+# on startup does not spin the supervisor.
+RESTART_BACKOFF_SECONDS = 2.0
+
+
+def available_cpus() -> list[int]:
+    """Returns the CPUs this process may run on, in ascending order."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def partition_cpus(cpus: list[int], processes: int) -> list[list[int]]:
+    """
+    Splits CPUs into contiguous, near-equal sets, one per process.
+
+    Contiguous sets keep each process on neighbouring cores (and usually one
+    NUMA node). With fewer CPUs than processes, CPUs are shared round-robin.
+
+    Args:
+        cpus: CPU ids to distribute.
+        processes: Number of worker processes.
+
+    Returns:
+        list[list[int]]: One non-empty CPU set per process.
+    """
+    if processes <= 0:
+        raise ValueError("processes must be positive")
+    if not cpus:
+        raise ValueError("no CPUs to distribute")
+    if len(cpus) < processes:
+        return [[cpus[index % len(cpus)]] for index in range(processes)]
+
+    base, extra = divmod(len(cpus), processes)
+    sets = []
+    start = 0
+    for index in range(processes):
+        size = base + (1 if index < extra else 0)
+        sets.append(cpus[start : start + size])
+        start += size
+    return sets
+
+
+class WorkerSupervisor:
+    """
+    Forks and supervises pinned worker processes.
+
+    The target is called in each child as `target(index, cpus)` and should
+    block until the worker shuts down. SIGTERM/SIGINT received by the
+    supervisor are forwarded to all children, and the supervisor returns once
+    every child has exited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        processes: int,
+        target: Callable[[int, list[int]], None],
+        pin_cpus: bool = True,
+    ) -> None:
+        """
+        Initializes the supervisor.
+
+        Args:
+            name: Name used in log messages.
+            processes: Number of worker processes to run.
+            target: Worker entry point executed in each child.
+            pin_cpus: Whether to pin each child to its CPU set.
+        """
+        self.name = name
+        self.processes = processes
+        self.target = target
+        self.pin_cpus = pin_cpus and hasattr(os, "sched_setaffinity")
+        self.cpu_sets = partition_cpus(available_cpus(), processes)
+        self._children: dict[int, int] = {}
+        self._last_start: dict[int, float] = {}
+        self._stopping = False
+
+    def run(self) -> int:
+        """
+        Starts all workers and supervises them until shutdown.
+
+        Returns:
+            int: 0 after a clean shutdown.
+        """
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        for index in range(self.processes):
+            self._spawn(index)
+        logger.info(
+            "Worker supervisor started",
+            extra={
+                "supervisor": self.name,
+                "processes": self.processes,
+                "cpu_sets": [",".join(map(str, cpus)) for cpus in self.cpu_sets],
+            },
+        )
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            index = self._children.pop(pid, None)
+            if index is None:
+                continue
+            exit_code = os.waitstatus_to_exitcode(status)
+            if self._stopping:
+                logger.info(
+                    "Worker process exited",
+                    extra={"supervisor": self.name, "index": index, "exit_code": exit_code},
+                )
+                continue
+
+            logger.warning(
+                "Worker process died, restarting",
+                extra={"supervisor": self.name, "index": index, "exit_code": exit_code},
+            )
+            delay = self._last_start.get(index, 0.0) + RESTART_BACKOFF_SECONDS - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if not self._stopping:
+                self._spawn(index)
+
+        logger.info("Worker supervisor stopped", extra={"supervisor": self.name})
+        return 0
+
+    def _spawn(self, index: int) -> None:
+        """Forks the worker process for one slot."""
+        cpus = self.cpu_sets[index]
+        self._last_start[index] = time.monotonic()
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self.pin_cpus:
+                os.sched_setaffinity(0, cpus)
+            self.target(index, cpus)
+        except BaseException:
+            logger.exception(
+                "Worker process failed", extra={"supervisor": self.name, "index": index}
+            )
+            exit_code = 1
+        finally:
+            logging.shutdown()
+            os._exit(exit_code)
+
+    def _handle_signal(self, signum: int, frame: Optional[object]) -> None:
+        """Forwards a shutdown signal to every child."""
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
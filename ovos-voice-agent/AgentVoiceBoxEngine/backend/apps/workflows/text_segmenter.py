@@ -0,0 +1,152 @@
+"""
+Incremental text segmentation for streaming TTS.
+
+LLM tokens arrive a few characters at a time. `SentenceSegmenter` buffers
+them and releases text as soon as a sentence (or, for long sentences, a
+clause) is complete, so synthesis can start long before the response is
+finished. A boundary is only confirmed once the next non-space character
+has arrived, which lets abbreviations ("Dr. Smith", "e.g. this"), initials,
+decimals ("3.14") and thousands separators ("1,000") stay inside a segment.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+# Words that end with a period without ending the sentence.
+ABBREVIATIONS = frozenset(
+    {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "ft",
+        "vs", "etc", "e.g", "i.e", "cf", "approx", "dept", "est", "inc", "ltd",
+        "co", "corp", "no", "vol", "fig", "jan", "feb", "mar", "apr", "jun",
+        "jul", "aug", "sep", "sept", "oct", "nov", "dec", "a.m", "p.m", "u.s",
+    }
+)  # fmt: skip
+
+SENTENCE_END = ".!?…。！？"
+CLAUSE_END = ",;:—–"
+# Characters that belong to the segment after its terminal punctuation.
+CLOSERS = "\"'”’)]}»"
+
+_LAST_WORD = re.compile(r"([\w.]+)\.$")
+
+
+class SentenceSegmenter:
+    """
+    Splits a stream of text into speakable segments.
+
+    Sentences are always emitted at their end. Clause boundaries (",", ";",
+    ":" and dashes) split a sentence once the pending text reaches
+    `min_clause_chars`, and text longer than `max_chars` without any
+    boundary is split at the last space.
+    """
+
+    def __init__(self, min_clause_chars: int = 40, max_chars: int = 250) -> None:
+        """
+        Initializes the segmenter.
+
+        Args:
+            min_clause_chars: Pending length from which clause boundaries split.
+            max_chars: Longest segment emitted without a boundary.
+        """
+        self.min_clause_chars = min_clause_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+        # Offset up to which the buffer has been scanned for boundaries.
+        self._scanned = 0
+
+    def feed(self, text: str) -> list[str]:
+        """
+        Adds text and returns the segments it completes.
+
+        Returns:
+            list[str]: Complete segments, in order, stripped of outer whitespace.
+        """
+        self._buffer += text
+        segments = []
+        while True:
+            end = self._find_boundary()
+            if end is None:
+                break
+            segment = self._buffer[:end].strip()
+            self._buffer = self._buffer[end:]
+            self._scanned = 0
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> list[str]:
+        """Returns the remaining text as a final segment."""
+        segment = self._buffer.strip()
+        self._buffer = ""
+        self._scanned = 0
+        return [segment] if segment else []
+
+    def _find_boundary(self) -> Optional[int]:
+        """Returns the end of the first confirmed segment in the buffer, if any."""
+        buffer = self._buffer
+        index = self._scanned
+        while index < len(buffer):
+            char = buffer[index]
+            if char in SENTENCE_END or char in CLAUSE_END:
+                end = index + 1
+                while end < len(buffer) and buffer[end] in CLOSERS + SENTENCE_END:
+                    end += 1
+                next_index = end
+                while next_index < len(buffer) and buffer[next_index].isspace():
+                    next_index += 1
+                if next_index == len(buffer):
+                    # The next character decides; wait for more text.
+                    self._scanned = index
+                    return self._split_long()
+                if next_index > end and self._is_boundary(buffer, index, end, next_index):
+                    return end if end <= self.max_chars else self._split_long()
+                index = end
+                continue
+            index += 1
+
+        self._scanned = index
+        return self._split_long()
+
+    def _is_boundary(self, buffer: str, index: int, end: int, next_index: int) -> bool:
+        """Decides whether punctuation at `index` ends a segment."""
+        char = buffer[index]
+        following = buffer[next_index]
+
+        if char in CLAUSE_END:
+            return len(buffer[:end].strip()) >= self.min_clause_chars
+
+        if char == ".":
+            match = _LAST_WORD.search(buffer[: index + 1])
+            word = match.group(1).lower() if match else ""
+            if word in ABBREVIATIONS:
+                return False
+            # Initials ("J. R. R. Tolkien") and lowercase continuations.
+            if len(word) == 1 and word.isalpha():
+                return False
+            if following.islower():
+                return False
+        return True
+
+    def _split_long(self) -> Optional[int]:
+        """Splits an over-long buffer at its last space before `max_chars`."""
+        if len(self._buffer) <= self.max_chars:
+            return None
+        split = self._buffer.rfind(" ", 0, self.max_chars)
+        return split if split > 0 else self.max_chars
+
+
+def unspoken_tail(text: str, received: str) -> str:
+    """
+    Returns the part of a completed response that follows the received tokens.
+
+    All of `text` is returned when nothing was received. If the start of the
+    response was missed, only the text after the received tokens is returned,
+    since the missed start could no longer be spoken in order. Nothing is
+    returned when the received tokens are not part of the text.
+    """
+    if text.startswith(received):
+        return text[len(received) :]
+    start = text.rfind(received)
+    return text[start + len(received) :] if start >= 0 else ""
@@ -0,0 +1,170 @@
+"""
+Coalescing of streamed LLM tokens before they are published.
+
+Providers stream a token of a few characters at a time; publishing each one
+costs a JSON encoding and a Redis round trip. `TokenCoalescer` buffers the
+tokens of a response and releases them together after `flush_ms`, once
+`max_chars` are buffered or at the end of a sentence, whichever comes first.
+Sentence ends are released at once, so the TTS worker can start speaking a
+sentence as soon as it is complete; within a sentence, the delay is bounded
+by `flush_ms`, below what a listener or reader notices.
+
+Pub/sub drops messages published before a subscriber joins, so every
+message of a response is also appended to its replay stream
+(`replay_stream`), where a late reader such as the TTS worker finds the
+whole response from the first token on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Any, Optional
+
+from apps.workflows.text_segmenter import CLOSERS, SENTENCE_END
+
+# Marks the end of the token stream in the coalescing queue.
+_END = object()
+
+# Seconds a replay stream is kept after its last message.
+REPLAY_TTL_SECONDS = 300
+
+# Messages kept per replay stream.
+REPLAY_MAXLEN = 1000
+
+
+def replay_stream(channel: str, correlation_id: str) -> str:
+    """
+    Returns the stream replaying the messages of one response.
+
+    Args:
+        channel: The session's response channel.
+        correlation_id: Correlation ID of the response; responses without
+            one share the session's stream.
+    """
+    if not correlation_id:
+        return f"{channel}:replay"
+    return f"{channel}:replay:{correlation_id}"
+
+
+class TokenCoalescer:
+    """Buffers the tokens of one response and decides when to release them."""
+
+    def __init__(self, flush_ms: int, max_chars: int, sentences: bool = True) -> None:
+        """
+        Initializes an empty buffer.
+
+        Args:
+            flush_ms: Longest time a token is held; 0 releases every token.
+            max_chars: Buffered characters that release the buffer early.
+            sentences: Whether the end of a sentence releases the buffer.
+        """
+        self.flush_ms = flush_ms
+        self.max_chars = max_chars
+        self.sentences = sentences
+        self.tokens_total = 0
+        self._parts: list[str] = []
+        self._chars = 0
+        self._first_at: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, config: dict[str, Any]) -> TokenCoalescer:
+        """Creates a coalescer from the LLM_WORKER settings."""
+        return cls(
+            flush_ms=config["COALESCE_MS"],
+            max_chars=config["COALESCE_MAX_CHARS"],
+            sentences=config["COALESCE_SENTENCES"],
+        )
+
+    def add(self, token: str, now: float) -> Optional[str]:
+        """
+        Buffers a token.
+
+        Args:
+            token: The token text.
+            now: Monotonic time in seconds.
+
+        Returns:
+            Optional[str]: The buffered text if the token releases it, else None.
+        """
+        self.tokens_total += 1
+        if not token:
+            return None
+        if self._first_at is None:
+            self._first_at = now
+        self._parts.append(token)
+        self._chars += len(token)
+        if (
+            self.flush_ms <= 0
+            or self._chars >= self.max_chars
+            or (self.sentences and self._ends_sentence(token))
+            or self.time_left(now) == 0
+        ):
+            return self.flush()
+        return None
+
+    def time_left(self, now: float) -> Optional[float]:
+        """Returns the seconds until the buffer is due, or None when it is empty."""
+        if self._first_at is None:
+            return None
+        return max(0.0, self._first_at + self.flush_ms / 1000 - now)
+
+    def flush(self) -> str:
+        """Returns the buffered text and empties the buffer."""
+        text = "".join(self._parts)
+        self._parts.clear()
+        self._chars = 0
+        self._first_at = None
+        return text
+
+    @staticmethod
+    def _ends_sentence(token: str) -> bool:
+        """Whether a token ends a sentence or a line."""
+        if "\n" in token:
+            return True
+        stripped = token.rstrip().rstrip(CLOSERS)
+        return bool(stripped) and stripped[-1] in SENTENCE_END
+
+
+async def coalesce(tokens: AsyncIterable[str], coalescer: TokenCoalescer) -> AsyncIterator[str]:
+    """
+    Yields the tokens of a stream in coalesced batches.
+
+    The stream is read by a task of its own, so a batch is released when it
+    is due even while the provider is silent. Text still buffered when the
+    stream ends is left in the coalescer, so the caller can publish it
+    together with the end of the response. If the stream fails, the
+    buffered text is yielded before the error is raised.
+    """
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def read() -> None:
+        try:
+            async for token in tokens:
+                queue.put_nowait(token)
+        except Exception as exc:
+            queue.put_nowait(exc)
+            return
+        queue.put_nowait(_END)
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            timeout = coalescer.time_left(time.monotonic())
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield coalescer.flush()
+                continue
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                if text := coalescer.flush():
+                    yield text
+                raise item
+            if text := coalescer.add(item, time.monotonic()):
+                yield text
+    finally:
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
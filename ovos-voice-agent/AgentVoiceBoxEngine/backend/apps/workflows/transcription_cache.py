@@ -0,0 +1,190 @@
+"""
+Content-addressed cache of transcriptions.
+
+IVR prompts, test calls, health probes and replayed recordings send
+byte-identical audio through the STT pipeline many times a day. Results are
+cached under a hash of the decoded PCM plus every setting that changes the
+output (model, language, beam size and the caller's variant), so repeated
+audio skips the model entirely. Entries live in Redis with a TTL and in a
+small in-process LRU in front of it, which answers repeats without a
+network round trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+import numpy as np
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "stt:tx"
+
+
+def transcription_key(
+    audio: Union[np.ndarray, bytes],
+    model: str,
+    language: Optional[str],
+    beam_size: int,
+    variant: str = "",
+) -> str:
+    """
+    Builds the cache key of a transcription.
+
+    Args:
+        audio: Decoded float32 samples, or the raw payload when it could not
+               be decoded in memory.
+        model: Model name or path.
+        language: Language passed to the model (None when detected).
+        beam_size: Beam size of the decode.
+        variant: Caller-specific decode options (e.g. VAD, result shape).
+
+    Returns:
+        str: Redis key of the transcription.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{model}|{language or ''}|{beam_size}|{variant}|".encode())
+    if isinstance(audio, np.ndarray):
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).data)
+    else:
+        digest.update(audio)
+    return f"{KEY_PREFIX}:{digest.hexdigest()}"
+
+
+class TranscriptionCache:
+    """
+    Two-level (in-process LRU, then Redis) transcription cache.
+
+    Values are JSON-serializable dicts chosen by the caller. Redis failures
+    are logged and treated as misses so the cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        ttl: int,
+        local_size: int = 1024,
+        local_ttl: float = 300.0,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            redis: Redis client (decode_responses=True).
+            ttl: Seconds an entry is kept in Redis.
+            local_size: Entries kept in the in-process LRU (0 disables it).
+            local_ttl: Seconds an entry is kept in the in-process LRU.
+        """
+        self._redis = redis
+        self.ttl = ttl
+        self.local_size = local_size
+        self.local_ttl = min(local_ttl, ttl)
+        self._local: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Returns the cached value for a key, or None on a miss."""
+        now = time.monotonic()
+        local = self._local.get(key)
+        if local is not None:
+            if local[1] > now:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return local[0]
+            del self._local[key]
+
+        try:
+            raw = await self._redis.get(key)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Transcription cache read failed", extra={"error": str(exc)})
+            raw = None
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        value = json.loads(raw)
+        self.redis_hits += 1
+        self._remember(key, value, now)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Stores a value under a key in both levels."""
+        self._remember(key, value, time.monotonic())
+        try:
+            await self._redis.set(key, json.dumps(value), ex=self.ttl)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("Transcription cache write failed", extra={"error": str(exc)})
+
+    def stats(self) -> dict[str, Any]:
+        """Returns hit/miss counters."""
+        hits = self.local_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "transcription_cache_local_hits": self.local_hits,
+            "transcription_cache_redis_hits": self.redis_hits,
+            "transcription_cache_misses": self.misses,
+            "transcription_cache_errors": self.errors,
+            "transcription_cache_hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "transcription_cache_local_entries": len(self._local),
+        }
+
+    def _remember(self, key: str, value: dict[str, Any], now: float) -> None:
+        """Adds an entry to the in-process LRU, evicting the oldest beyond its size."""
+        if self.local_size <= 0:
+            return
+        self._local[key] = (value, now + self.local_ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+
+def cacheable(audio_seconds: float) -> bool:
+    """Returns True if the cache is enabled and the audio is short enough to cache."""
+    config = settings.TRANSCRIPTION_CACHE
+    return config["ENABLED"] and audio_seconds <= config["MAX_AUDIO_SECONDS"]
+
+
+def build_transcription_cache(redis: aioredis.Redis) -> Optional[TranscriptionCache]:
+    """Returns a cache configured from TRANSCRIPTION_CACHE, or None when disabled."""
+    config = settings.TRANSCRIPTION_CACHE
+    if not config["ENABLED"]:
+        return None
+    return TranscriptionCache(
+        redis,
+        ttl=config["TTL"],
+        local_size=config["LOCAL_SIZE"],
+        local_ttl=config["LOCAL_TTL"],
+    )
+
+
+_activity_cache: Optional[TranscriptionCache] = None
+
+
+async def get_activity_transcription_cache() -> Optional[TranscriptionCache]:
+    """Returns the process-wide cache used by the STT activities, or None when disabled."""
+    global _activity_cache
+    if not settings.TRANSCRIPTION_CACHE["ENABLED"]:
+        return None
+    if _activity_cache is None:
+        from apps.workflows.redis_client import get_shared_redis
+
+        try:
+            redis = await get_shared_redis()
+        except Exception as exc:
+            logger.warning("Transcription cache unavailable", extra={"error": str(exc)})
+            return None
+        _activity_cache = build_transcription_cache(redis.client)
+    return _activity_cache
@@ -0,0 +1,218 @@
+"""
+Long-form TTS synthesized sentence by sentence across the TTS workers.
+
+A long document is split into sentences as it is read. Each sentence is
+queued as a `batch` request on the batch TTS request stream, so every TTS
+worker process (and every free inference slot in it) synthesizes sentences
+in parallel. A worker pushes the PCM16 audio of its sentence to a result key
+of its own; the assembler pops the results in sentence order and yields
+them, joined back to back without crossfades.
+
+Only a window of sentences is in flight at a time: a new sentence is queued
+each time the oldest one is consumed. Memory, in Redis and in the assembling
+process, is bounded by the window and does not grow with the document.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import redis.asyncio as aioredis
+from django.conf import settings
+
+from apps.workflows.audio_framing import wav_header
+from apps.workflows.text_segmenter import SentenceSegmenter
+from apps.workflows.tts_scheduler import Priority, request_stream
+
+KEY_PREFIX = "tts:batch"
+
+# First byte of a sentence result.
+SEGMENT_OK = b"\x00"
+SEGMENT_FAILED = b"\x01"
+
+# Largest data size of a WAV header, used when the length is not known yet.
+STREAMING_DATA_BYTES = 0xFFFFFFFF - 36
+
+
+def iter_sentences(chunks: Iterable[str], max_chars: int) -> Iterator[str]:
+    """
+    Splits text read in chunks into sentences.
+
+    Sentences longer than `max_chars` are split at clause boundaries or
+    spaces. Only the pending sentence is held in memory.
+    """
+    segmenter = SentenceSegmenter(min_clause_chars=max_chars // 2, max_chars=max_chars)
+    for chunk in chunks:
+        yield from segmenter.feed(chunk)
+    yield from segmenter.flush()
+
+
+def segment_key(job_id: str, index: int) -> str:
+    """Returns the result key of a sentence."""
+    return f"{KEY_PREFIX}:{job_id}:{index}"
+
+
+def encode_segment(pcm: bytes) -> bytes:
+    """Encodes the result of a synthesized sentence."""
+    return SEGMENT_OK + pcm
+
+
+def encode_failure(error: str) -> bytes:
+    """Encodes the result of a sentence whose synthesis failed."""
+    return SEGMENT_FAILED + error.encode("utf-8", "replace")
+
+
+def decode_segment(raw: bytes) -> bytes:
+    """
+    Decodes a sentence result into its PCM16 audio.
+
+    Raises:
+        RuntimeError: If the synthesis of the sentence failed.
+    """
+    if raw[:1] == SEGMENT_FAILED:
+        raise RuntimeError(f"Sentence synthesis failed: {raw[1:].decode('utf-8', 'replace')}")
+    return raw[1:]
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """
+    A long-form synthesis job.
+
+    Attributes:
+        job_id: Identifier of the job, part of its result keys.
+        tenant_id: Tenant sharing the batch class fairly with others.
+        voice: Voice of every sentence.
+        speed: Speech speed of every sentence.
+        sample_rate: Sample rate of the audio.
+    """
+
+    job_id: str
+    tenant_id: str
+    voice: str
+    speed: float
+    sample_rate: int = 24000
+
+    @classmethod
+    def create(cls, tenant_id: str, voice: str, speed: float) -> BatchJob:
+        """Creates a job with a new ID."""
+        return cls(uuid.uuid4().hex, tenant_id, voice, speed)
+
+    @property
+    def session_id(self) -> str:
+        """Session of the sentence requests, used to cancel them together."""
+        return f"batch:{self.job_id}"
+
+    def request(self, index: int, text: str) -> dict[str, str]:
+        """Returns the TTS request fields of a sentence."""
+        return {
+            "type": "batch",
+            "job_id": self.job_id,
+            "index": str(index),
+            "text": text,
+            "voice": self.voice,
+            "speed": str(self.speed),
+            "session_id": self.session_id,
+            "response_id": self.session_id,
+            "tenant_id": self.tenant_id,
+            "priority": "batch",
+        }
+
+
+def binary_redis() -> aioredis.Redis:
+    """Returns a Redis client that reads sentence results as bytes."""
+    config = settings.REDIS_WORKER
+    return aioredis.from_url(
+        config["URL"],
+        socket_timeout=None,
+        socket_connect_timeout=config["SOCKET_CONNECT_TIMEOUT"],
+    )
+
+
+def read_chunks(path: str, size: int = 65536) -> Iterator[str]:
+    """Reads a UTF-8 text file in chunks."""
+    with open(path, encoding="utf-8") as text_file:
+        while chunk := text_file.read(size):
+            yield chunk
+
+
+async def synthesize_batch(
+    redis: Any,
+    job: BatchJob,
+    sentences: Iterable[str],
+    window: int,
+    timeout: float,
+) -> AsyncIterator[bytes]:
+    """
+    Synthesizes sentences on the TTS workers and yields their PCM16 audio in order.
+
+    If the consumer stops early or a sentence fails, the sentences still in
+    flight are cancelled and their results deleted.
+
+    Args:
+        redis: Redis client with decode_responses=False.
+        job: The job the sentences belong to.
+        sentences: Sentences, read lazily.
+        window: Sentences queued ahead of the one being consumed.
+        timeout: Seconds to wait for the result of one sentence.
+
+    Raises:
+        TimeoutError: If a sentence result does not arrive in time.
+        RuntimeError: If the synthesis of a sentence failed.
+    """
+    stream = request_stream(settings.TTS_WORKER["STREAM_REQUESTS"], Priority.BATCH)
+    source = iter(sentences)
+    pending: deque[int] = deque()
+    queued = 0
+
+    async def fill() -> None:
+        nonlocal queued
+        while len(pending) < max(1, window):
+            text = next(source, None)
+            if text is None:
+                return
+            await redis.xadd(stream, job.request(queued, text))
+            pending.append(queued)
+            queued += 1
+
+    try:
+        await fill()
+        while pending:
+            index = pending[0]
+            result = await redis.blpop([segment_key(job.job_id, index)], timeout=timeout)
+            if result is None:
+                raise TimeoutError(f"No audio for sentence {index} of batch {job.job_id}")
+            pending.popleft()
+            pcm = decode_segment(result[1])
+            await fill()
+            yield pcm
+    finally:
+        if pending:
+            await redis.publish(
+                f"{settings.TTS_WORKER['CHANNEL_TTS']}:{job.session_id}",
+                json.dumps({"type": "tts.cancel", "session_id": job.session_id}),
+            )
+            await redis.delete(*(segment_key(job.job_id, index) for index in pending))
+
+
+async def stream_wav(
+    redis: Any,
+    job: BatchJob,
+    sentences: Iterable[str],
+    window: int,
+    timeout: float,
+) -> AsyncIterator[bytes]:
+    """
+    Yields a streaming WAV file of a batch job.
+
+    The header carries the largest data size since the length is not known
+    until the last sentence; players read such files to their end.
+    """
+    yield wav_header(job.sample_rate, 1, STREAMING_DATA_BYTES)
+    async for pcm in synthesize_batch(redis, job, sentences, window, timeout):
+        yield pcm
@@ -0,0 +1,322 @@
+"""
+Two-tier cache of synthesized phrases.
+
+Greetings, hold messages, confirmations and persona intros are synthesized
+again on every call. Synthesized audio is cached under a hash of the
+normalized text and every setting that changes the audio (engine, voice,
+speed, sample rate and output format). The first tier is an in-process LRU
+bounded by a byte budget; the second is shared by all workers, in Redis or
+on a local disk. Entries store the audio chunks as they are published
+(binary framings base64 encoded), so a hit replays in the `tts:audio`
+stream format without touching the model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional, Protocol
+
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "tts:phrase"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text for cache lookups.
+
+    Applies NFKC and collapses whitespace. Case and punctuation are kept
+    because both change the synthesized prosody.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def phrase_key(
+    text: str,
+    voice: str,
+    speed: float,
+    sample_rate: int,
+    output_format: str,
+    engine: str,
+) -> str:
+    """
+    Builds the cache key of a synthesized phrase.
+
+    Args:
+        text: Text to synthesize (normalized here).
+        voice: Voice identifier.
+        speed: Speech speed multiplier.
+        sample_rate: Output sample rate.
+        output_format: Encoding of the cached chunks (e.g. "wav").
+        engine: Engine and language producing the audio (e.g. "kokoro_onnx").
+
+    Returns:
+        str: Key of the phrase in both tiers.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{engine}|{voice}|{speed:.3f}|{sample_rate}|{output_format}|".encode())
+    digest.update(normalize_text(text).encode())
+    return f"{KEY_PREFIX}:{digest.hexdigest()}"
+
+
+@dataclass
+class CachedPhrase:
+    """
+    Synthesized audio of one phrase.
+
+    Attributes:
+        sample_rate: Sample rate of the audio.
+        duration_seconds: Duration of the audio.
+        chunks: Base64 encoded chunks in publish order.
+    """
+
+    sample_rate: int
+    duration_seconds: float
+    chunks: list[str] = field(default_factory=list)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by the chunks."""
+        return sum(len(chunk) for chunk in self.chunks)
+
+    def dumps(self) -> str:
+        """Serializes the phrase for the shared store."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, raw: str) -> CachedPhrase:
+        """Deserializes a phrase from the shared store."""
+        return cls(**json.loads(raw))
+
+
+class PhraseStore(Protocol):
+    """Shared second tier of the phrase cache."""
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+
+class RedisPhraseStore:
+    """Phrase store in Redis, shared by every worker."""
+
+    def __init__(self, redis: aioredis.Redis) -> None:
+        """Initializes the store on a Redis client (decode_responses=True)."""
+        self._redis = redis
+
+    async def get(self, key: str) -> Optional[str]:
+        """Returns the serialized phrase, or None."""
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Stores a serialized phrase with a TTL."""
+        await self._redis.set(key, value, ex=ttl)
+
+
+class DiskPhraseStore:
+    """
+    Phrase store in a local directory, shared by the workers of one host.
+
+    Files are written atomically; entries older than the TTL are treated
+    as misses and replaced on the next store.
+    """
+
+    def __init__(self, directory: str, ttl: int) -> None:
+        """Initializes the store, creating the directory if needed."""
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Returns the file holding a key."""
+        return os.path.join(self.directory, key.rsplit(":", 1)[-1] + ".json")
+
+    async def get(self, key: str) -> Optional[str]:
+        """Returns the serialized phrase, or None if missing or expired."""
+        return await asyncio.to_thread(self._read, self._path(key))
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Stores a serialized phrase; expiry uses the store's TTL."""
+        await asyncio.to_thread(self._write, self._path(key), value)
+
+    def _read(self, path: str) -> Optional[str]:
+        """Reads a file unless it is older than the TTL."""
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, encoding="utf-8") as phrase_file:
+                return phrase_file.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write(path: str, value: str) -> None:
+        """Writes a file atomically."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as phrase_file:
+            phrase_file.write(value)
+        os.replace(temp_path, path)
+
+
+class TTSPhraseCache:
+    """
+    In-process LRU with a byte budget in front of a shared phrase store.
+
+    Store failures are logged and treated as misses so the cache never
+    fails a synthesis.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PhraseStore],
+        memory_budget_bytes: int,
+        ttl: int,
+        max_characters: int,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            store: Shared second tier, or None for an in-process cache only.
+            memory_budget_bytes: Bytes of chunks kept in the in-process LRU.
+            ttl: Seconds an entry is kept in the shared store.
+            max_characters: Longest normalized text that is cached.
+        """
+        self._store = store
+        self.memory_budget_bytes = memory_budget_bytes
+        self.ttl = ttl
+        self.max_characters = max_characters
+        self._local: OrderedDict[str, CachedPhrase] = OrderedDict()
+        self._local_bytes = 0
+        self.local_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def cacheable(self, text: str) -> bool:
+        """Returns True if a text is short enough to be cached."""
+        return 0 < len(normalize_text(text)) <= self.max_characters
+
+    async def get(self, key: str) -> Optional[CachedPhrase]:
+        """Returns the cached phrase for a key, or None on a miss."""
+        phrase = self._local.get(key)
+        if phrase is not None:
+            self._local.move_to_end(key)
+            self.local_hits += 1
+            return phrase
+
+        raw = None
+        if self._store is not None:
+            try:
+                raw = await self._store.get(key)
+            except Exception as exc:
+                self.errors += 1
+                logger.warning("TTS cache read failed", extra={"error": str(exc)})
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        phrase = CachedPhrase.loads(raw)
+        self.store_hits += 1
+        self._remember(key, phrase)
+        return phrase
+
+    async def put(self, key: str, phrase: CachedPhrase) -> None:
+        """Stores a phrase in both tiers."""
+        self._remember(key, phrase)
+        if self._store is None:
+            return
+        try:
+            await self._store.set(key, phrase.dumps(), self.ttl)
+        except Exception as exc:
+            self.errors += 1
+            logger.warning("TTS cache write failed", extra={"error": str(exc)})
+
+    def stats(self) -> dict[str, Any]:
+        """Returns hit/miss counters and the in-process footprint."""
+        hits = self.local_hits + self.store_hits
+        lookups = hits + self.misses
+        return {
+            "tts_cache_local_hits": self.local_hits,
+            "tts_cache_store_hits": self.store_hits,
+            "tts_cache_misses": self.misses,
+            "tts_cache_errors": self.errors,
+            "tts_cache_hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "tts_cache_local_entries": len(self._local),
+            "tts_cache_local_bytes": self._local_bytes,
+        }
+
+    def _remember(self, key: str, phrase: CachedPhrase) -> None:
+        """Adds a phrase to the LRU, evicting the oldest beyond the byte budget."""
+        size = phrase.size_bytes
+        if size > self.memory_budget_bytes:
+            return
+        previous = self._local.pop(key, None)
+        if previous is not None:
+            self._local_bytes -= previous.size_bytes
+        self._local[key] = phrase
+        self._local_bytes += size
+        while self._local_bytes > self.memory_budget_bytes:
+            _, evicted = self._local.popitem(last=False)
+            self._local_bytes -= evicted.size_bytes
+
+
+def build_phrase_cache(redis: Optional[aioredis.Redis]) -> Optional[TTSPhraseCache]:
+    """
+    Returns a phrase cache configured from TTS_CACHE, or None when disabled.
+
+    Args:
+        redis: Redis client for the "redis" backend.
+    """
+    config = settings.TTS_CACHE
+    if not config["ENABLED"]:
+        return None
+
+    store: Optional[PhraseStore] = None
+    if config["BACKEND"] == "redis" and redis is not None:
+        store = RedisPhraseStore(redis)
+    elif config["BACKEND"] == "disk":
+        store = DiskPhraseStore(config["DIRECTORY"], config["TTL"])
+
+    return TTSPhraseCache(
+        store,
+        memory_budget_bytes=config["MEMORY_BUDGET_MB"] * 1024 * 1024,
+        ttl=config["TTL"],
+        max_characters=config["MAX_CHARACTERS"],
+    )
+
+
+_activity_cache: Optional[TTSPhraseCache] = None
+
+
+async def get_activity_phrase_cache() -> Optional[TTSPhraseCache]:
+    """Returns the process-wide cache used by the TTS activities, or None when disabled."""
+    global _activity_cache
+    if not settings.TTS_CACHE["ENABLED"]:
+        return None
+    if _activity_cache is None:
+        redis = None
+        if settings.TTS_CACHE["BACKEND"] == "redis":
+            from apps.workflows.redis_client import get_shared_redis
+
+            try:
+                redis = (await get_shared_redis()).client
+            except Exception as exc:
+                logger.warning("TTS cache store unavailable", extra={"error": str(exc)})
+        _activity_cache = build_phrase_cache(redis)
+    return _activity_cache
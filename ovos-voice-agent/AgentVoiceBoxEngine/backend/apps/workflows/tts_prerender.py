@@ -0,0 +1,184 @@
+"""
+Pre-rendering of persona phrases into the TTS phrase cache.
+
+Every session of a persona opens with the same greeting and many turns reuse
+the same canned phrases. When a persona is saved, its greeting and canned
+phrases are queued on the batch TTS request stream as one `prerender`
+request; the TTS worker synthesizes each phrase once and stores it in the
+phrase cache in every pre-rendered output format. A session start then asks
+for the greeting at live priority and the worker replays it from the cache
+without running the model.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.workflows.audio_framing import OUTPUT_FORMATS
+from apps.workflows.tts_cache import normalize_text
+from apps.workflows.tts_scheduler import Priority, request_stream
+
+logger = logging.getLogger(__name__)
+
+# Persona fields whose change invalidates the pre-rendered audio.
+PRERENDER_FIELDS = frozenset({"greeting", "canned_phrases", "voice_id", "voice_speed"})
+
+
+def persona_phrases(
+    greeting: str,
+    canned_phrases: Iterable[Any],
+    max_characters: int,
+) -> list[str]:
+    """
+    Returns the phrases of a persona to pre-render, greeting first.
+
+    Phrases are normalized and de-duplicated; empty phrases and phrases too
+    long to be cached are skipped.
+    """
+    phrases: list[str] = []
+    for phrase in [greeting, *canned_phrases]:
+        if not isinstance(phrase, str):
+            continue
+        text = normalize_text(phrase)
+        if text and len(text) <= max_characters and text not in phrases:
+            phrases.append(text)
+    return phrases
+
+
+def prerender_formats(value: str) -> list[str]:
+    """
+    Parses TTS_CACHE_PRERENDER_FORMATS.
+
+    Unknown formats are skipped; an empty value selects every output format.
+    """
+    formats: list[str] = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if name in OUTPUT_FORMATS and name not in formats:
+            formats.append(name)
+    return formats or list(OUTPUT_FORMATS)
+
+
+def prerender_request(persona: Any) -> Optional[dict[str, str]]:
+    """
+    Builds the `prerender` TTS request of a persona.
+
+    Returns:
+        The request fields, or None when the persona has nothing to pre-render.
+    """
+    phrases = persona_phrases(
+        persona.greeting,
+        persona.canned_phrases or [],
+        settings.TTS_CACHE["MAX_CHARACTERS"],
+    )
+    if not phrases:
+        return None
+    return {
+        "type": "prerender",
+        "tenant_id": str(persona.tenant_id),
+        "persona_id": str(persona.id),
+        "voice": persona.voice_id,
+        "speed": str(persona.voice_speed),
+        "texts": json.dumps(phrases),
+        "formats": ",".join(prerender_formats(settings.TTS_CACHE["PRERENDER_FORMATS"])),
+        "priority": "batch",
+    }
+
+
+def enqueue_prerender(fields: dict[str, str]) -> None:
+    """
+    Queues a `prerender` request on the batch TTS request stream.
+
+    Failures are logged; a persona save never fails because of them.
+    """
+    import redis
+
+    stream = request_stream(settings.TTS_WORKER["STREAM_REQUESTS"], Priority.BATCH)
+    client = redis.Redis.from_url(
+        settings.REDIS_WORKER["URL"],
+        socket_timeout=settings.REDIS_WORKER["SOCKET_TIMEOUT"],
+        socket_connect_timeout=settings.REDIS_WORKER["SOCKET_CONNECT_TIMEOUT"],
+        decode_responses=True,
+    )
+    try:
+        client.xadd(stream, fields, maxlen=10000, approximate=True)
+        logger.info(
+            "Persona pre-render queued",
+            extra={"persona_id": fields["persona_id"], "stream": stream},
+        )
+    except Exception as exc:
+        logger.warning(
+            "Persona pre-render not queued",
+            extra={"persona_id": fields["persona_id"], "error": str(exc)},
+        )
+    finally:
+        client.close()
+
+
+def schedule_persona_prerender(persona: Any, changed: Optional[Iterable[str]] = None) -> bool:
+    """
+    Queues the pre-render of a persona once the current transaction commits.
+
+    Args:
+        persona: The saved VoicePersona.
+        changed: Fields changed by an update; None for a new persona. Updates
+            that change none of PRERENDER_FIELDS are not pre-rendered again.
+
+    Returns:
+        bool: True if a pre-render was scheduled.
+    """
+    if not (settings.TTS_CACHE["ENABLED"] and settings.TTS_CACHE["PRERENDER_ENABLED"]):
+        return False
+    if changed is not None and not PRERENDER_FIELDS.intersection(changed):
+        return False
+    if not persona.is_active:
+        return False
+    fields = prerender_request(persona)
+    if fields is None:
+        return False
+    transaction.on_commit(lambda: enqueue_prerender(fields))
+    return True
+
+
+def greeting_request(
+    session_id: str,
+    tenant_id: str,
+    config: dict[str, Any],
+) -> Optional[dict[str, str]]:
+    """
+    Builds the live TTS request speaking a session's greeting.
+
+    Reads the greeting, voice and speed from a persona configuration
+    (`voice.greeting`, `voice.id`, `voice.speed`) or a project configuration
+    (`tts.greeting`, `tts.voice`, `tts.speed`).
+
+    Returns:
+        The request fields, or None when the session has no greeting.
+    """
+    voice_config = config.get("voice")
+    if isinstance(voice_config, dict) and voice_config.get("greeting"):
+        greeting = voice_config["greeting"]
+        voice = voice_config.get("id")
+        speed = voice_config.get("speed")
+    else:
+        tts_config = config.get("tts")
+        if not isinstance(tts_config, dict) or not tts_config.get("greeting"):
+            return None
+        greeting = tts_config["greeting"]
+        voice = tts_config.get("voice")
+        speed = tts_config.get("speed")
+
+    return {
+        "session_id": session_id,
+        "tenant_id": tenant_id,
+        "response_id": f"greeting:{session_id}",
+        "text": normalize_text(greeting),
+        "voice": voice or settings.TTS_WORKER["DEFAULT_VOICE"],
+        "speed": str(speed if speed is not None else settings.TTS_WORKER["DEFAULT_SPEED"]),
+        "priority": "live",
+    }
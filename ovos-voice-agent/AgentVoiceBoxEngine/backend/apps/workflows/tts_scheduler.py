@@ -0,0 +1,461 @@
+"""
+Bounded, priority-aware scheduling of TTS inference.
+
+Every Kokoro inference competes for the same cores, so the TTS worker runs
+at most a fixed number of them at a time. Queued requests are dispatched by
+priority class (live conversational turns, then interactive previews and
+MCP requests, then batch work) and, within a class, round-robin across
+tenants so one tenant's bulk job cannot starve another's. Slots can be
+reserved for live turns: lower classes never occupy them, so a live turn
+always finds a free slot as soon as any live work finishes, however much
+batch work is queued.
+
+The worker reads new requests only while the scheduler has room for them
+(`capacity`), leaving the rest in Redis where other workers can take them.
+Requests handled outside the slots, such as LLM-backed requests waiting
+for their response, are held against their class's capacity (`hold`), so
+a burst of them cannot grow past what a worker would queue.
+
+Each request gets a `CancellationToken` keyed by its response_id. Cancelling
+a response (or every response of a session, on barge-in) sets the tokens of
+requests in progress, and a short-lived record makes requests of that
+response, or of the session queued before the cancel, start cancelled so
+they are dropped without running the model. `until_cancelled` stops
+consuming an inference stream as soon as its token is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Priority classes of TTS requests; lower values are served first."""
+
+    LIVE = 0
+    INTERACTIVE = 1
+    BATCH = 2
+
+
+# Accepted values of the `priority` request field.
+PRIORITY_NAMES = {
+    "live": Priority.LIVE,
+    "realtime": Priority.LIVE,
+    "interactive": Priority.INTERACTIVE,
+    "preview": Priority.INTERACTIVE,
+    "mcp": Priority.INTERACTIVE,
+    "batch": Priority.BATCH,
+}
+
+
+def parse_priority(value: Optional[str], default: Priority = Priority.LIVE) -> Priority:
+    """Returns the priority class named by a request field, or `default`."""
+    return PRIORITY_NAMES.get((value or "").strip().lower(), default)
+
+
+def request_stream(base: str, priority: Priority) -> str:
+    """
+    Returns the request stream of a priority class.
+
+    Live requests use the base stream so existing producers keep working;
+    the other classes use `<base>:interactive` and `<base>:batch`.
+    """
+    if priority == Priority.LIVE:
+        return base
+    return f"{base}:{priority.name.lower()}"
+
+
+@dataclass
+class _Job:
+    """A queued request with the coroutine that processes it."""
+
+    run: Callable[[], Awaitable[None]]
+    enqueued_at: float
+
+
+@dataclass
+class _ClassQueue:
+    """Queued jobs of one priority class, one FIFO per tenant."""
+
+    tenants: OrderedDict[str, deque[_Job]] = field(default_factory=OrderedDict)
+    size: int = 0
+    running: int = 0
+    held: int = 0
+    dispatched: int = 0
+    queue_wait_ms: deque = field(default_factory=lambda: deque(maxlen=1024))
+
+    def push(self, tenant_id: str, job: _Job) -> None:
+        """Appends a job to its tenant's FIFO."""
+        self.tenants.setdefault(tenant_id, deque()).append(job)
+        self.size += 1
+
+    def pop(self) -> _Job:
+        """Takes the next job of the tenant whose turn it is."""
+        tenant_id, jobs = next(iter(self.tenants.items()))
+        job = jobs.popleft()
+        # Round-robin: the tenant goes to the back of the rotation.
+        del self.tenants[tenant_id]
+        if jobs:
+            self.tenants[tenant_id] = jobs
+        self.size -= 1
+        return job
+
+
+class TTSScheduler:
+    """
+    Runs queued TTS jobs in a fixed number of inference slots.
+
+    Jobs are coroutine functions; exceptions they raise are logged and do
+    not affect other jobs.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        reserved_live_slots: int = 0,
+        queue_depth: int = 8,
+    ) -> None:
+        """
+        Initializes the scheduler.
+
+        Args:
+            slots: Maximum number of jobs running at the same time.
+            reserved_live_slots: Slots only live jobs may use.
+            queue_depth: Jobs of each class held locally while waiting for
+                a slot; more are left in Redis until capacity frees up.
+        """
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        if not 0 <= reserved_live_slots < slots:
+            raise ValueError("reserved_live_slots must be between 0 and slots - 1")
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1")
+
+        self.slots = slots
+        self.reserved_live_slots = reserved_live_slots
+        self.queue_depth = queue_depth
+        self._classes = {priority: _ClassQueue() for priority in Priority}
+        self._tasks: set[asyncio.Task] = set()
+        self._changed = asyncio.Event()
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently running."""
+        return sum(queue.running for queue in self._classes.values())
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a slot."""
+        return sum(queue.size for queue in self._classes.values())
+
+    def capacity(self, priority: Priority) -> int:
+        """
+        Returns how many more requests of a class should be read.
+
+        Counts the slots the class could start right now plus room in its
+        local queue, less the requests held outside the slots, so requests
+        are pulled from Redis only as fast as they can be served.
+        """
+        queue = self._classes[priority]
+        free = self._free_slots(priority)
+        return max(0, free + self.queue_depth - queue.size - queue.held)
+
+    def hold(self, priority: Priority) -> None:
+        """Counts a request handled outside the slots against its class's capacity."""
+        self._classes[priority].held += 1
+
+    def release(self, priority: Priority) -> None:
+        """Returns the capacity taken by `hold` once its request has finished."""
+        self._classes[priority].held -= 1
+        self._changed.set()
+
+    def submit(
+        self,
+        priority: Priority,
+        tenant_id: str,
+        run: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Queues a job and starts it as soon as a slot is free."""
+        self._classes[priority].push(tenant_id, _Job(run, time.monotonic()))
+        self._dispatch()
+
+    async def execute(
+        self,
+        priority: Priority,
+        tenant_id: str,
+        run: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Queues a job and waits for it to finish in a slot.
+
+        Unlike `submit`, the job's result or exception is returned to the
+        caller. A job whose caller is cancelled before it starts is skipped.
+        """
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+
+        async def job() -> None:
+            if future.done():
+                return
+            try:
+                result = await run()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+        self.submit(priority, tenant_id, job)
+        return await future
+
+    async def wait_for_capacity(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until any class has capacity.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        while not any(self.capacity(priority) for priority in Priority):
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def join(self) -> None:
+        """Waits until every queued and running job has finished."""
+        while self._tasks or self.queued:
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def cancel_all(self) -> None:
+        """Drops queued jobs and cancels running ones."""
+        for queue in self._classes.values():
+            queue.tenants.clear()
+            queue.size = 0
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns slot usage, queue sizes and queue waits per class."""
+
+        def _percentile(values: list[float], pct: float) -> float:
+            if not values:
+                return 0.0
+            index = min(len(values) - 1, int(round(pct * (len(values) - 1))))
+            return values[index]
+
+        result: dict[str, Any] = {"tts_slots": self.slots, "tts_running": self.running}
+        for priority, queue in self._classes.items():
+            name = priority.name.lower()
+            waits = sorted(queue.queue_wait_ms)
+            result[f"tts_{name}_queued"] = queue.size
+            result[f"tts_{name}_held"] = queue.held
+            result[f"tts_{name}_dispatched"] = queue.dispatched
+            result[f"tts_{name}_wait_ms_p95"] = round(_percentile(waits, 0.95), 1)
+        return result
+
+    def _free_slots(self, priority: Priority) -> int:
+        """Returns the slots a job of this class could start in now."""
+        free = self.slots - self.running
+        if priority != Priority.LIVE:
+            non_live = self.running - self._classes[Priority.LIVE].running
+            free = min(free, self.slots - self.reserved_live_slots - non_live)
+        return max(0, free)
+
+    def _dispatch(self) -> None:
+        """Starts queued jobs, highest class first, while slots are free."""
+        for priority, queue in self._classes.items():
+            while queue.size and self._free_slots(priority):
+                job = queue.pop()
+                queue.running += 1
+                queue.dispatched += 1
+                queue.queue_wait_ms.append((time.monotonic() - job.enqueued_at) * 1000)
+                task = asyncio.create_task(self._run(priority, job))
+                self._tasks.add(task)
+        self._changed.set()
+
+    async def _run(self, priority: Priority, job: _Job) -> None:
+        """Runs a job and hands its slot to the next one."""
+        try:
+            await job.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("TTS job failed", extra={"error": str(exc)}, exc_info=True)
+        finally:
+            self._classes[priority].running -= 1
+            self._tasks.discard(asyncio.current_task())
+            self._dispatch()
+
+
+@dataclass(eq=False)
+class CancellationToken:
+    """
+    Cancellation state of one TTS request.
+
+    Attributes:
+        session_id: Session the request speaks for.
+        response_id: Response the request belongs to.
+    """
+
+    session_id: str
+    response_id: str
+    _event: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the request has been cancelled."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Marks the request as cancelled."""
+        self._event.set()
+
+    async def wait(self) -> None:
+        """Waits until the request is cancelled."""
+        await self._event.wait()
+
+
+class CancellationRegistry:
+    """
+    Cancellation tokens of the requests a worker holds.
+
+    Cancelled response_ids and session-wide cancels are remembered for `ttl`
+    seconds, so requests that arrive or start later still see them; older
+    records are pruned and memory stays bounded.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """
+        Initializes the registry.
+
+        Args:
+            ttl: Seconds a cancelled response or session is remembered.
+        """
+        self.ttl = ttl
+        self._active: set[CancellationToken] = set()
+        self._cancelled_responses: dict[str, float] = {}
+        self._cancelled_sessions: dict[str, float] = {}
+        self.cancelled_total = 0
+
+    def open(
+        self,
+        session_id: str,
+        response_id: str,
+        requested_at: Optional[float] = None,
+    ) -> CancellationToken:
+        """
+        Returns the token of a request that is about to start.
+
+        The token is already cancelled if its response was cancelled, or if
+        its session was cancelled after the request was queued.
+
+        Args:
+            session_id: Session of the request.
+            response_id: Response of the request.
+            requested_at: Epoch seconds at which the request was queued.
+        """
+        now = time.time()
+        self.prune(now)
+        token = CancellationToken(session_id, response_id)
+        session_cancelled_at = self._cancelled_sessions.get(session_id)
+        if response_id in self._cancelled_responses or (
+            session_cancelled_at is not None
+            and (requested_at if requested_at is not None else now) <= session_cancelled_at
+        ):
+            token.cancel()
+        self._active.add(token)
+        return token
+
+    def close(self, token: CancellationToken) -> None:
+        """Forgets the token of a finished request."""
+        self._active.discard(token)
+
+    def cancel(self, session_id: str, response_id: str = "") -> int:
+        """
+        Cancels one response, or every response of a session.
+
+        Returns:
+            int: Number of requests in progress that were cancelled.
+        """
+        now = time.time()
+        self.prune(now)
+        if response_id:
+            self._cancelled_responses[response_id] = now
+        else:
+            self._cancelled_sessions[session_id] = now
+
+        count = 0
+        for token in self._active:
+            if token.cancelled or token.session_id != session_id:
+                continue
+            if not response_id or token.response_id == response_id:
+                token.cancel()
+                count += 1
+        self.cancelled_total += count
+        return count
+
+    def prune(self, now: Optional[float] = None) -> None:
+        """Drops cancellation records older than the TTL."""
+        cutoff = (now if now is not None else time.time()) - self.ttl
+        for records in (self._cancelled_responses, self._cancelled_sessions):
+            for key in [key for key, at in records.items() if at < cutoff]:
+                del records[key]
+
+    def stats(self) -> dict[str, int]:
+        """Returns the number of tracked tokens and records."""
+        return {
+            "tts_cancel_active_tokens": len(self._active),
+            "tts_cancel_records": len(self._cancelled_responses) + len(self._cancelled_sessions),
+            "tts_cancelled_total": self.cancelled_total,
+        }
+
+
+async def until_cancelled(items: AsyncIterable[T], token: CancellationToken) -> AsyncIterator[T]:
+    """
+    Yields items until the token is cancelled.
+
+    Waiting for the next item is raced against the token, so a cancel takes
+    effect without waiting for the item in progress; the source iterator is
+    closed either way.
+    """
+    iterator = items.__aiter__()
+    try:
+        while not token.cancelled:
+            step = asyncio.ensure_future(iterator.__anext__())
+            waiter = asyncio.ensure_future(token.wait())
+            try:
+                await asyncio.wait({step, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            if not step.done():
+                step.cancel()
+                await asyncio.gather(step, return_exceptions=True)
+                return
+            try:
+                item = step.result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -359,6 +359,8 @@ LLM_WORKER = {
     "TEMPERATURE": env.llm_temperature,
     "CIRCUIT_BREAKER_THRESHOLD": env.llm_circuit_breaker_threshold,
     "CIRCUIT_BREAKER_TIMEOUT": env.llm_circuit_breaker_timeout,
+    "CIRCUIT_BREAKER_SHARED": env.llm_circuit_breaker_shared,
+    "CIRCUIT_BREAKER_PROBE_TIMEOUT": env.llm_circuit_breaker_probe_timeout,
     "MAX_HISTORY_ITEMS": env.llm_max_history_items,
     "PROVIDER_PRIORITY": [
         provider.strip()
@@ -368,13 +370,56 @@ LLM_WORKER = {
     "STREAM_REQUESTS": env.llm_stream_requests,
     "GROUP_WORKERS": env.llm_group_workers,
     "RESPONSE_CHANNEL": env.llm_response_channel,
+    "HTTP2": env.llm_http2,
+    "HTTP_MAX_CONNECTIONS": env.llm_http_max_connections,
+    "HTTP_MAX_KEEPALIVE": env.llm_http_max_keepalive,
+    "HTTP_KEEPALIVE_EXPIRY": env.llm_http_keepalive_expiry,
+    "HTTP_CONNECT_TIMEOUT": env.llm_http_connect_timeout,
+    "HTTP_READ_TIMEOUT": env.llm_http_read_timeout,
+    "HTTP_POOL_TIMEOUT": env.llm_http_pool_timeout,
+    "HTTP_PRECONNECT": env.llm_http_preconnect,
+    "COALESCE_MS": env.llm_coalesce_ms,
+    "COALESCE_MAX_CHARS": env.llm_coalesce_max_chars,
+    "COALESCE_SENTENCES": env.llm_coalesce_sentences,
+    "ROUTING": env.llm_routing,
+    "ROUTING_EWMA_ALPHA": env.llm_routing_ewma_alpha,
+    "ROUTING_MAX_ERROR_RATE": env.llm_routing_max_error_rate,
+    "ROUTING_WINDOW": env.llm_routing_window,
+    "HEDGE_ENABLED": env.llm_hedge_enabled,
+    "HEDGE_MIN_MS": env.llm_hedge_min_ms,
+    "HEDGE_MAX_MS": env.llm_hedge_max_ms,
+    "HEDGE_MIN_SAMPLES": env.llm_hedge_min_samples,
 }
 
 STT_WORKER = {
     "MODEL": env.stt_model,
     "DEVICE": env.stt_device,
     "COMPUTE_TYPE": env.stt_compute_type,
+    "PROCESSES": env.stt_worker_processes,
+    "CPU_THREADS": env.stt_cpu_threads,
+    "NUM_WORKERS": env.stt_num_workers,
+    "PIN_CPUS": env.stt_pin_cpus,
     "BATCH_SIZE": env.stt_batch_size,
+    "BATCH_MAX_WAIT_MS": env.stt_batch_max_wait_ms,
+    "STREAM_MIN_DECODE_MS": env.stt_stream_min_decode_ms,
+    "STREAM_MAX_BUFFER_SECONDS": env.stt_stream_max_buffer_seconds,
+    "STREAM_SESSION_TTL": env.stt_stream_session_ttl,
+    "LONGFORM_CHUNK_SECONDS": env.stt_longform_chunk_seconds,
+    "LONGFORM_SEARCH_SECONDS": env.stt_longform_search_seconds,
+    "LONGFORM_OVERLAP_MS": env.stt_longform_overlap_ms,
+    "LONGFORM_WINDOW": env.stt_longform_window,
+    "LONGFORM_CONCURRENCY": env.stt_longform_concurrency,
+    "LONGFORM_CHUNK_TIMEOUT": env.stt_longform_chunk_timeout,
+    "LONGFORM_RESULT_TTL": env.stt_longform_result_ttl,
+    "VAD_ENABLED": env.stt_vad_enabled,
+    "VAD_FRAME_MS": env.stt_vad_frame_ms,
+    "VAD_ENERGY_THRESHOLD_DB": env.stt_vad_energy_threshold_db,
+    "VAD_MIN_SPEECH_MS": env.stt_vad_min_speech_ms,
+    "VAD_HANGOVER_MS": env.stt_vad_hangover_ms,
+    "LANGUAGE_MIN_PROBABILITY": env.stt_language_min_probability,
+    "LANGUAGE_DETECT_SECONDS": env.stt_language_detect_seconds,
+    "LANGUAGE_REDETECT_CONFIDENCE": env.stt_language_redetect_confidence,
+    "LANGUAGE_PIN_TTL": env.stt_language_pin_ttl,
     "SAMPLE_RATE": env.stt_sample_rate,
     "STREAM_AUDIO": env.stt_stream_audio,
     "GROUP_WORKERS": env.stt_group_workers,
@@ -385,15 +430,66 @@ TTS_WORKER = {
     "MODEL_DIR": env.tts_model_dir,
     "MODEL_FILE": env.tts_model_file,
     "VOICES_FILE": env.tts_voices_file,
+    "ONNX_REPLICAS": env.tts_onnx_replicas,
+    "ONNX_INTRA_OP_THREADS": env.tts_onnx_intra_op_threads,
+    "ONNX_INTER_OP_THREADS": env.tts_onnx_inter_op_threads,
+    "ONNX_GRAPH_OPTIMIZATION": env.tts_onnx_graph_optimization,
+    "ONNX_CPU_MEM_ARENA": env.tts_onnx_cpu_mem_arena,
+    "ONNX_MEM_PATTERN": env.tts_onnx_mem_pattern,
+    "WARMUP_VOICES": env.tts_warmup_voices,
+    "WARMUP_TEXT": env.tts_warmup_text,
     "DEFAULT_VOICE": env.tts_default_voice,
     "DEFAULT_SPEED": env.tts_default_speed,
     "CHUNK_SIZE": env.tts_chunk_size,
+    "STREAM_MIN_CLAUSE_CHARS": env.tts_stream_min_clause_chars,
+    "STREAM_MAX_SEGMENT_CHARS": env.tts_stream_max_segment_chars,
+    "STREAM_IDLE_TIMEOUT": env.tts_stream_idle_timeout,
+    "OUTPUT_FORMAT": env.tts_output_format,
+    "INFERENCE_SLOTS": env.tts_inference_slots,
+    "LIVE_RESERVED_SLOTS": env.tts_live_reserved_slots,
+    "QUEUE_DEPTH": env.tts_queue_depth,
+    "CANCEL_TTL": env.tts_cancel_ttl,
+    "BATCH_WINDOW": env.tts_batch_window,
+    "BATCH_MAX_SENTENCE_CHARS": env.tts_batch_max_sentence_chars,
+    "BATCH_SEGMENT_TIMEOUT": env.tts_batch_segment_timeout,
+    "BATCH_RESULT_TTL": env.tts_batch_result_ttl,
     "STREAM_REQUESTS": env.tts_stream_requests,
     "GROUP_WORKERS": env.tts_group_workers,
     "CHANNEL_TTS": env.tts_channel_tts,
     "CHANNEL_AUDIO_OUT": env.tts_channel_audio_out,
 }
 
+MODEL_REGISTRY = {
+    "MEMORY_BUDGET_MB": env.model_registry_memory_budget_mb,
+    "WARMUP": env.model_registry_warmup,
+}
+
+TRANSCRIPTION_CACHE = {
+    "ENABLED": env.transcription_cache_enabled,
+    "TTL": env.transcription_cache_ttl,
+    "LOCAL_SIZE": env.transcription_cache_local_size,
+    "LOCAL_TTL": env.transcription_cache_local_ttl,
+    "MAX_AUDIO_SECONDS": env.transcription_cache_max_audio_seconds,
+}
+
+TTS_CACHE = {
+    "ENABLED": env.tts_cache_enabled,
+    "BACKEND": env.tts_cache_backend,
+    "DIRECTORY": env.tts_cache_directory,
+    "MEMORY_BUDGET_MB": env.tts_cache_memory_budget_mb,
+    "TTL": env.tts_cache_ttl,
+    "MAX_CHARACTERS": env.tts_cache_max_characters,
+    "PRERENDER_ENABLED": env.tts_cache_prerender_enabled,
+    "PRERENDER_FORMATS": env.tts_cache_prerender_formats,
+}
+
+LLM_CACHE = {
+    "ENABLED": env.llm_cache_enabled,
+    "TTL": env.llm_cache_ttl,
+    "MAX_ENTRIES": env.llm_cache_max_entries,
+    "MAX_CHARACTERS": env.llm_cache_max_characters,
+}
+
 # ==========================================================================
 # LOGGING (Standard Python logging)
 # ==========================================================================
@@ -277,6 +277,14 @@ class Settings(BaseSettings):
         ...,
         description="LLM circuit breaker timeout seconds",
     )
+    llm_circuit_breaker_shared: bool = Field(
+        default=True,
+        description="Share LLM circuit breaker state across workers through Redis",
+    )
+    llm_circuit_breaker_probe_timeout: float = Field(
+        default=60.0,
+        description="Seconds a half-open LLM circuit waits for its probe before admitting another",
+    )
     llm_max_history_items: int = Field(
         ...,
         description="Max conversation items to include in LLM context",
@@ -301,9 +309,105 @@ class Settings(BaseSettings):
         ...,
         description="STT compute type",
     )
+    stt_worker_processes: int = Field(
+        default=1,
+        description="STT inference processes forked by run_stt_worker (1 disables the supervisor)",
+    )
+    stt_cpu_threads: int = Field(
+        default=0,
+        description="CTranslate2 intra-op threads per STT process (0 = CPUs of the process / num_workers)",
+    )
+    stt_num_workers: int = Field(
+        default=1,
+        description="CTranslate2 model replicas per STT process for concurrent decodes",
+    )
+    stt_pin_cpus: bool = Field(
+        default=True,
+        description="Pin each STT process to its own CPU set",
+    )
     stt_batch_size: int = Field(
         ...,
-        description="Max concurrent STT transcriptions",
+        description="Max audio chunks decoded in one batched Whisper pass",
+    )
+    stt_batch_max_wait_ms: int = Field(
+        default=25,
+        description="Max time the first queued chunk waits for an STT batch to fill",
+    )
+    stt_stream_min_decode_ms: int = Field(
+        default=300,
+        description="New audio required before a streaming session is re-decoded",
+    )
+    stt_stream_max_buffer_seconds: float = Field(
+        default=15.0,
+        description="Streaming buffer length that forces a commit",
+    )
+    stt_stream_session_ttl: int = Field(
+        default=30,
+        description="Idle seconds before streaming session state is released",
+    )
+    stt_longform_chunk_seconds: int = Field(
+        default=28,
+        description="Target chunk length of long-form transcription (within one Whisper window)",
+    )
+    stt_longform_search_seconds: int = Field(
+        default=6,
+        description="Seconds before each chunk boundary searched for silence",
+    )
+    stt_longform_overlap_ms: int = Field(
+        default=300,
+        description="Overlap added on both sides of a long-form chunk",
+    )
+    stt_longform_window: int = Field(
+        default=8,
+        description="Long-form chunks of one job in flight at a time",
+    )
+    stt_longform_concurrency: int = Field(
+        default=2,
+        description="Long-form chunks a worker decodes at once when it has no live work",
+    )
+    stt_longform_chunk_timeout: int = Field(
+        default=300,
+        description="Seconds to wait for the transcript of one long-form chunk",
+    )
+    stt_longform_result_ttl: int = Field(
+        default=600,
+        description="Seconds a long-form chunk transcript is kept for the assembler",
+    )
+    stt_vad_enabled: bool = Field(
+        default=True,
+        description="Default VAD state for audio without tenant settings",
+    )
+    stt_vad_frame_ms: int = Field(
+        default=30,
+        description="VAD analysis frame length",
+    )
+    stt_vad_energy_threshold_db: float = Field(
+        default=-45.0,
+        description="Frame energy (dBFS) below which audio is treated as silence",
+    )
+    stt_vad_min_speech_ms: int = Field(
+        default=150,
+        description="Consecutive speech required before speech_started",
+    )
+    stt_vad_hangover_ms: int = Field(
+        default=500,
+        description="Trailing silence required before speech_stopped ends an utterance",
+    )
+    stt_language_min_probability: float = Field(
+        default=0.8,
+        description="Language detection probability required before a detection counts towards pinning",
+    )
+    stt_language_detect_seconds: float = Field(
+        default=3.0,
+        description="Seconds of consistently detected speech before a session language is pinned",
+    )
+    stt_language_redetect_confidence: float = Field(
+        default=0.35,
+        description="Decode confidence below which a pinned session language is re-detected",
+    )
+    stt_language_pin_ttl: int = Field(
+        default=3600,
+        description="Seconds a pinned session language is kept after the last decode",
     )
     stt_sample_rate: int = Field(
         ...,
@@ -325,6 +429,38 @@ class Settings(BaseSettings):
         ...,
         description="Kokoro voices filename",
     )
+    tts_onnx_replicas: int = Field(
+        default=1,
+        description="Kokoro ONNX session replicas per TTS worker process",
+    )
+    tts_onnx_intra_op_threads: int = Field(
+        default=0,
+        description="Intra-op threads per Kokoro session (0 splits the CPUs between replicas)",
+    )
+    tts_onnx_inter_op_threads: int = Field(
+        default=1,
+        description="Inter-op threads per Kokoro session",
+    )
+    tts_onnx_graph_optimization: str = Field(
+        default="all",
+        description="ONNX graph optimization level (disable, basic, extended, all)",
+    )
+    tts_onnx_cpu_mem_arena: bool = Field(
+        default=True,
+        description="Keep freed Kokoro session memory in an arena for reuse",
+    )
+    tts_onnx_mem_pattern: bool = Field(
+        default=True,
+        description="Pre-plan Kokoro session allocations from the first run",
+    )
+    tts_warmup_voices: str = Field(
+        default="",
+        description="Comma-separated voices synthesized at startup (default voice when empty)",
+    )
+    tts_warmup_text: str = Field(
+        default="Hello.",
+        description="Phrase synthesized per voice and replica at startup",
+    )
     tts_default_voice: str = Field(
         ...,
         description="Default TTS voice",
@@ -337,6 +473,146 @@ class Settings(BaseSettings):
         ...,
         description="TTS chunk size (samples)",
     )
+    tts_stream_min_clause_chars: int = Field(
+        default=40,
+        description="Pending characters from which TTS splits text at clause boundaries",
+    )
+    tts_stream_max_segment_chars: int = Field(
+        default=250,
+        description="Longest text segment TTS synthesizes in one inference",
+    )
+    tts_stream_idle_timeout: float = Field(
+        default=30.0,
+        description="Seconds streaming TTS waits for the next LLM token",
+    )
+    tts_output_format: str = Field(
+        default="pcm16",
+        description="Default framing of TTS audio chunks (pcm16, mulaw or wav)",
+    )
+    tts_inference_slots: int = Field(
+        default=2,
+        description="Kokoro inferences a TTS worker runs at the same time",
+    )
+    tts_live_reserved_slots: int = Field(
+        default=1,
+        description="Inference slots reserved for live conversational turns",
+    )
+    tts_queue_depth: int = Field(
+        default=4,
+        description="TTS requests per priority class held locally while waiting for a slot",
+    )
+    tts_cancel_ttl: int = Field(
+        default=60,
+        description="Seconds a cancelled TTS response or session is remembered",
+    )
+    tts_batch_window: int = Field(
+        default=16,
+        description="Sentences of a long-form job in flight at a time",
+    )
+    tts_batch_max_sentence_chars: int = Field(
+        default=400,
+        description="Longest sentence of a long-form job synthesized in one request",
+    )
+    tts_batch_segment_timeout: int = Field(
+        default=120,
+        description="Seconds to wait for the audio of one long-form sentence",
+    )
+    tts_batch_result_ttl: int = Field(
+        default=600,
+        description="Seconds a synthesized long-form sentence is kept for the assembler",
+    )
+
+    # ==========================================================================
+    # MODEL REGISTRY
+    # ==========================================================================
+    model_registry_memory_budget_mb: int = Field(
+        default=4096,
+        description="Estimated memory for loaded STT/TTS models per process (0 = unlimited)",
+    )
+    model_registry_warmup: str = Field(
+        default="",
+        description="Models loaded at worker startup (e.g. whisper:tiny,kokoro:en)",
+    )
+
+    # ==========================================================================
+    # TRANSCRIPTION CACHE
+    # ==========================================================================
+    transcription_cache_enabled: bool = Field(
+        default=False,
+        description="Cache transcriptions of byte-identical audio",
+    )
+    transcription_cache_ttl: int = Field(
+        default=86400,
+        description="Seconds a cached transcription is kept in Redis",
+    )
+    transcription_cache_local_size: int = Field(
+        default=1024,
+        description="Transcriptions kept in the in-process cache (0 disables it)",
+    )
+    transcription_cache_local_ttl: int = Field(
+        default=300,
+        description="Seconds a transcription is kept in the in-process cache",
+    )
+    transcription_cache_max_audio_seconds: float = Field(
+        default=120.0,
+        description="Longest audio whose transcription is cached",
+    )
+
+    # ==========================================================================
+    # TTS CACHE
+    # ==========================================================================
+    tts_cache_enabled: bool = Field(
+        default=False,
+        description="Cache synthesized audio of short, repeated phrases",
+    )
+    tts_cache_backend: str = Field(
+        default="redis",
+        description="Shared phrase store: redis, disk or memory",
+    )
+    tts_cache_directory: str = Field(
+        default="/var/cache/agentvoicebox/tts",
+        description="Directory of the disk phrase store",
+    )
+    tts_cache_memory_budget_mb: int = Field(
+        default=64,
+        description="Audio kept in the in-process phrase cache, in MB",
+    )
+    tts_cache_ttl: int = Field(
+        default=604800,
+        description="Seconds a phrase is kept in the shared store",
+    )
+    tts_cache_max_characters: int = Field(
+        default=200,
+        description="Longest text whose audio is cached",
+    )
+    tts_cache_prerender_enabled: bool = Field(
+        default=True,
+        description="Pre-render persona greetings and canned phrases into the cache on save",
+    )
+    tts_cache_prerender_formats: str = Field(
+        default="",
+        description="Comma-separated output formats pre-rendered (all formats when empty)",
+    )
+
+    # ==========================================================================
+    # LLM RESPONSE CACHE
+    # ==========================================================================
+    llm_cache_enabled: bool = Field(
+        default=False,
+        description="Cache deterministic LLM responses for tenants that opt in",
+    )
+    llm_cache_ttl: int = Field(
+        default=3600,
+        description="Seconds a cached LLM response is kept",
+    )
+    llm_cache_max_entries: int = Field(
+        default=1000,
+        description="Cached LLM responses kept per tenant",
+    )
+    llm_cache_max_characters: int = Field(
+        default=4000,
+        description="Longest LLM response that is cached",
+    )
 
     # ==========================================================================
     # WORKER STREAMS
@@ -353,6 +629,82 @@ class Settings(BaseSettings):
         ...,
         description="Redis channel prefix for LLM responses",
     )
+    llm_http2: bool = Field(
+        default=True,
+        description="Negotiate HTTP/2 with LLM providers (needs the h2 package)",
+    )
+    llm_http_max_connections: int = Field(
+        default=20,
+        description="Connections per LLM provider base URL",
+    )
+    llm_http_max_keepalive: int = Field(
+        default=10,
+        description="Idle connections kept per LLM provider base URL",
+    )
+    llm_http_keepalive_expiry: float = Field(
+        default=120.0,
+        description="Seconds an idle LLM provider connection stays open",
+    )
+    llm_http_connect_timeout: float = Field(
+        default=5.0,
+        description="Seconds to connect to an LLM provider",
+    )
+    llm_http_read_timeout: float = Field(
+        default=60.0,
+        description="Seconds to wait for data from an LLM provider",
+    )
+    llm_http_pool_timeout: float = Field(
+        default=5.0,
+        description="Seconds to wait for a free LLM provider connection",
+    )
+    llm_http_preconnect: bool = Field(
+        default=True,
+        description="Open connections to the configured LLM providers at startup",
+    )
+    llm_coalesce_ms: int = Field(
+        default=30,
+        description="Milliseconds LLM tokens are buffered before publishing (0 publishes every token)",
+    )
+    llm_coalesce_max_chars: int = Field(
+        default=80,
+        description="Buffered characters that publish LLM tokens early",
+    )
+    llm_coalesce_sentences: bool = Field(
+        default=True,
+        description="Publish buffered LLM tokens at the end of every sentence",
+    )
+    llm_routing: str = Field(
+        default="latency",
+        description="LLM provider order: latency (fastest healthy first) or priority",
+    )
+    llm_routing_ewma_alpha: float = Field(
+        default=0.2,
+        description="Weight of the newest sample in the LLM latency and error averages",
+    )
+    llm_routing_max_error_rate: float = Field(
+        default=0.5,
+        description="Average error rate above which an LLM provider is tried last",
+    )
+    llm_routing_window: int = Field(
+        default=200,
+        description="Recent time-to-first-token samples kept per LLM provider and model",
+    )
+    llm_hedge_enabled: bool = Field(
+        default=False,
+        description="Start a second LLM provider when the first is slow to answer",
+    )
+    llm_hedge_min_ms: int = Field(
+        default=250,
+        description="Shortest wait before a hedged LLM request",
+    )
+    llm_hedge_max_ms: int = Field(
+        default=2000,
+        description="Longest wait before a hedged LLM request",
+    )
+    llm_hedge_min_samples: int = Field(
+        default=20,
+        description="Samples needed before the hedge wait follows the p95 time to first token",
+    )
     stt_stream_audio: str = Field(
         ...,
         description="Redis stream for STT audio",
@@ -468,6 +820,35 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid log level: {v}. Must be one of {valid_levels}")
         return v.upper()
 
+    @field_validator("tts_onnx_graph_optimization")
+    @classmethod
+    def validate_tts_onnx_graph_optimization(cls, v: str) -> str:
+        """Validate ONNX graph optimization level."""
+        valid_levels = {"disable", "basic", "extended", "all"}
+        if v.lower() not in valid_levels:
+            raise ValueError(
+                f"Invalid ONNX graph optimization level: {v}. Must be one of {valid_levels}"
+            )
+        return v.lower()
+
+    @field_validator("tts_output_format")
+    @classmethod
+    def validate_tts_output_format(cls, v: str) -> str:
+        """Validate TTS output framing."""
+        valid_formats = {"pcm16", "mulaw", "wav"}
+        if v.lower() not in valid_formats:
+            raise ValueError(f"Invalid TTS output format: {v}. Must be one of {valid_formats}")
+        return v.lower()
+
+    @field_validator("llm_routing")
+    @classmethod
+    def validate_llm_routing(cls, v: str) -> str:
+        """Validate LLM provider routing policy."""
+        valid_policies = {"latency", "priority"}
+        if v.lower() not in valid_policies:
+            raise ValueError(f"Invalid LLM routing policy: {v}. Must be one of {valid_policies}")
+        return v.lower()
+
 
 # ==========================================================================
 # INSTANTIATE AND VALIDATE SETTINGS AT MODULE LOAD
@@ -577,6 +958,8 @@ llm_max_tokens = _settings.llm_max_tokens
 llm_temperature = _settings.llm_temperature
 llm_circuit_breaker_threshold = _settings.llm_circuit_breaker_threshold
 llm_circuit_breaker_timeout = _settings.llm_circuit_breaker_timeout
+llm_circuit_breaker_shared = _settings.llm_circuit_breaker_shared
+llm_circuit_breaker_probe_timeout = _settings.llm_circuit_breaker_probe_timeout
 llm_max_history_items = _settings.llm_max_history_items
 llm_provider_priority = _settings.llm_provider_priority
 
@@ -584,21 +967,111 @@ llm_provider_priority = _settings.llm_provider_priority
 stt_model = _settings.stt_model
 stt_device = _settings.stt_device
 stt_compute_type = _settings.stt_compute_type
+stt_worker_processes = _settings.stt_worker_processes
+stt_cpu_threads = _settings.stt_cpu_threads
+stt_num_workers = _settings.stt_num_workers
+stt_pin_cpus = _settings.stt_pin_cpus
 stt_batch_size = _settings.stt_batch_size
+stt_batch_max_wait_ms = _settings.stt_batch_max_wait_ms
+stt_stream_min_decode_ms = _settings.stt_stream_min_decode_ms
+stt_stream_max_buffer_seconds = _settings.stt_stream_max_buffer_seconds
+stt_stream_session_ttl = _settings.stt_stream_session_ttl
+stt_longform_chunk_seconds = _settings.stt_longform_chunk_seconds
+stt_longform_search_seconds = _settings.stt_longform_search_seconds
+stt_longform_overlap_ms = _settings.stt_longform_overlap_ms
+stt_longform_window = _settings.stt_longform_window
+stt_longform_concurrency = _settings.stt_longform_concurrency
+stt_longform_chunk_timeout = _settings.stt_longform_chunk_timeout
+stt_longform_result_ttl = _settings.stt_longform_result_ttl
+stt_vad_enabled = _settings.stt_vad_enabled
+stt_vad_frame_ms = _settings.stt_vad_frame_ms
+stt_vad_energy_threshold_db = _settings.stt_vad_energy_threshold_db
+stt_vad_min_speech_ms = _settings.stt_vad_min_speech_ms
+stt_vad_hangover_ms = _settings.stt_vad_hangover_ms
+stt_language_min_probability = _settings.stt_language_min_probability
+stt_language_detect_seconds = _settings.stt_language_detect_seconds
+stt_language_redetect_confidence = _settings.stt_language_redetect_confidence
+stt_language_pin_ttl = _settings.stt_language_pin_ttl
 stt_sample_rate = _settings.stt_sample_rate
 
 # TTS
 tts_model_dir = _settings.tts_model_dir
 tts_model_file = _settings.tts_model_file
 tts_voices_file = _settings.tts_voices_file
+tts_onnx_replicas = _settings.tts_onnx_replicas
+tts_onnx_intra_op_threads = _settings.tts_onnx_intra_op_threads
+tts_onnx_inter_op_threads = _settings.tts_onnx_inter_op_threads
+tts_onnx_graph_optimization = _settings.tts_onnx_graph_optimization
+tts_onnx_cpu_mem_arena = _settings.tts_onnx_cpu_mem_arena
+tts_onnx_mem_pattern = _settings.tts_onnx_mem_pattern
+tts_warmup_voices = _settings.tts_warmup_voices
+tts_warmup_text = _settings.tts_warmup_text
 tts_default_voice = _settings.tts_default_voice
 tts_default_speed = _settings.tts_default_speed
 tts_chunk_size = _settings.tts_chunk_size
+tts_stream_min_clause_chars = _settings.tts_stream_min_clause_chars
+tts_stream_max_segment_chars = _settings.tts_stream_max_segment_chars
+tts_stream_idle_timeout = _settings.tts_stream_idle_timeout
+tts_output_format = _settings.tts_output_format
+tts_inference_slots = _settings.tts_inference_slots
+tts_live_reserved_slots = _settings.tts_live_reserved_slots
+tts_queue_depth = _settings.tts_queue_depth
+tts_cancel_ttl = _settings.tts_cancel_ttl
+tts_batch_window = _settings.tts_batch_window
+tts_batch_max_sentence_chars = _settings.tts_batch_max_sentence_chars
+tts_batch_segment_timeout = _settings.tts_batch_segment_timeout
+tts_batch_result_ttl = _settings.tts_batch_result_ttl
+
+# Model registry
+model_registry_memory_budget_mb = _settings.model_registry_memory_budget_mb
+model_registry_warmup = _settings.model_registry_warmup
+
+# Transcription cache
+transcription_cache_enabled = _settings.transcription_cache_enabled
+transcription_cache_ttl = _settings.transcription_cache_ttl
+transcription_cache_local_size = _settings.transcription_cache_local_size
+transcription_cache_local_ttl = _settings.transcription_cache_local_ttl
+transcription_cache_max_audio_seconds = _settings.transcription_cache_max_audio_seconds
+
+# TTS cache
+tts_cache_enabled = _settings.tts_cache_enabled
+tts_cache_backend = _settings.tts_cache_backend
+tts_cache_directory = _settings.tts_cache_directory
+tts_cache_memory_budget_mb = _settings.tts_cache_memory_budget_mb
+tts_cache_ttl = _settings.tts_cache_ttl
+tts_cache_max_characters = _settings.tts_cache_max_characters
+tts_cache_prerender_enabled = _settings.tts_cache_prerender_enabled
+tts_cache_prerender_formats = _settings.tts_cache_prerender_formats
+
+# Llm response cache
+llm_cache_enabled = _settings.llm_cache_enabled
+llm_cache_ttl = _settings.llm_cache_ttl
+llm_cache_max_entries = _settings.llm_cache_max_entries
+llm_cache_max_characters = _settings.llm_cache_max_characters
 
 # Worker Streams
 llm_stream_requests = _settings.llm_stream_requests
 llm_group_workers = _settings.llm_group_workers
 llm_response_channel = _settings.llm_response_channel
+llm_http2 = _settings.llm_http2
+llm_http_max_connections = _settings.llm_http_max_connections
+llm_http_max_keepalive = _settings.llm_http_max_keepalive
+llm_http_keepalive_expiry = _settings.llm_http_keepalive_expiry
+llm_http_connect_timeout = _settings.llm_http_connect_timeout
+llm_http_read_timeout = _settings.llm_http_read_timeout
+llm_http_pool_timeout = _settings.llm_http_pool_timeout
+llm_http_preconnect = _settings.llm_http_preconnect
+llm_coalesce_ms = _settings.llm_coalesce_ms
+llm_coalesce_max_chars = _settings.llm_coalesce_max_chars
+llm_coalesce_sentences = _settings.llm_coalesce_sentences
+llm_routing = _settings.llm_routing
+llm_routing_ewma_alpha = _settings.llm_routing_ewma_alpha
+llm_routing_max_error_rate = _settings.llm_routing_max_error_rate
+llm_routing_window = _settings.llm_routing_window
+llm_hedge_enabled = _settings.llm_hedge_enabled
+llm_hedge_min_ms = _settings.llm_hedge_min_ms
+llm_hedge_max_ms = _settings.llm_hedge_max_ms
+llm_hedge_min_samples = _settings.llm_hedge_min_samples
 stt_stream_audio = _settings.stt_stream_audio
 stt_group_workers = _settings.stt_group_workers
 stt_channel_transcription = _settings.stt_channel_transcription
@@ -227,6 +227,29 @@ class BaseConsumer(AsyncJsonWebsocketConsumer):
             }
         )
 
+    async def send_audio(self, event_type: str, data: dict[str, Any]):
+        """
+        Send a TTS audio chunk to client.
+
+        `data` holds the fields of a `tts:audio` stream entry. Binary chunks
+        (pcm16 and mulaw framing) are sent as binary frames; the layout that
+        comes with the first chunk of a response is sent once as a
+        `<event_type>.header` event and the end of the response as
+        `<event_type>.done`. Base64 WAV chunks are sent as JSON events.
+        """
+        chunk = data.get("chunk")
+        if not isinstance(chunk, bytes):
+            await self.send_event(event_type, data)
+            return
+
+        fields = {key: value for key, value in data.items() if key != "chunk"}
+        if "format" in data:
+            await self.send_event(f"{event_type}.header", fields)
+        if chunk:
+            await self.send(bytes_data=chunk)
+        if data.get("is_final") == "1":
+            await self.send_event(f"{event_type}.done", fields)
+
     async def _check_rate_limit(self) -> bool:
         """
         Check if audio input rate limit is exceeded.
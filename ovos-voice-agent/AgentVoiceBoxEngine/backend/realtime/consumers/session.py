@@ -66,6 +66,8 @@ class SessionConsumer(BaseConsumer):
                 },
             )
 
+            await self._request_greeting()
+
     async def disconnect(self, close_code):
         """Handle disconnection."""
         if self.session_id:
@@ -121,6 +123,34 @@ class SessionConsumer(BaseConsumer):
                 {"session_id": self.session_id}
             )
 
+    async def _request_greeting(self):
+        """
+        Queue the session's greeting for speech.
+
+        Greetings are pre-rendered into the TTS cache when their persona is
+        saved, so the worker replays them without synthesis.
+        """
+        if not self.session:
+            return
+
+        from apps.workflows.tts_prerender import greeting_request
+
+        request = greeting_request(
+            str(self.session_id), str(self.tenant_id), self.session.config or {}
+        )
+        if request is None:
+            return
+
+        try:
+            from django.conf import settings
+
+            from apps.workflows.redis_client import get_shared_redis
+
+            redis = await get_shared_redis()
+            await redis.client.xadd(settings.TTS_WORKER["STREAM_REQUESTS"], request)
+        except Exception as e:
+            logger.error(f"Failed to request greeting for session {self.session_id}: {e}")
+
     async def _complete_session(self):
         """
         Mark session as completed.
@@ -268,4 +298,4 @@ class SessionConsumer(BaseConsumer):
 
     async def audio_output(self, event: dict[str, Any]):
         """Handle audio output from TTS worker."""
-        await self.send_event("audio.output", event["data"])
+        await self.send_audio("audio.output", event["data"])
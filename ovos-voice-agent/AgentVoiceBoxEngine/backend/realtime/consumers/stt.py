@@ -82,3 +82,11 @@ class STTConsumer(BaseConsumer):
     async def transcription_final(self, event: dict[str, Any]):
         """Handle final transcription result."""
         await self.send_event("transcription.final", event["data"])
+
+    async def speech_started(self, event: dict[str, Any]):
+        """Handle start of speech detected by server-side VAD."""
+        await self.send_event("speech_started", event["data"])
+
+    async def speech_stopped(self, event: dict[str, Any]):
+        """Handle end of speech detected by server-side VAD."""
+        await self.send_event("speech_stopped", event["data"])
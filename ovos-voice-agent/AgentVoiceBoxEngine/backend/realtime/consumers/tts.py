@@ -33,7 +33,7 @@ class TTSConsumer(BaseConsumer):
                         {"id": "am_adam", "name": "Adam", "language": "en"},
                         {"id": "am_michael", "name": "Michael", "language": "en"},
                     ],
-                    "formats": ["pcm16", "mp3", "opus"],
+                    "formats": ["pcm16", "mulaw", "wav"],
                 },
             )
 
@@ -82,7 +82,7 @@ class TTSConsumer(BaseConsumer):
     # Group message handlers
     async def audio_chunk(self, event: dict[str, Any]):
         """Handle audio chunk from TTS worker."""
-        await self.send_event("tts.audio", event["data"])
+        await self.send_audio("tts.audio", event["data"])
 
     async def synthesis_completed(self, event: dict[str, Any]):
         """Handle synthesis completion."""
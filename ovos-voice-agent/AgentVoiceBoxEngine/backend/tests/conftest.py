@@ -11,11 +11,14 @@ Uses hypothesis.extra.django for Django-specific property testing:
 - TestCase for per-example transaction isolation
 """
 
+import asyncio
+import functools
 import os
 import uuid
 
 import django
 import pytest
+import redis.asyncio as aioredis
 from hypothesis import HealthCheck
 from hypothesis import settings as hypothesis_settings
 
@@ -214,6 +217,61 @@ def request_factory() -> RequestFactory:
     return RequestFactory()
 
 
+# ==========================================================================
+# REDIS FIXTURES
+# ==========================================================================
+# Tests marked `redis` run against the REAL Redis server from REDIS_URL and
+# are skipped when it cannot be reached.
+
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+
+@functools.cache
+def redis_available() -> bool:
+    """Whether the Redis server at REDIS_URL answers a ping, checked once per run."""
+
+    async def ping() -> bool:
+        client = aioredis.from_url(REDIS_URL, decode_responses=True)
+        try:
+            return await client.ping()
+        except Exception:
+            return False
+        finally:
+            await client.aclose()
+
+    return asyncio.run(ping())
+
+
+@pytest.fixture(autouse=True)
+def skip_without_redis(request):
+    """Skip tests marked `redis` when Redis is not reachable."""
+    if request.node.get_closest_marker("redis") and not redis_available():
+        pytest.skip("Redis not reachable")
+
+
+def run_with_redis(scenario, clients: int = 1):
+    """
+    Runs an async scenario against fresh Redis clients and closes them afterwards.
+
+    Args:
+        scenario: Coroutine function called with one client per requested client.
+        clients: Number of clients, e.g. one per simulated worker.
+
+    Returns:
+        The scenario's result.
+    """
+
+    async def runner():
+        opened = [aioredis.from_url(REDIS_URL, decode_responses=True) for _ in range(clients)]
+        try:
+            return await scenario(*opened)
+        finally:
+            for client in opened:
+                await client.aclose()
+
+    return asyncio.run(runner())
+
+
 # ==========================================================================
 # UTILITY FUNCTIONS
 # ==========================================================================
@@ -0,0 +1,47 @@
+"""
+STT worker benchmark for pytest-benchmark.
+
+**Feature: production-voice-agent, Benchmark: STT Throughput**
+
+Runs the `benchmark_stt` harness for a small sweep against the REAL
+Faster-Whisper model and the REAL Redis server from REDIS_WORKER, and
+records RTF, latency percentiles, throughput and peak RSS in the
+benchmark's extra_info so `--benchmark-json` output can be compared across
+runs to catch regressions.
+
+Run with: pytest tests/test_benchmark_stt.py --benchmark-json=stt.json -p no:xdist
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("faster_whisper")
+
+from django.conf import settings  # noqa: E402
+
+from apps.workflows.benchmark import sweep  # noqa: E402
+from apps.workflows.management.commands.benchmark_stt import (  # noqa: E402
+    benchmark_config,
+    synthetic_corpus,
+)
+
+CONFIGS = sweep(batch_size=[1, 8], model=["tiny"], compute_type=["int8"])
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: f"batch{c['batch_size']}-{c['model']}")
+def test_stt_worker_throughput(benchmark, config):
+    corpus = synthetic_corpus(4, 4.0, settings.STT_WORKER["SAMPLE_RATE"])
+
+    result = benchmark.pedantic(
+        lambda: asyncio.run(benchmark_config(config, corpus, requests=16, concurrency=8)),
+        rounds=1,
+        iterations=1,
+    )
+
+    benchmark.extra_info.update(result)
+    assert result["failures"] == 0
+    assert result["latency"]["count"] == 16
+    assert result["rtf"] > 0
@@ -0,0 +1,48 @@
+"""
+TTS benchmark for pytest-benchmark.
+
+**Feature: production-voice-agent, Benchmark: TTS Time to First Chunk**
+
+Runs the `benchmark_tts` harness for a small sweep of output framings
+against the REAL Kokoro ONNX model from TTS_WORKER, and records time to
+first chunk, RTF, chunks per second and peak RSS in the benchmark's
+extra_info so `--benchmark-json` output can be compared across runs and
+hardware to catch regressions.
+
+Run with: pytest tests/test_benchmark_tts.py --benchmark-json=tts.json -p no:xdist
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("kokoro_onnx")
+
+from apps.workflows.benchmark import sweep  # noqa: E402
+from apps.workflows.management.commands.benchmark_tts import (  # noqa: E402
+    benchmark_worker,
+    synthetic_corpus,
+)
+
+CONFIGS = sweep(
+    intra_op_threads=[0], inter_op_threads=[1], output_format=["pcm16", "wav"], concurrency=[2]
+)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: c["output_format"])
+def test_tts_worker_first_chunk(benchmark, config):
+    corpus = synthetic_corpus([40, 200], 1)
+
+    result = benchmark.pedantic(
+        lambda: asyncio.run(benchmark_worker(config, corpus, requests=4)),
+        rounds=1,
+        iterations=1,
+    )
+
+    benchmark.extra_info.update(result)
+    assert result["failures"] == 0
+    assert result["first_chunk"]["count"] == 4
+    assert result["first_chunk"]["max_ms"] <= result["latency"]["max_ms"]
+    assert result["rtf"] > 0
@@ -0,0 +1,177 @@
+"""
+Property tests for TTS output framing.
+
+**Feature: production-voice-agent, Property: TTS Audio Framing**
+
+Tests that:
+- Format negotiation picks the first supported framing, else the default
+- float32 to PCM16 conversion rounds, clips and works in place
+- μ-law encoding round-trips within the G.711 quantization error
+- Binary framings carry no per-chunk header and are smaller than WAV+base64
+- The legacy WAV framing produces valid PCM16 WAV files
+
+Uses REAL NumPy arrays - NO MOCKS.
+"""
+
+import base64
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from hypothesis.extra.numpy import arrays
+
+from apps.workflows.audio_framing import (
+    OUTPUT_FORMATS,
+    AudioFramer,
+    float32_to_pcm16,
+    mulaw_to_pcm16,
+    negotiate_format,
+    pcm16_to_mulaw,
+)
+from apps.workflows.audio_processing import PCMFormat, parse_wav, pcm_to_float32
+
+float_audio = arrays(
+    np.float32,
+    st.integers(min_value=1, max_value=4096),
+    elements=st.floats(min_value=-1.5, max_value=1.5, width=32),
+)
+
+
+class TestNegotiation:
+    """
+    For any requested preference list:
+    - The first supported framing SHALL be chosen
+    - The default SHALL be used when none is supported
+    """
+
+    @pytest.mark.property
+    def test_preference_order(self):
+        assert negotiate_format("opus, MULAW,pcm16", "wav") == "mulaw"
+        assert negotiate_format("pcm16", "mulaw") == "pcm16"
+
+    @pytest.mark.property
+    @given(requested=st.one_of(st.none(), st.text(alphabet="abcxyz,", max_size=20)))
+    @settings(max_examples=50)
+    def test_unsupported_falls_back(self, requested):
+        assert negotiate_format(requested, "pcm16") == "pcm16"
+
+    @pytest.mark.property
+    def test_unknown_framer_rejected(self):
+        with pytest.raises(ValueError):
+            AudioFramer("opus")
+
+
+class TestPCM16Conversion:
+    """
+    For any float32 audio:
+    - Samples SHALL be rounded to the nearest int16 and clipped to its range
+    - Writable float32 input SHALL be converted without a float copy
+    """
+
+    @pytest.mark.property
+    @given(audio=float_audio)
+    @settings(max_examples=100)
+    def test_rounds_and_clips(self, audio):
+        expected = np.clip(np.rint(audio * np.float32(32767)), -32768, 32767)
+        result = float32_to_pcm16(audio.copy())
+        assert result.dtype == np.int16
+        assert np.array_equal(result, expected.astype(np.int16))
+
+    @pytest.mark.property
+    def test_in_place(self):
+        audio = np.array([0.5, -2.0, 1.0], dtype=np.float32)
+        out = np.empty(3, dtype=np.int16)
+        assert float32_to_pcm16(audio, out=out) is out
+        assert out.tolist() == [16384, -32768, 32767]
+        # The input buffer holds the scaled samples afterwards.
+        assert audio.tolist() == [16384.0, -32768.0, 32767.0]
+
+    @pytest.mark.property
+    def test_read_only_input_is_copied(self):
+        audio = np.array([0.25], dtype=np.float32)
+        audio.flags.writeable = False
+        assert float32_to_pcm16(audio).tolist() == [8192]
+        assert audio.tolist() == [0.25]
+
+
+class TestMulaw:
+    """
+    For any int16 sample:
+    - Decoding the μ-law byte SHALL stay within the segment's quantization error
+    - Encoding SHALL be monotonic in the sample value
+    """
+
+    @pytest.mark.property
+    def test_round_trip_error(self):
+        samples = np.arange(-32124, 32125, dtype=np.int32)
+        decoded = mulaw_to_pcm16(pcm16_to_mulaw(samples.astype(np.int16))).astype(np.int32)
+        error = np.abs(decoded - samples)
+        assert np.all(error <= np.abs(samples) / 32 + 16)
+
+    @pytest.mark.property
+    def test_monotonic(self):
+        samples = np.arange(-32768, 32768, dtype=np.int32).astype(np.int16)
+        decoded = mulaw_to_pcm16(pcm16_to_mulaw(samples)).astype(np.int32)
+        assert np.all(np.diff(decoded) >= 0)
+
+    @pytest.mark.property
+    def test_silence_and_extremes(self):
+        encoded = pcm16_to_mulaw(np.array([0, 32767, -32768], dtype=np.int16))
+        assert encoded.tolist() == [0xFF, 0x80, 0x00]
+
+
+class TestFramer:
+    """
+    For any synthesized chunk:
+    - Binary framings SHALL contain only the samples (2 or 1 bytes each)
+    - The WAV framing SHALL decode to the same PCM16 samples
+    - Binary framings SHALL be smaller than the legacy WAV+base64 chunks
+    - Binary responses SHALL end with an empty chunk
+    """
+
+    @pytest.mark.property
+    @given(audio=float_audio)
+    @settings(max_examples=50)
+    def test_framings_agree(self, audio):
+        pcm16 = AudioFramer("pcm16").encode(audio.copy(), 24000)
+        mulaw = AudioFramer("mulaw").encode(audio.copy(), 24000)
+        wav = AudioFramer("wav").encode(audio.copy(), 24000)
+
+        assert len(pcm16) == 2 * len(audio)
+        assert len(mulaw) == len(audio)
+        parsed = parse_wav(base64.b64decode(wav))
+        assert parsed is not None
+        pcm_format, payload = parsed
+        assert pcm_format.sample_rate == 24000 and pcm_format.encoding == "pcm16"
+        assert bytes(payload) == pcm16
+        assert len(pcm16) < len(wav) and len(mulaw) < len(pcm16)
+        assert np.array_equal(
+            mulaw_to_pcm16(mulaw), mulaw_to_pcm16(pcm16_to_mulaw(np.frombuffer(pcm16, "<i2")))
+        )
+
+    @pytest.mark.property
+    def test_reused_buffer_across_chunks(self):
+        framer = AudioFramer("pcm16")
+        long_chunk = framer.encode(np.full(100, 0.5, dtype=np.float32), 24000)
+        short_chunk = framer.encode(np.full(10, -0.5, dtype=np.float32), 24000)
+        assert len(long_chunk) == 200 and len(short_chunk) == 20
+        restored = pcm_to_float32(short_chunk, PCMFormat("pcm16", 24000))
+        assert np.allclose(restored, -0.5, atol=1e-4)
+
+    @pytest.mark.property
+    @pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+    def test_final_chunk_and_cache_round_trip(self, output_format):
+        framer = AudioFramer(output_format)
+        chunk = framer.encode(np.linspace(-1, 1, 64, dtype=np.float32), 24000)
+        assert framer.from_cache(framer.to_cache(chunk)) == chunk
+        final = framer.final_chunk(24000)
+        if framer.binary:
+            assert final == b""
+            assert framer.header(24000) == {
+                "format": output_format,
+                "sample_rate": "24000",
+                "channels": "1",
+            }
+        else:
+            assert parse_wav(base64.b64decode(final)) is not None
@@ -0,0 +1,187 @@
+"""
+Property tests for raw PCM ingestion and polyphase resampling.
+
+**Feature: production-voice-agent, Property: STT Raw PCM Ingestion**
+
+Tests that:
+1. PCM16 and float32 frames decode to the same mono float32 signal
+2. Multi-channel frames are downmixed to mono
+3. Resampling preserves in-band tones at common telephony and media rates
+4. Content above the target Nyquist frequency is suppressed
+5. WAV payloads are decoded in memory from a view of the data chunk
+
+Uses the REAL decoder and resampler - NO MOCKS.
+"""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.activities.stt import decode_audio_in_memory
+from apps.workflows.audio_processing import PCMFormat, parse_wav, pcm_to_float32, resample
+
+TARGET_RATE = 16000
+
+
+def _tone(frequency: float, sample_rate: int, seconds: float = 0.5) -> np.ndarray:
+    """Generates a float32 sine tone."""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+class TestPCMDecoding:
+    """
+    Property tests for raw PCM frame decoding.
+
+    For any raw frame:
+    - Decoded samples SHALL be mono float32 in [-1, 1]
+    """
+
+    @pytest.mark.property
+    @given(samples=st.lists(st.integers(min_value=-32768, max_value=32767), max_size=256))
+    @settings(max_examples=50)
+    def test_pcm16_and_float32_agree(self, samples):
+        """
+        Property: A PCM16 frame and its float32 equivalent decode identically.
+        """
+        pcm16 = np.array(samples, dtype="<i2")
+        as_float = (pcm16 / 32768.0).astype("<f4")
+
+        decoded = pcm_to_float32(pcm16.tobytes(), PCMFormat("pcm16", 16000))
+        reference = pcm_to_float32(as_float.tobytes(), PCMFormat("float32", 16000))
+
+        assert decoded.dtype == np.float32
+        np.testing.assert_allclose(decoded, reference, atol=1e-7)
+        assert np.all(np.abs(decoded) <= 1.0)
+
+    @pytest.mark.property
+    @given(channels=st.integers(min_value=2, max_value=6))
+    @settings(max_examples=10)
+    def test_interleaved_channels_are_downmixed(self, channels):
+        """
+        Property: Interleaved channels are averaged into one mono channel.
+        """
+        frames = np.tile(np.arange(channels, dtype="<f4"), 10)
+        decoded = pcm_to_float32(frames.tobytes(), PCMFormat("float32", 8000, channels))
+
+        assert decoded.shape == (10,)
+        np.testing.assert_allclose(decoded, (channels - 1) / 2)
+
+    @pytest.mark.property
+    def test_stream_fields(self):
+        """
+        Property: Stream fields select raw PCM; missing format means container audio.
+        """
+        assert PCMFormat.from_fields({}) is None
+        assert PCMFormat.from_fields(
+            {"format": "pcm16", "sample_rate": "8000", "channels": "2"}
+        ) == PCMFormat("pcm16", 8000, 2)
+        with pytest.raises(ValueError):
+            PCMFormat.from_fields({"format": "pcm16"})
+        with pytest.raises(ValueError):
+            PCMFormat.from_fields({"format": "mp3", "sample_rate": "8000"})
+        with pytest.raises(ValueError):
+            pcm_to_float32(b"\x00\x01\x02", PCMFormat("pcm16", 8000))
+
+
+class TestPolyphaseResampler:
+    """
+    Property tests for the polyphase resampler.
+
+    For any supported rate:
+    - Output length SHALL match the rate ratio
+    - In-band tones SHALL be preserved and out-of-band tones suppressed
+    """
+
+    @pytest.mark.property
+    @given(
+        orig_rate=st.sampled_from([8000, 11025, 22050, 24000, 44100, 48000]),
+        frequency=st.floats(min_value=100.0, max_value=3400.0),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_in_band_tone_is_preserved(self, orig_rate, frequency):
+        """
+        Property: A telephony-band tone survives resampling to 16 kHz.
+        """
+        resampled = resample(_tone(frequency, orig_rate), orig_rate, TARGET_RATE)
+        expected = _tone(frequency, TARGET_RATE, seconds=len(resampled) / TARGET_RATE)
+
+        assert resampled.dtype == np.float32
+        assert abs(len(resampled) - len(expected)) <= 1
+        inner = slice(200, len(expected) - 200)
+        error = resampled[inner] - expected[: len(resampled)][inner]
+        assert np.sqrt(np.mean(np.square(error))) < 5e-3
+
+    @pytest.mark.property
+    def test_out_of_band_tone_is_suppressed(self):
+        """
+        Property: Content above the target Nyquist does not alias into the output.
+        """
+        resampled = resample(_tone(10000.0, 44100), 44100, TARGET_RATE)
+        assert np.sqrt(np.mean(np.square(resampled[200:-200]))) < 5e-3
+
+    @pytest.mark.property
+    def test_matching_rate_returns_input(self):
+        """
+        Property: No work is done when the rates already match.
+        """
+        audio = _tone(440.0, TARGET_RATE)
+        assert resample(audio, TARGET_RATE, TARGET_RATE) is audio
+
+
+class TestInMemoryDecode:
+    """
+    Property tests for in-memory decoding in the STT activities.
+
+    For any PCM16/float32 WAV or raw PCM payload:
+    - Samples SHALL be decoded without a temporary file
+    """
+
+    @staticmethod
+    def _wav(samples: np.ndarray, sample_rate: int, channels: int) -> bytes:
+        """Encodes interleaved int16 samples as a WAV file."""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(samples.astype("<i2").tobytes())
+        return buffer.getvalue()
+
+    @pytest.mark.property
+    @given(
+        sample_rate=st.sampled_from([8000, 16000, 44100]),
+        channels=st.integers(min_value=1, max_value=2),
+    )
+    @settings(max_examples=10, deadline=None)
+    def test_wav_is_decoded_in_memory(self, sample_rate, channels):
+        """
+        Property: PCM16 WAV decodes to 16 kHz mono float32 matching the source tone.
+        """
+        tone = (_tone(440.0, sample_rate) * 32767).astype(np.int16)
+        payload = self._wav(np.repeat(tone, channels), sample_rate, channels)
+
+        pcm_format, frames = parse_wav(payload)
+        assert pcm_format == PCMFormat("pcm16", sample_rate, channels)
+        assert frames.obj is payload
+
+        decoded = decode_audio_in_memory(payload, "wav")
+        expected = _tone(440.0, TARGET_RATE, seconds=len(decoded) / TARGET_RATE)
+        inner = slice(200, len(expected) - 200)
+        assert decoded.dtype == np.float32
+        assert np.sqrt(np.mean(np.square(decoded[inner] - expected[inner]))) < 5e-3
+
+    @pytest.mark.property
+    def test_raw_pcm_and_non_wav_payloads(self):
+        """
+        Property: Raw PCM uses the given rate; non-WAV bytes are not parsed as WAV.
+        """
+        raw = _tone(440.0, 8000).astype("<f4").tobytes()
+        decoded = decode_audio_in_memory(raw, "float32", sample_rate=8000)
+
+        assert len(decoded) == 2 * len(raw) // 4
+        assert parse_wav(b"ID3\x03 not a wav file") is None
@@ -0,0 +1,163 @@
+"""
+Property tests for the inference benchmark helpers.
+
+**Feature: production-voice-agent, Property: Benchmark Reporting**
+
+Tests that:
+- Sweeps expand to the full cartesian product of their axes
+- Latency percentiles are ordered and bounded by the observed latencies
+- The synthetic corpus is deterministic, bounded and contains speech and pauses
+- The synthetic text corpus is deterministic, long enough and splits into sentences
+- The RSS sampler reports a positive peak
+
+Uses REAL NumPy computations - NO MOCKS.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.audio_processing import VADConfig, extract_speech
+from apps.workflows.benchmark import (
+    RSSSampler,
+    host_info,
+    load_text_corpus,
+    parse_axis,
+    pcm16_bytes,
+    summarize_latencies,
+    sweep,
+    synthetic_speech,
+    synthetic_text,
+)
+from apps.workflows.tts_batch import iter_sentences
+
+
+class TestSweep:
+    """
+    For any set of sweep axes:
+    - The sweep SHALL contain one configuration per combination of values
+    """
+
+    @pytest.mark.property
+    @given(
+        batch_sizes=st.lists(st.integers(1, 32), min_size=1, max_size=4, unique=True),
+        models=st.lists(st.sampled_from(["tiny", "base", "small"]), min_size=1, unique=True),
+    )
+    @settings(max_examples=50)
+    def test_cartesian_product(self, batch_sizes, models):
+        configs = sweep(batch_size=batch_sizes, model=models)
+        assert len(configs) == len(batch_sizes) * len(models)
+        assert {(c["batch_size"], c["model"]) for c in configs} == {
+            (b, m) for b in batch_sizes for m in models
+        }
+
+    @pytest.mark.property
+    def test_parse_axis(self):
+        assert parse_axis("1, 4,8,", int) == [1, 4, 8]
+        assert parse_axis("int8,float16", str) == ["int8", "float16"]
+
+
+class TestLatencySummary:
+    """
+    For any list of latencies:
+    - p50 <= p95 <= p99 <= max SHALL hold
+    - All percentiles SHALL lie within the observed range
+    """
+
+    @pytest.mark.property
+    @given(
+        latencies=st.lists(
+            st.floats(min_value=0.0, max_value=30.0, allow_nan=False), min_size=1, max_size=500
+        )
+    )
+    @settings(max_examples=100)
+    def test_percentiles_ordered(self, latencies):
+        summary = summarize_latencies(latencies)
+        assert summary["count"] == len(latencies)
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+        assert min(latencies) * 1000 - 0.01 <= summary["p50_ms"]
+        assert summary["max_ms"] <= max(latencies) * 1000 + 0.01
+
+    @pytest.mark.property
+    def test_empty(self):
+        summary = summarize_latencies([])
+        assert summary["count"] == 0
+        assert summary["p99_ms"] == 0.0
+
+
+class TestSyntheticSpeech:
+    """
+    For any seed and duration:
+    - The corpus SHALL be deterministic and within [-1, 1]
+    - The VAD SHALL find speech in it and drop its pauses
+    """
+
+    @pytest.mark.property
+    @given(seed=st.integers(0, 1000), seconds=st.floats(min_value=2.5, max_value=6.0))
+    @settings(max_examples=20, deadline=None)
+    def test_deterministic_and_bounded(self, seed, seconds):
+        audio = synthetic_speech(seconds, 16000, seed)
+        assert np.array_equal(audio, synthetic_speech(seconds, 16000, seed))
+        assert audio.dtype == np.float32
+        assert len(audio) == int(seconds * 16000)
+        assert np.abs(audio).max() <= 1.0
+        assert len(pcm16_bytes(audio)) == 2 * len(audio)
+
+    @pytest.mark.property
+    def test_has_speech_and_pauses(self):
+        audio = synthetic_speech(5.0, 16000, seed=3)
+        speech = extract_speech(audio, VADConfig(sample_rate=16000))
+        assert 0 < len(speech) < len(audio)
+
+
+class TestSyntheticText:
+    """
+    For any seed and length:
+    - The text SHALL be deterministic and at least the requested length
+    - The text SHALL split into several sentences once long enough
+    - A text corpus file SHALL yield one request per non-empty line
+    """
+
+    @pytest.mark.property
+    @given(seed=st.integers(0, 1000), characters=st.integers(min_value=0, max_value=2000))
+    @settings(max_examples=50)
+    def test_deterministic_and_long_enough(self, seed, characters):
+        text = synthetic_text(characters, seed)
+        assert text == synthetic_text(characters, seed)
+        assert len(text) >= characters and text.strip()
+        if characters >= 400:
+            assert len(list(iter_sentences([text], 400))) > 1
+
+    @pytest.mark.property
+    def test_text_corpus(self, tmp_path):
+        path = tmp_path / "corpus.txt"
+        path.write_text("Hello there.\n\n  How are you?  \n", encoding="utf-8")
+        assert load_text_corpus(str(path)) == [
+            ("line-1", "Hello there."),
+            ("line-3", "How are you?"),
+        ]
+        assert host_info()["cpus"] > 0
+
+
+class TestRSSSampler:
+    """
+    For any sampled run:
+    - The peak RSS SHALL be positive and at least the RSS at entry
+    """
+
+    @pytest.mark.property
+    def test_peak_rss(self):
+        async def run():
+            async with RSSSampler(interval=0.01) as sampler:
+                entry = sampler.peak_bytes
+                buffer = np.ones(8 * 1024 * 1024, dtype=np.uint8)
+                await asyncio.sleep(0.05)
+                del buffer
+            return entry, sampler.peak_bytes
+
+        entry, peak = asyncio.run(run())
+        assert peak > 0
+        assert peak >= entry
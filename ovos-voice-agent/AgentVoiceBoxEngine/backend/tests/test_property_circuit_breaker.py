@@ -0,0 +1,228 @@
+"""
+Property tests for the LLM provider circuit breakers.
+
+**Feature: production-voice-agent, Property: Shared Circuit Breaker**
+
+Tests that:
+- A circuit opens after `threshold` consecutive failures and a success resets the count
+- Failures seen by any worker count towards one shared threshold
+- An open circuit rejects requests on every worker
+- A half-open circuit admits a single probe cluster-wide
+- The probe's outcome closes or reopens the circuit; a stale probe cannot
+- Workers fall back to their own state when Redis is unreachable
+
+Uses the REAL Redis server from REDIS_URL - NO MOCKS.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import redis.asyncio as aioredis
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.circuit_breaker import CircuitBreaker, CircuitState, SharedCircuitBreaker
+from tests.conftest import run_with_redis
+
+
+def _run(scenario, replicas=3, threshold=3, timeout=60.0, probe_timeout=60.0):
+    """Runs a scenario against breakers of one fresh provider, one client per worker."""
+
+    async def with_breakers(*clients):
+        provider = f"test-{uuid.uuid4().hex}"
+        breakers = [
+            SharedCircuitBreaker(client, provider, threshold, timeout, probe_timeout, local_ttl=0)
+            for client in clients
+        ]
+        try:
+            return await scenario(breakers)
+        finally:
+            await clients[0].delete(SharedCircuitBreaker.key(provider))
+
+    return run_with_redis(with_breakers, clients=replicas)
+
+
+class TestLocalBreaker:
+    """
+    For any sequence of outcomes on one worker:
+    - The circuit SHALL open once `threshold` failures follow the last success
+    - An open circuit SHALL admit a request again after `timeout`
+    """
+
+    @pytest.mark.property
+    @given(
+        outcomes=st.lists(st.booleans(), max_size=30),
+        threshold=st.integers(min_value=1, max_value=5),
+    )
+    @settings(max_examples=100)
+    def test_threshold(self, outcomes, threshold):
+        breaker = CircuitBreaker(threshold=threshold, timeout=3600.0)
+        streak = 0
+        for success in outcomes:
+            if success:
+                breaker.record_success()
+                streak = 0
+            else:
+                breaker.record_failure()
+                streak += 1
+        assert breaker.can_execute() == (streak < threshold)
+
+    @pytest.mark.property
+    def test_timeout_half_opens(self):
+        breaker = CircuitBreaker(threshold=1, timeout=0.0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.can_execute()
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+
+class TestFallback:
+    """
+    For a worker without Redis:
+    - The breaker SHALL keep admitting and rejecting from its own state
+    - The switch to its own state SHALL be logged once, not on every call
+    """
+
+    @pytest.mark.property
+    @pytest.mark.parametrize("url", [None, "redis://127.0.0.1:1/0"])
+    def test_local_state(self, url):
+        async def run():
+            client = aioredis.from_url(url, socket_connect_timeout=0.5) if url else None
+            breaker = SharedCircuitBreaker(client, "groq", 2, 3600.0, 60.0)
+            try:
+                admitted = []
+                for _ in range(3):
+                    permit = await breaker.acquire()
+                    admitted.append(permit is not None)
+                    if permit:
+                        await breaker.record_failure(permit)
+                return admitted
+            finally:
+                if client is not None:
+                    await client.aclose()
+
+        assert asyncio.run(run()) == [True, True, False]
+
+    @pytest.mark.property
+    def test_fallback_logged_once(self, caplog):
+        async def run():
+            client = aioredis.from_url("redis://127.0.0.1:1/0", socket_connect_timeout=0.5)
+            breaker = SharedCircuitBreaker(client, "groq", 5, 3600.0, 60.0)
+            try:
+                for _ in range(3):
+                    await breaker.record_failure(await breaker.acquire())
+            finally:
+                await client.aclose()
+
+        with caplog.at_level("WARNING", logger="apps.workflows.circuit_breaker"):
+            asyncio.run(run())
+        unavailable = [r for r in caplog.records if "unavailable" in r.getMessage()]
+        assert len(unavailable) == 1
+
+
+@pytest.mark.redis
+class TestSharedState:
+    """
+    For any workers sharing a provider's circuit:
+    - Failures on any worker SHALL count towards the threshold
+    - An open circuit SHALL reject requests on every worker
+    - A success SHALL reset the shared failure count
+    """
+
+    @pytest.mark.property
+    @given(workers=st.lists(st.integers(min_value=0, max_value=2), min_size=3, max_size=3))
+    @settings(max_examples=20, deadline=None)
+    def test_failures_add_up(self, workers):
+        async def scenario(breakers):
+            for index in workers:
+                permit = await breakers[index].acquire()
+                assert permit is not None
+                await breakers[index].record_failure(permit)
+            return [await breaker.acquire() for breaker in breakers]
+
+        assert _run(scenario) == [None, None, None]
+
+    @pytest.mark.property
+    def test_success_resets(self):
+        async def scenario(breakers):
+            for breaker in breakers[:2]:
+                await breaker.record_failure(await breaker.acquire())
+            await breakers[2].record_success(await breakers[2].acquire())
+            await breakers[0].record_failure(await breakers[0].acquire())
+            return await breakers[1].acquire()
+
+        assert _run(scenario) is not None
+
+
+@pytest.mark.redis
+class TestHalfOpen:
+    """
+    For an open circuit past its timeout:
+    - Concurrent requests from every worker SHALL admit exactly one probe
+    - A successful probe SHALL close the circuit; a failed one SHALL reopen it
+    - A probe whose lease expired SHALL no longer decide the state
+    - A released probe SHALL let the next request probe at once
+    """
+
+    @staticmethod
+    async def _open(breakers):
+        for _ in range(3):
+            await breakers[0].record_failure(await breakers[0].acquire())
+
+    @pytest.mark.property
+    def test_single_probe(self):
+        async def scenario(breakers):
+            await self._open(breakers)
+            permits = await asyncio.gather(*(b.acquire() for b in breakers for _ in range(10)))
+            return [permit for permit in permits if permit is not None]
+
+        admitted = _run(scenario, timeout=0.0)
+        assert len(admitted) == 1 and admitted[0].probe
+
+    @pytest.mark.property
+    @pytest.mark.parametrize("success", [True, False])
+    def test_probe_outcome(self, success):
+        async def scenario(breakers):
+            await self._open(breakers)
+            await asyncio.sleep(0.25)
+            probe = await breakers[1].acquire()
+            if success:
+                await breakers[1].record_success(probe)
+            else:
+                await breakers[1].record_failure(probe)
+            return await breakers[2].acquire()
+
+        permit = _run(scenario, timeout=0.2)
+        if success:
+            assert permit is not None and not permit.probe
+        else:
+            assert permit is None
+
+    @pytest.mark.property
+    def test_stale_probe(self):
+        async def scenario(breakers):
+            await self._open(breakers)
+            stale = await breakers[1].acquire()
+            await asyncio.sleep(0.1)
+            fresh = await breakers[2].acquire()
+            await breakers[1].record_success(stale)
+            return stale, fresh, await breakers[0].acquire()
+
+        stale, fresh, after = _run(scenario, timeout=0.0, probe_timeout=0.05)
+        assert stale.probe and fresh.probe and stale.probe_id != fresh.probe_id
+        assert after is None
+
+    @pytest.mark.property
+    def test_release(self):
+        async def scenario(breakers):
+            await self._open(breakers)
+            probe = await breakers[1].acquire()
+            blocked = await breakers[2].acquire()
+            await breakers[1].release(probe)
+            return blocked, await breakers[2].acquire()
+
+        blocked, next_probe = _run(scenario, timeout=0.0)
+        assert blocked is None and next_probe.probe
@@ -0,0 +1,171 @@
+"""
+Property tests for the Kokoro ONNX runtime tuning.
+
+**Feature: production-voice-agent, Property: Kokoro Runtime**
+
+Tests that:
+- Automatic intra-op threads split the CPUs between the replicas
+- The voice table holds every voice of the archive
+- Streams go to the least busy replica with the cached voice style
+- Warmup runs every known voice on every replica
+- Session options follow the configuration (when ONNX Runtime is installed)
+
+Uses REAL numpy archives and asyncio streams - NO MOCKS.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.kokoro_runtime import (
+    KokoroReplicaPool,
+    RuntimeConfig,
+    intra_op_threads,
+    load_voice_table,
+    session_options,
+)
+
+
+class _ToneEngine:
+    """Minimal Kokoro-compatible engine that synthesizes a constant tone."""
+
+    def __init__(self) -> None:
+        self.styles: list[np.ndarray] = []
+        self.warmed: list[str] = []
+
+    async def create_stream(self, text, voice, speed, **kwargs):
+        self.styles.append(voice)
+        for _ in range(2):
+            await asyncio.sleep(0.001)
+            yield np.full(len(text), float(voice[0]), dtype=np.float32), 24000
+
+    def create(self, text, voice, **kwargs):
+        self.warmed.append(float(voice[0]))
+        return np.zeros(len(text), dtype=np.float32), 24000
+
+
+class TestThreadSplit:
+    """
+    For any CPU count and replica count:
+    - Automatic threads SHALL split the CPUs evenly, at least one per replica
+    - Explicit threads SHALL be used as configured
+    """
+
+    @pytest.mark.property
+    @given(
+        cpus=st.integers(min_value=1, max_value=128),
+        replicas=st.integers(min_value=1, max_value=16),
+    )
+    @settings(max_examples=100)
+    def test_auto_split(self, cpus, replicas):
+        threads = intra_op_threads(RuntimeConfig(replicas=replicas), cpus)
+        assert threads >= 1
+        assert threads == max(1, cpus // replicas)
+        if cpus >= replicas:
+            assert threads * replicas <= cpus
+
+    @pytest.mark.property
+    def test_explicit_threads(self):
+        assert intra_op_threads(RuntimeConfig(replicas=4, intra_op_threads=3), 2) == 3
+
+
+class TestVoiceTable:
+    """
+    For any voices archive:
+    - The table SHALL hold every voice with its style array
+    """
+
+    @pytest.mark.property
+    def test_load_voice_table(self, tmp_path):
+        path = tmp_path / "voices.npz"
+        styles = {
+            "af_bella": np.random.rand(4, 1, 8).astype(np.float32),
+            "am_onyx": np.random.rand(4, 1, 8).astype(np.float32),
+        }
+        np.savez(path, **styles)
+
+        table = load_voice_table(str(path))
+        assert sorted(table) == sorted(styles)
+        for name, style in styles.items():
+            np.testing.assert_array_equal(table[name], style)
+
+
+class TestReplicaPool:
+    """
+    For concurrent streams:
+    - Each stream SHALL run on the least busy replica
+    - The replica SHALL receive the cached voice style
+    - Warmup SHALL run each known voice on each replica
+    """
+
+    @staticmethod
+    def _pool(replicas: int) -> tuple[KokoroReplicaPool, list[_ToneEngine]]:
+        engines = [_ToneEngine() for _ in range(replicas)]
+        voices = {
+            "af_bella": np.array([1.0], dtype=np.float32),
+            "am_onyx": np.array([2.0], dtype=np.float32),
+        }
+        return KokoroReplicaPool(engines, voices), engines
+
+    @pytest.mark.property
+    def test_least_busy_dispatch(self):
+        pool, engines = self._pool(3)
+
+        async def consume(voice):
+            return [chunk async for chunk in pool.create_stream("hello", voice)]
+
+        async def run():
+            return await asyncio.gather(*(consume("am_onyx") for _ in range(3)))
+
+        results = asyncio.run(run())
+        assert [len(engine.styles) for engine in engines] == [1, 1, 1]
+        assert all(float(audio[0]) == 2.0 for chunks in results for audio, _ in chunks)
+        assert pool._active == [0, 0, 0]
+        assert pool.get_voices() == ["af_bella", "am_onyx"]
+        assert "am_onyx" in pool.voice_names
+
+    @pytest.mark.property
+    def test_warmup(self):
+        pool, engines = self._pool(2)
+        pool.warmup(["am_onyx", "missing", "af_bella"], "Hello.")
+        assert [engine.warmed for engine in engines] == [[2.0, 1.0], [2.0, 1.0]]
+
+    @pytest.mark.property
+    def test_requires_replica(self):
+        with pytest.raises(ValueError):
+            KokoroReplicaPool([], {})
+
+
+class TestSessionOptions:
+    """
+    For any runtime configuration:
+    - Session options SHALL carry the configured threads, level and memory flags
+    - An unknown optimization level SHALL be rejected
+    """
+
+    @pytest.mark.property
+    def test_options(self):
+        rt = pytest.importorskip("onnxruntime")
+        config = RuntimeConfig(
+            replicas=2,
+            inter_op_threads=2,
+            graph_optimization="extended",
+            cpu_mem_arena=False,
+            mem_pattern=False,
+        )
+        options = session_options(config, cpus=8)
+        assert options.intra_op_num_threads == 4
+        assert options.inter_op_num_threads == 2
+        assert options.execution_mode == rt.ExecutionMode.ORT_PARALLEL
+        assert options.graph_optimization_level == rt.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        assert not options.enable_cpu_mem_arena
+        assert not options.enable_mem_pattern
+
+    @pytest.mark.property
+    def test_unknown_level(self):
+        pytest.importorskip("onnxruntime")
+        with pytest.raises(ValueError):
+            session_options(RuntimeConfig(graph_optimization="turbo"), cpus=2)
@@ -0,0 +1,188 @@
+"""
+Property tests for the LLM response cache.
+
+**Feature: production-voice-agent, Property: LLM Response Cache**
+
+Tests that:
+- Requests differing only in key order share a cache key
+- Any change of tenant, model, messages, tools or sampling changes the key
+- Only temperature-0 requests are deterministic
+- Replayed tokens coalesce into the same text as the live stream
+- Each tenant keeps at most max_entries responses, evicting its oldest
+- Responses longer than max_characters are not stored
+- The per-process tenant opt-in cache stays bounded
+
+Uses the REAL Redis server from REDIS_URL - NO MOCKS.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows import llm_cache
+from apps.workflows.llm_cache import (
+    TENANT_SETTINGS_MAX,
+    TENANT_SETTINGS_TTL,
+    LLMResponseCache,
+    deterministic,
+    index_key,
+    replay,
+    response_key,
+)
+from apps.workflows.token_coalescer import TokenCoalescer, coalesce
+from tests.conftest import run_with_redis
+
+messages_strategy = st.lists(
+    st.fixed_dictionaries(
+        {"role": st.sampled_from(["system", "user", "assistant"]), "content": st.text(max_size=40)}
+    ),
+    min_size=1,
+    max_size=5,
+)
+
+
+def _run(scenario, max_entries=3, max_characters=100):
+    """Runs a scenario against a fresh cache and cleans up the keys of its tenants."""
+
+    async def with_cache(client):
+        cache = LLMResponseCache(
+            client, ttl=60, max_entries=max_entries, max_characters=max_characters
+        )
+        tenants = [f"test-{uuid.uuid4().hex}" for _ in range(2)]
+        try:
+            return await scenario(client, cache, tenants)
+        finally:
+            for tenant in tenants:
+                keys = [key async for key in client.scan_iter(f"llm:cache:{{{tenant}}}:*")]
+                if keys:
+                    await client.delete(*keys)
+
+    return run_with_redis(with_cache)
+
+
+class TestResponseKey:
+    """
+    For any request:
+    - Reordering dictionary keys SHALL keep the key
+    - Changing the tenant, messages or sampling SHALL change the key
+    - The tenant SHALL be the key's Redis hash tag
+    """
+
+    @pytest.mark.property
+    @given(messages=messages_strategy, max_tokens=st.integers(min_value=1, max_value=4096))
+    @settings(max_examples=100)
+    def test_canonical(self, messages, max_tokens):
+        sampling = {"temperature": 0.0, "max_tokens": max_tokens}
+        key = response_key("t1", "groq", "m", messages, sampling=sampling)
+        reordered = [dict(reversed(list(message.items()))) for message in messages]
+        assert key == response_key(
+            "t1", "groq", "m", reordered, sampling=dict(reversed(list(sampling.items())))
+        )
+        assert key.startswith("llm:cache:{t1}:")
+
+        assert key != response_key("t2", "groq", "m", messages, sampling=sampling)
+        assert key != response_key("t1", "groq", "other", messages, sampling=sampling)
+        assert key != response_key("t1", "groq", "m", messages + messages, sampling=sampling)
+        assert key != response_key(
+            "t1", "groq", "m", messages, sampling={**sampling, "max_tokens": max_tokens + 1}
+        )
+        assert key != response_key(
+            "t1", "groq", "m", messages, tools=[{"type": "function"}], sampling=sampling
+        )
+
+    @pytest.mark.property
+    @given(temperature=st.one_of(st.none(), st.floats(min_value=0.0, max_value=2.0)))
+    def test_deterministic(self, temperature):
+        assert deterministic(temperature) == (temperature == 0.0)
+
+
+class TestReplay:
+    """
+    For any cached response:
+    - Replayed tokens SHALL coalesce into the cached text, in order
+    """
+
+    @pytest.mark.property
+    @given(tokens=st.lists(st.sampled_from(["Hel", "lo", ".", " How", " can", " I", " help?"])))
+    @settings(max_examples=30, deadline=None)
+    def test_replay(self, tokens):
+        async def run():
+            coalescer = TokenCoalescer(flush_ms=30, max_chars=16)
+            batches = [batch async for batch in coalesce(replay(tokens), coalescer)]
+            return "".join(batches) + coalescer.flush()
+
+        assert asyncio.run(run()) == "".join(tokens)
+
+
+class TestTenantOptIn:
+    """
+    For any sequence of tenant lookups:
+    - The opt-in cache SHALL hold at most TENANT_SETTINGS_MAX tenants
+    - Expired entries SHALL be dropped before live ones
+    """
+
+    @pytest.mark.property
+    @given(tenants=st.integers(min_value=0, max_value=3 * TENANT_SETTINGS_MAX))
+    @settings(max_examples=10, deadline=None)
+    def test_bounded(self, tenants):
+        llm_cache._tenant_opt_in.clear()
+        for index in range(tenants):
+            llm_cache._remember_opt_in(f"tenant-{index}", True, 0.0)
+        assert len(llm_cache._tenant_opt_in) == min(tenants, TENANT_SETTINGS_MAX)
+        llm_cache._tenant_opt_in.clear()
+
+    @pytest.mark.property
+    def test_expired_first(self):
+        llm_cache._tenant_opt_in.clear()
+        llm_cache._remember_opt_in("live", True, TENANT_SETTINGS_TTL)
+        for index in range(TENANT_SETTINGS_MAX - 1):
+            llm_cache._remember_opt_in(f"stale-{index}", False, 0.0)
+        llm_cache._remember_opt_in("new", True, TENANT_SETTINGS_TTL)
+        assert set(llm_cache._tenant_opt_in) == {"live", "new"}
+        llm_cache._tenant_opt_in.clear()
+
+
+@pytest.mark.redis
+class TestStore:
+    """
+    For any sequence of stored responses:
+    - A stored response SHALL be returned for its key
+    - A tenant SHALL keep at most max_entries, evicting its oldest first
+    - Eviction SHALL never touch another tenant's entries
+    - Responses over max_characters SHALL not be stored
+    """
+
+    @pytest.mark.property
+    @given(count=st.integers(min_value=1, max_value=8))
+    @settings(max_examples=10, deadline=None)
+    def test_bounded_per_tenant(self, count):
+        async def scenario(client, cache, tenants):
+            other = response_key(tenants[1], "groq", "m", [{"role": "user", "content": "hi"}])
+            await cache.put(tenants[1], other, {"tokens": ["hello"]}, 5)
+            keys = []
+            for index in range(count):
+                messages = [{"role": "user", "content": str(index)}]
+                key = response_key(tenants[0], "groq", "m", messages)
+                await cache.put(tenants[0], key, {"tokens": [str(index)]}, 1)
+                keys.append(key)
+            found = [await cache.get(key) for key in keys]
+            return found, await cache.get(other), await client.zcard(index_key(tenants[0]))
+
+        found, other, indexed = _run(scenario, max_entries=3)
+        kept = min(count, 3)
+        assert found[: count - kept] == [None] * (count - kept)
+        assert found[count - kept :] == [{"tokens": [str(i)]} for i in range(count - kept, count)]
+        assert other == {"tokens": ["hello"]}
+        assert indexed == kept
+
+    @pytest.mark.property
+    def test_too_long(self):
+        async def scenario(client, cache, tenants):
+            key = response_key(tenants[0], "groq", "m", [{"role": "user", "content": "essay"}])
+            await cache.put(tenants[0], key, {"tokens": ["x" * 101]}, 101)
+            return await cache.get(key)
+
+        assert _run(scenario, max_characters=100) is None
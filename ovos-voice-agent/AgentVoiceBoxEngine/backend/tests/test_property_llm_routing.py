@@ -0,0 +1,159 @@
+"""
+Property tests for latency-aware LLM routing and hedging.
+
+**Feature: production-voice-agent, Property: LLM Hedged Routing**
+
+Tests that:
+- Healthy providers are ordered by their average time to first token
+- Providers with a high error rate are tried last
+- The hedge deadline follows the p95 time to first token within its bounds
+- A hedged race answers with the first provider to produce a token
+- A provider failing before answering hands over to the hedge at once
+
+Uses REAL asyncio streams - NO MOCKS.
+"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.llm_routing import LatencyRouter, RaceFailed, RoutingConfig, race
+
+PROVIDERS = ["groq", "openai", "ollama"]
+
+
+async def _stream(delay: float, tokens: list[str], error: Exception = None):
+    await asyncio.sleep(delay)
+    if error:
+        raise error
+    for token in tokens:
+        yield token
+
+
+async def _collect(result) -> list[str]:
+    return [token async for token in result.tokens()]
+
+
+class TestRouterOrder:
+    """
+    For any measured latencies:
+    - Healthy providers SHALL be ordered fastest first
+    - Unmeasured providers SHALL follow measured ones in the given order
+    - Unhealthy providers SHALL come last
+    - The priority policy SHALL keep the given order
+    """
+
+    @pytest.mark.property
+    @given(latencies=st.lists(st.floats(min_value=0.01, max_value=5.0), min_size=3, max_size=3))
+    @settings(max_examples=100)
+    def test_fastest_first(self, latencies):
+        router = LatencyRouter(RoutingConfig(alpha=1.0))
+        for provider, latency in zip(PROVIDERS, latencies):
+            router.record_ttft(provider, "m", latency)
+
+        order = router.order(PROVIDERS, "m")
+        assert [router._stats[(p, "m")].ttft_ewma for p in order] == sorted(latencies)
+        assert LatencyRouter(RoutingConfig(policy="priority")).order(PROVIDERS, "m") == PROVIDERS
+
+    @pytest.mark.property
+    def test_health_and_unmeasured(self):
+        router = LatencyRouter(RoutingConfig(alpha=0.5, max_error_rate=0.5))
+        router.record_ttft("groq", "m", 0.1)
+        for _ in range(3):
+            router.record_failure("groq", "m")
+        router.record_ttft("ollama", "m", 0.9)
+
+        assert not router.healthy("groq", "m")
+        assert router.order(PROVIDERS, "m") == ["ollama", "openai", "groq"]
+        # Statistics are kept per model.
+        assert router.order(PROVIDERS, "other") == PROVIDERS
+
+
+class TestHedgeDelay:
+    """
+    For any first-token samples:
+    - Without enough samples the deadline SHALL be the maximum
+    - Otherwise it SHALL be the p95 clamped to [min, max]
+    """
+
+    @pytest.mark.property
+    @given(samples=st.lists(st.floats(min_value=0.0, max_value=5.0), min_size=1, max_size=60))
+    @settings(max_examples=100)
+    def test_bounds(self, samples):
+        config = RoutingConfig(hedge_min=0.25, hedge_max=2.0, hedge_min_samples=20)
+        router = LatencyRouter(config)
+        for sample in samples:
+            router.record_ttft("groq", "m", sample)
+
+        delay = router.hedge_delay("groq", "m")
+        assert config.hedge_min <= delay <= config.hedge_max
+        if len(samples) < 20:
+            assert delay == config.hedge_max
+        elif config.hedge_min < delay < config.hedge_max:
+            assert sum(s <= delay for s in samples) >= 0.95 * len(samples)
+
+
+class TestRace:
+    """
+    For any race between a primary and a hedge:
+    - A primary answering before the deadline SHALL win with the hedge unused
+    - A slow primary SHALL lose to a faster hedge and be abandoned
+    - A failing primary SHALL hand over to the hedge without waiting
+    - A race where every provider fails SHALL raise RaceFailed
+    """
+
+    @pytest.mark.property
+    def test_primary_in_time(self):
+        async def run():
+            streams = {"groq": _stream(0.0, ["a", "b"]), "openai": _stream(0.0, ["x"])}
+            result = await race("groq", "openai", streams.pop, delay=0.5)
+            return result, await _collect(result)
+
+        result, tokens = asyncio.run(run())
+        assert result.winner.name == "groq" and tokens == ["a", "b"]
+        assert result.unused == "openai" and not result.abandoned
+
+    @pytest.mark.property
+    def test_hedge_wins(self):
+        async def run():
+            streams = {"groq": _stream(2.0, ["slow"]), "openai": _stream(0.01, ["fast"])}
+            started = asyncio.get_running_loop().time()
+            result = await race("groq", "openai", streams.pop, delay=0.05)
+            elapsed = asyncio.get_running_loop().time() - started
+            return result, await _collect(result), elapsed
+
+        result, tokens, elapsed = asyncio.run(run())
+        assert result.winner.name == "openai" and tokens == ["fast"]
+        assert [name for name, _ in result.abandoned] == ["groq"]
+        assert elapsed < 1.0
+
+    @pytest.mark.property
+    def test_failure_hands_over(self):
+        async def run():
+            streams = {
+                "groq": _stream(0.0, [], error=RuntimeError("503")),
+                "openai": _stream(0.0, ["ok"]),
+            }
+            started = asyncio.get_running_loop().time()
+            result = await race("groq", "openai", streams.pop, delay=5.0)
+            return result, await _collect(result), asyncio.get_running_loop().time() - started
+
+        result, tokens, elapsed = asyncio.run(run())
+        assert result.winner.name == "openai" and tokens == ["ok"]
+        assert [name for name, _ in result.failures] == ["groq"]
+        assert elapsed < 1.0
+
+    @pytest.mark.property
+    def test_all_fail(self):
+        async def run():
+            streams = {
+                "groq": _stream(0.0, [], error=RuntimeError("503")),
+                "openai": _stream(0.0, [], error=RuntimeError("429")),
+            }
+            await race("groq", "openai", streams.pop, delay=0.01)
+
+        with pytest.raises(RaceFailed) as exc_info:
+            asyncio.run(run())
+        assert [name for name, _ in exc_info.value.failures] == ["groq", "openai"]
@@ -0,0 +1,138 @@
+"""
+Property tests for the pooled LLM provider transport.
+
+**Feature: production-voice-agent, Property: LLM Connection Pooling**
+
+Tests that:
+- Base URLs are pooled per origin, whatever their path
+- Sequential requests to a provider reuse one kept-alive connection
+- Pre-connect opens the connection before the first request
+- Pool metrics count requests and release finished streams
+
+Uses a REAL local HTTP server and the REAL httpx transport - NO MOCKS.
+"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.llm_transport import LLMTransport, TransportConfig, pool_key
+
+CONFIG = TransportConfig(http2=False, max_connections=4, max_keepalive=4, preconnect=True)
+
+
+class _Server:
+    """Minimal keep-alive HTTP/1.1 server that counts its connections."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def __aenter__(self) -> "_Server":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                body = b"" if head.startswith(b"HEAD") else b'{"ok": true}'
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(b'{"ok": true}'), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class TestPoolKey:
+    """
+    For any provider URL:
+    - URLs differing only in path SHALL share a pool
+    - Default ports SHALL be made explicit
+    """
+
+    @pytest.mark.property
+    @given(
+        host=st.sampled_from(["api.groq.com", "api.openai.com", "localhost"]),
+        path=st.sampled_from(["", "/", "/v1", "/openai/v1"]),
+    )
+    @settings(max_examples=30)
+    def test_origin(self, host, path):
+        assert pool_key(f"https://{host}{path}") == f"https://{host}:443"
+        assert pool_key(f"http://{host}:11434{path}") == f"http://{host}:11434"
+
+
+class TestConnectionReuse:
+    """
+    For any number of sequential requests:
+    - The provider SHALL see a single connection, opened by pre-connect
+    - The pool SHALL count every request and hold no stream once they finish
+    """
+
+    @pytest.mark.property
+    @given(requests=st.integers(min_value=1, max_value=8), streamed=st.booleans())
+    @settings(max_examples=10, deadline=None)
+    def test_reuse(self, requests, streamed):
+        async def run():
+            async with _Server() as server:
+                transport = LLMTransport(CONFIG)
+                try:
+                    await transport.preconnect([server.url, server.url + "/"])
+                    assert server.connections == 1
+                    client = transport.client(server.url)
+                    for _ in range(requests):
+                        if streamed:
+                            async with client.stream("POST", f"{server.url}/chat", json={}) as r:
+                                async for _ in r.aiter_bytes():
+                                    pass
+                        else:
+                            response = await client.post(f"{server.url}/chat", json={})
+                            assert response.json() == {"ok": True}
+                    return server.connections, server.requests, transport.stats()
+                finally:
+                    await transport.aclose()
+
+        connections, served, stats = asyncio.run(run())
+        assert connections == 1
+        assert served == requests + 1
+        [pool] = stats
+        assert pool["requests_total"] == requests + 1
+        assert pool["in_flight"] == 0 and pool["failures_total"] == 0
+        assert pool["connections"] == pool["idle_connections"] == 1
+
+    @pytest.mark.property
+    def test_preconnect_failure_is_logged(self):
+        async def run():
+            transport = LLMTransport(CONFIG)
+            try:
+                await transport.preconnect(["http://127.0.0.1:9/v1"])
+                return transport.stats()
+            finally:
+                await transport.aclose()
+
+        [pool] = asyncio.run(run())
+        assert pool["failures_total"] == 1 and pool["in_flight"] == 0
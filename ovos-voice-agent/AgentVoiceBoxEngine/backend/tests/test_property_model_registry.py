@@ -0,0 +1,109 @@
+"""
+Property tests for the process-wide model registry.
+
+**Feature: production-voice-agent, Property: Shared Model Registry**
+
+Tests that:
+1. Each model key is loaded at most once, even under concurrent access
+2. Loaded models stay within the memory budget by evicting least recently used models
+3. Recently used models survive eviction
+
+Uses the REAL ModelRegistry with in-process loaders - NO MOCKS.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.model_registry import ModelKey, ModelRegistry
+
+
+def _registry(budget: int = 0) -> tuple[ModelRegistry, list[ModelKey]]:
+    """Creates a registry whose models are 100-byte objects, recording every load."""
+    loads: list[ModelKey] = []
+    registry = ModelRegistry(memory_budget_bytes=budget)
+
+    def load(key: ModelKey) -> dict:
+        loads.append(key)
+        return {"key": key}
+
+    registry.register_loader("fake", load, sizer=lambda model: 100)
+    return registry, loads
+
+
+class TestModelRegistry:
+    """
+    Property tests for ModelRegistry.
+
+    For any access pattern:
+    - A key SHALL be loaded only if it is not already loaded
+    - Estimated memory SHALL not exceed the budget except for the newest model
+    """
+
+    @pytest.mark.property
+    def test_concurrent_callers_share_one_load(self):
+        """
+        Property: Concurrent first access loads the model exactly once.
+        """
+        registry, loads = _registry()
+        key = ModelKey("fake", "tiny")
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get(key))) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == [key]
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.property
+    @given(
+        accesses=st.lists(st.integers(min_value=0, max_value=6), min_size=1, max_size=40),
+        capacity=st.integers(min_value=1, max_value=4),
+    )
+    @settings(max_examples=50)
+    def test_lru_eviction_respects_budget(self, accesses, capacity):
+        """
+        Property: The registry behaves like an LRU cache of `capacity` models.
+        """
+        registry, loads = _registry(budget=capacity * 100)
+        expected: list[int] = []
+        expected_loads = 0
+
+        for index in accesses:
+            registry.get(ModelKey("fake", f"model-{index}"))
+            if index in expected:
+                expected.remove(index)
+            else:
+                expected_loads += 1
+            expected.append(index)
+            del expected[:-capacity]
+
+        stats = registry.stats()
+        assert len(loads) == expected_loads
+        assert stats["memory_bytes"] <= capacity * 100
+        assert [m["model"] for m in stats["models"]] == [f"model-{i}" for i in expected]
+
+    @pytest.mark.property
+    def test_async_access_and_unknown_engine(self):
+        """
+        Property: aget returns the shared model; unknown engines are rejected.
+        """
+        registry, loads = _registry()
+        key = ModelKey("fake", "base", language="en")
+
+        first = asyncio.run(registry.aget(key))
+        second = asyncio.run(registry.aget(key))
+
+        assert first is second
+        assert loads == [key]
+        assert key in registry
+        with pytest.raises(KeyError):
+            registry.get(ModelKey("missing", "model"))
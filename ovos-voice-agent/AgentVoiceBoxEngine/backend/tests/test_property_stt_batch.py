@@ -0,0 +1,166 @@
+"""
+Property tests for offline long-recording transcription.
+
+**Feature: production-voice-agent, Property: STT Long-Form Chunking**
+
+Tests that:
+- Chunks own contiguous, non-overlapping ranges covering the whole recording
+- Decoded ranges stay within one chunk length plus overlap on each side
+- Chunk boundaries land in the silence between sounds
+- Segments decoded twice in an overlap are kept exactly once
+
+Uses REAL memory-mapped WAV files and signal processing - NO MOCKS.
+"""
+
+import wave
+
+import numpy as np
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.stt_batch import (
+    ChunkPlan,
+    open_recording,
+    plan_chunks,
+    quietest_frame,
+    stitch,
+)
+
+RATE = 8000
+
+
+def _write_wav(path, audio: np.ndarray) -> None:
+    """Writes mono float audio as a PCM16 WAV file."""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(RATE)
+        wav_file.writeframes((np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+
+
+def _bursts(n_bursts: int, burst_seconds: float, gap_seconds: float) -> np.ndarray:
+    """Returns tone bursts separated by silence."""
+    t = np.arange(int(burst_seconds * RATE)) / RATE
+    burst = 0.5 * np.sin(2 * np.pi * 440 * t)
+    gap = np.zeros(int(gap_seconds * RATE))
+    return np.concatenate([np.concatenate([burst, gap]) for _ in range(n_bursts)])
+
+
+class TestChunkPlan:
+    """
+    For any recording and chunking:
+    - Kept ranges SHALL tile the recording in order without gaps or overlaps
+    - Decoded ranges SHALL contain the kept range plus at most the overlap
+    - No kept range SHALL exceed the chunk length
+    """
+
+    @pytest.mark.property
+    @given(
+        seconds=st.floats(min_value=0.01, max_value=12.0),
+        chunk_seconds=st.floats(min_value=0.5, max_value=4.0),
+        search_seconds=st.floats(min_value=0.0, max_value=2.0),
+        overlap_seconds=st.floats(min_value=0.0, max_value=0.5),
+        seed=st.integers(min_value=0, max_value=2**32 - 1),
+    )
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_tiling(self, tmp_path, seconds, chunk_seconds, search_seconds, overlap_seconds, seed):
+        audio = np.random.default_rng(seed).uniform(-0.5, 0.5, int(seconds * RATE) + 1)
+        path = tmp_path / "recording.wav"
+        _write_wav(path, audio)
+
+        with open_recording(str(path)) as (pcm_format, samples):
+            plans = list(
+                plan_chunks(samples, pcm_format, chunk_seconds, search_seconds, overlap_seconds)
+            )
+
+        chunk = int(chunk_seconds * RATE)
+        overlap = int(overlap_seconds * RATE)
+        assert [plan.index for plan in plans] == list(range(len(plans)))
+        assert plans[0].keep_start == 0 and plans[-1].keep_end == len(audio)
+        for previous, current in zip(plans, plans[1:]):
+            assert previous.keep_end == current.keep_start
+        for plan in plans:
+            assert 0 < plan.keep_end - plan.keep_start <= chunk
+            assert 0 <= plan.start <= plan.keep_start and plan.keep_end <= plan.end
+            assert plan.keep_start - plan.start <= overlap
+            assert plan.end - plan.keep_end <= overlap
+
+
+class TestSilenceCuts:
+    """
+    For any recording of sounds separated by silence:
+    - Every chunk boundary SHALL fall in a silent gap
+    - Ties between equally silent frames SHALL go to the latest one
+    """
+
+    @pytest.mark.property
+    @given(
+        burst_seconds=st.floats(min_value=0.3, max_value=1.2),
+        gap_seconds=st.floats(min_value=0.2, max_value=0.6),
+        chunk_seconds=st.floats(min_value=2.0, max_value=4.0),
+    )
+    @settings(max_examples=25, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_cuts_in_silence(self, tmp_path, burst_seconds, gap_seconds, chunk_seconds):
+        audio = _bursts(12, burst_seconds, gap_seconds)
+        path = tmp_path / "recording.wav"
+        _write_wav(path, audio)
+
+        with open_recording(str(path)) as (pcm_format, samples):
+            plans = list(plan_chunks(samples, pcm_format, chunk_seconds, 1.5, 0.1))
+
+        assert len(plans) > 1
+        for plan in plans[:-1]:
+            assert audio[plan.keep_end] == 0.0
+
+    @pytest.mark.property
+    def test_latest_tie(self):
+        audio = np.concatenate([np.zeros(160), np.ones(160), np.zeros(160), np.ones(160)])
+        assert quietest_frame(audio, 160) == 2 * 160 + 80
+
+    @pytest.mark.property
+    def test_rejects_non_wav(self, tmp_path):
+        path = tmp_path / "recording.wav"
+        path.write_bytes(b"not a wav file")
+        with pytest.raises(ValueError):
+            with open_recording(str(path)):
+                pass
+
+
+class TestStitch:
+    """
+    For any segments decoded by two chunks that overlap:
+    - Each segment SHALL be kept by exactly one chunk
+    - Kept segments SHALL be placed on the recording's timeline
+    - Stitching SHALL be deterministic
+    """
+
+    @pytest.mark.property
+    @given(
+        midpoints=st.lists(
+            st.floats(min_value=0.1, max_value=7.9), min_size=1, max_size=20, unique=True
+        ),
+    )
+    @settings(max_examples=100)
+    def test_exactly_once(self, midpoints):
+        first = ChunkPlan(0, start=0, end=5 * RATE, keep_start=0, keep_end=4 * RATE)
+        second = ChunkPlan(1, start=3 * RATE, end=8 * RATE, keep_start=4 * RATE, keep_end=8 * RATE)
+
+        def decoded(plan: ChunkPlan) -> list:
+            offset = plan.start / RATE
+            return [
+                [mid - 0.05 - offset, mid + 0.05 - offset, f"w{i}"]
+                for i, mid in enumerate(midpoints)
+                if plan.start / RATE <= mid - 0.05 and mid + 0.05 <= plan.end / RATE
+            ]
+
+        kept = stitch(first, RATE, decoded(first)) + stitch(second, RATE, decoded(second))
+        in_both = [f"w{i}" for i, mid in enumerate(midpoints) if 3.05 <= mid <= 4.95]
+
+        texts = [segment.text for segment in kept]
+        assert len(texts) == len(set(texts))
+        assert set(in_both) <= set(texts)
+        for segment in kept:
+            index = int(segment.text[1:])
+            assert segment.start == pytest.approx(midpoints[index] - 0.05)
+        assert stitch(first, RATE, decoded(first)) == stitch(first, RATE, decoded(first))
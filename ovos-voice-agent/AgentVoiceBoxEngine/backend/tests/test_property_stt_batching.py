@@ -0,0 +1,123 @@
+"""
+Property tests for the inference micro-batching scheduler.
+
+**Feature: production-voice-agent, Property: Cross-Session Micro-Batching**
+
+Tests that:
+1. Every submitter receives exactly its own result, in any arrival order
+2. No dispatched batch exceeds the configured maximum size
+3. A per-item exception fails only that submitter
+4. Batch metrics account for every dispatched item
+
+Uses the REAL MicroBatcher on a real asyncio event loop - NO MOCKS.
+"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.batching import MicroBatcher
+
+
+def _run(coro):
+    """Runs a coroutine on a fresh event loop."""
+    return asyncio.run(coro)
+
+
+class TestMicroBatcher:
+    """
+    Property tests for MicroBatcher.
+
+    For any set of concurrently submitted items:
+    - Each submitter SHALL receive the result computed for its own item
+    - No batch SHALL contain more than max_batch_size items
+    """
+
+    @pytest.mark.property
+    @given(
+        items=st.lists(st.integers(), min_size=1, max_size=64),
+        max_batch_size=st.integers(min_value=1, max_value=16),
+    )
+    @settings(max_examples=30, deadline=None)
+    def test_results_routed_to_own_submitter(self, items, max_batch_size):
+        """
+        Property: Results are routed back to the submitting caller.
+
+        For any list of items, awaiting submit(item) SHALL return f(item)
+        and every dispatched batch SHALL respect max_batch_size.
+        """
+        seen_sizes: list[int] = []
+
+        async def process(batch: list[int]) -> list[int]:
+            seen_sizes.append(len(batch))
+            await asyncio.sleep(0)
+            return [value * 2 + 1 for value in batch]
+
+        async def scenario() -> list[int]:
+            batcher = MicroBatcher(process, max_batch_size, 0.005, name="test")
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in items))
+            finally:
+                await batcher.stop()
+
+        results = _run(scenario())
+
+        assert results == [value * 2 + 1 for value in items]
+        assert all(size <= max_batch_size for size in seen_sizes)
+        assert sum(seen_sizes) == len(items)
+
+    @pytest.mark.property
+    def test_item_exception_fails_only_that_submitter(self):
+        """
+        Property: An exception returned for one item does not fail the batch.
+        """
+
+        async def process(batch: list[int]) -> list[object]:
+            return [ValueError("bad") if value < 0 else value for value in batch]
+
+        async def scenario():
+            batcher = MicroBatcher(process, 8, 0.01, name="test")
+            await batcher.start()
+            try:
+                return await asyncio.gather(
+                    batcher.submit(1),
+                    batcher.submit(-1),
+                    batcher.submit(2),
+                    return_exceptions=True,
+                )
+            finally:
+                await batcher.stop()
+
+        ok_first, failed, ok_second = _run(scenario())
+
+        assert ok_first == 1
+        assert isinstance(failed, ValueError)
+        assert ok_second == 2
+
+    @pytest.mark.property
+    def test_metrics_account_for_every_item(self):
+        """
+        Property: Batch metrics count every dispatched item and bound fill to [0, 1].
+        """
+
+        async def process(batch: list[int]) -> list[int]:
+            return batch
+
+        async def scenario():
+            batcher = MicroBatcher(process, 4, 0.01, name="test")
+            await batcher.start()
+            try:
+                await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+            finally:
+                await batcher.stop()
+            return batcher.metrics.snapshot()
+
+        snapshot = _run(scenario())
+
+        assert snapshot["items_total"] == 10
+        assert snapshot["batches_total"] >= 3
+        assert 0.0 < snapshot["batch_fill"] <= 1.0
+        assert snapshot["queue_wait_ms_p95"] >= snapshot["queue_wait_ms_p50"] >= 0.0
@@ -0,0 +1,116 @@
+"""
+Property tests for per-session language pinning.
+
+**Feature: production-voice-agent, Property: Session Language Pinning**
+
+Tests that:
+- A language is pinned only after enough seconds of confident detections
+- Low-probability detections and language changes never pin
+- Repeated low-confidence decodes drop the pin so the session re-detects
+
+Uses the REAL Redis server from REDIS_URL - NO MOCKS.
+"""
+
+import uuid
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.language_cache import REDETECT_STRIKES, SessionLanguageCache
+from tests.conftest import run_with_redis
+
+pytestmark = pytest.mark.redis
+
+
+def _run(scenario):
+    """Runs a scenario against a fresh cache and cleans up its session key."""
+
+    async def with_cache(client):
+        cache = SessionLanguageCache(
+            client, ttl=60, min_probability=0.8, detect_seconds=3.0, redetect_confidence=0.35
+        )
+        session_id = f"test-{uuid.uuid4().hex}"
+        try:
+            return await scenario(cache, session_id)
+        finally:
+            await client.delete(cache.key(session_id))
+
+    return run_with_redis(with_cache)
+
+
+class TestLanguagePinning:
+    """
+    For any sequence of detections:
+    - The language SHALL be pinned once confident detections of it cover detect_seconds
+    - Detections below min_probability SHALL never count
+    """
+
+    @pytest.mark.property
+    @given(chunks=st.lists(st.floats(min_value=0.1, max_value=2.0), min_size=1, max_size=10))
+    @settings(max_examples=25, deadline=None)
+    def test_pins_after_detect_seconds(self, chunks):
+        async def scenario(cache, session_id):
+            total = 0.0
+            for seconds in chunks:
+                pinned = await cache.observe(session_id, "de", 0.95, seconds)
+                total += seconds
+                assert (pinned == "de") == (total >= cache.detect_seconds)
+                if pinned:
+                    break
+            return total
+
+        total = _run(scenario)
+        assert total > 0
+
+    @pytest.mark.property
+    @given(probability=st.floats(min_value=0.0, max_value=0.79))
+    @settings(max_examples=15, deadline=None)
+    def test_low_probability_never_pins(self, probability):
+        async def scenario(cache, session_id):
+            assert await cache.observe(session_id, "fr", probability, 10.0) is None
+            return await cache.pinned(session_id)
+
+        assert _run(scenario) is None
+
+    @pytest.mark.property
+    def test_language_change_restarts_count(self):
+        async def scenario(cache, session_id):
+            assert await cache.observe(session_id, "en", 0.9, 2.0) is None
+            assert await cache.observe(session_id, "es", 0.9, 2.0) is None
+            return await cache.observe(session_id, "es", 0.9, 1.0)
+
+        assert _run(scenario) == "es"
+
+
+class TestRedetection:
+    """
+    For any pinned session:
+    - Low-confidence decodes SHALL unpin after REDETECT_STRIKES consecutive strikes
+    - A confident decode SHALL reset the strike count
+    """
+
+    @pytest.mark.property
+    def test_unpins_after_strikes(self):
+        async def scenario(cache, session_id):
+            await cache.observe(session_id, "it", 0.99, 5.0)
+            assert await cache.pinned(session_id) == "it"
+            results = [
+                await cache.record_confidence(session_id, 0.1) for _ in range(REDETECT_STRIKES)
+            ]
+            return results, await cache.pinned(session_id)
+
+        results, pinned = _run(scenario)
+        assert results == [False] * (REDETECT_STRIKES - 1) + [True]
+        assert pinned is None
+
+    @pytest.mark.property
+    def test_confident_decode_resets_strikes(self):
+        async def scenario(cache, session_id):
+            await cache.observe(session_id, "it", 0.99, 5.0)
+            for _ in range(REDETECT_STRIKES * 2):
+                assert not await cache.record_confidence(session_id, 0.1)
+                assert not await cache.record_confidence(session_id, 0.9)
+            return await cache.pinned(session_id)
+
+        assert _run(scenario) == "it"
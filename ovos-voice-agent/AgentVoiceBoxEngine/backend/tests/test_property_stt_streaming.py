@@ -0,0 +1,199 @@
+"""
+Property tests for incremental (streaming) transcription state.
+
+**Feature: production-voice-agent, Property: Local-Agreement Streaming STT**
+
+Tests that:
+1. Only prefixes on which two consecutive hypotheses agree are committed
+2. Committed text is never retracted by later hypotheses
+3. Finishing an utterance returns committed plus unstable text
+4. Audio behind closed, fully committed segments is trimmed from the buffer
+5. Numbered chunks are processed in sequence order, whatever their arrival order
+
+Uses the REAL LocalAgreementBuffer and StreamingSession - NO MOCKS.
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.stt_streaming import (
+    MAX_HELD_CHUNKS,
+    HypothesisSegment,
+    LocalAgreementBuffer,
+    StreamingSession,
+)
+
+word_strategy = st.sampled_from(["hello", "world", "how", "are", "you", "today", "fine"])
+
+
+def _session() -> StreamingSession:
+    """Creates a streaming session with test-sized limits."""
+    return StreamingSession(
+        session_id="test-session",
+        sample_rate=16000,
+        max_buffer_seconds=15.0,
+        min_decode_seconds=0.3,
+    )
+
+
+class TestLocalAgreement:
+    """
+    Property tests for LocalAgreementBuffer.
+
+    For any sequence of hypotheses:
+    - Committed words SHALL be a prefix agreed by two consecutive hypotheses
+    - Committed words SHALL never change once committed
+    """
+
+    @pytest.mark.property
+    @given(words=st.lists(word_strategy, min_size=1, max_size=20))
+    @settings(max_examples=50)
+    def test_first_hypothesis_commits_nothing(self, words):
+        """
+        Property: A single hypothesis is never committed on its own.
+        """
+        buffer = LocalAgreementBuffer()
+        assert buffer.insert(words) == []
+        assert buffer.unstable == words
+
+    @pytest.mark.property
+    @given(
+        hypotheses=st.lists(
+            st.lists(word_strategy, min_size=0, max_size=12), min_size=2, max_size=8
+        )
+    )
+    @settings(max_examples=50)
+    def test_committed_prefix_is_never_retracted(self, hypotheses):
+        """
+        Property: Committed words only grow, and each commit was agreed.
+        """
+        buffer = LocalAgreementBuffer()
+        committed: list[str] = []
+        previous_unstable: list[str] = []
+
+        for words in hypotheses:
+            before = list(buffer.committed_in_buffer)
+            delta = buffer.insert(words)
+            assert buffer.committed_in_buffer[: len(before)] == before
+            assert delta == previous_unstable[: len(delta)]
+            committed.extend(delta)
+            previous_unstable = buffer.unstable
+
+        assert buffer.committed_in_buffer == committed
+
+
+class TestStreamingSession:
+    """
+    Property tests for StreamingSession.
+
+    For any streaming session:
+    - Partial updates SHALL expose the delta committed by that update
+    - Trimmed audio SHALL only cover closed segments whose words are committed
+    """
+
+    @pytest.mark.property
+    def test_partial_delta_and_final_text(self):
+        """
+        Property: Agreed words are published as deltas; the tail is committed at the end.
+        """
+        session = _session()
+        session.append(np.zeros(16000, dtype=np.float32))
+
+        first = session.apply_hypothesis([HypothesisSegment(0.0, None, "hello wor")])
+        assert first.delta == ""
+        assert first.unstable_text == "hello wor"
+
+        second = session.apply_hypothesis([HypothesisSegment(0.0, None, "hello world how")])
+        assert second.delta == "hello"
+        assert second.committed_text == "hello"
+        assert second.unstable_text == "world how"
+
+        assert session.finish_utterance() == "hello world how"
+        assert session.utterance_words == []
+        assert session.buffer_seconds == 0.0
+
+    @pytest.mark.property
+    def test_committed_closed_segment_is_trimmed(self):
+        """
+        Property: Audio behind a closed, fully committed segment is not decoded again.
+        """
+        session = _session()
+        session.append(np.zeros(3 * 16000, dtype=np.float32))
+        segments = [
+            HypothesisSegment(0.0, 1.0, "hello world"),
+            HypothesisSegment(1.0, None, "how are"),
+        ]
+
+        session.apply_hypothesis(segments)
+        update = session.apply_hypothesis(segments)
+
+        assert update.delta == "hello world how are"
+        assert session.buffer_seconds == pytest.approx(2.0)
+        assert session.agreement.committed_in_buffer == ["how", "are"]
+
+    @pytest.mark.property
+    @given(seconds=st.floats(min_value=0.0, max_value=0.29))
+    @settings(max_examples=20)
+    def test_short_audio_is_not_decoded(self, seconds):
+        """
+        Property: Less new audio than min_decode_seconds does not trigger a decode.
+        """
+        session = _session()
+        session.append(np.zeros(int(seconds * 16000), dtype=np.float32))
+        assert not session.ready_to_decode()
+
+
+class TestChunkOrdering:
+    """
+    Property tests for StreamingSession.order.
+
+    For any streaming session:
+    - Numbered chunks SHALL be released in sequence order
+    - Duplicate chunks SHALL be released once
+    - A missing chunk SHALL NOT hold back more than MAX_HELD_CHUNKS chunks
+    """
+
+    @pytest.mark.property
+    @given(
+        arrival=st.permutations(range(MAX_HELD_CHUNKS)),
+        duplicates=st.lists(st.integers(0, MAX_HELD_CHUNKS - 1), max_size=8),
+    )
+    @settings(max_examples=50)
+    def test_chunks_released_in_order(self, arrival, duplicates):
+        """
+        Property: Any arrival order within the window is released as 0, 1, 2, ...
+        """
+        session = _session()
+        released = []
+        for seq in [*arrival, *duplicates]:
+            released.extend(session.order(seq, f"chunk-{seq}"))
+
+        assert released == [f"chunk-{seq}" for seq in range(MAX_HELD_CHUNKS)]
+        assert session.held == {}
+
+    @pytest.mark.property
+    def test_missing_chunk_is_given_up(self):
+        """
+        Property: A gap is skipped once the window is full; the late chunk is dropped.
+        """
+        session = _session()
+        assert session.order(0, 0) == [0]
+        for seq in range(2, MAX_HELD_CHUNKS + 2):
+            assert session.order(seq, seq) == []
+
+        assert session.order(MAX_HELD_CHUNKS + 2, MAX_HELD_CHUNKS + 2) == list(
+            range(2, MAX_HELD_CHUNKS + 3)
+        )
+        assert session.order(1, 1) == []
+
+    @pytest.mark.property
+    def test_taken_over_session_starts_at_first_chunk(self):
+        """
+        Property: A session first seen past the window starts at the chunk it sees first.
+        """
+        session = _session()
+        first = MAX_HELD_CHUNKS + 10
+        assert session.order(first, "a") == ["a"]
+        assert session.order(first + 1, "b") == ["b"]
@@ -0,0 +1,114 @@
+"""
+Property tests for server-side voice activity detection and endpointing.
+
+**Feature: production-voice-agent, Property: STT VAD and Endpointing**
+
+Tests that:
+1. Silence and broadband noise produce no speech
+2. A voiced burst yields one utterance with speech_started and speech_stopped
+3. Bursts shorter than min_speech_ms are dropped
+4. Detection does not depend on how the stream is chunked
+
+Uses the REAL VoiceActivityDetector on synthetic audio - NO MOCKS.
+"""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.audio_processing import (
+    PREROLL_MS,
+    VADConfig,
+    VoiceActivityDetector,
+    extract_speech,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _voiced(seconds: float, f0: float = 150.0) -> np.ndarray:
+    """Generates a harmonic, voice-like signal."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 12))
+    return (0.1 * signal).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    """Generates digital silence."""
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+class TestVoiceActivityDetector:
+    """
+    Property tests for VoiceActivityDetector.
+
+    For any audio stream:
+    - Non-speech audio SHALL NOT produce speech spans
+    - Each utterance SHALL be opened once and closed once
+    """
+
+    @pytest.mark.property
+    @given(
+        level=st.floats(min_value=0.001, max_value=0.3),
+        seed=st.integers(min_value=0, max_value=1000),
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_noise_is_not_speech(self, level, seed):
+        """
+        Property: White noise at any level is dropped entirely.
+        """
+        rng = np.random.default_rng(seed)
+        noise = (rng.standard_normal(2 * SAMPLE_RATE) * level).astype(np.float32)
+
+        assert len(extract_speech(noise, VADConfig())) == 0
+        assert len(extract_speech(_silence(2.0), VADConfig())) == 0
+
+    @pytest.mark.property
+    @given(
+        f0=st.floats(min_value=90.0, max_value=300.0),
+        seconds=st.floats(min_value=0.4, max_value=2.0),
+    )
+    @settings(max_examples=20, deadline=None)
+    def test_voiced_burst_is_one_utterance(self, f0, seconds):
+        """
+        Property: A voiced burst between silences opens and closes one utterance.
+        """
+        audio = np.concatenate((_silence(1.0), _voiced(seconds, f0), _silence(1.0)))
+        spans = VoiceActivityDetector(VADConfig()).process(audio)
+
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.started
+        assert span.end_ms is not None
+        assert 1000 - PREROLL_MS - 60 <= span.start_ms <= 1000
+        assert abs(span.end_ms - (1000 + seconds * 1000)) <= 60
+        assert len(span.audio) < len(audio)
+
+    @pytest.mark.property
+    def test_short_click_is_dropped(self):
+        """
+        Property: Bursts shorter than min_speech_ms never start an utterance.
+        """
+        audio = np.concatenate((_silence(0.5), _voiced(0.06), _silence(0.5)))
+        assert VoiceActivityDetector(VADConfig(min_speech_ms=150)).process(audio) == []
+
+    @pytest.mark.property
+    @given(chunk=st.integers(min_value=160, max_value=8000))
+    @settings(max_examples=20, deadline=None)
+    def test_chunking_does_not_change_endpoints(self, chunk):
+        """
+        Property: Onset, offset and speech audio are independent of chunk size.
+        """
+        audio = np.concatenate((_silence(0.7), _voiced(0.8), _silence(0.9)))
+        reference = VoiceActivityDetector(VADConfig()).process(audio)
+
+        detector = VoiceActivityDetector(VADConfig())
+        spans = []
+        for offset in range(0, len(audio), chunk):
+            spans.extend(detector.process(audio[offset : offset + chunk]))
+
+        assert [s.start_ms for s in spans if s.started] == [reference[0].start_ms]
+        assert [s.end_ms for s in spans if s.end_ms is not None] == [reference[0].end_ms]
+        assert sum(len(s.audio) for s in spans) == len(reference[0].audio)
+        assert detector.flush() is None
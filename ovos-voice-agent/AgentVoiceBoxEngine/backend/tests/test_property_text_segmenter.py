@@ -0,0 +1,135 @@
+"""
+Property tests for incremental TTS text segmentation.
+
+**Feature: production-voice-agent, Property: Streaming TTS Segmentation**
+
+Tests that:
+- Segments reproduce the input text, in order, for any token split
+- Segmentation does not depend on how the text is split into tokens
+- Sentences are released as soon as the next sentence starts
+- Abbreviations, initials, decimals and thousands separators never split
+- No segment exceeds the maximum length
+- The unspoken tail of a response is exactly what follows the received tokens
+
+Uses the REAL segmenter on generated token streams - NO MOCKS.
+"""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.text_segmenter import SentenceSegmenter, unspoken_tail
+
+words = st.sampled_from(
+    ["hello", "World", "the", "Dr.", "3.14", "1,000", "e.g.", "J.", "ok", "Yes", "no"]
+)
+punctuation = st.sampled_from(["", "", "", ",", ".", "!", "?", ";", "..."])
+text_strategy = st.lists(
+    st.tuples(words, punctuation).map(lambda pair: pair[0] + pair[1]), min_size=1, max_size=60
+).map(" ".join)
+
+
+def segment(text: str, cuts: list[int], **kwargs) -> list[str]:
+    """Feeds text split at the given offsets and returns all segments."""
+    segmenter = SentenceSegmenter(**kwargs)
+    result = []
+    start = 0
+    for cut in sorted(set(cuts)) + [len(text)]:
+        result += segmenter.feed(text[start:cut])
+        start = max(start, cut)
+    return result + segmenter.flush()
+
+
+class TestSegmentationCompleteness:
+    """
+    For any text and any token split:
+    - The segments SHALL contain exactly the input's non-space characters, in order
+    - The segments SHALL be identical for every token split
+    """
+
+    @pytest.mark.property
+    @given(text=text_strategy, data=st.data())
+    @settings(max_examples=200)
+    def test_reproduces_text(self, text, data):
+        cuts = data.draw(st.lists(st.integers(0, len(text)), max_size=30))
+        segments = segment(text, cuts, min_clause_chars=20)
+        assert "".join("".join(segments).split()) == "".join(text.split())
+        assert all(seg == seg.strip() and seg for seg in segments)
+
+    @pytest.mark.property
+    @given(text=text_strategy, data=st.data())
+    @settings(max_examples=200)
+    def test_independent_of_token_split(self, text, data):
+        cuts = data.draw(st.lists(st.integers(0, len(text)), max_size=30))
+        assert segment(text, cuts, min_clause_chars=20) == segment(text, [], min_clause_chars=20)
+
+
+class TestBoundaries:
+    """
+    For any stream of sentences:
+    - A sentence SHALL be emitted once the next sentence's first character arrives
+    - Abbreviations, initials and numbers SHALL NOT end a segment
+    """
+
+    @pytest.mark.property
+    def test_sentence_released_on_lookahead(self):
+        segmenter = SentenceSegmenter()
+        assert segmenter.feed("Hello there.") == []
+        assert segmenter.feed(" ") == []
+        assert segmenter.feed("H") == ["Hello there."]
+        assert segmenter.flush() == ["H"]
+
+    @pytest.mark.property
+    def test_abbreviations_and_numbers(self):
+        text = "Dr. Smith paid $3.50 for 1,000 apples, e.g. the red ones. J. R. Tolkien agreed."
+        assert segment(text, list(range(len(text)))) == [
+            "Dr. Smith paid $3.50 for 1,000 apples, e.g. the red ones.",
+            "J. R. Tolkien agreed.",
+        ]
+
+    @pytest.mark.property
+    def test_closing_quotes_stay_with_sentence(self):
+        assert segment('He said "stop." Then left.', []) == ['He said "stop."', "Then left."]
+
+    @pytest.mark.property
+    def test_clause_split_only_when_long(self):
+        assert segment("Yes, sure. Fine.", [], min_clause_chars=20) == ["Yes, sure.", "Fine."]
+        long_text = "Because the numbers we computed carefully add up, we can go ahead now."
+        assert segment(long_text, [], min_clause_chars=20) == [
+            "Because the numbers we computed carefully add up,",
+            "we can go ahead now.",
+        ]
+
+
+class TestMaximumLength:
+    """
+    For any text:
+    - No segment SHALL be longer than max_chars
+    """
+
+    @pytest.mark.property
+    @given(text=text_strategy, max_chars=st.integers(min_value=20, max_value=80))
+    @settings(max_examples=100)
+    def test_max_length(self, text, max_chars):
+        assert all(len(seg) <= max_chars for seg in segment(text, [], max_chars=max_chars))
+
+
+class TestUnspokenTail:
+    """
+    For any completed response and received prefix:
+    - The tail SHALL be the text after the prefix, or the whole text if nothing was received
+    - A missed start SHALL leave only the text after the received tokens
+    """
+
+    @pytest.mark.property
+    @given(text=text_strategy, cut=st.integers(min_value=0))
+    @settings(max_examples=100)
+    def test_prefix(self, text, cut):
+        cut = cut % (len(text) + 1)
+        assert unspoken_tail(text, text[:cut]) == text[cut:]
+
+    @pytest.mark.property
+    def test_missed_start(self):
+        text = "Hello there. Your order number is 42. It ships tomorrow."
+        assert unspoken_tail(text, "Your order number is 42.") == " It ships tomorrow."
+        assert unspoken_tail(text, "Something else.") == ""
@@ -0,0 +1,125 @@
+"""
+Property tests for LLM token coalescing.
+
+**Feature: production-voice-agent, Property: LLM Token Coalescing**
+
+Tests that:
+- Coalesced batches hold every token, in order, exactly once
+- No batch holds more than one token past the character limit
+- Sentence ends release the buffer at once
+- A silent provider does not hold buffered tokens past the flush interval
+- A failing stream releases its buffered tokens before the error
+
+Uses REAL asyncio streams - NO MOCKS.
+"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.token_coalescer import TokenCoalescer, coalesce
+
+tokens_strategy = st.lists(
+    st.sampled_from(["Hel", "lo", " there", ",", " how", " are", " you", "?", " I", "'m", " ok."]),
+    max_size=60,
+)
+
+
+async def _stream(tokens, delay=0.0, error=None):
+    for token in tokens:
+        if delay:
+            await asyncio.sleep(delay)
+        yield token
+    if error:
+        raise error
+
+
+class TestCoalescer:
+    """
+    For any token stream and limits:
+    - Batches plus the remaining buffer SHALL join to the whole response
+    - Batches SHALL stay within max_chars plus one token
+    - A batch ending inside a sentence SHALL have reached max_chars
+    - Every token SHALL be counted
+    """
+
+    @pytest.mark.property
+    @given(tokens=tokens_strategy, max_chars=st.integers(min_value=1, max_value=60))
+    @settings(max_examples=100)
+    def test_batches(self, tokens, max_chars):
+        coalescer = TokenCoalescer(flush_ms=10_000, max_chars=max_chars)
+        batches = [batch for token in tokens if (batch := coalescer.add(token, 0.0))]
+        tail = coalescer.flush()
+
+        assert "".join(batches) + tail == "".join(tokens)
+        assert coalescer.tokens_total == len(tokens)
+        longest = max((len(token) for token in tokens), default=0)
+        for batch in batches:
+            assert len(batch) < max_chars + longest
+            if not batch.rstrip().endswith((".", "?", "!")):
+                assert len(batch) >= max_chars
+
+    @pytest.mark.property
+    @given(tokens=tokens_strategy)
+    @settings(max_examples=50)
+    def test_zero_interval_releases_every_token(self, tokens):
+        coalescer = TokenCoalescer(flush_ms=0, max_chars=1000)
+        assert [coalescer.add(token, 0.0) for token in tokens] == tokens
+
+    @pytest.mark.property
+    def test_interval(self):
+        coalescer = TokenCoalescer(flush_ms=50, max_chars=1000, sentences=False)
+        assert coalescer.time_left(0.0) is None
+        assert coalescer.add("Hello", 1.0) is None
+        assert coalescer.time_left(1.02) == pytest.approx(0.03)
+        assert coalescer.add(" world.", 1.03) is None
+        assert coalescer.add("!", 1.06) == "Hello world.!"
+
+
+class TestCoalesceStream:
+    """
+    For any streamed response:
+    - A silent provider SHALL not hold buffered tokens past the interval
+    - The end of the stream SHALL leave the remaining text to the caller
+    - A failure SHALL release the buffered tokens before raising
+    """
+
+    @pytest.mark.property
+    def test_silent_provider_flushes(self):
+        async def run():
+            coalescer = TokenCoalescer(flush_ms=20, max_chars=1000)
+            batches = [batch async for batch in coalesce(_stream(["a", "b"], 0.1), coalescer)]
+            return batches, coalescer.flush()
+
+        batches, tail = asyncio.run(run())
+        assert batches == ["a"]
+        assert tail == "b"
+
+    @pytest.mark.property
+    @given(tokens=tokens_strategy)
+    @settings(max_examples=30, deadline=None)
+    def test_stream_order(self, tokens):
+        async def run():
+            coalescer = TokenCoalescer(flush_ms=5, max_chars=16)
+            batches = [batch async for batch in coalesce(_stream(tokens), coalescer)]
+            return batches, coalescer.flush()
+
+        batches, tail = asyncio.run(run())
+        assert "".join(batches) + tail == "".join(tokens)
+
+    @pytest.mark.property
+    def test_failure_releases_buffer(self):
+        async def run():
+            coalescer = TokenCoalescer(flush_ms=10_000, max_chars=1000)
+            batches = []
+            with pytest.raises(RuntimeError, match="provider down"):
+                async for batch in coalesce(
+                    _stream(["partial", " answer"], error=RuntimeError("provider down")),
+                    coalescer,
+                ):
+                    batches.append(batch)
+            return batches
+
+        assert asyncio.run(run()) == ["partial answer"]
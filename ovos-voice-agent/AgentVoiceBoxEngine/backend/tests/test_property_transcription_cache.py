@@ -0,0 +1,133 @@
+"""
+Property tests for the content-addressed transcription cache.
+
+**Feature: production-voice-agent, Property: Transcription Cache**
+
+Tests that:
+- Identical audio and decode settings always map to the same key
+- Any change to the audio or a decode setting changes the key
+- Cached values round-trip through Redis and the in-process LRU
+- The in-process LRU stays within its size and counts hits and misses
+
+Uses REAL NumPy buffers and the REAL Redis server from REDIS_URL - NO MOCKS.
+"""
+
+import uuid
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.transcription_cache import TranscriptionCache, transcription_key
+from tests.conftest import run_with_redis
+
+audio_strategy = st.lists(
+    st.floats(min_value=-1.0, max_value=1.0, allow_nan=False, width=32),
+    min_size=1,
+    max_size=400,
+).map(lambda values: np.asarray(values, dtype=np.float32))
+
+
+class TestTranscriptionKey:
+    """
+    For any audio buffer and decode settings:
+    - The key SHALL be deterministic
+    - The key SHALL change when the audio, model, language or beam size changes
+    """
+
+    @pytest.mark.property
+    @given(audio=audio_strategy)
+    @settings(max_examples=50, deadline=None)
+    def test_key_is_deterministic(self, audio):
+        assert transcription_key(audio, "base", "en", 5) == transcription_key(
+            audio.copy(), "base", "en", 5
+        )
+
+    @pytest.mark.property
+    @given(audio=audio_strategy, index=st.integers(min_value=0))
+    @settings(max_examples=50, deadline=None)
+    def test_key_changes_with_audio(self, audio, index):
+        changed = audio.copy()
+        changed[index % len(audio)] += np.float32(0.5)
+        assert transcription_key(audio, "base", "en", 5) != transcription_key(
+            changed, "base", "en", 5
+        )
+
+    @pytest.mark.property
+    @given(audio=audio_strategy)
+    @settings(max_examples=25, deadline=None)
+    def test_key_changes_with_settings(self, audio):
+        keys = {
+            transcription_key(audio, "base", "en", 5),
+            transcription_key(audio, "small", "en", 5),
+            transcription_key(audio, "base", None, 5),
+            transcription_key(audio, "base", "en", 1),
+            transcription_key(audio, "base", "en", 5, variant="vad=1"),
+        }
+        assert len(keys) == 5
+
+    @pytest.mark.property
+    def test_non_contiguous_audio_matches_contiguous(self):
+        audio = np.arange(200, dtype=np.float32)[::2]
+        assert transcription_key(audio, "base", "en", 5) == transcription_key(
+            np.ascontiguousarray(audio), "base", "en", 5
+        )
+
+
+def _run(scenario, local_size=4):
+    """Runs a scenario against a fresh cache and deletes the keys it wrote."""
+
+    async def with_cache(client):
+        cache = TranscriptionCache(client, ttl=60, local_size=local_size, local_ttl=60)
+        written: list[str] = []
+        try:
+            return await scenario(cache, written)
+        finally:
+            if written:
+                await client.delete(*written)
+
+    return run_with_redis(with_cache)
+
+
+@pytest.mark.redis
+class TestTranscriptionCache:
+    """
+    For any cached transcription:
+    - A value SHALL round-trip unchanged
+    - Repeats SHALL be answered by the in-process LRU without growing past its size
+    """
+
+    @pytest.mark.property
+    @given(text=st.text(max_size=200), confidence=st.floats(min_value=0.0, max_value=1.0))
+    @settings(max_examples=20, deadline=None)
+    def test_round_trip(self, text, confidence):
+        value = {"text": text, "language": "en", "confidence": confidence}
+
+        async def scenario(cache, written):
+            key = f"stt:tx:test:{uuid.uuid4().hex}"
+            written.append(key)
+            assert await cache.get(key) is None
+            await cache.set(key, value)
+            cache._local.clear()
+            from_redis = await cache.get(key)
+            from_local = await cache.get(key)
+            return from_redis, from_local, cache.stats()
+
+        from_redis, from_local, stats = _run(scenario)
+        assert from_redis == value
+        assert from_local == value
+        assert stats["transcription_cache_misses"] == 1
+        assert stats["transcription_cache_redis_hits"] == 1
+        assert stats["transcription_cache_local_hits"] == 1
+
+    @pytest.mark.property
+    def test_local_lru_is_bounded(self):
+        async def scenario(cache, written):
+            for index in range(10):
+                key = f"stt:tx:test:{uuid.uuid4().hex}"
+                written.append(key)
+                await cache.set(key, {"index": index})
+            return len(cache._local)
+
+        assert _run(scenario, local_size=4) == 4
@@ -0,0 +1,102 @@
+"""
+Property tests for long-form batch synthesis.
+
+**Feature: production-voice-agent, Property: TTS Batch Synthesis**
+
+Tests that:
+- Documents read in any chunking split into the same bounded sentences
+- No words are lost or reordered by the split
+- Sentence results round-trip their audio and surface failures
+- Sentence requests carry the job's voice, order and cancellation session
+
+Uses REAL text segmentation - NO MOCKS.
+"""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.tts_batch import (
+    BatchJob,
+    decode_segment,
+    encode_failure,
+    encode_segment,
+    iter_sentences,
+    segment_key,
+)
+
+words = st.sampled_from(
+    ["Hello", "world.", "This", "is", "a", "test,", "of", "long", "form", "speech!", "Why?"]
+)
+documents = st.lists(words, min_size=1, max_size=200).map(" ".join)
+
+
+def _chunked(text: str, cuts: list[int]) -> list[str]:
+    """Splits a text at the given offsets."""
+    offsets = sorted({cut % (len(text) + 1) for cut in cuts})
+    bounds = [0, *offsets, len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+class TestSentenceSplit:
+    """
+    For any document and chunking:
+    - The sentences SHALL not depend on how the document is chunked
+    - Every sentence SHALL be non-empty and at most max_chars long
+    - The sentences SHALL hold every word of the document, in order
+    """
+
+    @pytest.mark.property
+    @given(
+        text=documents,
+        cuts=st.lists(st.integers(min_value=0, max_value=2000), max_size=20),
+        max_chars=st.integers(min_value=20, max_value=200),
+    )
+    @settings(max_examples=100)
+    def test_split(self, text, cuts, max_chars):
+        whole = list(iter_sentences([text], max_chars))
+        chunked = list(iter_sentences(_chunked(text, cuts), max_chars))
+
+        assert chunked == whole
+        assert all(0 < len(sentence) <= max_chars for sentence in whole)
+        assert " ".join(whole).split() == text.split()
+
+
+class TestSegmentResults:
+    """
+    For any sentence result:
+    - Audio SHALL round-trip unchanged, including empty audio
+    - A failure SHALL raise with its error message
+    """
+
+    @pytest.mark.property
+    @given(pcm=st.binary(max_size=2048))
+    @settings(max_examples=100)
+    def test_round_trip(self, pcm):
+        assert decode_segment(encode_segment(pcm)) == pcm
+
+    @pytest.mark.property
+    def test_failure(self):
+        with pytest.raises(RuntimeError, match="voice not available"):
+            decode_segment(encode_failure("voice not available"))
+
+
+class TestBatchRequests:
+    """
+    For any batch job:
+    - Sentence requests SHALL carry the voice, speed and index
+    - All requests SHALL share the job's cancellation session at batch priority
+    - Result keys SHALL be unique per sentence
+    """
+
+    @pytest.mark.property
+    def test_requests(self):
+        job = BatchJob.create("tenant-1", "am_onyx", 1.2)
+        first, second = job.request(0, "One."), job.request(1, "Two.")
+
+        assert first["type"] == "batch" and first["priority"] == "batch"
+        assert first["voice"] == "am_onyx" and float(first["speed"]) == 1.2
+        assert (first["index"], second["index"]) == ("0", "1")
+        assert first["session_id"] == second["session_id"] == job.session_id
+        assert segment_key(job.job_id, 0) != segment_key(job.job_id, 1)
+        assert BatchJob.create("tenant-1", "am_onyx", 1.2).job_id != job.job_id
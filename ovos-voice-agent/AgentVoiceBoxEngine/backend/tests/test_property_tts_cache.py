@@ -0,0 +1,158 @@
+"""
+Property tests for the TTS phrase cache.
+
+**Feature: production-voice-agent, Property: TTS Phrase Cache**
+
+Tests that:
+- Text normalization is idempotent and ignores whitespace differences only
+- Phrase keys change with every setting that changes the audio
+- The in-process LRU never exceeds its byte budget
+- Phrases round-trip through the disk store, which honours its TTL
+
+Uses the REAL filesystem and asyncio - NO MOCKS.
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.tts_cache import (
+    CachedPhrase,
+    DiskPhraseStore,
+    TTSPhraseCache,
+    normalize_text,
+    phrase_key,
+)
+
+chunk_strategy = st.text(alphabet="ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789+/", min_size=1, max_size=64)
+
+
+def _key(
+    text="Hello there.", voice="af_heart", speed=1.0, rate=24000, fmt="wav", engine="kokoro_onnx"
+):
+    return phrase_key(text, voice, speed, rate, fmt, engine)
+
+
+class TestNormalization:
+    """
+    For any text:
+    - Normalizing twice SHALL equal normalizing once
+    - Texts differing only in whitespace SHALL share a key
+    """
+
+    @pytest.mark.property
+    @given(text=st.text(max_size=200))
+    @settings(max_examples=100)
+    def test_idempotent(self, text):
+        assert normalize_text(normalize_text(text)) == normalize_text(text)
+
+    @pytest.mark.property
+    @given(
+        words=st.lists(
+            st.text(alphabet="abcXYZ.,!?", min_size=1, max_size=8), min_size=1, max_size=10
+        )
+    )
+    @settings(max_examples=50)
+    def test_whitespace_insensitive(self, words):
+        assert _key(" ".join(words)) == _key("  " + "\n\t ".join(words) + " ")
+
+    @pytest.mark.property
+    def test_case_and_punctuation_matter(self):
+        assert _key("Hello there.") != _key("hello there.")
+        assert _key("Hello there.") != _key("Hello there?")
+
+
+class TestPhraseKey:
+    """
+    For any phrase:
+    - The key SHALL change with the voice, speed, sample rate, format or engine
+    """
+
+    @pytest.mark.property
+    def test_settings_change_key(self):
+        keys = {
+            _key(),
+            _key(voice="am_adam"),
+            _key(speed=1.1),
+            _key(rate=16000),
+            _key(fmt="pcm16"),
+            _key(engine="kokoro:en"),
+        }
+        assert len(keys) == 6
+
+
+class TestLocalBudget:
+    """
+    For any sequence of cached phrases:
+    - The in-process LRU SHALL stay within its byte budget
+    - The most recently stored phrase that fits SHALL be retrievable
+    """
+
+    @pytest.mark.property
+    @given(
+        phrases=st.lists(st.lists(chunk_strategy, min_size=1, max_size=4), min_size=1, max_size=30),
+        budget=st.integers(min_value=16, max_value=512),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_budget_respected(self, phrases, budget):
+        async def run():
+            cache = TTSPhraseCache(None, memory_budget_bytes=budget, ttl=60, max_characters=200)
+            for index, chunks in enumerate(phrases):
+                phrase = CachedPhrase(sample_rate=24000, duration_seconds=1.0, chunks=chunks)
+                await cache.put(f"k{index}", phrase)
+                stats = cache.stats()
+                assert stats["tts_cache_local_bytes"] <= budget
+                if phrase.size_bytes <= budget:
+                    assert await cache.get(f"k{index}") == phrase
+
+        asyncio.run(run())
+
+    @pytest.mark.property
+    def test_cacheable_length(self):
+        cache = TTSPhraseCache(None, memory_budget_bytes=1024, ttl=60, max_characters=10)
+        assert cache.cacheable("Hi there")
+        assert not cache.cacheable("   ")
+        assert not cache.cacheable("This is much too long")
+
+
+class TestDiskStore:
+    """
+    For any phrase stored on disk:
+    - It SHALL round-trip through a fresh cache instance
+    - It SHALL be a miss once older than the TTL
+    """
+
+    @pytest.mark.property
+    @given(chunks=st.lists(chunk_strategy, min_size=1, max_size=5))
+    @settings(max_examples=20, deadline=None)
+    def test_round_trip(self, tmp_path_factory, chunks):
+        directory = str(tmp_path_factory.mktemp("tts"))
+        phrase = CachedPhrase(sample_rate=24000, duration_seconds=0.5, chunks=chunks)
+
+        async def run():
+            writer = TTSPhraseCache(DiskPhraseStore(directory, 60), 1024, 60, 200)
+            await writer.put(_key(), phrase)
+            reader = TTSPhraseCache(DiskPhraseStore(directory, 60), 1024, 60, 200)
+            return await reader.get(_key()), reader.stats()
+
+        loaded, stats = asyncio.run(run())
+        assert loaded == phrase
+        assert stats["tts_cache_store_hits"] == 1
+
+    @pytest.mark.property
+    def test_expired_entry_is_miss(self, tmp_path):
+        store = DiskPhraseStore(str(tmp_path), ttl=60)
+        phrase = CachedPhrase(sample_rate=24000, duration_seconds=0.5, chunks=["AAAA"])
+
+        async def run():
+            await store.set(_key(), phrase.dumps(), 60)
+            path = store._path(_key())
+            old = time.time() - 120
+            os.utime(path, (old, old))
+            return await store.get(_key())
+
+        assert asyncio.run(run()) is None
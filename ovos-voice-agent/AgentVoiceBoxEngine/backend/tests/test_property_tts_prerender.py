@@ -0,0 +1,177 @@
+"""
+Property tests for persona phrase pre-rendering.
+
+**Feature: production-voice-agent, Property: TTS Pre-render**
+
+Tests that:
+- Persona phrases are normalized, de-duplicated and bounded, greeting first
+- Pre-render formats are parsed against the supported output formats
+- The session greeting request matches the pre-rendered cache entry
+- A phrase pre-rendered into several formats decodes to the same audio in each
+
+Uses REAL phrase cache keys and the REAL Kokoro ONNX model - NO MOCKS.
+"""
+
+import asyncio
+import base64
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.audio_framing import OUTPUT_FORMATS, AudioFramer, mulaw_to_pcm16
+from apps.workflows.tts_cache import TTSPhraseCache, normalize_text, phrase_key
+from apps.workflows.tts_prerender import greeting_request, persona_phrases, prerender_formats
+from apps.workflows.tts_scheduler import CancellationToken
+
+
+class TestPersonaPhrases:
+    """
+    For any greeting and canned phrases:
+    - The greeting SHALL come first when it is cacheable
+    - Phrases SHALL be normalized, non-empty, unique and within the limit
+    - Non-text entries SHALL be skipped
+    """
+
+    @pytest.mark.property
+    @given(
+        greeting=st.text(max_size=40),
+        phrases=st.lists(st.one_of(st.text(max_size=40), st.integers()), max_size=10),
+        limit=st.integers(min_value=1, max_value=40),
+    )
+    @settings(max_examples=100)
+    def test_phrases(self, greeting, phrases, limit):
+        result = persona_phrases(greeting, phrases, limit)
+
+        assert len(result) == len(set(result))
+        assert all(text and len(text) <= limit for text in result)
+        assert all(text == normalize_text(text) for text in result)
+        expected = {
+            normalize_text(phrase)
+            for phrase in [greeting, *phrases]
+            if isinstance(phrase, str) and 0 < len(normalize_text(phrase)) <= limit
+        }
+        assert set(result) == expected
+        if normalize_text(greeting) in expected:
+            assert result[0] == normalize_text(greeting)
+
+    @pytest.mark.property
+    def test_duplicates_after_normalization(self):
+        assert persona_phrases("Hi  there!", ["Hi there!", " Please hold. "], 100) == [
+            "Hi there!",
+            "Please hold.",
+        ]
+
+
+class TestPrerenderFormats:
+    """
+    For any format list:
+    - Only supported formats SHALL be kept, in order and without duplicates
+    - An empty or unknown-only list SHALL select every output format
+    """
+
+    @pytest.mark.property
+    def test_formats(self):
+        assert prerender_formats("mulaw, PCM16,mulaw") == ["mulaw", "pcm16"]
+        assert prerender_formats("") == list(OUTPUT_FORMATS)
+        assert prerender_formats("opus") == list(OUTPUT_FORMATS)
+
+
+class TestGreetingRequest:
+    """
+    For a session configuration:
+    - A persona greeting SHALL be requested at live priority with its voice
+    - A project greeting SHALL be read from the tts section
+    - No request SHALL be built without a greeting
+    - The request SHALL hit the phrase cached by the pre-render
+    """
+
+    @pytest.mark.property
+    def test_persona_config(self):
+        config = {"voice": {"id": "am_onyx", "speed": 1.1, "greeting": " Hello,  welcome! "}}
+        request = greeting_request("s1", "t1", config)
+        assert request["priority"] == "live"
+        assert request["voice"] == "am_onyx"
+        assert request["text"] == "Hello, welcome!"
+        assert request["response_id"] == "greeting:s1"
+
+        prerendered = persona_phrases(" Hello,  welcome! ", [], 100)[0]
+        assert phrase_key(
+            request["text"],
+            request["voice"],
+            float(request["speed"]),
+            24000,
+            "pcm16",
+            "kokoro_onnx",
+        ) == phrase_key(prerendered, "am_onyx", 1.1, 24000, "pcm16", "kokoro_onnx")
+
+    @pytest.mark.property
+    def test_project_config(self):
+        config = {"tts": {"voice": "af_bella", "speed": 1.0, "greeting": "Hi."}}
+        request = greeting_request("s2", "t1", config)
+        assert request["voice"] == "af_bella" and request["text"] == "Hi."
+
+    @pytest.mark.property
+    def test_no_greeting(self):
+        assert greeting_request("s3", "t1", {"voice": {"id": "am_onyx", "greeting": ""}}) is None
+        assert greeting_request("s3", "t1", {}) is None
+
+
+def _decode(output_format: str, chunks: list[str]) -> np.ndarray:
+    """Decodes cached chunks of one framing to int16 samples."""
+    samples = []
+    for chunk in chunks:
+        data = base64.b64decode(chunk)
+        if output_format == "mulaw":
+            samples.append(mulaw_to_pcm16(data))
+        else:
+            # wav chunks are base64 WAV files with a 44-byte header.
+            payload = data[44:] if output_format == "wav" else data
+            samples.append(np.frombuffer(payload, dtype="<i2"))
+    return np.concatenate(samples).astype(np.int32)
+
+
+class TestWorkerPrerender:
+    """
+    For a phrase pre-rendered by the TTS worker into every output format:
+    - Each format SHALL be cached
+    - Each cached format SHALL decode to the same audio, up to mu-law quantization
+    """
+
+    @pytest.mark.slow
+    @pytest.mark.property
+    def test_formats_share_audio(self):
+        pytest.importorskip("kokoro_onnx")
+        from apps.workflows.management.commands.run_tts_worker import (
+            KOKORO_SAMPLE_RATE,
+            TTSWorker,
+        )
+
+        text = "Hello, thanks for calling."
+
+        async def run():
+            worker = TTSWorker()
+            await asyncio.to_thread(worker._load_model)
+            worker._phrases = TTSPhraseCache(
+                None, memory_budget_bytes=64 * 1024 * 1024, ttl=60, max_characters=200
+            )
+            voice = worker._engine.voice_names[0]
+            framers = [AudioFramer(name) for name in OUTPUT_FORMATS]
+            written = await worker._prerender_phrase(
+                text, voice, 1.0, framers, CancellationToken("s1", "r1")
+            )
+            cached = {}
+            for name in OUTPUT_FORMATS:
+                key = phrase_key(text, voice, 1.0, KOKORO_SAMPLE_RATE, name, "kokoro_onnx")
+                cached[name] = await worker._phrases.get(key)
+            return written, cached
+
+        written, cached = asyncio.run(run())
+        assert written == len(OUTPUT_FORMATS)
+        pcm16 = _decode("pcm16", cached["pcm16"].chunks)
+        assert np.abs(pcm16).max() > 0
+        assert np.array_equal(_decode("wav", cached["wav"].chunks), pcm16)
+        mulaw = _decode("mulaw", cached["mulaw"].chunks)
+        assert len(mulaw) == len(pcm16)
+        assert np.all(np.abs(mulaw - pcm16) <= np.abs(pcm16) // 16 + 32)
@@ -0,0 +1,404 @@
+"""
+Property tests for TTS inference scheduling.
+
+**Feature: production-voice-agent, Property: TTS Scheduling**
+
+Tests that:
+- No more jobs run than there are slots, and reserved slots stay free for live turns
+- Higher priority classes are dispatched first
+- Tenants within a class are served round-robin
+- Capacity reflects free slots and local queue room, less requests held outside the slots
+- A failing job does not stall the scheduler
+- Executed jobs return their result or error, and are skipped once their caller is gone
+- Cancellation reaches running, queued and later requests of a response
+  and stops an inference stream without waiting for its next item
+
+Uses REAL asyncio tasks - NO MOCKS.
+"""
+
+import asyncio
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.tts_scheduler import (
+    CancellationRegistry,
+    Priority,
+    TTSScheduler,
+    parse_priority,
+    request_stream,
+    until_cancelled,
+)
+
+
+class _Recorder:
+    """Records start order and peak concurrency of scheduled jobs."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.running = {priority: 0 for priority in Priority}
+        self.peak_total = 0
+        self.peak_non_live = 0
+
+    def job(self, name: str, priority: Priority, delay: float = 0.001):
+        async def run() -> None:
+            self.started.append(name)
+            self.running[priority] += 1
+            total = sum(self.running.values())
+            self.peak_total = max(self.peak_total, total)
+            self.peak_non_live = max(self.peak_non_live, total - self.running[Priority.LIVE])
+            await asyncio.sleep(delay)
+            self.running[priority] -= 1
+
+        return run
+
+
+jobs_strategy = st.lists(
+    st.tuples(st.sampled_from(list(Priority)), st.sampled_from(["t1", "t2", "t3"])),
+    min_size=1,
+    max_size=40,
+)
+
+
+class TestSlotBounds:
+    """
+    For any mix of submitted jobs:
+    - Running jobs SHALL never exceed the slots
+    - Non-live jobs SHALL never use the reserved live slots
+    - Every job SHALL eventually run
+    """
+
+    @pytest.mark.property
+    @given(
+        jobs=jobs_strategy,
+        slots=st.integers(min_value=1, max_value=4),
+        reserved=st.integers(min_value=0, max_value=3),
+    )
+    @settings(max_examples=50, deadline=None)
+    def test_bounds(self, jobs, slots, reserved):
+        reserved = min(reserved, slots - 1)
+
+        async def run():
+            scheduler = TTSScheduler(slots, reserved_live_slots=reserved, queue_depth=64)
+            recorder = _Recorder()
+            for index, (priority, tenant) in enumerate(jobs):
+                scheduler.submit(priority, tenant, recorder.job(str(index), priority))
+            await scheduler.join()
+            return recorder
+
+        recorder = asyncio.run(run())
+        assert recorder.peak_total <= slots
+        assert recorder.peak_non_live <= slots - reserved
+        assert sorted(recorder.started, key=int) == [str(i) for i in range(len(jobs))]
+
+
+class TestPriorityAndFairness:
+    """
+    For queued jobs:
+    - A live job SHALL start before queued preview and batch jobs
+    - Tenants of one class SHALL alternate
+    - A live job SHALL start at once while batch work fills the other slots
+    """
+
+    @pytest.mark.property
+    def test_priority_order(self):
+        async def run():
+            scheduler = TTSScheduler(1)
+            recorder = _Recorder()
+            scheduler.submit(Priority.BATCH, "a", recorder.job("batch-1", Priority.BATCH))
+            scheduler.submit(Priority.BATCH, "a", recorder.job("batch-2", Priority.BATCH))
+            scheduler.submit(
+                Priority.INTERACTIVE, "a", recorder.job("preview", Priority.INTERACTIVE)
+            )
+            scheduler.submit(Priority.LIVE, "a", recorder.job("live", Priority.LIVE))
+            await scheduler.join()
+            return recorder.started
+
+        assert asyncio.run(run()) == ["batch-1", "live", "preview", "batch-2"]
+
+    @pytest.mark.property
+    def test_tenant_round_robin(self):
+        async def run():
+            scheduler = TTSScheduler(1)
+            recorder = _Recorder()
+            for index in range(4):
+                scheduler.submit(
+                    Priority.BATCH, "bulk", recorder.job(f"bulk-{index}", Priority.BATCH)
+                )
+            scheduler.submit(Priority.BATCH, "small", recorder.job("small-0", Priority.BATCH))
+            scheduler.submit(Priority.BATCH, "small", recorder.job("small-1", Priority.BATCH))
+            await scheduler.join()
+            return recorder.started
+
+        # bulk-0 starts on submit; the queued jobs then alternate.
+        assert asyncio.run(run()) == [
+            "bulk-0",
+            "bulk-1",
+            "small-0",
+            "bulk-2",
+            "small-1",
+            "bulk-3",
+        ]
+
+    @pytest.mark.property
+    def test_reserved_slot_for_live(self):
+        async def run():
+            scheduler = TTSScheduler(2, reserved_live_slots=1)
+            recorder = _Recorder()
+            for index in range(5):
+                scheduler.submit(
+                    Priority.BATCH, "bulk", recorder.job(f"batch-{index}", Priority.BATCH, 0.05)
+                )
+            await asyncio.sleep(0)
+            scheduler.submit(Priority.LIVE, "call", recorder.job("live", Priority.LIVE))
+            await asyncio.sleep(0.01)
+            started = list(recorder.started)
+            await scheduler.cancel_all()
+            return started
+
+        assert asyncio.run(run()) == ["batch-0", "live"]
+
+
+class TestCapacity:
+    """
+    For any scheduler state:
+    - Capacity SHALL equal the free slots of a class plus its queue room
+    - Requests held outside the slots SHALL count against their class only
+    - Capacity SHALL never be negative
+    """
+
+    @pytest.mark.property
+    def test_capacity(self):
+        async def run():
+            scheduler = TTSScheduler(2, reserved_live_slots=1, queue_depth=2)
+            assert scheduler.capacity(Priority.LIVE) == 4
+            assert scheduler.capacity(Priority.BATCH) == 3
+            event = asyncio.Event()
+            for _ in range(4):
+                scheduler.submit(Priority.BATCH, "a", event.wait)
+            # One batch job running, three queued.
+            assert scheduler.running == 1 and scheduler.queued == 3
+            assert scheduler.capacity(Priority.BATCH) == 0
+            assert scheduler.capacity(Priority.LIVE) == 3
+            assert await scheduler.wait_for_capacity(timeout=0.01)
+            event.set()
+            await scheduler.join()
+            assert scheduler.capacity(Priority.BATCH) == 3
+
+        asyncio.run(run())
+
+    @pytest.mark.property
+    def test_held_requests(self):
+        async def run():
+            scheduler = TTSScheduler(2, queue_depth=2)
+            for _ in range(5):
+                scheduler.hold(Priority.LIVE)
+            assert scheduler.capacity(Priority.LIVE) == 0
+            assert scheduler.capacity(Priority.BATCH) == 4
+            assert scheduler.stats()["tts_live_held"] == 5
+
+            # Once the other classes are held full, reading waits for a release.
+            assert await scheduler.wait_for_capacity(timeout=0.01)
+            for priority in (Priority.INTERACTIVE, Priority.BATCH):
+                for _ in range(4):
+                    scheduler.hold(priority)
+            assert not await scheduler.wait_for_capacity(timeout=0.01)
+            waiter = asyncio.create_task(scheduler.wait_for_capacity(timeout=1.0))
+            await asyncio.sleep(0)
+            scheduler.release(Priority.LIVE)
+            scheduler.release(Priority.LIVE)
+            assert await waiter
+            return scheduler.capacity(Priority.LIVE)
+
+        assert asyncio.run(run()) == 1
+
+    @pytest.mark.property
+    def test_failing_job_releases_slot(self):
+        async def run():
+            scheduler = TTSScheduler(1)
+            recorder = _Recorder()
+
+            async def fail():
+                raise RuntimeError("boom")
+
+            scheduler.submit(Priority.LIVE, "a", fail)
+            scheduler.submit(Priority.LIVE, "a", recorder.job("next", Priority.LIVE))
+            await scheduler.join()
+            return recorder.started, scheduler.stats()
+
+        started, stats = asyncio.run(run())
+        assert started == ["next"]
+        assert stats["tts_running"] == 0 and stats["tts_live_dispatched"] == 2
+
+
+class TestExecute:
+    """
+    For any job executed through the scheduler:
+    - The caller SHALL get the job's result or exception once it ran in a slot
+    - A job whose caller was cancelled before it started SHALL not run
+    """
+
+    @pytest.mark.property
+    def test_result_and_error(self):
+        async def run():
+            scheduler = TTSScheduler(1)
+
+            async def answer():
+                return 42
+
+            async def fail():
+                raise ValueError("boom")
+
+            result = await scheduler.execute(Priority.LIVE, "a", answer)
+            with pytest.raises(ValueError):
+                await scheduler.execute(Priority.LIVE, "a", fail)
+            return result, scheduler.running
+
+        assert asyncio.run(run()) == (42, 0)
+
+    @pytest.mark.property
+    def test_cancelled_caller_skips_job(self):
+        async def run():
+            scheduler = TTSScheduler(1)
+            recorder = _Recorder()
+            event = asyncio.Event()
+            scheduler.submit(Priority.LIVE, "a", event.wait)
+            waiter = asyncio.create_task(
+                scheduler.execute(Priority.LIVE, "a", recorder.job("skipped", Priority.LIVE))
+            )
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            event.set()
+            await scheduler.join()
+            return recorder.started
+
+        assert asyncio.run(run()) == []
+
+
+class TestRequestFields:
+    """
+    For request messages:
+    - Priority names SHALL map to their class, unknown names to the default
+    - Live requests SHALL use the base stream
+    """
+
+    @pytest.mark.property
+    def test_parse_priority(self):
+        assert parse_priority("MCP") == Priority.INTERACTIVE
+        assert parse_priority("preview") == Priority.INTERACTIVE
+        assert parse_priority("batch") == Priority.BATCH
+        assert parse_priority(None, Priority.BATCH) == Priority.BATCH
+        assert parse_priority("urgent") == Priority.LIVE
+
+    @pytest.mark.property
+    def test_request_streams(self):
+        assert request_stream("tts:requests", Priority.LIVE) == "tts:requests"
+        assert request_stream("tts:requests", Priority.BATCH) == "tts:requests:batch"
+
+
+class TestCancellation:
+    """
+    For any cancelled response or session:
+    - Running requests of the response SHALL be cancelled, others SHALL NOT
+    - Requests of the response opened later SHALL start cancelled
+    - A session cancel SHALL cancel requests queued before it only
+    - Records SHALL be pruned after the TTL
+    """
+
+    @pytest.mark.property
+    @given(
+        requests=st.lists(
+            st.tuples(st.sampled_from(["s1", "s2"]), st.sampled_from(["r1", "r2", "r3"])),
+            min_size=1,
+            max_size=20,
+        ),
+        target=st.tuples(st.sampled_from(["s1", "s2"]), st.sampled_from(["", "r1", "r2"])),
+    )
+    @settings(max_examples=100)
+    def test_cancel_matches(self, requests, target):
+        registry = CancellationRegistry(ttl=60)
+        tokens = [registry.open(session, response) for session, response in requests]
+        session_id, response_id = target
+        count = registry.cancel(session_id, response_id)
+
+        expected = [
+            session == session_id and (not response_id or response == response_id)
+            for session, response in requests
+        ]
+        assert [token.cancelled for token in tokens] == expected
+        assert count == sum(expected)
+
+    @pytest.mark.property
+    def test_later_requests(self):
+        registry = CancellationRegistry(ttl=60)
+        registry.cancel("s1", "r1")
+        assert registry.open("s1", "r1").cancelled
+        assert not registry.open("s1", "r2").cancelled
+
+        registry.cancel("s2")
+        cancelled_at = registry._cancelled_sessions["s2"]
+        assert registry.open("s2", "r3", requested_at=cancelled_at - 1).cancelled
+        assert not registry.open("s2", "r4", requested_at=cancelled_at + 1).cancelled
+
+    @pytest.mark.property
+    def test_ttl_and_close(self):
+        registry = CancellationRegistry(ttl=10)
+        token = registry.open("s1", "r1")
+        registry.cancel("s1", "r1")
+        registry.cancel("s2")
+        registry.close(token)
+        assert registry.stats()["tts_cancel_active_tokens"] == 0
+        assert registry.stats()["tts_cancel_records"] == 2
+
+        registry.prune(registry._cancelled_responses["r1"] + 11)
+        assert registry.stats()["tts_cancel_records"] == 0
+        assert not registry.open("s1", "r1").cancelled
+
+
+class TestUntilCancelled:
+    """
+    For an inference stream:
+    - All items SHALL be yielded when not cancelled
+    - A cancel SHALL stop the stream without waiting for the pending item
+    - The source stream SHALL be closed
+    """
+
+    @pytest.mark.property
+    def test_yields_all(self):
+        async def source():
+            for index in range(5):
+                await asyncio.sleep(0)
+                yield index
+
+        async def run():
+            token = CancellationRegistry(ttl=60).open("s", "r")
+            return [item async for item in until_cancelled(source(), token)]
+
+        assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+
+    @pytest.mark.property
+    def test_cancel_interrupts_pending_item(self):
+        closed = []
+
+        async def source():
+            try:
+                yield "first"
+                await asyncio.sleep(10)
+                yield "never"
+            finally:
+                closed.append(True)
+
+        async def run():
+            registry = CancellationRegistry(ttl=60)
+            token = registry.open("s", "r")
+            asyncio.get_running_loop().call_later(0.05, registry.cancel, "s", "r")
+            started = asyncio.get_running_loop().time()
+            items = [item async for item in until_cancelled(source(), token)]
+            return items, asyncio.get_running_loop().time() - started
+
+        items, elapsed = asyncio.run(run())
+        assert items == ["first"]
+        assert elapsed < 1.0
+        assert closed == [True]
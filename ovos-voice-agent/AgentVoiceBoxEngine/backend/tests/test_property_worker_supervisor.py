@@ -0,0 +1,61 @@
+"""
+Property tests for multi-process worker CPU partitioning.
+
+**Feature: production-voice-agent, Property: Pinned Inference Processes**
+
+Tests that:
+1. Every process receives a non-empty CPU set
+2. CPU sets are disjoint and cover every CPU when there are enough CPUs
+3. CPU sets differ in size by at most one
+
+Uses the REAL partitioning used by WorkerSupervisor - NO MOCKS.
+"""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from apps.workflows.supervisor import partition_cpus
+
+
+class TestPartitionCpus:
+    """
+    Property tests for partition_cpus.
+
+    For any CPU list and process count:
+    - Each process SHALL be pinned to at least one CPU
+    - No CPU SHALL be shared while CPUs outnumber processes
+    """
+
+    @pytest.mark.property
+    @given(
+        cpus=st.lists(st.integers(min_value=0, max_value=255), min_size=1, unique=True),
+        processes=st.integers(min_value=1, max_value=64),
+    )
+    @settings(max_examples=100)
+    def test_sets_are_balanced_and_complete(self, cpus, processes):
+        """
+        Property: CPU sets are non-empty, balanced and (when possible) disjoint.
+        """
+        cpus = sorted(cpus)
+        sets = partition_cpus(cpus, processes)
+
+        assert len(sets) == processes
+        assert all(sets)
+        if len(cpus) >= processes:
+            flattened = [cpu for cpu_set in sets for cpu in cpu_set]
+            assert flattened == cpus
+            sizes = [len(cpu_set) for cpu_set in sets]
+            assert max(sizes) - min(sizes) <= 1
+        else:
+            assert {cpu for cpu_set in sets for cpu in cpu_set} <= set(cpus)
+
+    @pytest.mark.property
+    def test_invalid_arguments(self):
+        """
+        Property: A pool without processes or CPUs is rejected.
+        """
+        with pytest.raises(ValueError):
+            partition_cpus([0, 1], 0)
+        with pytest.raises(ValueError):
+            partition_cpus([], 2)